@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+📒 Aplicador de Migrações
+Aplica via rpc/exec_sql apenas os passos de schema ainda não registrados no ledger
+(schema_migrations), na ordem, e avisa sobre passos editados depois de aplicados
+"""
+
+import os
+import argparse
+
+from supabase_tools import (
+    get_admin_client, MigrationRunner, migrations_from_directory, migrations_from_schema, NCISO_SCHEMA
+)
+from supabase_tools.migrations import APPLIED, CHANGED, PENDING
+
+DEFAULT_MIGRATIONS_DIR = 'migrations'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Aplicar migrações pendentes registradas em schema_migrations')
+    parser.add_argument('--dir', default=DEFAULT_MIGRATIONS_DIR,
+                        help='Diretório com migrações extras NNNN_descricao.sql (aplicadas após o modelo)')
+    parser.add_argument('--status', action='store_true', help='Apenas mostrar o estado de cada passo')
+    parser.add_argument('--reapply-changed', action='store_true',
+                        help='Reaplicar passos cujo SQL mudou desde a aplicação')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    migrations = migrations_from_schema(NCISO_SCHEMA)
+    if os.path.isdir(args.dir):
+        migrations += migrations_from_directory(args.dir)
+
+    runner = MigrationRunner(get_admin_client())
+
+    try:
+        if args.status:
+            statuses = runner.status(migrations)
+        else:
+            print("📒 Aplicando migrações pendentes...\n")
+            statuses, results = runner.run(
+                migrations,
+                reapply_changed=args.reapply_changed,
+                on_result=lambda r: print(
+                    f"{'✅' if r.success else '❌'} {r.migration.id} ({r.elapsed_ms:.0f}ms)"
+                    + (f"\n   {r.error}" if r.error else '')
+                ),
+            )
+    except Exception as e:
+        print(f"❌ Erro ao ler o ledger: {str(e)}")
+        return False
+
+    counts = {state: sum(1 for s in statuses if s.state == state) for state in (APPLIED, PENDING, CHANGED)}
+
+    if args.status:
+        icons = {APPLIED: '✅', PENDING: '⏳', CHANGED: '✏️ '}
+        for status in statuses:
+            print(f"{icons[status.state]} {status.migration.id} - {status.state}")
+
+    changed = [s for s in statuses if s.state == CHANGED]
+    if changed and not args.reapply_changed:
+        print(f"\n⚠️  {len(changed)} passo(s) editado(s) depois de aplicado(s):")
+        for status in changed:
+            print(f"   • {status.migration.id}")
+        print("💡 Use sync-schema.py para alterar tabelas existentes ou --reapply-changed para reexecutar")
+
+    print(f"\n📊 Resumo:")
+    print(f"Já aplicados: {counts[APPLIED]}")
+    print(f"Pendentes: {counts[PENDING]}")
+    print(f"Editados: {counts[CHANGED]}")
+
+    if args.status:
+        return True
+
+    failed = [r for r in results if not r.success]
+    if failed:
+        print(f"\n❌ Migração interrompida em: {failed[0].migration.id}")
+        return False
+
+    if results:
+        print(f"\n✅ {len(results)} passo(s) aplicado(s)!")
+    else:
+        print("\n✅ Nada a aplicar - banco já está em dia!")
+    return True
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""
+📑 Benchmark de Paginação: offset x chave (keyset)
+Mede a latência de uma página em profundidades crescentes nas tabelas semeadas,
+com limit/offset (como o frontend pagina hoje) e com o cursor (created_at, id)
+sobre o índice (tenant_id, created_at, id) emitido pelo gerador de SQL
+"""
+
+import os
+import json
+import argparse
+
+from supabase_tools import NCISO_SCHEMA, SupabaseClient
+from supabase_tools.load import DEFAULT_TENANT
+from supabase_tools.pagination import (DEFAULT_PAGE_SIZE, DEFAULT_PAGES, DEFAULT_RUNS, DEFAULT_WARMUP,
+                                       benchmark_pagination)
+from supabase_tools.results import dataset_size, new_result, pagination_metrics, save_result
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Latência por profundidade de página: limit/offset x cursor por chave')
+    parser.add_argument('--tables', help='Tabelas separadas por vírgula (padrão: todas do schema)')
+    parser.add_argument('--tenant', default=DEFAULT_TENANT, help=f'Tenant dos dados semeados (padrão: {DEFAULT_TENANT})')
+    parser.add_argument('--pages', default=','.join(str(page) for page in DEFAULT_PAGES),
+                        help=f"Páginas medidas, além da última (padrão: {','.join(str(p) for p in DEFAULT_PAGES)})")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help=f'Linhas por página (padrão: {DEFAULT_PAGE_SIZE})')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help=f'Medições por página e estratégia (padrão: {DEFAULT_RUNS})')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help=f'Execuções descartadas antes de medir (padrão: {DEFAULT_WARMUP})')
+    parser.add_argument('--json', help='Salvar o relatório completo neste arquivo')
+    parser.add_argument('--save', action='store_true', help='Gravar o resultado em benchmarks/results (compare-benchmarks.py)')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def print_table(result):
+    if result.error:
+        print(f"\n❌ {result.table}: {result.error}")
+        return
+    print(f"\n📋 {result.table} — {result.total if result.total is not None else '?'} linhas no tenant, "
+          f"{result.page_size} por página")
+    print(f"   {'Página':>8}{'offset p50':>13}{'chave p50':>13}{'offset p95':>13}{'chave p95':>13}{'ganho':>9}")
+    for depth in result.depths:
+        offset, keyset = depth.offset.summary_ms(), depth.keyset.summary_ms()
+        speedup = depth.speedup()
+        mark = '' if depth.consistent else '  ⚠️  páginas diferentes'
+        print(f"   {depth.page:>8}{offset['p50']:>11.1f}ms{keyset['p50']:>11.1f}ms"
+              f"{offset['p95']:>11.1f}ms{keyset['p95']:>11.1f}ms"
+              f"{(f'{speedup:.1f}x' if speedup is not None else 'n/d'):>9}{mark}")
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    tables = args.tables.split(',') if args.tables else NCISO_SCHEMA.table_names
+    unknown = [name for name in tables if not NCISO_SCHEMA.table(name)]
+    if unknown:
+        print(f"❌ Tabelas desconhecidas: {', '.join(unknown)}")
+        return False
+    try:
+        pages = [int(page) for page in args.pages.split(',')]
+    except ValueError:
+        print(f"❌ Páginas inválidas: {args.pages}")
+        return False
+    if args.page_size < 1 or any(page < 1 for page in pages):
+        print("❌ Páginas e tamanho de página começam em 1")
+        return False
+
+    # Service role (sem RLS no caminho) e sem limitador nem novas tentativas: só a paginação varia
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_ANON_KEY')
+    client = SupabaseClient(key=key, adaptive=False, max_retries=0)
+
+    print(f"📑 {len(tables)} tabela(s) no tenant {args.tenant}, páginas {', '.join(str(p) for p in pages)} + última,"
+          f" {args.runs} medições (+{args.warmup} de aquecimento)")
+
+    results = benchmark_pagination(client, args.tenant, tables, pages=pages, page_size=args.page_size,
+                                   runs=args.runs, warmup=args.warmup, on_table=print_table)
+
+    measured = [r for r in results if r.growth('offset') is not None]
+    print(f"\n📊 Resumo:")
+    print(f"Tabelas medidas: {len(measured)}/{len(results)}")
+    for result in measured:
+        deepest = result.depths[-1]
+        print(f"   {result.table:<24}página {deepest.page}: offset {result.growth('offset'):.1f}x"
+              f" x chave {result.growth('keyset'):.1f}x a latência da primeira")
+    if any(not depth.consistent for result in results for depth in result.depths):
+        print("⚠️  Páginas diferentes entre as estratégias: created_at nulo ou dados mudando durante a medição")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'tenant': args.tenant, 'tables': [r.to_dict() for r in results]}, f, indent=2)
+        print(f"✅ Relatório salvo em: {args.json}")
+
+    if args.save:
+        result = new_result('pagination', pagination_metrics(results), dataset_size(client, tables, [args.tenant]),
+                            {'runs': args.runs, 'warmup': args.warmup, 'page_size': args.page_size,
+                             'pages': pages, 'tables': list(tables)})
+        print(f"✅ Resultado salvo em: {save_result(result)}")
+
+    return all(r.error is None for r in results)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
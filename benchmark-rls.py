@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+⚖️ Benchmark de Custo do RLS
+Roda as mesmas consultas por tabela sobre os dados semeados com a service role
+(ignora RLS) e com JWTs de tenant, e reporta a lentidão por tabela, as diferenças
+de plano e quais políticas de docs/rls-policies.sql reescrever ou indexar
+"""
+
+import os
+import json
+import argparse
+
+from supabase_tools import NCISO_SCHEMA, SeedConfig, SupabaseClient
+from supabase_tools.index_advisor import DEFAULT_POLICY_FILE
+from supabase_tools.results import dataset_size, new_result, rls_metrics, save_result
+from supabase_tools.rls_overhead import DEFAULT_RUNS, DEFAULT_WARMUP, benchmark_rls_overhead
+from supabase_tools.tokens import tenant_client
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Custo das políticas RLS: service role x JWT de tenant')
+    parser.add_argument('--tables', help='Tabelas separadas por vírgula (padrão: todas do schema)')
+    parser.add_argument('--tenants', help='Tenants separados por vírgula (padrão: os 3 primeiros semeados)')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help=f'Medições por consulta e tenant (padrão: {DEFAULT_RUNS})')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help=f'Execuções descartadas antes de medir (padrão: {DEFAULT_WARMUP})')
+    parser.add_argument('--no-plans', action='store_true', help='Não coletar EXPLAIN ANALYZE (requer db-plan-enabled no PostgREST)')
+    parser.add_argument('--policies', default=DEFAULT_POLICY_FILE, help=f'Arquivo de políticas (padrão: {DEFAULT_POLICY_FILE})')
+    parser.add_argument('--json', help='Salvar o relatório completo neste arquivo')
+    parser.add_argument('--save', action='store_true', help='Gravar o resultado em benchmarks/results (compare-benchmarks.py)')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def print_table(overhead):
+    slowdown = overhead.slowdown()
+    if overhead.error:
+        print(f"\n❌ {overhead.table}: {overhead.error}")
+        return
+    label = f"{slowdown:.2f}x" if slowdown is not None else 'n/d'
+    print(f"\n📋 {overhead.table} — RLS {label} (p50), {overhead.slowdown(95) or 0:.2f}x (p95)"
+          f" | políticas: {', '.join(overhead.policies) or 'nenhuma no arquivo'}")
+    print(f"   {'Consulta':<24}{'service p50':>12}{'tenant p50':>12}{'p95 s/t':>16}{'linhas s/t':>16}")
+    for query in overhead.queries:
+        if query.errors:
+            print(f"   {query.query:<24}❌ {query.errors[0]}")
+            continue
+        service, tenant = query.service.summary_ms(), query.tenant.summary_ms()
+        print(f"   {query.query:<24}{service['p50']:>10.1f}ms{tenant['p50']:>10.1f}ms"
+              f"{service['p95']:>8.1f}/{tenant['p95']:<7.1f}{str(query.service_rows):>8}/{query.tenant_rows}")
+        if query.service_plan and query.tenant_plan:
+            print(f"      plano: {query.service_plan.execution_ms:.2f}ms → {query.tenant_plan.execution_ms:.2f}ms")
+        for difference in query.plan_differences:
+            print(f"      ↳ {difference}")
+    for suggestion in overhead.suggestions:
+        print(f"   💡 {suggestion}")
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+    if not os.getenv('SUPABASE_SERVICE_ROLE_KEY') or not os.getenv('SUPABASE_JWT_SECRET'):
+        print("❌ Configure SUPABASE_SERVICE_ROLE_KEY e SUPABASE_JWT_SECRET para comparar com e sem RLS")
+        return False
+
+    tables = args.tables.split(',') if args.tables else NCISO_SCHEMA.table_names
+    unknown = [name for name in tables if not NCISO_SCHEMA.table(name)]
+    if unknown:
+        print(f"❌ Tabelas desconhecidas: {', '.join(unknown)}")
+        return False
+    tenants = args.tenants.split(',') if args.tenants else [SeedConfig().tenant_id(i) for i in range(3)]
+
+    # Sem limitador nem novas tentativas: a medição precisa ver cada requisição
+    service = SupabaseClient(key=os.getenv('SUPABASE_SERVICE_ROLE_KEY'), adaptive=False, max_retries=0)
+    tenant_clients = {tenant: tenant_client(tenant, adaptive=False, max_retries=0) for tenant in tenants}
+
+    print(f"⚖️  {len(tables)} tabela(s) x {len(tenants)} tenant(s), {args.runs} medições (+{args.warmup} de aquecimento)")
+    print(f"📋 Tenants: {', '.join(tenants)}")
+
+    try:
+        overheads = benchmark_rls_overhead(service, tenant_clients, tables, runs=args.runs, warmup=args.warmup,
+                                           plans=not args.no_plans, policy_file=args.policies, on_table=print_table,
+                                           on_warning=lambda warning: print(f"⚠️  {warning}\n"))
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return False
+
+    measured = [o for o in overheads if o.slowdown() is not None]
+    print(f"\n📊 Resumo:")
+    print(f"Tabelas medidas: {len(measured)}/{len(overheads)}")
+    for overhead in sorted(measured, key=lambda o: o.slowdown(), reverse=True):
+        print(f"   {overhead.table:<24}{overhead.slowdown():>6.2f}x"
+              f"{'  ⚠️  ' + overhead.suggestions[0] if overhead.suggestions else ''}")
+    if not any(q.service_plan for o in overheads for q in o.queries) and not args.no_plans:
+        print("ℹ️  Planos indisponíveis: habilite db-plan-enabled no PostgREST para comparar os planos")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'tenants': tenants, 'tables': [o.to_dict() for o in overheads]}, f, indent=2)
+        print(f"✅ Relatório salvo em: {args.json}")
+
+    if args.save:
+        result = new_result('rls', rls_metrics(overheads), dataset_size(service, tables, tenants),
+                            {'runs': args.runs, 'warmup': args.warmup, 'tables': list(tables)})
+        print(f"✅ Resultado salvo em: {save_result(result)}")
+
+    return all(o.error is None for o in overheads)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+"""
+🔬 Captura de Planos das Consultas Quentes
+Roda as consultas de listagem/filtro do frontend com EXPLAIN (ANALYZE, BUFFERS)
+nos dados semeados, aponta Seq Scans, ordenações em disco e estimativas erradas
+e salva os planos em benchmarks/plans/<rótulo> para comparar entre versões do schema
+"""
+
+import os
+import argparse
+import platform
+from datetime import datetime, timezone
+
+from supabase_tools import get_admin_client
+from supabase_tools.load import DEFAULT_TENANT
+from supabase_tools.plans import (HOT_QUERIES, MIN_SEQ_SCAN_ROWS, PLANS_DIR, capture_plans, default_label, diff_plans,
+                                  install_explain_function, load_plans, save_plans, validate_catalog)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='EXPLAIN ANALYZE das consultas quentes e detector de Seq Scan')
+    parser.add_argument('--tenant', default=DEFAULT_TENANT, help=f'Tenant dos dados semeados (padrão: {DEFAULT_TENANT})')
+    parser.add_argument('--queries', help='Consultas separadas por vírgula (padrão: todo o catálogo)')
+    parser.add_argument('--label', help='Rótulo da captura (padrão: schema-<hash do modelo>)')
+    parser.add_argument('--diff', help='Comparar com outra captura (rótulo ou diretório)')
+    parser.add_argument('--min-rows', type=int, default=MIN_SEQ_SCAN_ROWS,
+                        help=f'Linhas lidas a partir das quais um Seq Scan é apontado (padrão: {MIN_SEQ_SCAN_ROWS})')
+    parser.add_argument('--no-analyze', action='store_true', help='Apenas EXPLAIN, sem executar as consultas')
+    parser.add_argument('--install', action='store_true', help='Criar rpc/explain_sql via exec_sql antes de capturar')
+    parser.add_argument('--strict', action='store_true', help='Sair com erro se algum plano tiver achados')
+    parser.add_argument('--list', action='store_true', help='Listar o catálogo de consultas e sair')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def print_plan(captured):
+    if captured.error:
+        print(f"❌ {captured.query.name}: {captured.error}")
+        return
+    icon = '⚠️ ' if captured.findings else '✅'
+    timing = f"{captured.execution_ms:>9.2f}ms" if captured.execution_ms is not None else f"{'-':>11}"
+    print(f"{icon} {captured.query.name:<28}{timing}"
+          f"  ({', '.join(sorted(set(captured.scans().values()))) or 'sem varredura'})")
+    for finding in captured.findings:
+        print(f"   ↳ [{finding.kind}] {finding.node}: {finding.message}")
+
+def print_diff(changes, other):
+    print(f"\n🔀 Diferenças em relação a {other}:")
+    changed = [change for change in changes if change.changed]
+    if not changed:
+        print("   Nenhuma mudança de forma nos planos")
+    for change in changed:
+        timing = ''
+        if change.before_ms is not None and change.after_ms is not None:
+            timing = f" ({change.before_ms:.2f}ms → {change.after_ms:.2f}ms)"
+        print(f"   📋 {change.name}{timing}")
+        for line in change.scan_changes:
+            print(f"      {line}")
+        for line in change.new_findings:
+            print(f"      🟥 novo: {line}")
+        for line in change.resolved_findings:
+            print(f"      🟩 resolvido: {line}")
+
+def main():
+    args = parse_args()
+    load_env()
+
+    problems = validate_catalog()
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        return False
+
+    queries = HOT_QUERIES
+    if args.queries:
+        wanted = args.queries.split(',')
+        queries = [query for query in HOT_QUERIES if query.name in wanted]
+        unknown = set(wanted) - {query.name for query in queries}
+        if unknown:
+            print(f"❌ Consultas desconhecidas: {', '.join(sorted(unknown))}")
+            return False
+
+    if args.list:
+        for query in queries:
+            print(f"📋 {query.name:<28}{query.source}")
+        return True
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    client = get_admin_client()
+    if args.install:
+        report = install_explain_function(client)
+        if not report.success:
+            print(f"❌ Falha ao criar explain_sql: {report.failures[0].error}")
+            return False
+        print("✅ Função explain_sql instalada")
+
+    label = args.label or default_label()
+    print(f"🔬 {len(queries)} consulta(s) no tenant {args.tenant} ({'EXPLAIN' if args.no_analyze else 'EXPLAIN ANALYZE'})\n")
+    plans = capture_plans(client, args.tenant, queries, analyze=not args.no_analyze,
+                          min_seq_scan_rows=args.min_rows, on_plan=print_plan)
+
+    errors = [plan for plan in plans if plan.error]
+    if errors and all(plan.error for plan in plans):
+        print("\n💡 Crie a função com --install (scripts/create-explain-sql-function.sql)")
+        return False
+
+    target = save_plans(plans, label, {
+        'tenant': args.tenant,
+        'analyze': not args.no_analyze,
+        'captured_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'host': platform.node(),
+    }, PLANS_DIR)
+
+    if args.diff:
+        try:
+            print_diff(diff_plans(load_plans(args.diff), load_plans(target)), args.diff)
+        except OSError as e:
+            print(f"❌ Captura para comparação não encontrada: {str(e)}")
+            return False
+
+    flagged = [plan for plan in plans if plan.findings]
+    print(f"\n📊 Resumo:")
+    print(f"Consultas capturadas: {len(plans) - len(errors)}/{len(plans)}")
+    print(f"Com achados: {len(flagged)}")
+    for kind in ('seq_scan', 'sort_spill', 'hash_spill', 'misestimate'):
+        count = sum(1 for plan in plans for finding in plan.findings if finding.kind == kind)
+        if count:
+            print(f"   {kind}: {count}")
+    print(f"✅ Planos salvos em: {target}")
+
+    return not errors and not (args.strict and flagged)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
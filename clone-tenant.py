@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""
+🧬 Clonagem de Tenant
+Copia todos os dados de um tenant de referência (ex.: demo-tenant) para um novo
+tenant_id, remapeando as chaves estrangeiras e gravando em lotes, com as tabelas
+de um mesmo nível de dependência em paralelo
+"""
+
+import os
+import argparse
+
+from supabase_tools import get_admin_client, clone_tenant, NCISO_SCHEMA
+from supabase_tools.clone import DEFAULT_BATCH_SIZE, DEFAULT_SLICES, clone_selection, table_levels
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Copiar um tenant para um novo tenant_id com FKs remapeadas')
+    parser.add_argument('source', help='tenant_id de origem (ex.: demo-tenant)')
+    parser.add_argument('target', help='Novo tenant_id')
+    parser.add_argument('--tables', nargs='+', choices=NCISO_SCHEMA.table_names, help='Copiar apenas estas tabelas')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help=f'Linhas por página e por POST (padrão: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--slices', type=int, default=DEFAULT_SLICES, help=f'Fatias do espaço de ids lidas em paralelo por tabela (padrão: {DEFAULT_SLICES})')
+    parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar a ordem de cópia')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def main():
+    args = parse_args()
+    load_env()
+
+    print(f"🧬 Clonando {args.source} → {args.target}\n")
+    selected = clone_selection(NCISO_SCHEMA, args.tables)
+    added = sorted(selected - set(args.tables or selected))
+    if added:
+        print(f"➕ Incluídas por serem referenciadas: {', '.join(added)}")
+    for number, level in enumerate(table_levels(NCISO_SCHEMA)):
+        names = [table.name for table in level if table.name in selected]
+        if names:
+            print(f"📋 Nível {number}: {', '.join(names)}")
+
+    if args.dry_run:
+        return True
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    def progress(result):
+        if result.skipped:
+            print(f"⏭️  {result.table}: {result.error}")
+        elif result.success:
+            print(f"✅ {result.table}: {result.rows:,} linhas em {result.requests} POST(s), {result.elapsed_ms / 1000:.1f}s")
+        else:
+            print(f"❌ {result.table} ({result.status_code}): {result.error}")
+
+    print()
+    try:
+        report = clone_tenant(args.source, args.target, get_admin_client(), tables=args.tables,
+                              batch_size=args.batch_size, slices=args.slices, on_result=progress)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return False
+
+    print(f"\n📊 Resumo:")
+    print(f"Tabelas copiadas: {sum(1 for r in report.results if r.success)}/{len(report.results)}")
+    print(f"Linhas: {report.rows:,} em {report.elapsed_ms / 1000:.1f}s ({report.rows_per_second:,.0f} linhas/s)")
+
+    if not report.success:
+        print("💡 Execute novamente: as linhas já copiadas são ignoradas")
+    return report.success
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -13,6 +13,11 @@ git push origin main
 
 echo "✅ Commit realizado com sucesso!"
 
+echo "📒 Aplicando migrações pendentes do banco..."
+
+# Só os passos ainda não registrados em schema_migrations são executados
+python3 apply-migrations.py || exit 1
+
 echo "🚀 Iniciando deploy na VPS..."
 
 # Executar deploy
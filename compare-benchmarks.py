@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+🗃️ Comparação de Benchmarks com a Referência
+Compara um resultado salvo (load-test.py/benchmark-rls.py --save) com a referência
+do mesmo benchmark em benchmarks/baselines/ e sai com erro se alguma métrica
+regredir além do limite; --promote torna o resultado a nova referência
+"""
+
+import os
+import argparse
+
+from supabase_tools.results import (BASELINES_DIR, DEFAULT_THRESHOLD, OPERATING_POINT, RESULTS_DIR, baseline_path,
+                                    compare_results, latest_result, load_result, promote_baseline)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Comparar um resultado de benchmark com a referência e barrar regressões')
+    parser.add_argument('result', help='Arquivo de resultado ou nome do benchmark (usa o mais recente em benchmarks/results)')
+    parser.add_argument('--baseline', help='Arquivo de referência (padrão: benchmarks/baselines/<benchmark>.json)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD * 100,
+                        help=f'Piora máxima aceita em %% (padrão: {DEFAULT_THRESHOLD * 100:g})')
+    parser.add_argument('--metric', action='append', default=[], metavar='PADRÃO=%',
+                        help="Limite por métrica (fnmatch), ex.: --metric '*.p99.9_ms=25' (repetível)")
+    parser.add_argument('--all', action='store_true', help='Listar todas as métricas, não só as que mudaram')
+    parser.add_argument('--promote', action='store_true', help='Tornar este resultado a referência (sem comparar)')
+    return parser.parse_args()
+
+def resolve_result(value):
+    if os.path.exists(value):
+        return value
+    return latest_result(value, RESULTS_DIR)
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values:
+        pattern, _, percent = value.rpartition('=')
+        if not pattern:
+            raise ValueError(f"Limite inválido: {value} (use PADRÃO=%)")
+        overrides[pattern] = float(percent) / 100
+    return overrides
+
+def print_delta(delta):
+    change = delta.change
+    if not delta.comparable:
+        before = 'ausente' if delta.baseline is None else f"{delta.baseline:g}"
+        after = 'ausente' if delta.current is None else f"{delta.current:g}"
+        print(f"   ➖ {delta.name:<44}{before:>12} → {after:<12}não comparado")
+        return
+    if delta.current is None:
+        print(f"   {'🟥' if delta.regressed else '❔'} {delta.name:<44}{delta.baseline:>12g} → ausente")
+        return
+    if delta.baseline is None:
+        print(f"   🆕 {delta.name:<44}{'':>12} → {delta.current:g}")
+        return
+    icon = '🟥' if delta.regressed else '🟩' if delta.improved else '⬜'
+    change = 'antes zero' if change == float('inf') else f"{change:+.1%}"
+    print(f"   {icon} {delta.name:<44}{delta.baseline:>12g} → {delta.current:<12g}"
+          f"{change} (limite {delta.threshold:.0%})")
+
+def main():
+    args = parse_args()
+
+    path = resolve_result(args.result)
+    if not path:
+        print(f"❌ Nenhum resultado encontrado para: {args.result}")
+        return False
+    current = load_result(path)
+
+    if args.promote:
+        target = promote_baseline(path, BASELINES_DIR)
+        print(f"✅ {path} agora é a referência de {current.benchmark}: {target}")
+        return True
+
+    reference = args.baseline or baseline_path(current.benchmark, BASELINES_DIR)
+    if not os.path.exists(reference):
+        print(f"❌ Referência não encontrada: {reference}")
+        print(f"💡 Crie com: python compare-benchmarks.py {path} --promote")
+        return False
+
+    try:
+        overrides = parse_overrides(args.metric)
+        comparison = compare_results(load_result(reference), current, args.threshold / 100, overrides)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return False
+
+    print(f"🗃️  {current.benchmark}: {path}")
+    print(f"📋 Referência: {reference} ({comparison.baseline.created_at}, commit {comparison.baseline.environment.get('commit')})")
+    for warning in comparison.warnings():
+        print(f"⚠️  {warning}")
+
+    print()
+    for delta in comparison.deltas:
+        if args.all or delta.regressed or delta.improved or (delta.comparable and
+                                                             (delta.current is None or delta.baseline is None)):
+            print_delta(delta)
+
+    print(f"\n📊 Resumo:")
+    print(f"Métricas comparadas: {len(comparison.deltas)}")
+    print(f"Regressões: {len(comparison.regressions)}")
+    print(f"Melhorias: {len(comparison.improvements)}")
+    if comparison.missing:
+        print(f"Ausentes no resultado: {len(comparison.missing)}")
+    skipped = [delta for delta in comparison.deltas if not delta.comparable and delta.name != OPERATING_POINT]
+    if skipped:
+        print(f"Não comparadas (outro ponto de operação): {len(skipped)}")
+
+    if comparison.passed:
+        print("✅ Dentro dos limites da referência")
+    else:
+        print("❌ Desempenho regrediu em relação à referência")
+    return comparison.passed
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
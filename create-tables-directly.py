@@ -6,10 +6,14 @@ Script para criar tabelas diretamente via RPC do Supabase
 """
 
 import os
-import requests
 import json
 from datetime import datetime
 
+from supabase_tools import (
+    get_client, get_admin_client, plan_schema_changes, run_ddl_parallel, tasks_from_statements,
+    MigrationRunner, migrations_from_schema, NCISO_SCHEMA, TestRun
+)
+
 def create_tables_via_rpc():
     print("🔧 Criando tabelas via RPC...\n")
     
@@ -25,226 +29,95 @@ def create_tables_via_rpc():
         print("❌ Variáveis de ambiente não configuradas!")
         return False
     
-    # Headers para requisições
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json'
-    }
-    
-    # SQL para criar tabelas uma por uma
-    create_organizations_sql = """
-    CREATE TABLE IF NOT EXISTS organizations (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      name VARCHAR(255) NOT NULL,
-      type VARCHAR(50) NOT NULL CHECK (type IN ('company', 'department', 'unit', 'division')),
-      parent_id UUID REFERENCES organizations(id),
-      description TEXT,
-      tenant_id VARCHAR(255) NOT NULL,
-      is_active BOOLEAN DEFAULT true,
-      created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-      updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-    );
-    """
-    
-    create_assets_sql = """
-    CREATE TABLE IF NOT EXISTS assets (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      name VARCHAR(255) NOT NULL,
-      type VARCHAR(50) NOT NULL CHECK (type IN ('physical', 'digital', 'person', 'software', 'infrastructure', 'data')),
-      description TEXT,
-      owner_id UUID,
-      classification JSONB NOT NULL DEFAULT '{"confidentiality": "low", "integrity": "low", "availability": "low"}',
-      value DECIMAL(15,2),
-      location VARCHAR(255),
-      organization_id UUID REFERENCES organizations(id),
-      tenant_id VARCHAR(255) NOT NULL,
-      is_active BOOLEAN DEFAULT true,
-      created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-      updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-    );
-    """
-    
-    create_evaluations_sql = """
-    CREATE TABLE IF NOT EXISTS evaluations (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      name VARCHAR(255) NOT NULL,
-      description TEXT,
-      scope_id UUID,
-      domain_id UUID,
-      control_id UUID,
-      status VARCHAR(50) NOT NULL DEFAULT 'draft' CHECK (status IN ('draft', 'in_progress', 'completed', 'reviewed')),
-      percentage_score DECIMAL(5,2),
-      evidence_count INTEGER DEFAULT 0,
-      start_date DATE NOT NULL,
-      end_date DATE,
-      notes TEXT,
-      tenant_id VARCHAR(255) NOT NULL,
-      created_by VARCHAR(255),
-      created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-      updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-    );
-    """
+    # Cliente compartilhado (keep-alive + timeouts)
+    client = get_client()
     
-    create_technical_documents_sql = """
-    CREATE TABLE IF NOT EXISTS technical_documents (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      name VARCHAR(255) NOT NULL,
-      description TEXT,
-      document_type VARCHAR(50) NOT NULL CHECK (document_type IN ('policy', 'procedure', 'standard', 'guideline', 'template', 'manual', 'checklist')),
-      version VARCHAR(20) DEFAULT '1.0',
-      content TEXT,
-      file_path VARCHAR(500),
-      file_size BIGINT,
-      file_type VARCHAR(100),
-      tags TEXT[],
-      scope_id UUID,
-      asset_id UUID REFERENCES assets(id),
-      control_id UUID,
-      status VARCHAR(50) NOT NULL DEFAULT 'draft' CHECK (status IN ('draft', 'review', 'approved', 'active', 'inactive')),
-      tenant_id VARCHAR(255) NOT NULL,
-      created_by VARCHAR(255),
-      created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-      updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-    );
-    """
-    
-    create_teams_sql = """
-    CREATE TABLE IF NOT EXISTS teams (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      name VARCHAR(255) NOT NULL,
-      description TEXT,
-      organization_id UUID REFERENCES organizations(id),
-      tenant_id VARCHAR(255) NOT NULL,
-      is_active BOOLEAN DEFAULT true,
-      created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-      updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-    );
-    """
+    # Com o catálogo acessível, enviar apenas as diferenças para o modelo
+    try:
+        diff = plan_schema_changes(NCISO_SCHEMA)
+    except Exception as e:
+        print(f"⚠️  Catálogo indisponível ({str(e)}) - usando o ledger de migrações")
+        return apply_pending_migrations(get_admin_client())
     
-    create_credentials_registry_sql = """
-    CREATE TABLE IF NOT EXISTS credentials_registry (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      asset_id UUID NOT NULL REFERENCES assets(id),
-      holder_type VARCHAR(20) NOT NULL CHECK (holder_type IN ('user', 'team')),
-      holder_id VARCHAR(255) NOT NULL,
-      access_type VARCHAR(20) NOT NULL CHECK (access_type IN ('read', 'write', 'admin', 'full')),
-      justification TEXT,
-      valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
-      valid_until TIMESTAMP WITH TIME ZONE NOT NULL,
-      status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'active', 'inactive', 'expired', 'revoked')),
-      approved_by VARCHAR(255),
-      approved_at TIMESTAMP WITH TIME ZONE,
-      revoked_by VARCHAR(255),
-      revoked_at TIMESTAMP WITH TIME ZONE,
-      tenant_id VARCHAR(255) NOT NULL,
-      created_by VARCHAR(255),
-      created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-      updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-    );
-    """
+    if diff.is_empty:
+        print("✅ Schema já está atualizado - nenhum DDL enviado!")
+        return True
     
-    create_privileged_access_sql = """
-    CREATE TABLE IF NOT EXISTS privileged_access (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      user_id VARCHAR(255) NOT NULL,
-      scope_type VARCHAR(50) NOT NULL CHECK (scope_type IN ('system', 'database', 'application', 'network', 'infrastructure')),
-      scope_id VARCHAR(255) NOT NULL,
-      access_level VARCHAR(20) NOT NULL CHECK (access_level IN ('read', 'write', 'admin', 'full')),
-      justification TEXT,
-      valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
-      valid_until TIMESTAMP WITH TIME ZONE NOT NULL,
-      status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'active', 'inactive', 'expired', 'revoked')),
-      approved_by VARCHAR(255),
-      approved_at TIMESTAMP WITH TIME ZONE,
-      revoked_by VARCHAR(255),
-      revoked_at TIMESTAMP WITH TIME ZONE,
-      last_audit_date TIMESTAMP WITH TIME ZONE,
-      audit_notes TEXT,
-      tenant_id VARCHAR(255) NOT NULL,
-      created_by VARCHAR(255),
-      created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-      updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-    );
-    """
+    sql_commands = [(change.description, change.statement) for change in diff.changes]
     
-    # Lista de SQLs para executar
-    sql_commands = [
-        ('organizations', create_organizations_sql),
-        ('assets', create_assets_sql),
-        ('evaluations', create_evaluations_sql),
-        ('technical_documents', create_technical_documents_sql),
-        ('teams', create_teams_sql),
-        ('credentials_registry', create_credentials_registry_sql),
-        ('privileged_access', create_privileged_access_sql)
-    ]
+    # Mudanças independentes (sem FK entre si) são enviadas em paralelo, nível a nível
+    labels = [label for label, _ in sql_commands]
+    tasks = tasks_from_statements([sql for _, sql in sql_commands], labels=labels)
+    report = run_ddl_parallel(tasks, client)
     
-    created_tables = []
+    applied_commands = []
     
-    for table_name, sql in sql_commands:
-        print(f"\n📋 Criando tabela: {table_name}")
-        
-        try:
-            # Tentar executar SQL via RPC
-            rpc_url = f"{supabase_url}/rest/v1/rpc/exec_sql"
-            
-            response = requests.post(
-                rpc_url,
-                headers=headers,
-                json={'sql': sql}
-            )
-            
-            if response.status_code == 200:
-                print(f"✅ Tabela '{table_name}' criada com sucesso!")
-                created_tables.append(table_name)
-            else:
-                print(f"❌ Erro ao criar '{table_name}': {response.status_code}")
-                print(response.text)
-                
-        except Exception as e:
-            print(f"❌ Erro ao executar SQL para '{table_name}': {str(e)}")
+    for result in report.results:
+        label = result.task.label
+        if result.success:
+            print(f"✅ '{label}' aplicado com sucesso! ({result.elapsed_ms:.0f}ms, nível {result.level})")
+            applied_commands.append(label)
+        elif result.skipped:
+            print(f"⏭️  '{label}' não enviado: {result.error}")
+        else:
+            print(f"❌ Erro ao aplicar '{label}': {result.status_code}")
+            print(result.error)
     
     print(f"\n📊 Resumo:")
-    print(f"Tabelas criadas: {len(created_tables)}")
-    print(f"Tabelas que falharam: {len(sql_commands) - len(created_tables)}")
+    print(f"Comandos aplicados: {len(applied_commands)}")
+    print(f"Comandos que falharam: {len(sql_commands) - len(applied_commands)}")
+    print(f"Tempo total: {report.elapsed_ms:.0f}ms (sequencial seria ~{report.serial_ms:.0f}ms)")
     
-    if len(created_tables) > 0:
-        print(f"\n✅ Tabelas criadas com sucesso: {', '.join(created_tables)}")
+    if len(applied_commands) > 0:
+        print(f"\n✅ Aplicados com sucesso: {', '.join(applied_commands)}")
         return True
     else:
         print(f"\n❌ Nenhuma tabela foi criada via RPC")
         return False
 
+def apply_pending_migrations(client):
+    """Aplicar só os passos do modelo ainda não registrados em schema_migrations"""
+    runner = MigrationRunner(client)
+    
+    try:
+        statuses, results = runner.run(migrations_from_schema(NCISO_SCHEMA))
+    except Exception as e:
+        print(f"❌ Erro ao ler o ledger de migrações: {str(e)}")
+        return False
+    
+    for result in results:
+        if result.success:
+            print(f"✅ '{result.migration.description}' aplicado com sucesso!")
+        else:
+            print(f"❌ Erro ao aplicar '{result.migration.description}': {result.error}")
+    
+    changed = [status.migration.id for status in statuses if status.state == 'changed']
+    if changed:
+        print(f"⚠️  Passos editados depois de aplicados: {', '.join(changed)}")
+    
+    print(f"\n📊 Resumo:")
+    print(f"Passos já aplicados: {sum(1 for status in statuses if status.state == 'applied')}")
+    print(f"Passos aplicados agora: {sum(1 for result in results if result.success)}")
+    
+    return all(result.success for result in results)
+
 def test_after_creation():
     """Testar após criação das tabelas"""
     print("\n🧪 Testando após criação das tabelas...")
     
-    # Carregar variáveis de ambiente
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_ANON_KEY')
-    
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
-    }
+    client = get_client()
     
-    # Testar inserção em organizations
+    # Testar inserção em organizations, num tenant próprio da execução (limpo mesmo com erro)
     test_org = {
         'name': 'n.CISO Corporation',
         'type': 'company',
         'description': 'Empresa principal do sistema n.CISO',
-        'tenant_id': 'demo-tenant',
         'is_active': True
     }
     
+    run = TestRun(client, label='criacao')
     try:
-        response = requests.post(
-            f"{supabase_url}/rest/v1/organizations",
-            headers=headers,
-            json=test_org
-        )
+        response = run.insert("organizations", test_org)
         
         if response.status_code == 201:
             print("✅ Inserção em organizations funcionando!")
@@ -252,26 +125,19 @@ def test_after_creation():
             org_id = org_data[0]['id'] if org_data else None
             
             # Testar leitura
-            read_response = requests.get(
-                f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}",
-                headers=headers
-            )
+            read_response = client.get(f"organizations?id=eq.{org_id}")
             
             if read_response.status_code == 200:
                 print("✅ Leitura de organizations funcionando!")
                 
-                # Limpar dados de teste
-                delete_response = requests.delete(
-                    f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}",
-                    headers=headers
-                )
-                
-                if delete_response.status_code == 204:
-                    print("✅ Exclusão de organizations funcionando!")
+                # Limpar dados de teste pelo tenant da execução
+                try:
+                    deleted = run.cleanup()
+                    print(f"✅ Exclusão de organizations funcionando! ({deleted.get('organizations', 0)} linha(s))")
                     print("\n🎉 Todas as operações CRUD funcionando!")
                     return True
-                else:
-                    print(f"⚠️  Erro na exclusão: {delete_response.status_code}")
+                except RuntimeError as e:
+                    print(f"⚠️  Erro na exclusão: {e}")
             else:
                 print(f"❌ Erro na leitura: {read_response.status_code}")
         else:
@@ -281,6 +147,13 @@ def test_after_creation():
     except Exception as e:
         print(f"❌ Erro no teste: {str(e)}")
     
+    finally:
+        if run.tables and not run.deleted:
+            try:
+                run.cleanup()
+            except RuntimeError as e:
+                print(f"⚠️  Limpeza pendente ({run.tenant_id}): {e}")
+    
     return False
 
 def main():
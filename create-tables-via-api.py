@@ -6,10 +6,11 @@ Script para criar as tabelas do n.CISO via API REST
 """
 
 import os
-import requests
 import json
 from datetime import datetime
 
+from supabase_tools import get_client, SchemaIntrospector, TestRun
+
 def create_tables_via_api():
     print("🔧 Criando tabelas via API Supabase...\n")
     
@@ -26,13 +27,8 @@ def create_tables_via_api():
         print("Execute: ./configure-supabase.sh")
         return False
     
-    # Headers para requisições
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
-    }
+    # Cliente compartilhado (keep-alive + timeouts)
+    client = get_client()
     
     # Definir as tabelas que precisamos criar
     tables_to_create = [
@@ -127,34 +123,32 @@ def create_tables_via_api():
     
     created_tables = []
     
+    # Schema completo em uma única chamada (GET /rest/v1/, com cache local)
+    introspector = SchemaIntrospector(client)
+    
+    try:
+        introspector.load()
+    except Exception as e:
+        print(f"❌ Erro ao verificar tabelas: {str(e)}")
+        return False
+    
     for table in tables_to_create:
         print(f"\n📋 Criando tabela: {table['name']}")
         print(f"Descrição: {table['description']}")
         
-        # Tentar inserir dados de teste para verificar se a tabela existe
-        test_url = f"{supabase_url}/rest/v1/{table['name']}"
+        if not introspector.has_table(table['name']):
+            print(f"❌ Tabela '{table['name']}' não existe - precisa ser criada via SQL Editor")
+            print("💡 Execute o script SQL no painel do Supabase:")
+            print("   scripts/supabase-complete-schema.sql")
+            continue
         
-        try:
-            # Primeiro, tentar ler para ver se a tabela existe
-            response = requests.get(f"{test_url}?select=count&limit=1", headers=headers)
-            
-            if response.status_code == 200:
-                print(f"✅ Tabela '{table['name']}' já existe!")
-                created_tables.append(table['name'])
-                continue
-            elif response.status_code == 404:
-                print(f"❌ Tabela '{table['name']}' não existe - precisa ser criada via SQL Editor")
-                print("💡 Execute o script SQL no painel do Supabase:")
-                print("   scripts/supabase-complete-schema.sql")
-                continue
-            else:
-                print(f"⚠️  Status inesperado: {response.status_code}")
-                print(response.text)
-                continue
-                
-        except Exception as e:
-            print(f"❌ Erro ao verificar tabela: {str(e)}")
+        missing_columns = introspector.missing_columns(table['name'], table['test_data'].keys())
+        if missing_columns:
+            print(f"⚠️  Tabela '{table['name']}' existe mas faltam colunas: {', '.join(missing_columns)}")
             continue
+        
+        print(f"✅ Tabela '{table['name']}' já existe!")
+        created_tables.append(table['name'])
     
     print(f"\n📊 Resumo:")
     print(f"Tabelas existentes: {len(created_tables)}")
@@ -172,32 +166,19 @@ def create_tables_via_api():
 def test_after_creation():
     print("\n🧪 Testando após criação das tabelas...")
     
-    # Carregar variáveis de ambiente
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_ANON_KEY')
+    client = get_client()
     
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
-    }
-    
-    # Testar inserção em organizations
+    # Testar inserção em organizations, num tenant próprio da execução (limpo mesmo com erro)
     test_org = {
         'name': 'Organização de Teste API',
         'type': 'company',
         'description': 'Organização criada via API',
-        'tenant_id': 'demo-tenant',
         'is_active': True
     }
     
+    run = TestRun(client, label='api')
     try:
-        response = requests.post(
-            f"{supabase_url}/rest/v1/organizations",
-            headers=headers,
-            json=test_org
-        )
+        response = run.insert("organizations", test_org)
         
         if response.status_code == 201:
             print("✅ Inserção em organizations funcionando!")
@@ -205,24 +186,17 @@ def test_after_creation():
             org_id = org_data[0]['id'] if org_data else None
             
             # Testar leitura
-            read_response = requests.get(
-                f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}",
-                headers=headers
-            )
+            read_response = client.get(f"organizations?id=eq.{org_id}")
             
             if read_response.status_code == 200:
                 print("✅ Leitura de organizations funcionando!")
                 
-                # Limpar dados de teste
-                delete_response = requests.delete(
-                    f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}",
-                    headers=headers
-                )
-                
-                if delete_response.status_code == 204:
-                    print("✅ Exclusão de organizations funcionando!")
-                else:
-                    print(f"⚠️  Erro na exclusão: {delete_response.status_code}")
+                # Limpar dados de teste pelo tenant da execução
+                try:
+                    deleted = run.cleanup()
+                    print(f"✅ Exclusão de organizations funcionando! ({deleted.get('organizations', 0)} linha(s))")
+                except RuntimeError as e:
+                    print(f"⚠️  Erro na exclusão: {e}")
             else:
                 print(f"❌ Erro na leitura: {read_response.status_code}")
         else:
@@ -231,6 +205,13 @@ def test_after_creation():
             
     except Exception as e:
         print(f"❌ Erro no teste: {str(e)}")
+    
+    finally:
+        if run.tables and not run.deleted:
+            try:
+                run.cleanup()
+            except RuntimeError as e:
+                print(f"⚠️  Limpeza pendente ({run.tenant_id}): {e}")
 
 if __name__ == "__main__":
     # Carregar variáveis de ambiente do arquivo .env
@@ -49,11 +49,11 @@ ALTER TABLE tickets ENABLE ROW LEVEL SECURITY;
 
 -- Tenants: Apenas admins podem ver todos os tenants
 CREATE POLICY "tenants_admin_only" ON tenants
-    FOR ALL USING (auth.jwt() ->> 'role' = 'admin');
+    FOR ALL USING ((select auth.jwt() ->> 'role') = 'admin');
 
 -- Users: Usuário vê apenas dados do seu tenant
 CREATE POLICY "users_tenant_isolation" ON users
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Permissions: Globais (read-only para todos)
 CREATE POLICY "permissions_read_all" ON permissions
@@ -61,7 +61,7 @@ CREATE POLICY "permissions_read_all" ON permissions
 
 -- Role Permissions: Por tenant
 CREATE POLICY "role_permissions_tenant_isolation" ON role_permissions
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- =====================================================
 -- n.ISMS - Sistema de Gestão de Segurança
@@ -69,15 +69,15 @@ CREATE POLICY "role_permissions_tenant_isolation" ON role_permissions
 
 -- Organizations: Isolamento por tenant
 CREATE POLICY "organizations_tenant_isolation" ON organizations
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Policies: Isolamento por tenant
 CREATE POLICY "policies_tenant_isolation" ON policies
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Controls: Isolamento por tenant
 CREATE POLICY "controls_tenant_isolation" ON controls
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Compliance Frameworks: Globais (read-only)
 CREATE POLICY "compliance_frameworks_read_all" ON compliance_frameworks
@@ -85,11 +85,11 @@ CREATE POLICY "compliance_frameworks_read_all" ON compliance_frameworks
 
 -- Domains: Isolamento por tenant
 CREATE POLICY "domains_tenant_isolation" ON domains
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Assessments: Isolamento por tenant
 CREATE POLICY "assessments_tenant_isolation" ON assessments
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- =====================================================
 -- n.Controls - Catálogo de Controles
@@ -113,7 +113,7 @@ CREATE POLICY "control_mappings_read_all" ON control_mappings
 
 -- Control Effectiveness: Por tenant
 CREATE POLICY "control_effectiveness_tenant_isolation" ON control_effectiveness
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- =====================================================
 -- n.Audit - Auditorias
@@ -121,18 +121,18 @@ CREATE POLICY "control_effectiveness_tenant_isolation" ON control_effectiveness
 
 -- Audits: Isolamento por tenant
 CREATE POLICY "audits_tenant_isolation" ON audits
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Audit Findings: Isolamento por tenant
 CREATE POLICY "audit_findings_tenant_isolation" ON audit_findings
     FOR ALL USING (audit_id IN (
-        SELECT id FROM audits WHERE tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        SELECT id FROM audits WHERE tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- Audit Evidence: Isolamento por tenant
 CREATE POLICY "audit_evidence_tenant_isolation" ON audit_evidence
     FOR ALL USING (audit_id IN (
-        SELECT id FROM audits WHERE tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        SELECT id FROM audits WHERE tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- Corrective Actions: Isolamento por tenant
@@ -140,7 +140,7 @@ CREATE POLICY "corrective_actions_tenant_isolation" ON corrective_actions
     FOR ALL USING (finding_id IN (
         SELECT af.id FROM audit_findings af
         JOIN audits a ON af.audit_id = a.id
-        WHERE a.tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        WHERE a.tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- =====================================================
@@ -149,21 +149,21 @@ CREATE POLICY "corrective_actions_tenant_isolation" ON corrective_actions
 
 -- Risks: Isolamento por tenant
 CREATE POLICY "risks_tenant_isolation" ON risks
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Risk Assessments: Isolamento por tenant
 CREATE POLICY "risk_assessments_tenant_isolation" ON risk_assessments
     FOR ALL USING (risk_id IN (
-        SELECT id FROM risks WHERE tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        SELECT id FROM risks WHERE tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- Risk Questionnaires: Isolamento por tenant
 CREATE POLICY "risk_questionnaires_tenant_isolation" ON risk_questionnaires
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- KRIs: Isolamento por tenant
 CREATE POLICY "kris_tenant_isolation" ON kris
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- =====================================================
 -- n.Privacy - LGPD/GDPR
@@ -171,19 +171,19 @@ CREATE POLICY "kris_tenant_isolation" ON kris
 
 -- Data Subjects: Isolamento rigoroso por tenant
 CREATE POLICY "data_subjects_tenant_isolation" ON data_subjects
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Consents: Isolamento rigoroso por tenant
 CREATE POLICY "consents_tenant_isolation" ON consents
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Processing Activities: Isolamento por tenant
 CREATE POLICY "processing_activities_tenant_isolation" ON processing_activities
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Data Requests: Isolamento por tenant
 CREATE POLICY "data_requests_tenant_isolation" ON data_requests
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- =====================================================
 -- n.SecDevOps - Testes de Segurança
@@ -191,12 +191,12 @@ CREATE POLICY "data_requests_tenant_isolation" ON data_requests
 
 -- Security Projects: Isolamento por tenant
 CREATE POLICY "security_projects_tenant_isolation" ON security_projects
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Security Scans: Isolamento por tenant
 CREATE POLICY "security_scans_tenant_isolation" ON security_scans
     FOR ALL USING (project_id IN (
-        SELECT id FROM security_projects WHERE tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        SELECT id FROM security_projects WHERE tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- Vulnerability Reports: Isolamento por tenant
@@ -204,7 +204,7 @@ CREATE POLICY "vulnerability_reports_tenant_isolation" ON vulnerability_reports
     FOR ALL USING (scan_id IN (
         SELECT ss.id FROM security_scans ss
         JOIN security_projects sp ON ss.project_id = sp.id
-        WHERE sp.tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        WHERE sp.tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- =====================================================
@@ -221,7 +221,7 @@ CREATE POLICY "assessment_questions_read_all" ON assessment_questions
 
 -- Assessment Responses: Isolamento por tenant
 CREATE POLICY "assessment_responses_tenant_isolation" ON assessment_responses
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- =====================================================
 -- n.CIRT - Resposta a Incidentes
@@ -229,18 +229,18 @@ CREATE POLICY "assessment_responses_tenant_isolation" ON assessment_responses
 
 -- Incidents: Isolamento por tenant
 CREATE POLICY "incidents_tenant_isolation" ON incidents
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Incident Tasks: Isolamento por tenant
 CREATE POLICY "incident_tasks_tenant_isolation" ON incident_tasks
     FOR ALL USING (incident_id IN (
-        SELECT id FROM incidents WHERE tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        SELECT id FROM incidents WHERE tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- Incident Evidence: Isolamento por tenant
 CREATE POLICY "incident_evidence_tenant_isolation" ON incident_evidence
     FOR ALL USING (incident_id IN (
-        SELECT id FROM incidents WHERE tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        SELECT id FROM incidents WHERE tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     ));
 
 -- =====================================================
@@ -249,11 +249,11 @@ CREATE POLICY "incident_evidence_tenant_isolation" ON incident_evidence
 
 -- Ticket Categories: Isolamento por tenant
 CREATE POLICY "ticket_categories_tenant_isolation" ON ticket_categories
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- Tickets: Isolamento por tenant
 CREATE POLICY "tickets_tenant_isolation" ON tickets
-    FOR ALL USING (tenant_id = (auth.jwt() ->> 'tenant_id')::uuid);
+    FOR ALL USING (tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid));
 
 -- =====================================================
 -- Políticas Específicas por Role
@@ -262,21 +262,21 @@ CREATE POLICY "tickets_tenant_isolation" ON tickets
 -- Admin: Acesso total ao seu tenant
 CREATE POLICY "admin_full_access" ON users
     FOR ALL USING (
-        auth.jwt() ->> 'role' = 'admin' AND 
-        tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        (select auth.jwt() ->> 'role') = 'admin' AND 
+        tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     );
 
 -- Manager: Acesso limitado ao seu tenant
 CREATE POLICY "manager_limited_access" ON users
     FOR SELECT USING (
-        auth.jwt() ->> 'role' IN ('admin', 'manager') AND 
-        tenant_id = (auth.jwt() ->> 'tenant_id')::uuid
+        (select auth.jwt() ->> 'role') IN ('admin', 'manager') AND 
+        tenant_id = (select (auth.jwt() ->> 'tenant_id')::uuid)
     );
 
 -- User: Acesso apenas aos próprios dados
 CREATE POLICY "user_self_access" ON users
     FOR SELECT USING (
-        id = (auth.jwt() ->> 'user_id')::uuid
+        id = (select (auth.jwt() ->> 'user_id')::uuid)
     );
 
 -- =====================================================
@@ -6,10 +6,11 @@ Script para executar SQL diretamente via API REST
 """
 
 import os
-import requests
 import json
 from datetime import datetime
 
+from supabase_tools import get_client, TestRun, RETURN_REPRESENTATION
+
 def execute_sql_via_api():
     print("🔧 Executando SQL via API Supabase...\n")
     
@@ -26,12 +27,8 @@ def execute_sql_via_api():
         print("Execute: ./configure-supabase.sh")
         return False
     
-    # Headers para requisições
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json'
-    }
+    # Cliente compartilhado (keep-alive + timeouts)
+    client = get_client()
     
     # Tentar criar tabelas uma por uma via inserção de dados
     tables_to_create = [
@@ -41,7 +38,6 @@ def execute_sql_via_api():
                 'name': 'Test Organization',
                 'type': 'company',
                 'description': 'Test organization',
-                'tenant_id': 'demo-tenant',
                 'is_active': True
             }
         },
@@ -52,7 +48,6 @@ def execute_sql_via_api():
                 'type': 'infrastructure',
                 'description': 'Test asset',
                 'classification': {'confidentiality': 'low', 'integrity': 'low', 'availability': 'low'},
-                'tenant_id': 'demo-tenant',
                 'is_active': True
             }
         },
@@ -62,8 +57,7 @@ def execute_sql_via_api():
                 'name': 'Test Evaluation',
                 'description': 'Test evaluation',
                 'status': 'draft',
-                'start_date': datetime.now().date().isoformat(),
-                'tenant_id': 'demo-tenant'
+                'start_date': datetime.now().date().isoformat()
             }
         },
         {
@@ -73,8 +67,7 @@ def execute_sql_via_api():
                 'description': 'Test document',
                 'document_type': 'policy',
                 'version': '1.0',
-                'status': 'draft',
-                'tenant_id': 'demo-tenant'
+                'status': 'draft'
             }
         },
         {
@@ -82,7 +75,6 @@ def execute_sql_via_api():
             'test_data': {
                 'name': 'Test Team',
                 'description': 'Test team',
-                'tenant_id': 'demo-tenant',
                 'is_active': True
             }
         },
@@ -96,8 +88,7 @@ def execute_sql_via_api():
                 'justification': 'Test credential',
                 'valid_from': datetime.now().isoformat(),
                 'valid_until': datetime.now().isoformat(),
-                'status': 'pending',
-                'tenant_id': 'demo-tenant'
+                'status': 'pending'
             }
         },
         {
@@ -110,46 +101,45 @@ def execute_sql_via_api():
                 'justification': 'Test privileged access',
                 'valid_from': datetime.now().isoformat(),
                 'valid_until': datetime.now().isoformat(),
-                'status': 'pending',
-                'tenant_id': 'demo-tenant'
+                'status': 'pending'
             }
         }
     ]
     
     created_tables = []
+    # Dados de teste num tenant próprio da execução, apagado por tenant no final
+    run = TestRun(client, label='sql-api')
     
-    for table in tables_to_create:
-        print(f"\n📋 Tentando criar tabela: {table['name']}")
-        
-        try:
-            # Tentar inserir dados de teste
-            response = requests.post(
-                f"{supabase_url}/rest/v1/{table['name']}",
-                headers=headers,
-                json=table['test_data']
-            )
+    try:
+        for table in tables_to_create:
+            print(f"\n📋 Tentando criar tabela: {table['name']}")
             
-            if response.status_code == 201:
-                print(f"✅ Tabela '{table['name']}' criada com sucesso!")
-                created_tables.append(table['name'])
+            try:
+                # Tentar inserir dados de teste
+                response = run.insert(table['name'], table['test_data'])
                 
-                # Limpar dados de teste
-                inserted_data = response.json()
-                if inserted_data:
-                    delete_response = requests.delete(
-                        f"{supabase_url}/rest/v1/{table['name']}?id=eq.{inserted_data[0]['id']}",
-                        headers=headers
-                    )
-                    if delete_response.status_code == 204:
-                        print(f"✅ Dados de teste removidos de '{table['name']}'")
-            elif response.status_code == 404:
-                print(f"❌ Tabela '{table['name']}' não existe - precisa ser criada via SQL")
-            else:
-                print(f"⚠️  Status inesperado para '{table['name']}': {response.status_code}")
-                print(response.text)
-                
-        except Exception as e:
-            print(f"❌ Erro ao criar '{table['name']}': {str(e)}")
+                if response.status_code == 201:
+                    print(f"✅ Tabela '{table['name']}' criada com sucesso!")
+                    created_tables.append(table['name'])
+                elif response.status_code == 404:
+                    run.tables.discard(table['name'])
+                    print(f"❌ Tabela '{table['name']}' não existe - precisa ser criada via SQL")
+                else:
+                    print(f"⚠️  Status inesperado para '{table['name']}': {response.status_code}")
+                    print(response.text)
+                    
+            except Exception as e:
+                print(f"❌ Erro ao criar '{table['name']}': {str(e)}")
+    
+    finally:
+        if run.tables:
+            try:
+                deleted = run.cleanup()
+                for name, count in deleted.items():
+                    if count:
+                        print(f"✅ Dados de teste removidos de '{name}' ({count} linha(s))")
+            except RuntimeError as e:
+                print(f"⚠️  Limpeza pendente ({run.tenant_id}): {e}")
     
     print(f"\n📊 Resumo:")
     print(f"Tabelas criadas: {len(created_tables)}")
@@ -167,16 +157,7 @@ def create_simple_schema():
     """Criar schema simples via API"""
     print("\n🔧 Tentando criar schema simples...")
     
-    # Carregar variáveis de ambiente
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_ANON_KEY')
-    
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
-    }
+    client = get_client()
     
     # Tentar criar uma organização simples
     test_org = {
@@ -189,11 +170,7 @@ def create_simple_schema():
     
     try:
         print("📋 Tentando criar organização de teste...")
-        response = requests.post(
-            f"{supabase_url}/rest/v1/organizations",
-            headers=headers,
-            json=test_org
-        )
+        response = client.post("organizations", json=test_org, prefer=RETURN_REPRESENTATION)
         
         if response.status_code == 201:
             print("✅ Organização criada com sucesso!")
@@ -212,11 +189,7 @@ def create_simple_schema():
                 'is_active': True
             }
             
-            asset_response = requests.post(
-                f"{supabase_url}/rest/v1/assets",
-                headers=headers,
-                json=test_asset
-            )
+            asset_response = client.post("assets", json=test_asset, prefer=RETURN_REPRESENTATION)
             
             if asset_response.status_code == 201:
                 print("✅ Ativo criado com sucesso!")
@@ -236,10 +209,10 @@ def create_simple_schema():
                     'tenant_id': 'demo-tenant'
                 }
                 
-                cred_response = requests.post(
-                    f"{supabase_url}/rest/v1/credentials_registry",
-                    headers=headers,
-                    json=test_credential
+                cred_response = client.post(
+                    "credentials_registry",
+                    json=test_credential,
+                    prefer=RETURN_REPRESENTATION
                 )
                 
                 if cred_response.status_code == 201:
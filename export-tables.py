@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+📤 Exportação de Tabelas para Auditoria
+Exporta tabelas inteiras (ou um tenant) para NDJSON/CSV com paginação por chave:
+memória constante e o mesmo custo por página do início ao fim da tabela
+"""
+
+import os
+import argparse
+
+from supabase_tools import get_admin_client, export_table, NCISO_SCHEMA
+from supabase_tools.export import DEFAULT_PAGE_SIZE, KEYSETS
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Exportar tabelas com paginação keyset para NDJSON/CSV')
+    parser.add_argument('tables', nargs='*', default=list(NCISO_SCHEMA.table_names), help='Tabelas (padrão: todas do modelo)')
+    parser.add_argument('--output-dir', default='exports', help='Diretório de saída (padrão: exports)')
+    parser.add_argument('--format', choices=('ndjson', 'csv'), default='ndjson', help='Formato dos arquivos (padrão: ndjson)')
+    parser.add_argument('--gzip', action='store_true', help='Comprimir os arquivos (.gz)')
+    parser.add_argument('--tenant', help='Exportar apenas este tenant_id')
+    parser.add_argument('--key', default='id', help=f"Chave de paginação: {' | '.join(KEYSETS)} ou colunas separadas por vírgula (padrão: id)")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help=f'Linhas por página (padrão: {DEFAULT_PAGE_SIZE})')
+    parser.add_argument('--select', default='*', help='Colunas a exportar (padrão: *)')
+    parser.add_argument('--no-prefetch', action='store_true', help='Não buscar a próxima página durante a gravação')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    client = get_admin_client()
+    filters = {'tenant_id': f"eq.{args.tenant}"} if args.tenant else None
+    os.makedirs(args.output_dir, exist_ok=True)
+    reports = []
+    all_ok = True
+
+    for table in args.tables:
+        suffix = f".{args.format}" + ('.gz' if args.gzip else '')
+        path = os.path.join(args.output_dir, f"{table}{f'-{args.tenant}' if args.tenant else ''}{suffix}")
+        print(f"\n📤 {table} → {path}")
+
+        def progress(report):
+            if report.pages % 50 == 0:
+                print(f"   {report.rows:>12,} linhas  última página {report.last_page_ms:>7.1f}ms")
+
+        try:
+            report = export_table(table, path, client, file_format=args.format, key=args.key,
+                                  page_size=args.page_size, select=args.select, filters=filters,
+                                  prefetch=not args.no_prefetch, on_page=progress)
+        except Exception as e:
+            print(f"❌ {str(e)}")
+            all_ok = False
+            continue
+
+        reports.append(report)
+        print(f"✅ {report.rows:,} linhas em {report.pages} página(s), {report.elapsed_ms / 1000:.1f}s"
+              f" ({report.rows_per_second:,.0f} linhas/s, página mais lenta {report.slowest_page_ms:.0f}ms)")
+
+    print(f"\n📊 Resumo:")
+    print(f"Tabelas exportadas: {len(reports)}/{len(args.tables)}")
+    print(f"Linhas: {sum(report.rows for report in reports):,}")
+    fetch = sum(report.fetch_ms for report in reports)
+    write = sum(report.write_ms for report in reports)
+    overlap = '' if args.no_prefetch else ' (sobrepostos pelo prefetch)'
+    print(f"Tempo de busca: {fetch / 1000:.1f}s, gravação: {write / 1000:.1f}s{overlap}")
+
+    return all_ok
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
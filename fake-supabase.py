@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""
+🧪 Supabase Falso (PostgREST sobre SQLite)
+Sobe um PostgREST local com as tabelas do n.CISO para rodar os scripts sem rede
+nem projeto Supabase: aponte SUPABASE_URL para ele e use qualquer chave
+"""
+
+import argparse
+
+from supabase_tools import NCISO_SCHEMA
+from supabase_tools.fake_postgrest import DEFAULT_ERROR_STATUS, DEFAULT_STATEMENT_LOG, FAKE_KEY, FakePostgREST
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='PostgREST falso em SQLite, com latência e erros injetáveis')
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço de escuta (padrão: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=54321, help='Porta (padrão: 54321)')
+    parser.add_argument('--database', default=':memory:', help='Arquivo SQLite para manter os dados entre execuções (padrão: memória)')
+    parser.add_argument('--empty', action='store_true', help='Começar sem tabelas (criadas depois via exec_sql)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latência injetada em cada requisição (padrão: 0)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Atraso aleatório adicional de até N ms (padrão: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração das requisições que falham (padrão: 0)')
+    parser.add_argument('--error-status', type=int, default=DEFAULT_ERROR_STATUS,
+                        help=f'Status HTTP dos erros injetados (padrão: {DEFAULT_ERROR_STATUS})')
+    parser.add_argument('--seed', type=int, help='Semente da latência e dos erros injetados')
+    parser.add_argument('--statement-log', type=int, default=DEFAULT_STATEMENT_LOG,
+                        help=f'Últimos comandos SQL guardados em memória (padrão: {DEFAULT_STATEMENT_LOG}; 0 desliga)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    if not 0.0 <= args.error_rate <= 1.0:
+        print(f"❌ Taxa de erro inválida: {args.error_rate}")
+        return False
+
+    try:
+        server = FakePostgREST(schema=None if args.empty else NCISO_SCHEMA,
+                               database=args.database, latency=args.latency_ms / 1000,
+                               jitter=args.jitter_ms / 1000, error_rate=args.error_rate,
+                               error_status=args.error_status, seed=args.seed, host=args.host, port=args.port,
+                               statement_log=args.statement_log)
+    except Exception as e:
+        print(f"❌ Falha ao iniciar o servidor: {str(e)}")
+        return False
+
+    print(f"🧪 PostgREST falso em {server.url}/rest/v1 ({len(server.tables)} tabela(s), {args.database})")
+    if args.latency_ms or args.jitter_ms or args.error_rate:
+        print(f"   Latência {args.latency_ms:g}ms (+ até {args.jitter_ms:g}ms), "
+              f"{args.error_rate:.0%} de erros {args.error_status}")
+    print("\n💡 Use nos scripts:")
+    print(f"   export SUPABASE_URL={server.url}")
+    print(f"   export SUPABASE_ANON_KEY={FAKE_KEY}")
+    print(f"   export SUPABASE_SERVICE_ROLE_KEY={FAKE_KEY}")
+    print("\nCtrl+C para parar")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+    print(f"\n📊 Resumo:")
+    print(f"Requisições atendidas: {server.requests}")
+    print(f"Erros injetados: {server.injected_errors}")
+    print(f"Comandos SQL executados: {server.executed_statements}")
+    return True
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -5,300 +5,23 @@
 Script que gera o SQL formatado para copiar e colar no SQL Editor
 """
 
-def generate_sql():
-    sql_content = """-- =============================================================================
--- 🛡️ n.CISO - Schema Completo do Supabase
--- =============================================================================
--- Copie e cole este código no SQL Editor do Supabase
--- Projeto: pszfqqmmljekibmcgmig
-
--- =============================================================================
--- 📊 TABELA DE ORGANIZAÇÕES
--- =============================================================================
-CREATE TABLE IF NOT EXISTS organizations (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  name VARCHAR(255) NOT NULL,
-  type VARCHAR(50) NOT NULL CHECK (type IN ('company', 'department', 'unit', 'division')),
-  parent_id UUID REFERENCES organizations(id),
-  description TEXT,
-  tenant_id VARCHAR(255) NOT NULL,
-  is_active BOOLEAN DEFAULT true,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Índices para organizations
-CREATE INDEX IF NOT EXISTS idx_organizations_tenant_id ON organizations(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_organizations_parent_id ON organizations(parent_id);
-CREATE INDEX IF NOT EXISTS idx_organizations_type ON organizations(type);
-CREATE INDEX IF NOT EXISTS idx_organizations_is_active ON organizations(is_active);
-
--- Trigger para atualizar updated_at
-CREATE OR REPLACE FUNCTION update_organizations_updated_at()
-RETURNS TRIGGER AS $$
-BEGIN
-  NEW.updated_at = NOW();
-  RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER update_organizations_updated_at
-  BEFORE UPDATE ON organizations
-  FOR EACH ROW
-  EXECUTE FUNCTION update_organizations_updated_at();
-
--- =============================================================================
--- 📊 TABELA DE ATIVOS
--- =============================================================================
-CREATE TABLE IF NOT EXISTS assets (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  name VARCHAR(255) NOT NULL,
-  type VARCHAR(50) NOT NULL CHECK (type IN ('physical', 'digital', 'person', 'software', 'infrastructure', 'data')),
-  description TEXT,
-  owner_id UUID,
-  classification JSONB NOT NULL DEFAULT '{"confidentiality": "low", "integrity": "low", "availability": "low"}',
-  value DECIMAL(15,2),
-  location VARCHAR(255),
-  organization_id UUID REFERENCES organizations(id),
-  tenant_id VARCHAR(255) NOT NULL,
-  is_active BOOLEAN DEFAULT true,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Índices para assets
-CREATE INDEX IF NOT EXISTS idx_assets_tenant_id ON assets(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_assets_organization_id ON assets(organization_id);
-CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(type);
-CREATE INDEX IF NOT EXISTS idx_assets_is_active ON assets(is_active);
-
--- Trigger para atualizar updated_at
-CREATE OR REPLACE FUNCTION update_assets_updated_at()
-RETURNS TRIGGER AS $$
-BEGIN
-  NEW.updated_at = NOW();
-  RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER update_assets_updated_at
-  BEFORE UPDATE ON assets
-  FOR EACH ROW
-  EXECUTE FUNCTION update_assets_updated_at();
-
--- =============================================================================
--- 📊 TABELA DE AVALIAÇÕES
--- =============================================================================
-CREATE TABLE IF NOT EXISTS evaluations (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  name VARCHAR(255) NOT NULL,
-  description TEXT,
-  scope_id UUID,
-  domain_id UUID,
-  control_id UUID,
-  status VARCHAR(50) NOT NULL DEFAULT 'draft' CHECK (status IN ('draft', 'in_progress', 'completed', 'reviewed')),
-  percentage_score DECIMAL(5,2),
-  evidence_count INTEGER DEFAULT 0,
-  start_date DATE NOT NULL,
-  end_date DATE,
-  notes TEXT,
-  tenant_id VARCHAR(255) NOT NULL,
-  created_by VARCHAR(255),
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Índices para evaluations
-CREATE INDEX IF NOT EXISTS idx_evaluations_tenant_id ON evaluations(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_evaluations_status ON evaluations(status);
-CREATE INDEX IF NOT EXISTS idx_evaluations_start_date ON evaluations(start_date);
-
--- Trigger para atualizar updated_at
-CREATE OR REPLACE FUNCTION update_evaluations_updated_at()
-RETURNS TRIGGER AS $$
-BEGIN
-  NEW.updated_at = NOW();
-  RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER update_evaluations_updated_at
-  BEFORE UPDATE ON evaluations
-  FOR EACH ROW
-  EXECUTE FUNCTION update_evaluations_updated_at();
-
--- =============================================================================
--- 📊 TABELA DE DOCUMENTOS TÉCNICOS
--- =============================================================================
-CREATE TABLE IF NOT EXISTS technical_documents (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  name VARCHAR(255) NOT NULL,
-  description TEXT,
-  document_type VARCHAR(50) NOT NULL CHECK (document_type IN ('policy', 'procedure', 'standard', 'guideline', 'template', 'manual', 'checklist')),
-  version VARCHAR(20) DEFAULT '1.0',
-  content TEXT,
-  file_path VARCHAR(500),
-  file_size BIGINT,
-  file_type VARCHAR(100),
-  tags TEXT[],
-  scope_id UUID,
-  asset_id UUID REFERENCES assets(id),
-  control_id UUID,
-  status VARCHAR(50) NOT NULL DEFAULT 'draft' CHECK (status IN ('draft', 'review', 'approved', 'active', 'inactive')),
-  tenant_id VARCHAR(255) NOT NULL,
-  created_by VARCHAR(255),
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Índices para technical_documents
-CREATE INDEX IF NOT EXISTS idx_technical_documents_tenant_id ON technical_documents(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_technical_documents_document_type ON technical_documents(document_type);
-CREATE INDEX IF NOT EXISTS idx_technical_documents_status ON technical_documents(status);
-CREATE INDEX IF NOT EXISTS idx_technical_documents_scope_id ON technical_documents(scope_id);
-
--- Trigger para atualizar updated_at
-CREATE OR REPLACE FUNCTION update_technical_documents_updated_at()
-RETURNS TRIGGER AS $$
-BEGIN
-  NEW.updated_at = NOW();
-  RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER update_technical_documents_updated_at
-  BEFORE UPDATE ON technical_documents
-  FOR EACH ROW
-  EXECUTE FUNCTION update_technical_documents_updated_at();
-
--- =============================================================================
--- 📊 TABELA DE EQUIPES
--- =============================================================================
-CREATE TABLE IF NOT EXISTS teams (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  name VARCHAR(255) NOT NULL,
-  description TEXT,
-  organization_id UUID REFERENCES organizations(id),
-  tenant_id VARCHAR(255) NOT NULL,
-  is_active BOOLEAN DEFAULT true,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Índices para teams
-CREATE INDEX IF NOT EXISTS idx_teams_tenant_id ON teams(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_teams_organization_id ON teams(organization_id);
-CREATE INDEX IF NOT EXISTS idx_teams_is_active ON teams(is_active);
-
--- Trigger para atualizar updated_at
-CREATE OR REPLACE FUNCTION update_teams_updated_at()
-RETURNS TRIGGER AS $$
-BEGIN
-  NEW.updated_at = NOW();
-  RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER update_teams_updated_at
-  BEFORE UPDATE ON teams
-  FOR EACH ROW
-  EXECUTE FUNCTION update_teams_updated_at();
+import argparse
 
--- =============================================================================
--- 📊 TABELA DE REGISTRO DE CREDENCIAIS
--- =============================================================================
-CREATE TABLE IF NOT EXISTS credentials_registry (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  asset_id UUID NOT NULL REFERENCES assets(id),
-  holder_type VARCHAR(20) NOT NULL CHECK (holder_type IN ('user', 'team')),
-  holder_id VARCHAR(255) NOT NULL,
-  access_type VARCHAR(20) NOT NULL CHECK (access_type IN ('read', 'write', 'admin', 'full')),
-  justification TEXT,
-  valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
-  valid_until TIMESTAMP WITH TIME ZONE NOT NULL,
-  status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'active', 'inactive', 'expired', 'revoked')),
-  approved_by VARCHAR(255),
-  approved_at TIMESTAMP WITH TIME ZONE,
-  revoked_by VARCHAR(255),
-  revoked_at TIMESTAMP WITH TIME ZONE,
-  tenant_id VARCHAR(255) NOT NULL,
-  created_by VARCHAR(255),
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
+from supabase_tools.index_advisor import (
+    DEFAULT_POLICY_FILE, DEFAULT_SERVICES_GLOB, apply_index_advice, estimate_index_bytes, load_advice
+)
+from supabase_tools.schema import Partitioning, render_cached
+from supabase_tools.tables import HIGH_VOLUME_TABLES, NCISO_SCHEMA
 
--- Índices para credentials_registry
-CREATE INDEX IF NOT EXISTS idx_credentials_registry_tenant_id ON credentials_registry(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_credentials_registry_asset_id ON credentials_registry(asset_id);
-CREATE INDEX IF NOT EXISTS idx_credentials_registry_holder_type ON credentials_registry(holder_type);
-CREATE INDEX IF NOT EXISTS idx_credentials_registry_status ON credentials_registry(status);
-CREATE INDEX IF NOT EXISTS idx_credentials_registry_valid_until ON credentials_registry(valid_until);
+RULE = "-- " + "=" * 77
 
--- Trigger para atualizar updated_at
-CREATE OR REPLACE FUNCTION update_credentials_registry_updated_at()
-RETURNS TRIGGER AS $$
-BEGIN
-  NEW.updated_at = NOW();
-  RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER update_credentials_registry_updated_at
-  BEFORE UPDATE ON credentials_registry
-  FOR EACH ROW
-  EXECUTE FUNCTION update_credentials_registry_updated_at();
-
--- =============================================================================
--- 📊 TABELA DE ACESSO PRIVILEGIADO
--- =============================================================================
-CREATE TABLE IF NOT EXISTS privileged_access (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  user_id VARCHAR(255) NOT NULL,
-  scope_type VARCHAR(50) NOT NULL CHECK (scope_type IN ('system', 'database', 'application', 'network', 'infrastructure')),
-  scope_id VARCHAR(255) NOT NULL,
-  access_level VARCHAR(20) NOT NULL CHECK (access_level IN ('read', 'write', 'admin', 'full')),
-  justification TEXT,
-  valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
-  valid_until TIMESTAMP WITH TIME ZONE NOT NULL,
-  status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'active', 'inactive', 'expired', 'revoked')),
-  approved_by VARCHAR(255),
-  approved_at TIMESTAMP WITH TIME ZONE,
-  revoked_by VARCHAR(255),
-  revoked_at TIMESTAMP WITH TIME ZONE,
-  last_audit_date TIMESTAMP WITH TIME ZONE,
-  audit_notes TEXT,
-  tenant_id VARCHAR(255) NOT NULL,
-  created_by VARCHAR(255),
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Índices para privileged_access
-CREATE INDEX IF NOT EXISTS idx_privileged_access_tenant_id ON privileged_access(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_privileged_access_user_id ON privileged_access(user_id);
-CREATE INDEX IF NOT EXISTS idx_privileged_access_scope_type ON privileged_access(scope_type);
-CREATE INDEX IF NOT EXISTS idx_privileged_access_status ON privileged_access(status);
-CREATE INDEX IF NOT EXISTS idx_privileged_access_valid_until ON privileged_access(valid_until);
-
--- Trigger para atualizar updated_at
-CREATE OR REPLACE FUNCTION update_privileged_access_updated_at()
-RETURNS TRIGGER AS $$
-BEGIN
-  NEW.updated_at = NOW();
-  RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
-CREATE TRIGGER update_privileged_access_updated_at
-  BEFORE UPDATE ON privileged_access
-  FOR EACH ROW
-  EXECUTE FUNCTION update_privileged_access_updated_at();
-
--- =============================================================================
--- 📊 DADOS DE EXEMPLO
--- =============================================================================
+HEADER = f"""{RULE}
+-- 🛡️ n.CISO - Schema Completo do Supabase
+{RULE}
+-- Copie e cole este código no SQL Editor do Supabase
+-- Projeto: pszfqqmmljekibmcgmig"""
 
--- Inserir organizações de exemplo
+SAMPLE_DATA = """-- Inserir organizações de exemplo
 INSERT INTO organizations (name, type, description, tenant_id, is_active) VALUES
 ('n.CISO Corporation', 'company', 'Empresa principal do sistema n.CISO', 'demo-tenant', true),
 ('Departamento de TI', 'department', 'Departamento de Tecnologia da Informação', 'demo-tenant', true),
@@ -313,54 +36,133 @@ INSERT INTO assets (name, type, description, classification, value, organization
 -- Inserir equipes de exemplo
 INSERT INTO teams (name, description, organization_id, tenant_id, is_active) VALUES
 ('Equipe de Desenvolvimento', 'Equipe responsável pelo desenvolvimento de software', (SELECT id FROM organizations WHERE name = 'Departamento de TI' LIMIT 1), 'demo-tenant', true),
-('Equipe de Operações', 'Equipe responsável pelas operações de TI', (SELECT id FROM organizations WHERE name = 'Departamento de TI' LIMIT 1), 'demo-tenant', true);
-
--- =============================================================================
--- 📊 RLS (Row Level Security) - OPCIONAL
--- =============================================================================
-
--- Para desenvolvimento, você pode desabilitar RLS temporariamente:
--- ALTER TABLE organizations DISABLE ROW LEVEL SECURITY;
--- ALTER TABLE assets DISABLE ROW LEVEL SECURITY;
--- ALTER TABLE evaluations DISABLE ROW LEVEL SECURITY;
--- ALTER TABLE technical_documents DISABLE ROW LEVEL SECURITY;
--- ALTER TABLE teams DISABLE ROW LEVEL SECURITY;
--- ALTER TABLE credentials_registry DISABLE ROW LEVEL SECURITY;
--- ALTER TABLE privileged_access DISABLE ROW LEVEL SECURITY;
-
--- Ou criar políticas mais permissivas:
--- CREATE POLICY "allow_all" ON organizations FOR ALL USING (true);
--- CREATE POLICY "allow_all" ON assets FOR ALL USING (true);
--- CREATE POLICY "allow_all" ON evaluations FOR ALL USING (true);
--- CREATE POLICY "allow_all" ON technical_documents FOR ALL USING (true);
--- CREATE POLICY "allow_all" ON teams FOR ALL USING (true);
--- CREATE POLICY "allow_all" ON credentials_registry FOR ALL USING (true);
--- CREATE POLICY "allow_all" ON privileged_access FOR ALL USING (true);
-
--- =============================================================================
--- ✅ SCHEMA COMPLETO CRIADO
--- =============================================================================
-
-SELECT '✅ Schema n.CISO criado com sucesso!' as status;
-"""
+('Equipe de Operações', 'Equipe responsável pelas operações de TI', (SELECT id FROM organizations WHERE name = 'Departamento de TI' LIMIT 1), 'demo-tenant', true);"""
+
+def section(title):
+    """Cabeçalho de seção no padrão do arquivo"""
+    return f"{RULE}\n-- {title}\n{RULE}"
+
+def render_rls_section(schema):
+    disable = '\n'.join(f"-- ALTER TABLE {name} DISABLE ROW LEVEL SECURITY;" for name in schema.table_names)
+    allow_all = '\n'.join(f'-- CREATE POLICY "allow_all" ON {name} FOR ALL USING (true);' for name in schema.table_names)
+    return (
+        section("📊 RLS (Row Level Security) - OPCIONAL") + "\n\n"
+        "-- Para desenvolvimento, você pode desabilitar RLS temporariamente:\n"
+        f"{disable}\n\n"
+        "-- Ou criar políticas mais permissivas:\n"
+        f"{allow_all}"
+    )
+
+def render_schema(schema):
+    """Renderizar o schema completo a partir do modelo"""
+    parts = [HEADER]
+    
+    for table in schema.tables:
+        parts.append(section(f"📊 {table.title}") + "\n" + table.render())
+    
+    parts.append(section("📊 DADOS DE EXEMPLO") + "\n\n" + SAMPLE_DATA)
+    parts.append(render_rls_section(schema))
+    parts.append(section("✅ SCHEMA COMPLETO CRIADO") + "\n\n"
+                 "SELECT '✅ Schema n.CISO criado com sucesso!' as status;")
+    
+    return '\n\n'.join(parts) + '\n'
+
+def generate_sql(schema=NCISO_SCHEMA):
+    # Cache por hash do modelo + deste gerador: schema inalterado não é renderizado de novo
+    with open(__file__, 'r') as f:
+        generator_source = f.read()
+    return render_cached(schema, render_schema, generator_source)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Gerar o SQL do schema n.CISO para o SQL Editor do Supabase')
+    parser.add_argument('--output', default='supabase-schema-ready.sql', help='Arquivo de saída')
+    parser.add_argument('--advise-indexes', action='store_true',
+                        help=f'Usar os índices sugeridos a partir de {DEFAULT_POLICY_FILE} e {DEFAULT_SERVICES_GLOB}')
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help='Linhas por tabela usadas na estimativa de tamanho dos índices')
+    parser.add_argument('--partition', nargs='*', metavar='TABELA[=hash|range]',
+                        help=f"Particionar tabelas (sem nomes: {', '.join(HIGH_VOLUME_TABLES)})")
+    parser.add_argument('--partition-strategy', choices=('hash', 'range'), default='hash',
+                        help='hash em tenant_id ou range em created_at (padrão: hash)')
+    parser.add_argument('--hash-partitions', type=int, default=8, help='Número de partições hash')
+    parser.add_argument('--range-interval', choices=('day', 'month', 'year'), default='month',
+                        help='Tamanho de cada partição range')
+    parser.add_argument('--premake', type=int, default=3, help='Partições range futuras criadas antecipadamente')
+    return parser.parse_args()
+
+def partitioning_for(args):
+    """{tabela: Partitioning} a partir das opções --partition"""
+    partitioning = {}
+    for spec in args.partition or HIGH_VOLUME_TABLES:
+        table, _, strategy = spec.partition('=')
+        strategy = strategy or args.partition_strategy
+        if strategy == 'hash':
+            partitioning[table] = Partitioning('hash', 'tenant_id', partitions=args.hash_partitions)
+        else:
+            partitioning[table] = Partitioning('range', 'created_at', interval=args.range_interval,
+                                               premake=args.premake)
+    return partitioning
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def advise_indexes(schema, rows):
+    """Aplicar as sugestões do consultor de índices e mostrar a economia estimada"""
+    advice = load_advice(schema)
     
-    return sql_content
+    print(f"🧭 Índices sugeridos ({len(advice.proposals)}):")
+    added = 0
+    for proposal in advice.proposals:
+        size = estimate_index_bytes(schema.table(proposal.table), proposal.index, rows)
+        added += size
+        print(f"   + {proposal.index.index_name(proposal.table)} (~{format_bytes(size)}) - {proposal.reason}")
+    
+    print(f"\n🗑️  Índices redundantes ({len(advice.redundant)}):")
+    freed = 0
+    for redundant in advice.redundant:
+        size = estimate_index_bytes(schema.table(redundant.table), redundant.index, rows)
+        freed += size
+        print(f"   - {redundant.index.index_name(redundant.table)} (~{format_bytes(size)}) - {redundant.reason}")
+    
+    print(f"\n📊 Estimativa para {rows:,} linhas por tabela:")
+    print(f"Espaço liberado pelos redundantes: {format_bytes(freed)}")
+    print(f"Espaço dos novos índices: {format_bytes(added)}")
+    print(f"Saldo: {format_bytes(freed - added)}\n")
+    
+    return apply_index_advice(schema, advice)
 
 def main():
+    args = parse_args()
+    
     print("📝 Gerando SQL para Supabase...\n")
     
-    sql = generate_sql()
+    schema = advise_indexes(NCISO_SCHEMA, args.rows) if args.advise_indexes else NCISO_SCHEMA
+    
+    if args.partition is not None:
+        partitioning = partitioning_for(args)
+        try:
+            schema = schema.with_partitioning(partitioning)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            return False
+        for table, spec in partitioning.items():
+            print(f"🧩 {table}: PARTITION BY {spec.strategy.upper()} ({spec.column})")
+        print()
+    sql = generate_sql(schema)
     
     # Salvar em arquivo
-    with open('supabase-schema-ready.sql', 'w') as f:
+    with open(args.output, 'w') as f:
         f.write(sql)
     
-    print("✅ SQL gerado e salvo em: supabase-schema-ready.sql")
+    print(f"✅ SQL gerado e salvo em: {args.output}")
     print("\n📋 Instruções:")
     print("1. Acesse: https://supabase.com/dashboard/project/pszfqqmmljekibmcgmig")
     print("2. Vá em SQL Editor")
     print("3. Clique em 'New query'")
-    print("4. Copie e cole o conteúdo do arquivo: supabase-schema-ready.sql")
+    print(f"4. Copie e cole o conteúdo do arquivo: {args.output}")
     print("5. Clique em 'Run'")
     print("6. Execute o teste: python3 test-supabase-python.py")
     
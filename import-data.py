@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""
+📥 Importação de Inventário e Registros de Acesso
+Carrega arquivos CSV/NDJSON grandes (ativos, credenciais, acessos privilegiados...)
+em streaming, valida cada linha contra o modelo e envia upserts em lotes,
+retomando de onde parou se a execução for interrompida
+"""
+
+import os
+import argparse
+
+from supabase_tools import get_admin_client, import_file, NCISO_SCHEMA
+from supabase_tools.importer import DEFAULT_CHUNK_SIZE, clear_checkpoint, load_checkpoint
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Importar CSV/NDJSON com validação e upsert em lotes retomável')
+    parser.add_argument('file', help='Arquivo .csv, .ndjson ou .jsonl')
+    parser.add_argument('--table', required=True, choices=NCISO_SCHEMA.table_names, help='Tabela de destino')
+    parser.add_argument('--format', choices=('csv', 'ndjson'), default=None, help='Formato (padrão: pela extensão)')
+    parser.add_argument('--tenant', help='tenant_id aplicado às linhas que não trazem um')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help=f'Registros por lote (padrão: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--workers', type=int, default=2, help='Lotes em andamento ao mesmo tempo (padrão: 2)')
+    parser.add_argument('--on-conflict', help='Colunas únicas para o upsert (padrão: chave primária)')
+    parser.add_argument('--rejects', help='Arquivo NDJSON para as linhas rejeitadas (padrão: <arquivo>.rejected.ndjson)')
+    parser.add_argument('--restart', action='store_true', help='Ignorar o checkpoint e importar desde o início')
+    parser.add_argument('--validate-only', action='store_true', help='Apenas validar o arquivo, sem enviar')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+class _ValidationClient:
+    """Cliente que não envia nada: usado por --validate-only"""
+    def post(self, *args, **kwargs):
+        return None
+
+def main():
+    args = parse_args()
+    load_env()
+
+    table = NCISO_SCHEMA.table(args.table)
+    defaults = {'tenant_id': args.tenant} if args.tenant else None
+    rejects = args.rejects or f"{args.file}.rejected.ndjson"
+
+    if args.validate_only:
+        client = _ValidationClient()
+        resume = False
+    else:
+        if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+            print("❌ Variáveis de ambiente não configuradas!")
+            return False
+        client = get_admin_client()
+        if args.restart:
+            clear_checkpoint(args.file, table.name)
+        resume = True
+        checkpoint = load_checkpoint(args.file, table.name)
+        if checkpoint.records:
+            print(f"⏩ Retomando após {checkpoint.records:,} registro(s) já confirmados")
+
+    print(f"📥 Importando {args.file} → {table.name} (lotes de {args.chunk_size}, {args.workers} em andamento)...")
+
+    def progress(report):
+        print(f"   {report.records:>12,} registros  {report.rows:>12,} gravados  {report.rejected:>8,} rejeitados")
+
+    report = import_file(args.file, table, client, file_format=args.format, chunk_size=args.chunk_size,
+                         workers=args.workers, on_conflict=args.on_conflict, defaults=defaults,
+                         rejects_path=rejects, resume=resume, on_progress=progress)
+
+    print(f"\n📊 Resumo:")
+    print(f"Registros lidos: {report.records:,}")
+    print(f"Linhas {'válidas' if args.validate_only else 'gravadas'}: {report.rows:,}")
+    print(f"Linhas rejeitadas: {report.rejected:,}" + (f" (detalhes em {rejects})" if report.rejected else ''))
+    if not args.validate_only:
+        print(f"Tempo: {report.elapsed_ms / 1000:.1f}s ({report.rows_per_second:,.0f} linhas/s, {report.requests} POST(s))")
+
+    if not report.success:
+        first, last = report.error_lines
+        print(f"\n❌ Lote das linhas {first}-{last} falhou ({report.status_code}): {report.error}")
+        if report.resumable:
+            print("💡 Execute novamente para retomar do último lote confirmado")
+        return False
+
+    if report.rejected == 0 and os.path.exists(rejects) and os.path.getsize(rejects) == 0:
+        os.remove(rejects)
+    return report.rejected == 0
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+🔐 Linter de Políticas RLS
+Aponta chamadas avaliadas por linha (auth.jwt(), auth.uid(), current_setting) nas
+políticas, reescreve para o formato (select ...) avaliado uma vez por consulta e,
+opcionalmente, mede o ganho por tabela num Postgres local
+"""
+
+import os
+import argparse
+
+from supabase_tools.rls import benchmark_policies, compare_files, lint_file, rewrite_file
+
+DEFAULT_POLICY_FILE = 'docs/rls-policies.sql'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Lint e reescrita de políticas RLS para o formato InitPlan')
+    parser.add_argument('file', nargs='?', default=DEFAULT_POLICY_FILE, help=f'Arquivo de políticas (padrão: {DEFAULT_POLICY_FILE})')
+    parser.add_argument('--write', action='store_true', help='Reescrever o arquivo no lugar')
+    parser.add_argument('--output', help='Salvar a versão reescrita neste arquivo')
+    parser.add_argument('--alter', help='Salvar ALTER POLICY para aplicar a reescrita num banco existente')
+    parser.add_argument('--benchmark', action='store_true', help='Comparar antes/depois num Postgres local')
+    parser.add_argument('--before', help='No benchmark, medir as políticas deste arquivo contra as do arquivo analisado '
+                                         '(para um arquivo já reescrito)')
+    parser.add_argument('--dsn', default=None, help='Conexão do Postgres local (padrão: DATABASE_URL)')
+    parser.add_argument('--rows', type=int, default=100_000, help='Linhas por tabela no benchmark')
+    parser.add_argument('--tenants', type=int, default=50, help='Tenants distintos nos dados do benchmark')
+    parser.add_argument('--runs', type=int, default=5, help='Execuções por medição (usa a mediana)')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def run_benchmark(results, args):
+    dsn = args.dsn or os.getenv('DATABASE_URL')
+    if not dsn:
+        print("❌ Informe --dsn ou DATABASE_URL para o benchmark")
+        return False
+
+    if args.before:
+        results = compare_files(args.before, args.file)
+        print(f"\n🔁 Antes: {args.before} → depois: {args.file}")
+    elif not any(result.changed for result in results):
+        print(f"\n❌ Nada a medir: {args.file} não tem políticas a reescrever")
+        print("💡 Para um arquivo já reescrito, informe a versão anterior com --before")
+        return False
+
+    print(f"\n⏱️  Benchmark ({args.rows:,} linhas, {args.tenants} tenants, mediana de {args.runs})...")
+    try:
+        benchmarks = benchmark_policies(results, dsn, rows=args.rows, tenants=args.tenants, runs=args.runs)
+    except Exception as e:
+        print(f"❌ Erro no benchmark: {str(e)}")
+        return False
+
+    print(f"\n{'Tabela':<28}{'Antes':>12}{'Depois':>12}{'Ganho':>9}")
+    for benchmark in benchmarks:
+        if benchmark.skipped:
+            print(f"{benchmark.table:<28}   ⏭️  {benchmark.skipped}")
+            continue
+        print(f"{benchmark.table:<28}{benchmark.before_ms:>10.1f}ms{benchmark.after_ms:>10.1f}ms"
+              f"{benchmark.speedup:>8.1f}x")
+    return True
+
+def main():
+    args = parse_args()
+    load_env()
+
+    print(f"🔐 Analisando políticas de {args.file}...\n")
+    results = lint_file(args.file)
+
+    findings = [finding for result in results for finding in result.findings]
+    for finding in findings:
+        icon = '✏️ ' if finding.rewritable else '⚠️ '
+        print(f"{icon} {args.file}:{finding.line} [{finding.policy.name}] {finding.clause}: {finding.message}")
+        print(f"    {' '.join(finding.expression.split())}")
+
+    rewritable = [result for result in results if result.changed]
+    print(f"\n📊 Resumo:")
+    print(f"Políticas analisadas: {len(results)}")
+    print(f"Políticas reescritas: {len(rewritable)}")
+    print(f"Avisos sem reescrita automática: {sum(1 for f in findings if not f.rewritable)}")
+
+    if rewritable and (args.write or args.output):
+        target = args.file if args.write else args.output
+        rewritten = rewrite_file(args.file)
+        with open(target, 'w') as f:
+            f.write(rewritten)
+        print(f"\n✅ Políticas reescritas salvas em: {target}")
+
+    if rewritable and args.alter:
+        with open(args.alter, 'w') as f:
+            f.write('\n\n'.join(result.render_alter() for result in rewritable) + '\n')
+        print(f"✅ ALTER POLICY salvo em: {args.alter}")
+
+    if args.benchmark and not run_benchmark(results, args):
+        return False
+
+    # Como linter (sem --write/--output), falhar se ainda houver políticas a reescrever
+    return not rewritable or bool(args.write or args.output or args.alter)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""
+🔥 Teste de Carga do PostgREST (malha aberta)
+Dispara misturas de operações (CRUD de organizations, listagens do frontend) numa
+taxa fixa de chegada e reporta p50/p95/p99/p99.9 por operação; com --rates sobe
+a taxa em degraus até a implantação deixar de acompanhar
+"""
+
+import os
+import json
+import argparse
+
+from supabase_tools import NCISO_SCHEMA, TestRun
+from supabase_tools.load import (DEFAULT_TENANT, MIXES, OPERATIONS, available_cpus, load_client, parse_mix,
+                                 run_steps)
+from supabase_tools.results import dataset_size, load_metrics, new_result, save_result
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Teste de carga open-loop com histogramas HDR por operação')
+    parser.add_argument('--mix', default='read-heavy', help=f"Mistura: {' | '.join(MIXES)} ou pesos op=peso,... ({', '.join(OPERATIONS)})")
+    parser.add_argument('--rate', type=float, default=20.0, help='Operações por segundo (padrão: 20)')
+    parser.add_argument('--rates', help='Degraus de taxa separados por vírgula (ex.: 10,20,50,100)')
+    parser.add_argument('--duration', type=float, default=30.0, help='Segundos medidos por taxa (padrão: 30)')
+    parser.add_argument('--warmup', type=float, default=5.0, help='Segundos iniciais fora da medição (padrão: 5)')
+    parser.add_argument('--concurrency', type=int, default=64, help='Operações simultâneas no total (padrão: 64)')
+    parser.add_argument('--processes', type=int, default=len(available_cpus()),
+                        help=f'Processos geradores, um por núcleo (padrão: {len(available_cpus())})')
+    parser.add_argument('--uniform', action='store_true', help='Chegadas em intervalos fixos em vez de Poisson')
+    parser.add_argument('--tenant', default=DEFAULT_TENANT, help=f'Tenant lido pelas listagens (padrão: {DEFAULT_TENANT})')
+    parser.add_argument('--slo-p99', type=float, default=None, help='p99 alvo em ms: acima disso o degrau conta como saturado')
+    parser.add_argument('--seed', type=int, default=None, help='Semente das chegadas e da escolha de operações')
+    parser.add_argument('--json', help='Salvar o relatório completo (com histogramas) neste arquivo')
+    parser.add_argument('--save', action='store_true', help='Gravar o resultado em benchmarks/results (compare-benchmarks.py)')
+    parser.add_argument('--name', help='Nome do benchmark no resultado salvo (padrão: load-<mistura>)')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def print_report(report, slo_p99=None):
+    status = '🟥 saturado' if report.saturated(slo_p99) else '🟩 acompanhou'
+    print(f"\n⏱️  {report.rate:g} op/s oferecidas → {report.throughput:.1f} op/s concluídas ({status})")
+    print(f"   agendadas {report.scheduled}, erros {report.failed}, descartadas {report.dropped},"
+          f" sem resposta {report.unfinished},"
+          f" atraso máx. do agendador {report.max_schedule_lag_ms:.0f}ms")
+    if report.client_bound():
+        print(f"   ⚠️  Gerador no limite de CPU ({report.client_cpu:.0%} de um núcleo em {report.workers} processo(s)):"
+              f" a taxa medida é do cliente; aumente --processes")
+    print(f"   {'Operação':<22}{'ok':>7}{'erros':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'p99.9':>9}{'máx':>9}  (ms)")
+    for name, stats in sorted(report.operations.items()):
+        summary = stats.latency.summary_ms()
+        if stats.ok:
+            print(f"   {name:<22}{stats.ok:>7}{stats.failed:>7}{summary['p50']:>9.1f}{summary['p95']:>9.1f}"
+                  f"{summary['p99']:>9.1f}{summary['p99.9']:>9.1f}{summary['max']:>9.1f}")
+        else:
+            print(f"   {name:<22}{0:>7}{stats.failed:>7}")
+        for error, count in sorted(stats.errors.items()):
+            print(f"      ❌ {error}: {count}")
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return False
+    rates = [float(rate) for rate in args.rates.split(',')] if args.rates else [args.rate]
+
+    client = load_client(args.concurrency)
+    # Escritas do CRUD vão para um tenant da execução, limpo ao final
+    run = TestRun(client, label='load', tables=['organizations'])
+
+    print(f"🔥 Mistura: {', '.join(f'{name}={weight:g}' for name, weight in mix.items())}")
+    print(f"📋 Leituras em {args.tenant}, escritas em {run.tenant_id}")
+    print(f"🚀 {len(rates)} degrau(s) de {args.duration:g}s (+{args.warmup:g}s de aquecimento),"
+          f" {'uniforme' if args.uniform else 'Poisson'}, até {args.concurrency} simultâneas"
+          f" em {args.processes} processo(s)")
+
+    try:
+        reports = run_steps(client, mix, rates, args.duration, on_step=lambda r: print_report(r, args.slo_p99),
+                            slo_p99_ms=args.slo_p99, concurrency=args.concurrency, tenant_id=args.tenant,
+                            run_tenant=run.tenant_id, warmup=args.warmup, poisson=not args.uniform,
+                            seed=args.seed, processes=args.processes)
+    finally:
+        if 'crud' in mix:
+            try:
+                run.cleanup()
+            except RuntimeError as e:
+                print(f"⚠️  Limpeza pendente ({run.tenant_id}): {str(e)}")
+
+    sustained = [r for r in reports if not r.saturated(args.slo_p99)]
+    print(f"\n📊 Resumo:")
+    if sustained:
+        best = max(sustained, key=lambda r: r.throughput)
+        p99 = best.total_latency().percentile(99) / 1000
+        print(f"Maior taxa sustentada: {best.throughput:.1f} op/s (p99 {p99:.1f}ms)")
+    else:
+        print("Nenhum degrau sustentado: reduza --rate/--rates")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'mix': mix, 'tenant': args.tenant, 'steps': [r.to_dict() for r in reports]}, f, indent=2)
+        print(f"✅ Relatório salvo em: {args.json}")
+
+    if args.save and reports:
+        result = new_result(args.name or f"load-{args.mix if args.mix in MIXES else 'custom'}", load_metrics(reports),
+                            dataset_size(client, NCISO_SCHEMA.table_names, [args.tenant]),
+                            {'mix': mix, 'rates': rates, 'duration': args.duration, 'warmup': args.warmup,
+                             'concurrency': args.concurrency, 'processes': args.processes,
+                             'poisson': not args.uniform})
+        print(f"✅ Resultado salvo em: {save_result(result)}")
+
+    return bool(sustained)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
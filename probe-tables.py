@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+🔎 Verificação Concorrente de Tabelas
+Script que verifica a disponibilidade de todas as tabelas do schema em paralelo
+"""
+
+import os
+import json
+import argparse
+
+from supabase_tools import SupabaseClient, probe_tables, tables_from_sql
+
+DEFAULT_SCHEMA_FILE = 'docs/database-schema.sql'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Verificar disponibilidade das tabelas via PostgREST')
+    parser.add_argument('tables', nargs='*', help='Tabelas a verificar (padrão: todas do arquivo de schema)')
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA_FILE, help='Arquivo SQL de onde ler as tabelas')
+    parser.add_argument('--concurrency', type=int, default=None, help='Requisições simultâneas (padrão: uma por tabela)')
+    parser.add_argument('--adaptive', action='store_true', help='Ajustar a concorrência automaticamente (backoff em 429/503)')
+    parser.add_argument('--json', action='store_true', help='Imprimir o mapa de disponibilidade em JSON')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    # Carregar variáveis de ambiente
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        print("Execute: ./configure-supabase.sh")
+        return False
+
+    tables = args.tables or tables_from_sql(args.schema)
+    concurrency = args.concurrency or len(tables)
+
+    # Pool do tamanho da concorrência para reaproveitar todas as conexões
+    with SupabaseClient(pool_size=concurrency, adaptive=args.adaptive or None) as client:
+        results = probe_tables(tables, client=client, concurrency=concurrency)
+
+    if args.json:
+        print(json.dumps({
+            table: {
+                'available': status.available,
+                'status_code': status.status_code,
+                'error': status.error,
+                'elapsed_ms': round(status.elapsed_ms, 1)
+            }
+            for table, status in results.items()
+        }, indent=2, ensure_ascii=False))
+    else:
+        print(f"🔎 Verificando {len(tables)} tabelas (concorrência: {concurrency})...\n")
+        for table, status in results.items():
+            if status.available:
+                print(f"✅ Tabela '{table}': Disponível ({status.elapsed_ms:.0f} ms)")
+            else:
+                print(f"❌ Tabela '{table}': {status.status_code or status.error}")
+
+    available = [table for table, status in results.items() if status.available]
+    if not args.json:
+        print(f"\n📊 Resumo:")
+        print(f"Tabelas disponíveis: {len(available)}/{len(tables)}")
+
+    return len(available) == len(tables)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
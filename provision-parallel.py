@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+🕸️ Provisionamento Paralelo de Schema
+Executa o DDL em paralelo respeitando as chaves estrangeiras: cada nível do grafo
+de dependências é enviado de uma vez e o tempo de cada comando é reportado
+"""
+
+import os
+import argparse
+
+from supabase_tools import (
+    get_admin_client, dependency_levels, run_ddl_parallel, split_statements,
+    tasks_from_schema, tasks_from_statements, NCISO_SCHEMA
+)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Executar DDL em paralelo, nível a nível do grafo de FKs')
+    parser.add_argument('--sql', help='Arquivo SQL a executar (padrão: tabelas do modelo Python)')
+    parser.add_argument('--workers', type=int, default=None, help='Comandos simultâneos por nível (padrão: pool do cliente)')
+    parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar os níveis, sem executar')
+    parser.add_argument('--top', type=int, default=5, help='Quantos comandos mais lentos listar')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if args.sql:
+        with open(args.sql, 'r') as f:
+            tasks = tasks_from_statements(split_statements(f.read()))
+        source = args.sql
+    else:
+        tasks = tasks_from_schema(NCISO_SCHEMA)
+        source = 'modelo NCISO_SCHEMA'
+
+    try:
+        levels = dependency_levels(tasks)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return False
+
+    print(f"🕸️ {len(tasks)} comando(s) de {source} em {len(levels)} nível(is)\n")
+    for number, level in enumerate(levels):
+        print(f"📋 Nível {number} ({len(level)}): {', '.join(task.label for task in level)}")
+
+    if args.dry_run:
+        return True
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("\n❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    print("\n🚀 Executando...")
+    report = run_ddl_parallel(tasks, get_admin_client(), max_workers=args.workers)
+
+    for result in report.results:
+        if result.success:
+            print(f"✅ [{result.level}] {result.task.label} - {result.elapsed_ms:.0f}ms")
+        elif result.skipped:
+            print(f"⏭️  [{result.level}] {result.task.label} - {result.error}")
+        else:
+            print(f"❌ [{result.level}] {result.task.label} - {result.status_code}: {result.error}")
+
+    print(f"\n📊 Resumo:")
+    print(f"Comandos executados: {len(report.results) - len(report.skipped)}")
+    print(f"Falhas: {len(report.failed)}")
+    print(f"Não enviados (dependência falhou): {len(report.skipped)}")
+    print(f"Tempo total: {report.elapsed_ms:.0f}ms")
+    print(f"Soma dos comandos (equivalente sequencial): {report.serial_ms:.0f}ms")
+
+    print(f"\n🐢 Mais lentos:")
+    for result in report.slowest(args.top):
+        print(f"   {result.elapsed_ms:8.0f}ms  {result.task.label}")
+
+    return report.success
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
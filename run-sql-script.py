@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+✂️ Executor de Scripts SQL Comando a Comando
+Divide os scripts (supabase-schema-ready.sql, docs/*.sql...) em comandos, envia cada
+um (ou lotes) ao exec_sql e reporta a latência e o local exato de cada erro
+"""
+
+import os
+import json
+import argparse
+
+from supabase_tools import get_admin_client
+from supabase_tools.sql import execute_statements, read_statements
+
+DEFAULT_SCRIPT = 'supabase-schema-ready.sql'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Executar scripts SQL comando a comando com relatório de tempo e erros')
+    parser.add_argument('files', nargs='*', default=[DEFAULT_SCRIPT], help=f'Arquivos SQL (padrão: {DEFAULT_SCRIPT})')
+    parser.add_argument('--batch-size', type=int, default=1, help='Comandos por chamada ao exec_sql (padrão: 1)')
+    parser.add_argument('--continue-on-error', action='store_true', help='Seguir para os próximos comandos após um erro')
+    parser.add_argument('--top', type=int, default=10, help='Quantos envios mais lentos listar')
+    parser.add_argument('--json', help='Salvar o relatório completo neste arquivo JSON')
+    parser.add_argument('--list', action='store_true', help='Apenas listar os comandos encontrados, sem executar')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def list_statements(files):
+    for path in files:
+        statements = list(read_statements(path))
+        print(f"📄 {path}: {len(statements)} comando(s)")
+        for statement in statements:
+            print(f"   {statement.line:5d}  {statement.summary}")
+    return True
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if args.list:
+        return list_statements(args.files)
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    client = get_admin_client()
+    all_ok = True
+    reports = {}
+
+    for path in args.files:
+        print(f"\n🚀 Executando {path} (lotes de {args.batch_size})...")
+        report = execute_statements(read_statements(path), client, batch_size=args.batch_size,
+                                    stop_on_error=not args.continue_on_error)
+        reports[path] = report.to_dict()
+
+        for result in report.failures:
+            print(f"❌ {result.statement.location}: {result.statement.summary}")
+            print(f"   {result.status_code}: {result.error}")
+
+        print(f"📊 {report.statement_count} comando(s) aplicados em {report.elapsed_ms:.0f}ms"
+              f" - {len(report.failures)} erro(s)")
+
+        print(f"🐢 Envios mais lentos:")
+        for result in report.slowest(args.top):
+            count = f" (+{len(result.statements) - 1})" if len(result.statements) > 1 else ''
+            print(f"   {result.elapsed_ms:8.0f}ms  {result.statement.location}  {result.statement.summary[:50]}{count}")
+
+        all_ok = all_ok and report.success
+        if not report.success and not args.continue_on_error:
+            break
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Relatório salvo em: {args.json}")
+
+    return all_ok
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
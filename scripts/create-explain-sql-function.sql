@@ -0,0 +1,30 @@
+-- =====================================================
+-- Função para Capturar Planos de Execução via RPC
+-- Complementa rpc/exec_sql e rpc/query_sql: roda EXPLAIN (ANALYZE, BUFFERS,
+-- FORMAT JSON) de um SELECT e devolve o plano em JSON
+-- Usada por capture-plans.py (supabase_tools/plans.py)
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION explain_sql(sql TEXT, analyze BOOLEAN DEFAULT true)
+RETURNS JSONB AS $$
+DECLARE
+  plan JSON;
+BEGIN
+  -- EXPLAIN ANALYZE executa a consulta: apenas leituras
+  IF sql !~* '^\s*select\s' THEN
+    RAISE EXCEPTION 'explain_sql aceita apenas SELECT';
+  END IF;
+  PERFORM set_config('statement_timeout', '60s', true);
+  EXECUTE format('EXPLAIN (ANALYZE %s, BUFFERS %s, FORMAT JSON) %s', analyze, analyze, sql)
+    INTO plan;
+  RETURN plan::jsonb;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = public;
+
+-- Apenas a service role pode executar SQL arbitrário
+REVOKE ALL ON FUNCTION explain_sql(TEXT, BOOLEAN) FROM PUBLIC;
+REVOKE ALL ON FUNCTION explain_sql(TEXT, BOOLEAN) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION explain_sql(TEXT, BOOLEAN) TO service_role;
+
+SELECT '✅ Função explain_sql criada com sucesso!' as status;
@@ -0,0 +1,24 @@
+-- =====================================================
+-- Função para Consultas de Leitura via RPC
+-- Complementa rpc/exec_sql: executa um SELECT e devolve as linhas em JSON
+-- Usada pelas ferramentas Python (supabase_tools) para ler o catálogo
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION query_sql(sql TEXT)
+RETURNS JSONB AS $$
+DECLARE
+  result JSONB;
+BEGIN
+  EXECUTE format('SELECT COALESCE(jsonb_agg(q), ''[]''::jsonb) FROM (%s) q', sql)
+    INTO result;
+  RETURN result;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = public;
+
+-- Apenas a service role pode executar SQL arbitrário
+REVOKE ALL ON FUNCTION query_sql(TEXT) FROM PUBLIC;
+REVOKE ALL ON FUNCTION query_sql(TEXT) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION query_sql(TEXT) TO service_role;
+
+SELECT '✅ Função query_sql criada com sucesso!' as status;
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+"""
+🌱 Carga de Dados Sintéticos Multi-tenant
+Gera dados determinísticos (mesma semente = mesmos dados) para todas as tabelas
+do n.ISMS e grava via POSTs em massa do PostgREST, em paralelo por tenant
+"""
+
+import os
+import json
+import argparse
+from datetime import date
+
+from supabase_tools import get_admin_client, SeedConfig, seed_tenants, tenant_rows
+
+def parse_args():
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(description='Gerar e gravar dados sintéticos determinísticos por tenant')
+    parser.add_argument('--tenants', type=int, default=defaults.tenants, help=f'Quantidade de tenants (padrão: {defaults.tenants})')
+    parser.add_argument('--depth', type=int, default=defaults.depth, help=f'Níveis da árvore de organizações (padrão: {defaults.depth})')
+    parser.add_argument('--fanout', type=int, default=defaults.fanout, help=f'Filhas por organização (padrão: {defaults.fanout})')
+    parser.add_argument('--assets-per-org', type=int, default=defaults.assets_per_org, help=f'Ativos por organização (padrão: {defaults.assets_per_org})')
+    parser.add_argument('--teams-per-org', type=int, default=defaults.teams_per_org, help=f'Equipes por organização (padrão: {defaults.teams_per_org})')
+    parser.add_argument('--users', type=int, default=defaults.users_per_tenant, help=f'Usuários distintos por tenant (padrão: {defaults.users_per_tenant})')
+    parser.add_argument('--credentials-per-asset', type=float, default=defaults.credentials_per_asset, help=f'Credenciais por ativo em média (padrão: {defaults.credentials_per_asset})')
+    parser.add_argument('--privileged', type=int, default=defaults.privileged_per_tenant, help=f'Acessos privilegiados por tenant (padrão: {defaults.privileged_per_tenant})')
+    parser.add_argument('--evaluations', type=int, default=defaults.evaluations_per_tenant, help=f'Avaliações por tenant (padrão: {defaults.evaluations_per_tenant})')
+    parser.add_argument('--documents', type=int, default=defaults.documents_per_tenant, help=f'Documentos técnicos por tenant (padrão: {defaults.documents_per_tenant})')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help=f'Semente do gerador (padrão: {defaults.seed})')
+    parser.add_argument('--reference-date', type=date.fromisoformat, default=None, help='Data de referência AAAA-MM-DD para as janelas de validade (padrão: hoje)')
+    parser.add_argument('--tenant-prefix', default=defaults.tenant_prefix, help=f'Prefixo do tenant_id (padrão: {defaults.tenant_prefix})')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Linhas por POST (padrão: 5000)')
+    parser.add_argument('--workers', type=int, default=None, help='Tenants gravados em paralelo (padrão: pool do cliente)')
+    parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar os volumes e uma linha de exemplo por tabela')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def build_config(args):
+    return SeedConfig(
+        tenants=args.tenants,
+        depth=args.depth,
+        fanout=args.fanout,
+        assets_per_org=args.assets_per_org,
+        teams_per_org=args.teams_per_org,
+        users_per_tenant=args.users,
+        credentials_per_asset=args.credentials_per_asset,
+        privileged_per_tenant=args.privileged,
+        evaluations_per_tenant=args.evaluations,
+        documents_per_tenant=args.documents,
+        seed=args.seed,
+        reference_date=args.reference_date,
+        tenant_prefix=args.tenant_prefix,
+    )
+
+def show_samples(config):
+    print(f"\n🔎 Exemplo ({config.tenant_id(0)}):")
+    for table, rows in tenant_rows(config, 0):
+        if rows:
+            print(f"\n📋 {table}:")
+            print(json.dumps(rows[0], indent=2, ensure_ascii=False))
+    return True
+
+def main():
+    args = parse_args()
+    load_env()
+    config = build_config(args)
+
+    expected = config.expected_rows()
+    print(f"🌱 Semente {config.seed}, {config.tenants} tenant(s), referência {config.now.date()}")
+    print(f"🌳 {config.orgs_per_tenant} organização(ões) por tenant (profundidade {config.depth}, {config.fanout} filhas)\n")
+    for table, count in expected.items():
+        print(f"   {table:<22}{count:>12,}")
+    print(f"   {'total':<22}{sum(expected.values()):>12,}")
+
+    if args.dry_run:
+        return show_samples(config)
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    client = get_admin_client()
+    done = []
+
+    def progress(result):
+        done.append(result)
+        icon = '✅' if result.success else '❌'
+        rows = sum(result.rows.values())
+        print(f"{icon} [{len(done)}/{config.tenants}] {result.tenant_id}: {rows:,} linhas"
+              f" em {result.requests} POST(s), {result.elapsed_ms / 1000:.1f}s")
+        if not result.success:
+            print(f"   {result.table} ({result.status_code}): {result.error}")
+
+    print(f"\n🚀 Gravando em lotes de {args.batch_size}...")
+    report = seed_tenants(config, client, batch_size=args.batch_size, max_workers=args.workers,
+                          on_result=progress)
+
+    print(f"\n📊 Resumo:")
+    for table, count in report.rows.items():
+        print(f"{table}: {count:,}")
+    print(f"Total: {report.total_rows:,} linhas em {report.elapsed_ms / 1000:.1f}s"
+          f" ({report.rows_per_second:,.0f} linhas/s)")
+    print(f"Tenants com erro: {len(report.failures)}")
+
+    return report.success
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
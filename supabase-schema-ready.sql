@@ -20,7 +20,7 @@ CREATE TABLE IF NOT EXISTS organizations (
 );
 
 -- Índices para organizations
-CREATE INDEX IF NOT EXISTS idx_organizations_tenant_id ON organizations(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_organizations_tenant_id_created_at_id ON organizations(tenant_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_organizations_parent_id ON organizations(parent_id);
 CREATE INDEX IF NOT EXISTS idx_organizations_type ON organizations(type);
 CREATE INDEX IF NOT EXISTS idx_organizations_is_active ON organizations(is_active);
@@ -59,7 +59,7 @@ CREATE TABLE IF NOT EXISTS assets (
 );
 
 -- Índices para assets
-CREATE INDEX IF NOT EXISTS idx_assets_tenant_id ON assets(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_assets_tenant_id_created_at_id ON assets(tenant_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_assets_organization_id ON assets(organization_id);
 CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(type);
 CREATE INDEX IF NOT EXISTS idx_assets_is_active ON assets(is_active);
@@ -101,7 +101,7 @@ CREATE TABLE IF NOT EXISTS evaluations (
 );
 
 -- Índices para evaluations
-CREATE INDEX IF NOT EXISTS idx_evaluations_tenant_id ON evaluations(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_evaluations_tenant_id_created_at_id ON evaluations(tenant_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_evaluations_status ON evaluations(status);
 CREATE INDEX IF NOT EXISTS idx_evaluations_start_date ON evaluations(start_date);
 
@@ -144,7 +144,7 @@ CREATE TABLE IF NOT EXISTS technical_documents (
 );
 
 -- Índices para technical_documents
-CREATE INDEX IF NOT EXISTS idx_technical_documents_tenant_id ON technical_documents(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_technical_documents_tenant_id_created_at_id ON technical_documents(tenant_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_technical_documents_document_type ON technical_documents(document_type);
 CREATE INDEX IF NOT EXISTS idx_technical_documents_status ON technical_documents(status);
 CREATE INDEX IF NOT EXISTS idx_technical_documents_scope_id ON technical_documents(scope_id);
@@ -178,7 +178,7 @@ CREATE TABLE IF NOT EXISTS teams (
 );
 
 -- Índices para teams
-CREATE INDEX IF NOT EXISTS idx_teams_tenant_id ON teams(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_teams_tenant_id_created_at_id ON teams(tenant_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_teams_organization_id ON teams(organization_id);
 CREATE INDEX IF NOT EXISTS idx_teams_is_active ON teams(is_active);
 
@@ -220,7 +220,7 @@ CREATE TABLE IF NOT EXISTS credentials_registry (
 );
 
 -- Índices para credentials_registry
-CREATE INDEX IF NOT EXISTS idx_credentials_registry_tenant_id ON credentials_registry(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_credentials_registry_tenant_id_created_at_id ON credentials_registry(tenant_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_credentials_registry_asset_id ON credentials_registry(asset_id);
 CREATE INDEX IF NOT EXISTS idx_credentials_registry_holder_type ON credentials_registry(holder_type);
 CREATE INDEX IF NOT EXISTS idx_credentials_registry_status ON credentials_registry(status);
@@ -266,7 +266,7 @@ CREATE TABLE IF NOT EXISTS privileged_access (
 );
 
 -- Índices para privileged_access
-CREATE INDEX IF NOT EXISTS idx_privileged_access_tenant_id ON privileged_access(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_privileged_access_tenant_id_created_at_id ON privileged_access(tenant_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_privileged_access_user_id ON privileged_access(user_id);
 CREATE INDEX IF NOT EXISTS idx_privileged_access_scope_type ON privileged_access(scope_type);
 CREATE INDEX IF NOT EXISTS idx_privileged_access_status ON privileged_access(status);
@@ -0,0 +1,117 @@
+"""
+🛠️ Ferramentas Python compartilhadas do n.CISO para o Supabase/PostgREST
+"""
+
+from .client import SupabaseClient, get_client, get_admin_client, reset_client, RETURN_MINIMAL, RETURN_REPRESENTATION
+from .catalog import LiveCatalog, fetch_catalog
+from .clone import CloneReport, clone_tenant
+from .concurrency import AdaptiveLimiter, run_bulk
+from .ddl import DDLTask, dependency_levels, run_ddl_parallel, tasks_from_schema, tasks_from_statements
+from .export import ExportReport, export_table, iter_pages
+from .fake_postgrest import FakePostgREST
+from .histogram import LatencyHistogram
+from .importer import ImportReport, import_file, iter_records, validate_record
+from .index_advisor import IndexAdvice, advise_indexes, apply_index_advice, load_advice
+from .introspection import SchemaIntrospector
+from .load import LoadReport, run_load, run_steps
+from .migrations import Migration, MigrationRunner, migrations_from_directory, migrations_from_schema
+from .pagination import TablePagination, benchmark_pagination, fetch_keyset_page
+from .plans import HOT_QUERIES, capture_plans, diff_plans
+from .probe import TableStatus, probe_tables, probe_tables_async, tables_from_sql
+from .rls import benchmark_policies, compare_files, lint_file, parse_policies, rewrite_file
+from .rls_overhead import TableOverhead, benchmark_rls_overhead
+from .schema import Column, ForeignKey, Index, Partitioning, Schema, Table, Trigger, render_cached, render_tables
+from .seed import SeedConfig, SeedReport, seed_tenants, tenant_rows
+from .schema_diff import SchemaChange, SchemaDiff, diff_schema, plan_schema_changes
+from .sql import error_message, execute_statements, read_statements, split_statements
+from .tables import NCISO_SCHEMA
+from .testdata import TestRun, count_orphans, delete_ids, sweep_orphans
+from .timing import TimingRecorder
+from .tokens import tenant_client, tenant_token
+
+__all__ = [
+    'SupabaseClient',
+    'get_client',
+    'get_admin_client',
+    'reset_client',
+    'RETURN_MINIMAL',
+    'RETURN_REPRESENTATION',
+    'LiveCatalog',
+    'fetch_catalog',
+    'CloneReport',
+    'clone_tenant',
+    'AdaptiveLimiter',
+    'run_bulk',
+    'DDLTask',
+    'dependency_levels',
+    'run_ddl_parallel',
+    'tasks_from_schema',
+    'tasks_from_statements',
+    'ExportReport',
+    'export_table',
+    'iter_pages',
+    'FakePostgREST',
+    'LatencyHistogram',
+    'ImportReport',
+    'import_file',
+    'iter_records',
+    'validate_record',
+    'IndexAdvice',
+    'advise_indexes',
+    'apply_index_advice',
+    'load_advice',
+    'SchemaIntrospector',
+    'LoadReport',
+    'run_load',
+    'run_steps',
+    'Migration',
+    'MigrationRunner',
+    'migrations_from_directory',
+    'migrations_from_schema',
+    'TablePagination',
+    'benchmark_pagination',
+    'fetch_keyset_page',
+    'HOT_QUERIES',
+    'capture_plans',
+    'diff_plans',
+    'TableStatus',
+    'probe_tables',
+    'probe_tables_async',
+    'tables_from_sql',
+    'benchmark_policies',
+    'compare_files',
+    'lint_file',
+    'parse_policies',
+    'rewrite_file',
+    'TableOverhead',
+    'benchmark_rls_overhead',
+    'Column',
+    'ForeignKey',
+    'Index',
+    'Partitioning',
+    'Schema',
+    'Table',
+    'Trigger',
+    'render_cached',
+    'render_tables',
+    'NCISO_SCHEMA',
+    'TestRun',
+    'count_orphans',
+    'delete_ids',
+    'sweep_orphans',
+    'TimingRecorder',
+    'tenant_client',
+    'tenant_token',
+    'SchemaChange',
+    'SchemaDiff',
+    'diff_schema',
+    'plan_schema_changes',
+    'SeedConfig',
+    'SeedReport',
+    'seed_tenants',
+    'tenant_rows',
+    'error_message',
+    'execute_statements',
+    'read_statements',
+    'split_statements',
+]
@@ -0,0 +1,138 @@
+"""
+🗂️ Catálogo ao vivo do Postgres
+Lê colunas, índices, CHECKs, chaves estrangeiras e triggers do schema public
+em uma única consulta (rpc/query_sql) e organiza o resultado por tabela.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from .client import get_admin_client
+
+CATALOG_SQL = """
+SELECT 'column' AS kind, c.relname AS table_name, a.attname AS name,
+       format_type(a.atttypid, a.atttypmod) AS definition,
+       a.attnotnull AS not_null
+FROM pg_attribute a
+JOIN pg_class c ON c.oid = a.attrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+  AND a.attnum > 0 AND NOT a.attisdropped
+UNION ALL
+SELECT 'index', tablename, indexname, indexdef, NULL
+FROM pg_indexes
+WHERE schemaname = 'public'
+UNION ALL
+SELECT CASE con.contype WHEN 'c' THEN 'check' ELSE 'foreign_key' END,
+       c.relname, con.conname, pg_get_constraintdef(con.oid), NULL
+FROM pg_constraint con
+JOIN pg_class c ON c.oid = con.conrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = 'public' AND con.contype IN ('c', 'f')
+UNION ALL
+SELECT 'trigger', c.relname, t.tgname, NULL, NULL
+FROM pg_trigger t
+JOIN pg_class c ON c.oid = t.tgrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = 'public' AND NOT t.tgisinternal
+"""
+
+# Tipos do modelo -> nome canônico devolvido por format_type()
+_TYPE_ALIASES = (
+    (r'^VARCHAR\((\d+)\)$', r'character varying(\1)'),
+    (r'^DECIMAL\((\d+),\s*(\d+)\)$', r'numeric(\1,\2)'),
+    (r'^TIMESTAMP WITH TIME ZONE$', 'timestamp with time zone'),
+    (r'^TIMESTAMPTZ$', 'timestamp with time zone'),
+    (r'^INT(EGER)?$', 'integer'),
+    (r'^BOOL(EAN)?$', 'boolean'),
+)
+
+_QUOTED_VALUE_RE = re.compile(r"'((?:[^']|'')*)'")
+_FK_RE = re.compile(r'FOREIGN KEY \((\w+)\) REFERENCES (\w+)\((\w+)\)', re.IGNORECASE)
+_CHECK_COLUMN_RE = re.compile(r'\(+\s*"?(\w+)"?\s*\)?(?:::\w+(?:\s+\w+)*)?\s*(?:=\s*ANY|IN)\b', re.IGNORECASE)
+
+
+def normalize_type(sql_type: str) -> str:
+    """Forma canônica de um tipo SQL para comparação com o catálogo"""
+    value = ' '.join(sql_type.strip().split())
+    upper = value.upper()
+    for pattern, replacement in _TYPE_ALIASES:
+        if re.match(pattern, upper):
+            return re.sub(pattern, replacement, upper).lower()
+    return value.lower()
+
+
+def check_values(definition: str):
+    """Valores permitidos em um CHECK do tipo `col IN (...)` / `= ANY (ARRAY[...])`"""
+    return tuple(value.replace("''", "'") for value in _QUOTED_VALUE_RE.findall(definition))
+
+
+def check_column(definition: str) -> Optional[str]:
+    match = _CHECK_COLUMN_RE.search(definition)
+    return match.group(1) if match else None
+
+
+@dataclass
+class LiveColumn:
+    name: str
+    type: str
+    not_null: bool
+
+
+@dataclass
+class LiveTable:
+    name: str
+    columns: Dict[str, LiveColumn] = field(default_factory=dict)
+    indexes: Dict[str, str] = field(default_factory=dict)
+    checks: Dict[str, str] = field(default_factory=dict)
+    foreign_keys: Dict[str, str] = field(default_factory=dict)
+    triggers: set = field(default_factory=set)
+
+    def check_for_column(self, column: str):
+        """(nome, definição) do CHECK que restringe a coluna, se houver"""
+        for name, definition in self.checks.items():
+            if check_column(definition) == column:
+                return name, definition
+        return None
+
+    def foreign_key_for_column(self, column: str):
+        for name, definition in self.foreign_keys.items():
+            match = _FK_RE.search(definition)
+            if match and match.group(1) == column:
+                return name, match.group(2), match.group(3)
+        return None
+
+
+@dataclass
+class LiveCatalog:
+    tables: Dict[str, LiveTable] = field(default_factory=dict)
+
+    def table(self, name: str) -> Optional[LiveTable]:
+        return self.tables.get(name)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> 'LiveCatalog':
+        catalog = cls()
+        for row in rows:
+            table = catalog.tables.setdefault(row['table_name'], LiveTable(row['table_name']))
+            kind, name, definition = row['kind'], row['name'], row.get('definition')
+            if kind == 'column':
+                table.columns[name] = LiveColumn(name, definition, bool(row.get('not_null')))
+            elif kind == 'index':
+                table.indexes[name] = definition
+            elif kind == 'check':
+                table.checks[name] = definition
+            elif kind == 'foreign_key':
+                table.foreign_keys[name] = definition
+            elif kind == 'trigger':
+                table.triggers.add(name)
+        # Descartar relações que não são tabelas (ex.: triggers em views)
+        catalog.tables = {name: t for name, t in catalog.tables.items() if t.columns}
+        return catalog
+
+
+def fetch_catalog(client=None) -> LiveCatalog:
+    """Ler o catálogo atual em uma única chamada"""
+    client = client or get_admin_client()
+    return LiveCatalog.from_rows(client.query_sql(CATALOG_SQL))
@@ -0,0 +1,255 @@
+"""
+🔌 Cliente PostgREST compartilhado
+Sessão HTTP única com keep-alive, pool de conexões, timeouts por requisição
+e HTTP/2 opcional (via httpx, se instalado) para todos os scripts do n.CISO.
+
+Configuração via ambiente:
+    SUPABASE_URL, SUPABASE_ANON_KEY   credenciais (como nos scripts existentes)
+    SUPABASE_SERVICE_ROLE_KEY         usada por get_admin_client() (catálogo/DDL)
+    SUPABASE_HTTP_POOL_SIZE           conexões mantidas por host (padrão: 10)
+    SUPABASE_HTTP_TIMEOUT             timeout de leitura em segundos (padrão: 30)
+    SUPABASE_HTTP_CONNECT_TIMEOUT     timeout de conexão em segundos (padrão: 5)
+    SUPABASE_HTTP2                    "1" para usar HTTP/2 quando disponível
+    SUPABASE_HTTP_ADAPTIVE            "1" para limitar a concorrência com AIMD
+                                      (backoff em 429/503 e Retry-After)
+    SUPABASE_HTTP_MAX_RETRIES         novas tentativas após 429/503 (padrão: 5)
+    SUPABASE_HTTP_TIMING              "1" para medir as fases de cada requisição
+                                      (DNS, TCP, TLS, TTFB, transferência) e
+                                      imprimir a tabela por endpoint ao sair;
+                                      um caminho .json grava também o JSON
+"""
+
+import os
+import time
+import warnings
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 é opcional
+    httpx = None
+
+from .concurrency import AdaptiveLimiter, OVERLOAD_STATUS_CODES, parse_retry_after
+from .timing import TimedHTTPAdapter, TimingRecorder, parse_server_timing, shared_recorder
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 5
+
+RETURN_REPRESENTATION = 'return=representation'
+RETURN_MINIMAL = 'return=minimal'
+
+
+def _env_flag(name):
+    return os.getenv(name, '').strip().lower() in ('1', 'true', 'yes', 'sim')
+
+
+class SupabaseClient:
+    """Cliente REST do Supabase com conexões reaproveitadas entre chamadas"""
+
+    def __init__(self, url=None, key=None, *, pool_size=None, timeout=None,
+                 connect_timeout=None, http2=None, limiter=None, adaptive=None,
+                 max_retries=None, access_token=None, timing=None):
+        self.url = (url or os.getenv('SUPABASE_URL') or '').rstrip('/')
+        self.key = key or os.getenv('SUPABASE_ANON_KEY')
+        self.rest_url = f"{self.url}/rest/v1"
+
+        self.pool_size = int(pool_size or os.getenv('SUPABASE_HTTP_POOL_SIZE') or DEFAULT_POOL_SIZE)
+        read_timeout = float(timeout or os.getenv('SUPABASE_HTTP_TIMEOUT') or DEFAULT_READ_TIMEOUT)
+        connect_timeout = float(connect_timeout or os.getenv('SUPABASE_HTTP_CONNECT_TIMEOUT') or DEFAULT_CONNECT_TIMEOUT)
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.headers = {
+            'apikey': self.key or '',
+            # JWT de usuário/tenant (RLS) no lugar da chave, se informado
+            'Authorization': f'Bearer {access_token or self.key}',
+            'Content-Type': 'application/json'
+        }
+
+        # Limitador AIMD opcional compartilhado por todas as requisições
+        if limiter is None:
+            if adaptive is None:
+                adaptive = _env_flag('SUPABASE_HTTP_ADAPTIVE')
+            if adaptive:
+                limiter = AdaptiveLimiter(max_limit=self.pool_size)
+        self.limiter = limiter
+        self.max_retries = int(max_retries if max_retries is not None
+                               else os.getenv('SUPABASE_HTTP_MAX_RETRIES') or DEFAULT_MAX_RETRIES)
+
+        # Fases por requisição: True (registro próprio), um TimingRecorder ou o ambiente
+        if timing is None:
+            setting = os.getenv('SUPABASE_HTTP_TIMING', '').strip()
+            if _env_flag('SUPABASE_HTTP_TIMING') or setting.endswith('.json'):
+                timing = shared_recorder(setting if setting.endswith('.json') else None)
+        elif timing is True:
+            timing = TimingRecorder()
+        self.timings = timing or None
+
+        if http2 is None:
+            http2 = _env_flag('SUPABASE_HTTP2')
+        self.http2 = False
+        self._session = None
+        if http2:
+            self._session = self._build_http2_session()
+        if self._session is None:
+            self._session = self._build_session()
+
+    def _build_session(self):
+        session = requests.Session()
+        adapter_class = TimedHTTPAdapter if self.timings else HTTPAdapter
+        adapter = adapter_class(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def _build_http2_session(self):
+        if httpx is None:
+            # warnings (e não print): aparece uma vez por processo, não a cada cliente
+            warnings.warn("HTTP/2 solicitado mas httpx não está instalado - usando HTTP/1.1", RuntimeWarning)
+            return None
+        try:
+            session = httpx.Client(
+                http2=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=self.pool_size,
+                                    max_keepalive_connections=self.pool_size),
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+            )
+        except ImportError:
+            # httpx sem o pacote h2
+            warnings.warn("HTTP/2 solicitado mas o pacote h2 não está instalado - usando HTTP/1.1", RuntimeWarning)
+            return None
+        self.http2 = True
+        return session
+
+    def endpoint(self, path):
+        """URL absoluta para um caminho relativo a /rest/v1"""
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.rest_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, *, params=None, json=None, data=None,
+                headers=None, prefer=None, timeout=None):
+        extra_headers = dict(headers or {})
+        if prefer:
+            extra_headers['Prefer'] = prefer
+
+        if timeout is None:
+            timeout = self.timeout
+        elif not isinstance(timeout, tuple):
+            timeout = (self.timeout[0], timeout)
+
+        kwargs = {'params': params, 'json': json, 'headers': extra_headers or None}
+        if self.http2:
+            kwargs['content'] = data
+            kwargs['timeout'] = httpx.Timeout(timeout[1], connect=timeout[0])
+        else:
+            kwargs['data'] = data
+            kwargs['timeout'] = timeout
+
+        url = self.endpoint(path)
+        if self.limiter is None:
+            return self._send(method, url, kwargs)
+        return self._limited_request(method, url, kwargs)
+
+    def _send(self, method, url, kwargs):
+        if self.timings is None:
+            return self._session.request(method, url, **kwargs)
+        with self.timings.track(method, url) as timing:
+            if self.http2:
+                kwargs = {**kwargs, 'extensions': {'trace': timing.trace}}
+            response = self._session.request(method, url, **kwargs)
+            timing.status = response.status_code
+            timing.server = parse_server_timing(response.headers.get('Server-Timing'))
+            return response
+
+    def _limited_request(self, method, url, kwargs):
+        """Requisição passando pelo limitador, com nova tentativa em 429/503"""
+        attempt = 0
+        while True:
+            with self.limiter.slot():
+                started = time.monotonic()
+                response = self._send(method, url, kwargs)
+                latency = time.monotonic() - started
+
+            if response.status_code not in OVERLOAD_STATUS_CODES:
+                self.limiter.on_success(latency)
+                return response
+
+            self.limiter.on_overload(parse_retry_after(response.headers.get('Retry-After')))
+            attempt += 1
+            if attempt > self.max_retries:
+                return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def rpc(self, function_name, payload=None, **kwargs):
+        """Chamar uma função Postgres exposta em /rest/v1/rpc/<nome>"""
+        return self.post(f"rpc/{function_name}", json=payload or {}, **kwargs)
+
+    def exec_sql(self, sql, **kwargs):
+        """Executar SQL via a função rpc/exec_sql"""
+        return self.rpc('exec_sql', {'sql': sql}, **kwargs)
+
+    def query_sql(self, sql, **kwargs):
+        """Executar um SELECT via rpc/query_sql e devolver as linhas
+
+        Requer a função de scripts/create-query-sql-function.sql.
+        """
+        response = self.rpc('query_sql', {'sql': sql}, **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"query_sql falhou ({response.status_code}): {response.text}")
+        return response.json() or []
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_default_client = None
+_admin_client = None
+
+
+def get_client():
+    """Cliente compartilhado do processo (mesmo pool para todas as funções)"""
+    global _default_client
+    if _default_client is None:
+        _default_client = SupabaseClient()
+    return _default_client
+
+
+def get_admin_client():
+    """Cliente com a service role key (se configurada) para catálogo e DDL"""
+    global _admin_client
+    if _admin_client is None:
+        service_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+        _admin_client = SupabaseClient(key=service_key) if service_key else get_client()
+    return _admin_client
+
+
+def reset_client():
+    """Descartar os clientes compartilhados (ex.: após recarregar o .env)"""
+    global _default_client, _admin_client
+    for client in {id(c): c for c in (_default_client, _admin_client) if c is not None}.values():
+        client.close()
+    _default_client = None
+    _admin_client = None
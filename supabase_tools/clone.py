@@ -0,0 +1,275 @@
+"""
+🧬 Clonagem de tenants
+Copia todas as linhas de um tenant de origem para um novo tenant_id, nível a
+nível do grafo de chaves estrangeiras (tabelas do mesmo nível em paralelo).
+
+Os novos ids são derivados de forma determinística (uuid5 do tenant de destino
++ id original), então as chaves estrangeiras são remapeadas sem manter um mapa
+em memória: `assets.organization_id` recebe o mesmo uuid5 que a organização
+copiada recebeu. Pelo mesmo motivo a clonagem pode ser repetida — as linhas já
+copiadas são ignoradas (`resolution=ignore-duplicates`) e apenas o restante é
+gravado.
+
+Ao clonar só algumas tabelas, as tabelas que elas referenciam (FKs e
+SOFT_REFERENCES) entram na seleção automaticamente: sem elas, as referências
+remapeadas apontariam para linhas que nunca foram copiadas.
+
+Cada tabela é lida com paginação keyset e dividida em fatias do espaço de
+UUIDs lidas em paralelo. Tabelas com auto-referência (organizations.parent_id)
+são carregadas inteiras e gravadas em ordem de profundidade.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .client import get_admin_client, RETURN_MINIMAL
+from .concurrency import run_bulk
+from .ddl import DDLTask, dependency_levels
+from .export import KEYSETS, iter_pages
+from .schema import Schema, Table
+from .seed import IGNORE_DUPLICATES
+from .sql import error_message
+from .tables import NCISO_SCHEMA
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_SLICES = 8
+TENANT_COLUMN = 'tenant_id'
+
+# Referências sem FK declarada: (tabela, coluna) -> (tabela referenciada, condição na linha)
+SOFT_REFERENCES: Dict[Tuple[str, str], Tuple[str, Callable[[dict], bool]]] = {
+    ('credentials_registry', 'holder_id'): ('teams', lambda row: row.get('holder_type') == 'team'),
+}
+
+
+def clone_id(target_tenant: str, source_id) -> Optional[str]:
+    """Id da cópia: o mesmo para o mesmo (tenant de destino, id de origem)"""
+    if source_id is None:
+        return None
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"nciso:{target_tenant}:{source_id}"))
+
+
+def id_slices(count: int) -> List[Optional[str]]:
+    """Filtros `and=(id.gte.X,id.lt.Y)` que dividem o espaço de UUIDs em `count` fatias"""
+    count = max(1, min(count, 256))
+    if count == 1:
+        return [None]
+    bounds = [f"{(256 * number) // count:02x}000000-0000-0000-0000-000000000000" for number in range(count)]
+    slices = []
+    for number, lower in enumerate(bounds):
+        if number + 1 < count:
+            slices.append(f"(id.gte.{lower},id.lt.{bounds[number + 1]})")
+        else:
+            slices.append(f"(id.gte.{lower})")
+    return slices
+
+
+def table_levels(schema: Schema) -> List[List[Table]]:
+    """Tabelas agrupadas por nível de dependência de chaves estrangeiras"""
+    tasks = [DDLTask(table.name, '', table.dependencies, label=table.name) for table in schema.tables]
+    return [[schema.table(task.key) for task in level] for level in dependency_levels(tasks)]
+
+
+def _referenced(table: Table) -> List[str]:
+    """Tabelas referenciadas por FK ou por SOFT_REFERENCES"""
+    names = [fk.table for _, fk in table.foreign_keys]
+    names += [target for (table_name, _), (target, _) in SOFT_REFERENCES.items() if table_name == table.name]
+    return [name for name in dict.fromkeys(names) if name != table.name]
+
+
+def clone_selection(schema: Schema = NCISO_SCHEMA, tables: Optional[Iterable[str]] = None) -> set:
+    """Tabelas pedidas mais, transitivamente, as que elas referenciam"""
+    selected = set(tables) if tables else set(schema.table_names)
+    pending = list(selected)
+    while pending:
+        table = schema.table(pending.pop())
+        for name in (_referenced(table) if table else ()):
+            if name not in selected and schema.table(name):
+                selected.add(name)
+                pending.append(name)
+    return selected
+
+
+def remap_row(table: Table, row: dict, target_tenant: str, selected: Optional[set] = None) -> dict:
+    """Linha para o tenant de destino, com id e referências remapeados
+
+    Só são remapeadas as referências a tabelas em `selected` (todas, se None):
+    as demais continuam apontando para a linha original.
+    """
+    copy = dict(row)
+    copy[TENANT_COLUMN] = target_tenant
+    if 'id' in copy:
+        copy['id'] = clone_id(target_tenant, row['id'])
+    for name, fk in table.foreign_keys:
+        if name in copy and (selected is None or fk.table in selected):
+            copy[name] = clone_id(target_tenant, row[name])
+    for (table_name, name), (target, applies) in SOFT_REFERENCES.items():
+        if table_name == table.name and name in copy and applies(row) and (selected is None or target in selected):
+            copy[name] = clone_id(target_tenant, row[name])
+    return copy
+
+
+def _depth_order(table: Table, rows: List[dict]) -> List[dict]:
+    """Pais antes dos filhos numa tabela com auto-referência"""
+    self_columns = [name for name, fk in table.foreign_keys if fk.table == table.name]
+    by_id = {row['id']: row for row in rows}
+    depth: Dict[str, int] = {}
+
+    def depth_of(row, seen=()):
+        if row['id'] in depth:
+            return depth[row['id']]
+        parents = [by_id.get(row.get(name)) for name in self_columns]
+        parents = [parent for parent in parents if parent is not None and parent['id'] not in seen]
+        value = 1 + max((depth_of(parent, seen + (row['id'],)) for parent in parents), default=-1)
+        depth[row['id']] = value
+        return value
+
+    return sorted(rows, key=depth_of)
+
+
+@dataclass
+class TableCloneResult:
+    table: str
+    level: int
+    rows: int = 0
+    requests: int = 0
+    elapsed_ms: float = 0.0
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    skipped: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+@dataclass
+class CloneReport:
+    source: str
+    target: str
+    results: List[TableCloneResult] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(result.success for result in self.results)
+
+    @property
+    def rows(self) -> int:
+        return sum(result.rows for result in self.results)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / (self.elapsed_ms / 1000) if self.elapsed_ms else 0.0
+
+
+class _TableCloner:
+    def __init__(self, client, table: Table, level: int, source: str, target: str,
+                 batch_size: int, slices: int, selected: Optional[set] = None):
+        self.client = client
+        self.table = table
+        self.source = source
+        self.target = target
+        self.batch_size = batch_size
+        self.slices = slices
+        self.selected = selected
+        self.result = TableCloneResult(table.name, level)
+        self.lock = threading.Lock()
+
+    def insert(self, rows: List[dict]) -> bool:
+        if not rows or self.result.error:
+            return not self.result.error
+        try:
+            response = self.client.post(self.table.name, json=rows,
+                                        prefer=f"{RETURN_MINIMAL},{IGNORE_DUPLICATES}")
+        except Exception as e:
+            response, error = None, str(e)
+        # Várias fatias gravam ao mesmo tempo no mesmo resultado
+        with self.lock:
+            if response is None:
+                self.result.error = self.result.error or error
+                return False
+            self.result.requests += 1
+            if response.status_code not in (200, 201, 204):
+                self.result.status_code = response.status_code
+                self.result.error = self.result.error or error_message(response)
+                return False
+            self.result.rows += len(rows)
+        return True
+
+    def pages(self, slice_filter: Optional[str] = None) -> Iterable[List[dict]]:
+        filters = {TENANT_COLUMN: f"eq.{self.source}"}
+        if slice_filter:
+            filters['and'] = slice_filter
+        for rows, _ in iter_pages(self.client, self.table.name, KEYSETS['id'], self.batch_size,
+                                  filters=filters):
+            yield rows
+
+    def copy_slice(self, slice_filter: Optional[str]) -> bool:
+        for rows in self.pages(slice_filter):
+            if not self.insert([remap_row(self.table, row, self.target, self.selected) for row in rows]):
+                return False
+        return True
+
+    def run(self) -> TableCloneResult:
+        started = time.perf_counter()
+        try:
+            if any(fk.table == self.table.name for _, fk in self.table.foreign_keys):
+                rows = [row for page in self.pages() for row in page]
+                ordered = [remap_row(self.table, row, self.target, self.selected) for row in _depth_order(self.table, rows)]
+                for start in range(0, len(ordered), self.batch_size):
+                    if not self.insert(ordered[start:start + self.batch_size]):
+                        break
+            else:
+                # As fatias compartilham o limitador do cliente
+                run_bulk(self.copy_slice, id_slices(self.slices), client=self.client)
+        except Exception as e:
+            self.result.error = self.result.error or str(e)
+        self.result.elapsed_ms = (time.perf_counter() - started) * 1000
+        return self.result
+
+
+def clone_tenant(source: str, target: str, client=None, schema: Schema = NCISO_SCHEMA,
+                 tables: Optional[Iterable[str]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 slices: int = DEFAULT_SLICES,
+                 on_result: Optional[Callable[[TableCloneResult], None]] = None) -> CloneReport:
+    """Copiar o tenant `source` para `target`, nível a nível das chaves estrangeiras"""
+    if source == target:
+        raise ValueError("O tenant de destino deve ser diferente do de origem")
+    client = client or get_admin_client()
+    selected = clone_selection(schema, tables)
+    report = CloneReport(source, target)
+    failed = set()
+    started = time.perf_counter()
+
+    for number, level in enumerate(table_levels(schema)):
+        runnable = []
+        for table in level:
+            if table.name not in selected:
+                continue
+            if any(dep in failed for dep in table.dependencies):
+                result = TableCloneResult(table.name, number, skipped=True,
+                                          error=f"dependência falhou: {', '.join(d for d in table.dependencies if d in failed)}")
+                report.results.append(result)
+                failed.add(table.name)
+                if on_result:
+                    on_result(result)
+                continue
+            runnable.append(_TableCloner(client, table, number, source, target, batch_size, slices,
+                                         selected))
+
+        def run(cloner):
+            result = cloner.run()
+            if on_result:
+                on_result(result)
+            return result
+
+        for result in run_bulk(run, runnable, client=client):
+            report.results.append(result)
+            if not result.success:
+                failed.add(result.table)
+
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
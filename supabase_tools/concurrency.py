@@ -0,0 +1,138 @@
+"""
+🚦 Controle adaptativo de concorrência (AIMD)
+Limita quantas requisições ficam em andamento ao mesmo tempo e ajusta esse
+limite sozinho: aumenta aditivamente enquanto a latência está saudável e
+reduz multiplicativamente quando o Supabase responde 429/503, respeitando o
+cabeçalho Retry-After antes de liberar novas requisições.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+OVERLOAD_STATUS_CODES = (429, 503)
+
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+DEFAULT_LATENCY_TOLERANCE = 2.0  # latência saudável: até 2x a melhor observada
+DEFAULT_BACKOFF = 1.0  # pausa (s) quando o servidor não envia Retry-After
+MAX_BACKOFF = 60.0
+
+
+def parse_retry_after(value, now=None):
+    """Segundos de espera indicados por um cabeçalho Retry-After (ou None)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now if now is not None else time.time()
+    return max(0.0, retry_at.timestamp() - now)
+
+
+class AdaptiveLimiter:
+    """Limitador AIMD compartilhado entre threads"""
+
+    def __init__(self, initial=DEFAULT_INITIAL_LIMIT, min_limit=DEFAULT_MIN_LIMIT,
+                 max_limit=DEFAULT_MAX_LIMIT, latency_target=None,
+                 latency_tolerance=DEFAULT_LATENCY_TOLERANCE, decrease_factor=0.5):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._min_latency = None
+        self._condition = threading.Condition()
+
+        self.successes = 0
+        self.overloads = 0
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                self._condition.wait(timeout=wait if wait > 0 else None)
+
+    def release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _is_healthy(self, latency):
+        if self.latency_target is not None:
+            return latency <= self.latency_target
+        return latency <= self._min_latency * self.latency_tolerance
+
+    def on_success(self, latency):
+        """Registrar resposta normal; cresce ~1 por janela enquanto saudável"""
+        with self._condition:
+            self.successes += 1
+            if self._min_latency is None or latency < self._min_latency:
+                self._min_latency = latency
+            if self._is_healthy(latency) and self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                self._condition.notify_all()
+
+    def on_overload(self, retry_after=None):
+        """Registrar 429/503: corta o limite e pausa até o Retry-After"""
+        with self._condition:
+            self.overloads += 1
+            self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+            delay = retry_after if retry_after is not None else DEFAULT_BACKOFF
+            delay = min(delay, MAX_BACKOFF)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def stats(self):
+        return {
+            'limit': self.limit,
+            'in_flight': self._in_flight,
+            'successes': self.successes,
+            'overloads': self.overloads,
+            'min_latency_ms': round(self._min_latency * 1000, 1) if self._min_latency else None
+        }
+
+
+def run_bulk(func, items, client=None, max_workers=None):
+    """Executar `func(item)` para todos os itens em paralelo, na ordem original
+
+    A concorrência efetiva é decidida pelo limitador do cliente; aqui apenas
+    garantimos threads suficientes para que ele possa crescer até o máximo.
+    """
+    items = list(items)
+    if not items:
+        return []
+    if max_workers is None:
+        limiter = getattr(client, 'limiter', None)
+        max_workers = limiter.max_limit if limiter else getattr(client, 'pool_size', DEFAULT_INITIAL_LIMIT)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        return list(executor.map(func, items))
@@ -0,0 +1,227 @@
+"""
+🕸️ Execução paralela de DDL guiada pelas chaves estrangeiras
+Monta o grafo de dependências entre tabelas, índices, funções e triggers e
+executa cada nível do grafo em paralelo via rpc/exec_sql. Cada comando tem o
+seu tempo registrado; comandos cuja dependência falhou não são enviados.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .client import get_client
+from .concurrency import run_bulk
+from .schema import Schema
+
+_CREATE_TABLE_RE = re.compile(r'^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:public\.)?"?(\w+)"?', re.IGNORECASE)
+_REFERENCES_RE = re.compile(r'\bREFERENCES\s+(?:public\.)?"?(\w+)"?', re.IGNORECASE)
+_CREATE_INDEX_RE = re.compile(r'^CREATE\s+(?:UNIQUE\s+)?INDEX\b.*?\bON\s+(?:ONLY\s+)?(?:public\.)?"?(\w+)"?',
+                              re.IGNORECASE | re.DOTALL)
+_CREATE_FUNCTION_RE = re.compile(r'^CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(?:public\.)?"?(\w+)"?', re.IGNORECASE)
+_CREATE_TRIGGER_RE = re.compile(r'^CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER\s+"?(\w+)"?.*?\bON\s+(?:public\.)?"?(\w+)"?'
+                                r'.*?\bEXECUTE\s+(?:FUNCTION|PROCEDURE)\s+(?:public\.)?"?(\w+)"?',
+                                re.IGNORECASE | re.DOTALL)
+_ALTER_TABLE_RE = re.compile(r'^ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(?:public\.)?"?(\w+)"?', re.IGNORECASE)
+_COMMENT_RE = re.compile(r'^(?:\s*--[^\n]*\n|\s*/\*.*?\*/)*\s*', re.DOTALL)
+
+
+@dataclass(frozen=True)
+class DDLTask:
+    key: str
+    sql: str
+    depends_on: Tuple[str, ...] = ()
+    label: str = ''
+
+
+@dataclass
+class DDLResult:
+    task: DDLTask
+    level: int
+    success: bool
+    elapsed_ms: float
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    skipped: bool = False
+
+
+@dataclass
+class DDLReport:
+    levels: List[List[DDLTask]]
+    results: List[DDLResult] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(result.success for result in self.results)
+
+    @property
+    def failed(self) -> List[DDLResult]:
+        return [result for result in self.results if not result.success and not result.skipped]
+
+    @property
+    def skipped(self) -> List[DDLResult]:
+        return [result for result in self.results if result.skipped]
+
+    @property
+    def serial_ms(self) -> float:
+        """Tempo que os mesmos comandos levariam enviados um a um"""
+        return sum(result.elapsed_ms for result in self.results)
+
+    def slowest(self, count=5) -> List[DDLResult]:
+        return sorted(self.results, key=lambda result: result.elapsed_ms, reverse=True)[:count]
+
+
+def _summary(statement: str) -> str:
+    return ' '.join(statement.split())[:60]
+
+
+def tasks_from_schema(schema: Schema) -> List[DDLTask]:
+    """Tabelas dependem das tabelas referenciadas; índices e triggers, da sua tabela"""
+    names = set(schema.table_names)
+    tasks = []
+    for table in schema.tables:
+        table_key = f"table:{table.name}"
+        deps = tuple(f"table:{dep}" for dep in table.dependencies if dep in names)
+        tasks.append(DDLTask(table_key, table.render_create(), deps, f"tabela {table.name}"))
+        if table.partitioning:
+            # Índices e triggers na tabela mãe são propagados às partições existentes
+            tasks.append(DDLTask(f"partitions:{table.name}", '\n\n'.join(table.render_partitions()),
+                                 (table_key,), f"partições de {table.name}"))
+        for index in table.indexes:
+            name = index.index_name(table.name)
+            tasks.append(DDLTask(f"index:{name}", index.render(table.name), (table_key,), f"índice {name}"))
+        for trigger in table.triggers:
+            tasks.append(DDLTask(
+                f"trigger:{table.name}.{trigger.name}",
+                f"{trigger.render_function()}\n\n{trigger.render(table.name)}",
+                (table_key,),
+                f"trigger {trigger.name}",
+            ))
+    return tasks
+
+
+def tasks_from_statements(statements: Iterable[str], labels: Optional[Iterable[str]] = None) -> List[DDLTask]:
+    """Grafo de dependências para comandos SQL soltos (ex.: docs/database-schema.sql)
+
+    CREATE TABLE depende das tabelas em REFERENCES; CREATE INDEX, ALTER TABLE e
+    CREATE TRIGGER dependem do comando anterior sobre a mesma tabela (não só do
+    CREATE TABLE: um índice espera o ADD COLUMN de que precisa, e no diff, em
+    que a tabela já existe, os ALTERs dela saem em sequência); o trigger também
+    depende da função. Comandos não
+    reconhecidos (extensões, GRANTs, DO blocks...) funcionam como barreira:
+    esperam tudo o que veio antes e tudo o que vem depois espera por eles.
+    """
+    labels = list(labels) if labels is not None else None
+    tasks: List[DDLTask] = []
+    tables: Dict[str, str] = {}  # tabela -> último comando sobre ela
+    functions: Dict[str, str] = {}
+    barrier: Optional[str] = None
+
+    for number, statement in enumerate(statements, 1):
+        body = _COMMENT_RE.sub('', statement, count=1)
+        key = f"stmt:{number}"
+        deps: List[str] = [barrier] if barrier else []
+        label = labels[number - 1] if labels else None
+
+        match = _CREATE_TABLE_RE.match(body)
+        if match:
+            name = match.group(1).lower()
+            for ref in _REFERENCES_RE.findall(body):
+                ref_key = tables.get(ref.lower())
+                if ref_key and ref.lower() != name and ref_key not in deps:
+                    deps.append(ref_key)
+            tables[name] = key
+            tasks.append(DDLTask(key, statement, tuple(deps), label or f"tabela {name}"))
+            continue
+
+        match = _CREATE_TRIGGER_RE.match(body)
+        if match:
+            for dep in (tables.get(match.group(2).lower()), functions.get(match.group(3).lower())):
+                if dep and dep not in deps:
+                    deps.append(dep)
+            tables[match.group(2).lower()] = key
+            tasks.append(DDLTask(key, statement, tuple(deps), label or f"trigger {match.group(1)}"))
+            continue
+
+        match = _CREATE_INDEX_RE.match(body) or _ALTER_TABLE_RE.match(body)
+        if match:
+            # ALTER TABLE ... ADD FOREIGN KEY também depende da tabela referenciada
+            names = [match.group(1)] + _REFERENCES_RE.findall(body)
+            for table_key in (tables.get(name.lower()) for name in names):
+                if table_key and table_key not in deps:
+                    deps.append(table_key)
+            tables[match.group(1).lower()] = key
+            tasks.append(DDLTask(key, statement, tuple(deps), label or _summary(body)))
+            continue
+
+        match = _CREATE_FUNCTION_RE.match(body)
+        if match:
+            functions[match.group(1).lower()] = key
+            tasks.append(DDLTask(key, statement, tuple(deps), label or f"função {match.group(1)}"))
+            continue
+
+        # Barreira: depende de todos os comandos anteriores
+        tasks.append(DDLTask(key, statement, tuple(task.key for task in tasks), label or _summary(body)))
+        barrier = key
+
+    return tasks
+
+
+def dependency_levels(tasks: Iterable[DDLTask]) -> List[List[DDLTask]]:
+    """Níveis do grafo (Kahn): cada nível só depende de níveis anteriores"""
+    tasks = list(tasks)
+    by_key = {task.key: task for task in tasks}
+    if len(by_key) != len(tasks):
+        raise ValueError("Chaves de DDL duplicadas")
+
+    level_of: Dict[str, int] = {}
+    remaining = list(tasks)
+    while remaining:
+        progressed = []
+        for task in remaining:
+            deps = [dep for dep in task.depends_on if dep in by_key]
+            if all(dep in level_of for dep in deps):
+                level_of[task.key] = 1 + max((level_of[dep] for dep in deps), default=-1)
+                progressed.append(task)
+        if not progressed:
+            cycle = ', '.join(task.key for task in remaining)
+            raise ValueError(f"Dependência circular entre: {cycle}")
+        remaining = [task for task in remaining if task.key not in level_of]
+
+    levels: List[List[DDLTask]] = [[] for _ in range(max(level_of.values(), default=-1) + 1)]
+    for task in tasks:
+        levels[level_of[task.key]].append(task)
+    return levels
+
+
+def run_ddl_parallel(tasks: Iterable[DDLTask], client=None, max_workers=None) -> DDLReport:
+    """Executar os comandos nível a nível, em paralelo dentro de cada nível"""
+    client = client or get_client()
+    report = DDLReport(dependency_levels(tasks))
+    failed_keys = set()
+    started = time.perf_counter()
+
+    for number, level in enumerate(report.levels):
+        def execute(task, number=number):
+            blocked = [dep for dep in task.depends_on if dep in failed_keys]
+            if blocked:
+                return DDLResult(task, number, False, 0.0, error=f"dependência falhou: {blocked[0]}",
+                                 skipped=True)
+            task_started = time.perf_counter()
+            try:
+                response = client.exec_sql(task.sql)
+            except Exception as e:
+                return DDLResult(task, number, False, (time.perf_counter() - task_started) * 1000,
+                                 error=str(e))
+            elapsed = (time.perf_counter() - task_started) * 1000
+            if response.status_code in (200, 204):
+                return DDLResult(task, number, True, elapsed, response.status_code)
+            return DDLResult(task, number, False, elapsed, response.status_code, response.text)
+
+        results = run_bulk(execute, level, client=client, max_workers=max_workers)
+        failed_keys.update(result.task.key for result in results if not result.success)
+        report.results.extend(results)
+
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
@@ -0,0 +1,193 @@
+"""
+📤 Exportação de tabelas com paginação por chave (keyset)
+Percorre a tabela em ordem de chave (`id` ou `created_at, id`) pedindo sempre
+a primeira faixa (`Range: 0-N`) depois do último registro visto
+(`id=gt.<último>`), em vez de OFFSET: cada página usa o índice da chave e custa
+o mesmo do começo ao fim da tabela, sem importar quantos milhões de linhas ela
+tem.
+
+A próxima página é buscada numa thread enquanto a atual é gravada no arquivo
+(NDJSON ou CSV, opcionalmente .gz). A memória fica limitada a duas páginas.
+"""
+
+import csv
+import gzip
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .client import get_client
+from .sql import error_message
+
+DEFAULT_PAGE_SIZE = 1000
+KEYSETS = {
+    'id': ('id',),
+    'created_at': ('created_at', 'id'),
+}
+
+
+def _quote(value) -> str:
+    """Valor dentro de um filtro or=(...) do PostgREST"""
+    text = str(value)
+    if any(char in text for char in ',.:()" '):
+        return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return text
+
+
+def keyset_params(keys: Sequence[str], cursor: Optional[Tuple], descending: bool = False) -> Dict[str, str]:
+    """Ordem e filtro "depois do cursor" para as colunas da chave"""
+    direction, operator = ('desc', 'lt') if descending else ('asc', 'gt')
+    params = {'order': ','.join(f"{key}.{direction}" for key in keys)}
+    if cursor is None:
+        return params
+    if len(keys) == 1:
+        params[keys[0]] = f"{operator}.{cursor[0]}"
+        return params
+    # (a, b) > (x, y)  =>  a > x OR (a = x AND b > y), generalizado para N colunas
+    terms = []
+    for position, key in enumerate(keys):
+        equal = [f"{keys[i]}.eq.{_quote(cursor[i])}" for i in range(position)]
+        greater = f"{key}.{operator}.{_quote(cursor[position])}"
+        terms.append(f"and({','.join(equal + [greater])})" if equal else greater)
+    params['or'] = f"({','.join(terms)})"
+    return params
+
+
+def fetch_page(client, table: str, keys: Sequence[str], cursor: Optional[Tuple],
+               page_size: int = DEFAULT_PAGE_SIZE, select: str = '*',
+               filters: Optional[Dict[str, str]] = None) -> Tuple[List[dict], float]:
+    """(linhas, latência em ms) da página seguinte ao cursor"""
+    params = {'select': select, **(filters or {}), **keyset_params(keys, cursor)}
+    headers = {'Range-Unit': 'items', 'Range': f"0-{page_size - 1}"}
+    started = time.perf_counter()
+    response = client.get(table, params=params, headers=headers)
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.status_code not in (200, 206):
+        raise RuntimeError(f"{table}: página após {cursor} falhou ({response.status_code}): {error_message(response)}")
+    return response.json() or [], elapsed
+
+
+def iter_pages(client, table: str, keys: Sequence[str] = KEYSETS['id'], page_size: int = DEFAULT_PAGE_SIZE,
+               select: str = '*', filters: Optional[Dict[str, str]] = None,
+               prefetch: bool = True) -> Iterator[Tuple[List[dict], float]]:
+    """Páginas em ordem de chave; com `prefetch`, a próxima já está a caminho"""
+    if select != '*':
+        columns = [column.strip() for column in select.split(',')]
+        select = ','.join(columns + [key for key in keys if key not in columns])
+
+    def fetch(cursor):
+        return fetch_page(client, table, keys, cursor, page_size, select, filters)
+
+    def next_cursor(rows):
+        return tuple(rows[-1][key] for key in keys)
+
+    if not prefetch:
+        cursor = None
+        while True:
+            rows, elapsed = fetch(cursor)
+            if rows:
+                yield rows, elapsed
+            if len(rows) < page_size:
+                return
+            cursor = next_cursor(rows)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, None)
+        while future is not None:
+            rows, elapsed = future.result()
+            # Pedir a próxima página antes de entregar a atual para gravação
+            future = executor.submit(fetch, next_cursor(rows)) if len(rows) == page_size else None
+            if rows:
+                yield rows, elapsed
+
+
+def _open(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, list) and all(not isinstance(item, (dict, list)) for item in value):
+        # Literal de array do Postgres, aceito de volta pelo importador
+        return '{' + ','.join(json.dumps(str(item), ensure_ascii=False) for item in value) + '}'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class _NDJSONWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, rows: List[dict]):
+        self.f.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows))
+
+
+class _CSVWriter:
+    def __init__(self, f):
+        self.f = f
+        self.writer = None
+
+    def write(self, rows: List[dict]):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.f, fieldnames=list(rows[0]), extrasaction='ignore')
+            self.writer.writeheader()
+        self.writer.writerows({key: _csv_value(value) for key, value in row.items()} for row in rows)
+
+
+def detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.lower().endswith('.csv') else 'ndjson'
+
+
+@dataclass
+class ExportReport:
+    table: str
+    path: str
+    rows: int = 0
+    pages: int = 0
+    elapsed_ms: float = 0.0
+    fetch_ms: float = 0.0
+    write_ms: float = 0.0
+    slowest_page_ms: float = 0.0
+    last_page_ms: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / (self.elapsed_ms / 1000) if self.elapsed_ms else 0.0
+
+
+def export_table(table: str, path: str, client=None, file_format: Optional[str] = None,
+                 key: str = 'id', page_size: int = DEFAULT_PAGE_SIZE, select: str = '*',
+                 filters: Optional[Dict[str, str]] = None, prefetch: bool = True,
+                 on_page=None) -> ExportReport:
+    """Gravar a tabela inteira (ou o recorte de `filters`) em NDJSON/CSV"""
+    client = client or get_client()
+    keys = KEYSETS.get(key) or tuple(column.strip() for column in key.split(','))
+    file_format = file_format or detect_format(path)
+    report = ExportReport(table, path)
+    started = time.perf_counter()
+
+    with _open(path) as f:
+        writer = _CSVWriter(f) if file_format == 'csv' else _NDJSONWriter(f)
+        for rows, fetch_ms in iter_pages(client, table, keys, page_size, select, filters, prefetch):
+            write_started = time.perf_counter()
+            writer.write(rows)
+            report.write_ms += (time.perf_counter() - write_started) * 1000
+            report.rows += len(rows)
+            report.pages += 1
+            report.fetch_ms += fetch_ms
+            report.slowest_page_ms = max(report.slowest_page_ms, fetch_ms)
+            report.last_page_ms = fetch_ms
+            if on_page:
+                on_page(report)
+
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
@@ -0,0 +1,996 @@
+"""
+🧪 PostgREST falso em processo, sobre SQLite, para rodar sem Supabase
+Servidor HTTP local que implementa o subconjunto do PostgREST usado pelos
+scripts e ferramentas do n.CISO, para desenvolver, provisionar e medir num
+notebook ou no CI sem rede:
+
+- CRUD em /rest/v1/<tabela> (GET, POST, PATCH, DELETE), com inserção em lote
+  (array JSON), `Prefer: return=representation|minimal`, `missing=default` e
+  upsert (`resolution=merge-duplicates|ignore-duplicates` + `on_conflict`);
+- `select=*`, lista de colunas (com `alias:coluna`), `select=count` e recursos
+  embutidos pelas chaves estrangeiras (`alias:asset_id(name)`, `assets(*)`,
+  `teams!inner(id)`), nos dois sentidos;
+- filtros eq, neq, gt, gte, lt, lte, like, ilike, in, is (e `not.`), além de
+  `or=(...)`/`and=(...)` aninhados, `order`, `limit`, `offset` e `Range`;
+- `Prefer: count=exact|planned|estimated` com o total no `Content-Range`, também
+  no POST, PATCH e DELETE (linhas afetadas);
+- rpc/exec_sql (DDL e DML num SQLite, numa transação por chamada) e
+  rpc/query_sql (SELECT, devolve as linhas);
+- documento OpenAPI mínimo em /rest/v1/ para o SchemaIntrospector.
+
+As tabelas saem do modelo (NCISO_SCHEMA por padrão) ou dos CREATE TABLE
+enviados ao exec_sql: tipos, NOT NULL, DEFAULT, CHECK ... IN (...), PRIMARY KEY
+e UNIQUE são respeitados; chaves estrangeiras só servem aos recursos embutidos
+(não são verificadas), e RLS, políticas, funções e triggers são aceitos e
+ignorados (exceto o trigger de updated_at, emulado no PATCH). Os últimos
+`statement_log` comandos SQL recebidos ficam em `statements`. Timestamps são
+guardados em UTC num formato fixo, então comparações e ordenações (paginação
+por chave) funcionam como no Postgres.
+
+Latência (`latency` + `jitter` aleatório) e erros (`error_rate`, com o status
+`error_status`) podem ser injetados em cada requisição para exercitar os
+limitadores, novas tentativas e benchmarks. O tempo gasto no SQLite vai em
+`Server-Timing: transaction`, então a latência injetada aparece como rede+proxy
+no registro de fases (SUPABASE_HTTP_TIMING).
+
+Não é um Postgres: consultas SQL livres (exec_sql/query_sql) passam por uma
+tradução simples para o dialeto do SQLite e podem falhar onde o Postgres não
+falharia.
+"""
+
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from .client import SupabaseClient
+from .schema import Schema
+from .sql import split_statements
+from .tables import NCISO_SCHEMA
+
+FAKE_KEY = 'fake-postgrest-key'
+DEFAULT_ERROR_STATUS = 503
+DEFAULT_STATEMENT_LOG = 100
+_META_TABLE = '_fake_postgrest_tables'
+_RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns', 'and', 'or', 'not.and', 'not.or'}
+_COLUMN_KEYWORDS = r'PRIMARY|NOT|NULL|DEFAULT|REFERENCES|CHECK|UNIQUE|CONSTRAINT|GENERATED|COLLATE'
+_COMPARISONS = {'eq': '=', 'neq': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+
+
+class ApiError(Exception):
+    """Erro devolvido no formato do PostgREST ({code, message, details, hint})"""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None,
+                 hint: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'details': details, 'hint': hint, 'message': message}
+
+
+@dataclass
+class FakeColumn:
+    name: str
+    type: str
+    nullable: bool = True
+    default: Optional[str] = None
+    primary_key: bool = False
+    unique: bool = False
+    choices: Tuple[str, ...] = ()
+    references: Optional[str] = None  # 'tabela.coluna'
+
+    @property
+    def kind(self) -> str:
+        sql_type = self.type.upper()
+        if sql_type.endswith('[]') or sql_type in ('JSON', 'JSONB'):
+            return 'json'
+        if sql_type in ('BOOLEAN', 'BOOL'):
+            return 'bool'
+        if sql_type.startswith(('INT', 'BIGINT', 'SMALLINT', 'SERIAL', 'BIGSERIAL')):
+            return 'int'
+        if sql_type.startswith(('DECIMAL', 'NUMERIC', 'REAL', 'DOUBLE', 'FLOAT')):
+            return 'number'
+        if sql_type.startswith('TIMESTAMP'):
+            return 'timestamp'
+        return 'text'
+
+    @property
+    def affinity(self) -> str:
+        return {'int': 'INTEGER', 'bool': 'INTEGER', 'number': 'REAL'}.get(self.kind, 'TEXT')
+
+
+@dataclass
+class FakeTable:
+    name: str
+    columns: Dict[str, FakeColumn] = field(default_factory=dict)
+    primary_key: Tuple[str, ...] = ()
+    unique: Tuple[Tuple[str, ...], ...] = ()
+    touch_updated_at: bool = False
+
+    def column(self, name: str) -> FakeColumn:
+        column = self.columns.get(name)
+        if column is None:
+            raise ApiError(400, '42703', f"column {self.name}.{name} does not exist")
+        return column
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'columns': [asdict(c) for c in self.columns.values()],
+                'primary_key': list(self.primary_key), 'unique': [list(u) for u in self.unique],
+                'touch_updated_at': self.touch_updated_at}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FakeTable':
+        columns = {c['name']: FakeColumn(**{**c, 'choices': tuple(c['choices'])}) for c in data['columns']}
+        return cls(data['name'], columns, tuple(data['primary_key']), tuple(tuple(u) for u in data['unique']),
+                   data.get('touch_updated_at', False))
+
+
+@dataclass
+class _Embed:
+    """Recurso embutido no select: linhas de `table` com `remote` = `local` da linha"""
+    table: FakeTable
+    local: str
+    remote: str
+    many: bool
+    fields: list
+    inner: bool = False
+
+
+def _now() -> str:
+    return _timestamp(datetime.now(timezone.utc))
+
+
+def _timestamp(value) -> str:
+    """Timestamp em UTC num formato fixo (ordenável como texto)"""
+    if isinstance(value, str):
+        text = value.strip().replace(' ', 'T', 1)
+        try:
+            value = datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+        except ValueError:
+            raise ApiError(400, '22007', f'invalid input syntax for type timestamp with time zone: "{value}"')
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if not isinstance(value, datetime):
+        raise ApiError(400, '22007', f'invalid input syntax for type timestamp with time zone: "{value}"')
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f+00:00')
+
+
+def _pg_array(text: str) -> list:
+    inner = text.strip()[1:-1]
+    return [item.strip().strip('"') for item in inner.split(',')] if inner.strip() else []
+
+
+def _default(column: FakeColumn):
+    """Valor do DEFAULT da coluna (as expressões que o schema usa)"""
+    if column.default is None:
+        return None
+    expression = column.default.strip()
+    lowered = expression.lower()
+    if lowered in ('gen_random_uuid()', 'uuid_generate_v4()'):
+        return str(uuid.uuid4())
+    if lowered in ('now()', 'current_timestamp', 'clock_timestamp()', 'statement_timestamp()'):
+        return _now()
+    if lowered == 'current_date':
+        return date.today().isoformat()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    if lowered == 'null':
+        return None
+    match = re.fullmatch(r"'((?:[^']|'')*)'(?:::[\w\[\] ]+)?", expression)
+    if match:
+        text = match.group(1).replace("''", "'")
+        if column.type.endswith('[]'):
+            return _pg_array(text)
+        return json.loads(text) if column.kind == 'json' else text
+    try:
+        return int(expression) if re.fullmatch(r'-?\d+', expression) else float(expression)
+    except ValueError:
+        return None
+
+
+_SQLITE_UUID = ("(lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+                "substr(lower(hex(randomblob(2))), 2) || '-' || substr('89ab', 1 + abs(random()) % 4, 1) || "
+                "substr(lower(hex(randomblob(2))), 2) || '-' || lower(hex(randomblob(6))))")
+_SQLITE_NOW = "(strftime('%Y-%m-%dT%H:%M:%f', 'now') || '000+00:00')"
+
+
+def _sqlite_default(column: FakeColumn) -> str:
+    """DEFAULT equivalente no SQLite, para os INSERT enviados via exec_sql"""
+    if column.default is None:
+        return ''
+    lowered = column.default.strip().lower()
+    if lowered in ('gen_random_uuid()', 'uuid_generate_v4()'):
+        return f" DEFAULT {_SQLITE_UUID}"
+    if lowered in ('now()', 'current_timestamp', 'clock_timestamp()', 'statement_timestamp()'):
+        return f" DEFAULT {_SQLITE_NOW}"
+    value = _encode(column, _default(column))
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return " DEFAULT '" + value.replace("'", "''") + "'"
+    return f" DEFAULT {value}"
+
+
+def _encode(column: FakeColumn, value):
+    """Valor JSON -> valor guardado no SQLite"""
+    if value is None:
+        return None
+    kind = column.kind
+    try:
+        if kind == 'json':
+            return json.dumps(value)
+        if kind == 'bool':
+            if isinstance(value, str):
+                if value.lower() not in ('true', 'false', 't', 'f'):
+                    raise ValueError(value)
+                return int(value.lower() in ('true', 't'))
+            return int(bool(value))
+        if kind == 'int':
+            return int(value)
+        if kind == 'number':
+            return float(value)
+        if kind == 'timestamp':
+            return _timestamp(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, '22P02', f'invalid input syntax for type {column.type.lower()}: "{value}"')
+    if column.choices and str(value) not in column.choices:
+        raise ApiError(400, '23514', f'new row violates check constraint "{column.name}_check"',
+                       f"{column.name} deve ser um de: {', '.join(column.choices)}")
+    return value if isinstance(value, str) else json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+
+
+def _decode(column: Optional[FakeColumn], value):
+    if value is None or column is None:
+        return value
+    if column.kind == 'json':
+        return json.loads(value)
+    if column.kind == 'bool':
+        return bool(value)
+    return value
+
+
+def _split_top(text: str, quotes: str = '"') -> List[str]:
+    """Separar por vírgulas fora de parênteses e aspas (`quotes`: '"' no PostgREST, '"\'' no SQL)"""
+    parts, depth, quoted, current = [], 0, None, ''
+    for i, char in enumerate(text):
+        if char in quotes and (i == 0 or text[i - 1] != '\\') and quoted in (None, char):
+            quoted = None if quoted else char
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(current)
+            current = ''
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return [part.strip() for part in parts]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+
+def _matching_paren(text: str, start: int) -> int:
+    depth, quoted = 0, None
+    for i in range(start, len(text)):
+        char = text[i]
+        if quoted:
+            if char == quoted:
+                quoted = None
+        elif char in ("'", '"'):
+            quoted = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ApiError(400, '42601', 'syntax error: parêntese não fechado')
+
+
+def _table_name(name: str) -> str:
+    name = name.strip().strip('"')
+    return name.split('.', 1)[1].strip('"') if name.lower().startswith('public.') else name
+
+
+def _parse_column(definition: str) -> Optional[FakeColumn]:
+    match = re.match(r'\s*("[^"]+"|\w+)\s+(.*)$', definition, re.S)
+    if not match:
+        return None
+    name, rest = match.group(1).strip('"'), match.group(2)
+    type_match = re.match(rf'(.+?)(?=\s+(?:{_COLUMN_KEYWORDS})\b|\s*$)', rest, re.S | re.I)
+    sql_type = ' '.join(type_match.group(1).split()) if type_match else rest.split()[0]
+    upper = rest.upper()
+    default = re.search(r"\bDEFAULT\s+('(?:[^']|'')*'(?:::[\w\[\]]+)?|[\w.]+\s*\([^)]*\)|[^\s,]+)", rest, re.I)
+    check = re.search(r'CHECK\s*\(\s*"?\w+"?\s+IN\s*\(([^)]*)\)\s*\)', rest, re.I)
+    choices = tuple(v.replace("''", "'") for v in re.findall(r"'((?:[^']|'')*)'", check.group(1))) if check else ()
+    return FakeColumn(name, sql_type, nullable='NOT NULL' not in upper and 'PRIMARY KEY' not in upper,
+                      default=default.group(1) if default else None, primary_key='PRIMARY KEY' in upper,
+                      unique=bool(re.search(r'\bUNIQUE\b', upper)), choices=choices, references=_references(rest))
+
+
+def _references(text: str) -> Optional[str]:
+    """'tabela.coluna' de um `REFERENCES tabela(coluna)` (a coluna padrão é id)"""
+    match = re.search(r'\bREFERENCES\s+([\w."]+)\s*(?:\(\s*"?(\w+)"?\s*\))?', text, re.I)
+    return f"{_table_name(match.group(1))}.{match.group(2) or 'id'}" if match else None
+
+
+def parse_create_table(statement: str) -> Tuple[FakeTable, bool]:
+    """(tabela, IF NOT EXISTS) de um CREATE TABLE do Postgres"""
+    match = re.match(r'\s*CREATE\s+(?:UNLOGGED\s+)?TABLE\s+(IF\s+NOT\s+EXISTS\s+)?([\w."]+)\s*\(', statement, re.I)
+    if not match:
+        raise ApiError(400, '42601', f"CREATE TABLE não suportado: {statement[:80]}")
+    body = statement[match.end() - 1:_matching_paren(statement, match.end() - 1) + 1][1:-1]
+    table = FakeTable(_table_name(match.group(2)))
+    unique = []
+    for definition in _split_top(body, '"\''):
+        head = definition.split(None, 1)[0].upper() if definition.strip() else ''
+        if head == 'CONSTRAINT':
+            definition = definition.split(None, 2)[2]
+            head = definition.split(None, 1)[0].upper()
+        if head in ('PRIMARY', 'UNIQUE'):
+            columns = tuple(c.strip().strip('"') for c in re.search(r'\(([^)]*)\)', definition).group(1).split(','))
+            if head == 'PRIMARY':
+                table.primary_key = columns
+            else:
+                unique.append(columns)
+            continue
+        if head == 'FOREIGN':
+            columns = re.search(r'KEY\s*\(([^)]*)\)', definition, re.I)
+            names = [c.strip().strip('"') for c in columns.group(1).split(',')] if columns else []
+            if len(names) == 1 and names[0] in table.columns:
+                table.columns[names[0]].references = _references(definition)
+            continue
+        if head in ('CHECK', 'EXCLUDE', 'LIKE', ''):
+            continue
+        column = _parse_column(definition)
+        if column:
+            table.columns[column.name] = column
+    if not table.primary_key:
+        table.primary_key = tuple(c.name for c in table.columns.values() if c.primary_key)
+    for name in table.primary_key:
+        if name in table.columns:
+            table.columns[name].nullable = False
+    table.unique = tuple(unique) + tuple((c.name,) for c in table.columns.values() if c.unique)
+    return table, bool(match.group(1))
+
+
+def _to_sqlite(sql: str) -> str:
+    """Tradução mínima de SQL do Postgres para o SQLite"""
+    sql = re.sub(r'::\s*[A-Za-z_][\w ]*?(\[\])?(?=[\s,;)]|$)', '', sql)
+    sql = re.sub(r'\bEXTRACT\s*\(\s*EPOCH\s+FROM\s+', '_epoch(', sql, flags=re.I)
+    sql = re.sub(r'\bILIKE\b', 'LIKE', sql, flags=re.I)
+    return sql.rstrip().rstrip(';')
+
+
+class FakePostgREST:
+    """Servidor PostgREST falso: `with FakePostgREST() as server: server.client().get(...)`"""
+
+    def __init__(self, schema: Optional[Schema] = NCISO_SCHEMA, database: str = ':memory:',
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = DEFAULT_ERROR_STATUS, seed: Optional[int] = None,
+                 host: str = '127.0.0.1', port: int = 0, statement_log: int = DEFAULT_STATEMENT_LOG):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.injected_errors = 0
+        # Só os últimos comandos, para não crescer sem limite num servidor de longa duração
+        self.statements = deque(maxlen=statement_log)
+        self.executed_statements = 0
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+
+        self._db = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        for name in ('now', 'clock_timestamp', 'statement_timestamp'):
+            self._db.create_function(name, 0, _now)
+        self._db.create_function('gen_random_uuid', 0, lambda: str(uuid.uuid4()))
+        self._db.create_function('_epoch', 1, lambda value: 0.0 if value is None else value)
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS {_META_TABLE} (name TEXT PRIMARY KEY, definition TEXT)")
+        self.tables: Dict[str, FakeTable] = {
+            row['name']: FakeTable.from_dict(json.loads(row['definition']))
+            for row in self._db.execute(f"SELECT name, definition FROM {_META_TABLE}")
+        }
+        if schema is not None:
+            self.execute_sql('\n\n'.join(table.render() for table in schema.tables))
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    # Ciclo de vida
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakePostgREST':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+        self._db.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def client(self, **kwargs) -> SupabaseClient:
+        """SupabaseClient apontado para este servidor"""
+        return SupabaseClient(url=self.url, key=kwargs.pop('key', FAKE_KEY), **kwargs)
+
+    # Injeção de falhas
+    def _inject(self) -> Optional[int]:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.injected_errors += 1
+                return self.error_status
+        return None
+
+    # Metadados
+    def _table(self, name: str) -> FakeTable:
+        table = self.tables.get(_table_name(name))
+        if table is None:
+            raise ApiError(404, 'PGRST205', f"Could not find the table 'public.{name}' in the schema cache")
+        return table
+
+    def _save_meta(self, table: FakeTable):
+        self._db.execute(f"INSERT OR REPLACE INTO {_META_TABLE} VALUES (?, ?)",
+                         (table.name, json.dumps(table.to_dict())))
+
+    def _create_table(self, table: FakeTable, if_not_exists: bool):
+        if table.name in self.tables:
+            if if_not_exists:
+                return
+            raise ApiError(400, '42P07', f'relation "{table.name}" already exists')
+        lines = [f'"{c.name}" {c.affinity}{"" if c.nullable else " NOT NULL"}{_sqlite_default(c)}'
+                 for c in table.columns.values()]
+        if table.primary_key:
+            lines.append(f"PRIMARY KEY ({', '.join(table.primary_key)})")
+        lines.extend(f"UNIQUE ({', '.join(columns)})" for columns in table.unique)
+        self._db.execute(f'CREATE TABLE "{table.name}" ({", ".join(lines)})')
+        self.tables[table.name] = table
+        self._save_meta(table)
+
+    def _drop_tables(self, statement: str):
+        match = re.match(r'\s*DROP\s+TABLE\s+(IF\s+EXISTS\s+)?(.+?)(\s+CASCADE|\s+RESTRICT)?\s*$', statement, re.I | re.S)
+        for name in (_table_name(n) for n in match.group(2).split(',')):
+            if name not in self.tables:
+                if match.group(1):
+                    continue
+                raise ApiError(400, '42P01', f'table "{name}" does not exist')
+            self._db.execute(f'DROP TABLE "{name}"')
+            self._db.execute(f"DELETE FROM {_META_TABLE} WHERE name = ?", (name,))
+            del self.tables[name]
+
+    def _alter_table(self, statement: str):
+        match = re.match(r'\s*ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?([\w."]+)\s+(.*)$', statement, re.I | re.S)
+        if not match or _table_name(match.group(1)) not in self.tables:
+            return
+        table = self.tables[_table_name(match.group(1))]
+        action = match.group(2)
+        added = re.match(r'ADD\s+(?:COLUMN\s+)?(IF\s+NOT\s+EXISTS\s+)?(.*)$', action, re.I | re.S)
+        dropped = re.match(r'DROP\s+(?:COLUMN\s+)?(?:IF\s+EXISTS\s+)?("?\w+"?)', action, re.I)
+        if added and not re.match(r'(CONSTRAINT|PRIMARY|FOREIGN|UNIQUE|CHECK)\b', added.group(2), re.I):
+            column = _parse_column(added.group(2))
+            if column.name in table.columns:
+                if added.group(1):
+                    return
+                raise ApiError(400, '42701', f'column "{column.name}" of relation "{table.name}" already exists')
+            self._db.execute(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.affinity}')
+            default = _encode(column, _default(column))
+            if default is not None:
+                # Linhas existentes recebem o DEFAULT, como no Postgres
+                self._db.execute(f'UPDATE "{table.name}" SET "{column.name}" = ?', (default,))
+            table.columns[column.name] = column
+        elif dropped and not re.match(r'(CONSTRAINT|NOT|DEFAULT)\b', action[5:].strip(), re.I):
+            name = dropped.group(1).strip('"')
+            if name in table.columns:
+                self._db.execute(f'ALTER TABLE "{table.name}" DROP COLUMN "{name}"')
+                del table.columns[name]
+        else:
+            return
+        self._save_meta(table)
+
+    def _create_index(self, statement: str):
+        match = re.match(r'\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+ON\s+'
+                         r'(?:ONLY\s+)?([\w."]+)\s*(?:USING\s+\w+\s*)?\(([^)]*)\)\s*(?:WHERE\s+(.*))?$',
+                         statement, re.I | re.S)
+        if not match or _table_name(match.group(3)) not in self.tables or match.group(4).strip() == '':
+            return
+        where = f" WHERE {_to_sqlite(match.group(5))}" if match.group(5) else ''
+        sql = (f'CREATE {match.group(1) or ""}INDEX IF NOT EXISTS "{match.group(2)}" '
+               f'ON "{_table_name(match.group(3))}" ({match.group(4)}){where}')
+        try:
+            self._db.execute(sql)
+        except sqlite3.Error:
+            # Índices só aceleram a cópia local; expressões do Postgres ficam de fora
+            pass
+
+    def _execute_statement(self, statement: str):
+        statement = re.sub(r'^\s*(?:--[^\n]*(?:\n|$)\s*)*', '', statement)
+        words = statement.split(None, 5)
+        first = ' '.join(words[:4]).upper()
+        if first.startswith('CREATE') and re.search(r'\bPARTITION\s+OF\b', statement, re.I):
+            return
+        if re.match(r'CREATE (UNLOGGED )?TABLE', first):
+            self._create_table(*parse_create_table(statement))
+        elif first.startswith('DROP TABLE'):
+            self._drop_tables(statement)
+        elif first.startswith('ALTER TABLE'):
+            self._alter_table(statement)
+        elif re.match(r'CREATE (UNIQUE )?INDEX', first):
+            self._create_index(statement)
+        elif first.startswith('DROP INDEX'):
+            name = re.search(r'(\w+)\s*(?:CASCADE|RESTRICT)?\s*$', statement).group(1)
+            self._db.execute(f'DROP INDEX IF EXISTS "{name}"')
+        elif re.match(r'CREATE (OR REPLACE )?TRIGGER', first):
+            target = re.search(r'\bON\s+([\w."]+)', statement, re.I)
+            table = self.tables.get(_table_name(target.group(1))) if target else None
+            if table is not None and 'updated_at' in statement.lower():
+                table.touch_updated_at = True
+                self._save_meta(table)
+        elif first.startswith('TRUNCATE'):
+            names = re.sub(r'(?i)^\s*TRUNCATE\s+(TABLE\s+)?|\s+(RESTART IDENTITY|CASCADE|RESTRICT)', '', statement)
+            for name in names.split(','):
+                self._db.execute(f'DELETE FROM "{self._table(name).name}"')
+        elif words and words[0].upper() in ('INSERT', 'UPDATE', 'DELETE', 'SELECT', 'WITH'):
+            try:
+                self._db.execute(_to_sqlite(statement))
+            except sqlite3.Error as e:
+                raise ApiError(400, '42601', f"{e} (SQLite)", statement[:200])
+        # Demais comandos (funções, políticas, GRANT, COMMENT, NOTIFY, DO ...) são aceitos sem efeito
+
+    def execute_sql(self, sql: str):
+        """Aplicar um script numa transação (o que rpc/exec_sql faz)"""
+        statements = split_statements(sql)
+        with self._lock:
+            snapshot = {name: FakeTable.from_dict(table.to_dict()) for name, table in self.tables.items()}
+            self._db.execute('BEGIN')
+            try:
+                for statement in statements:
+                    self.statements.append(statement)
+                    self.executed_statements += 1
+                    self._execute_statement(statement)
+            except Exception:
+                self._db.execute('ROLLBACK')
+                self.tables = snapshot
+                raise
+            self._db.execute('COMMIT')
+
+    def query(self, sql: str) -> List[dict]:
+        """Linhas de um SELECT (o que rpc/query_sql faz)"""
+        if not re.match(r'\s*(SELECT|WITH)\b', sql, re.I):
+            raise ApiError(400, '42601', 'query_sql aceita apenas SELECT')
+        with self._lock:
+            try:
+                return [dict(row) for row in self._db.execute(_to_sqlite(sql))]
+            except sqlite3.Error as e:
+                raise ApiError(400, '42601', f"{e} (SQLite)", sql[:200])
+
+    # Consultas REST
+    def _value(self, column: FakeColumn, text: str):
+        if column.kind == 'json':
+            return text
+        return _encode(column, text)
+
+    def _condition(self, table: FakeTable, name: str, expression: str) -> Tuple[str, list]:
+        negate = expression.startswith('not.')
+        if negate:
+            expression = expression[4:]
+        operator, _, value = expression.partition('.')
+        column = table.column(name.strip('"'))
+        quoted = f'"{column.name}"'
+        if operator in _COMPARISONS:
+            sql, args = f"{quoted} {_COMPARISONS[operator]} ?", [self._value(column, _unquote(value))]
+        elif operator == 'like':
+            pattern = _unquote(value).replace('*', '%').replace('%', '*').replace('_', '?')
+            sql, args = f"{quoted} GLOB ?", [pattern]
+        elif operator == 'ilike':
+            sql, args = f"{quoted} LIKE ?", [_unquote(value).replace('*', '%')]
+        elif operator == 'in':
+            if not (value.startswith('(') and value.endswith(')')):
+                raise ApiError(400, 'PGRST100', f'"failed to parse filter ({expression})"')
+            items = [self._value(column, _unquote(item)) for item in _split_top(value[1:-1])]
+            sql, args = f"{quoted} IN ({', '.join('?' * len(items))})" if items else '0', items
+        elif operator == 'is':
+            checks = {'null': 'IS NULL', 'not_null': 'IS NOT NULL', 'true': '= 1', 'false': '= 0',
+                      'unknown': 'IS NULL'}
+            if value.lower() not in checks:
+                raise ApiError(400, 'PGRST100', f'"failed to parse filter ({expression})"')
+            sql, args = f"{quoted} {checks[value.lower()]}", []
+        else:
+            raise ApiError(400, 'PGRST100', f'"failed to parse filter ({operator}.{value})"',
+                           'operador não suportado pelo PostgREST falso')
+        return (f"NOT ({sql})" if negate else sql), args
+
+    def _logic(self, table: FakeTable, operator: str, text: str) -> Tuple[str, list]:
+        """or=(a.eq.1,and(b.gt.2,c.lt.3)) -> SQL"""
+        if not (text.startswith('(') and text.endswith(')')):
+            raise ApiError(400, 'PGRST100', f'"failed to parse logic tree ({text})"')
+        parts, args = [], []
+        for item in _split_top(text[1:-1]):
+            match = re.match(r'(not\.)?(and|or)(\(.*\))$', item)
+            if match:
+                sql, item_args = self._logic(table, match.group(2), match.group(3))
+                sql = f"NOT {sql}" if match.group(1) else sql
+            else:
+                name, _, expression = item.partition('.')
+                sql, item_args = self._condition(table, name, expression)
+            parts.append(sql)
+            args.extend(item_args)
+        return f"({f' {operator.upper()} '.join(parts) or '1'})", args
+
+    def _where(self, table: FakeTable, params: List[Tuple[str, str]]) -> Tuple[str, list]:
+        clauses, args = [], []
+        for key, value in params:
+            if key in ('and', 'or', 'not.and', 'not.or'):
+                sql, item_args = self._logic(table, key.rsplit('.', 1)[-1], value)
+                sql = f"NOT {sql}" if key.startswith('not.') else sql
+            elif key in _RESERVED_PARAMS:
+                continue
+            else:
+                sql, item_args = self._condition(table, key, value)
+            clauses.append(sql)
+            args.extend(item_args)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), args
+
+    def _order(self, table: FakeTable, order: Optional[str]) -> str:
+        if not order:
+            return ''
+        terms = []
+        for term in order.split(','):
+            name, *options = term.strip().split('.')
+            direction = 'DESC' if 'desc' in options else 'ASC'
+            nulls = 'FIRST' if 'nullsfirst' in options or ('desc' in options and 'nullslast' not in options) else 'LAST'
+            terms.append(f'"{table.column(name).name}" {direction} NULLS {nulls}')
+        return f" ORDER BY {', '.join(terms)}"
+
+    def _embed(self, table: FakeTable, item: str) -> Tuple[str, _Embed]:
+        """`alias:alvo!dica(colunas)`: alvo é a coluna com a FK ou a tabela relacionada"""
+        match = re.fullmatch(r'(?:(\w+):)?(\w+)(?:!(\w+))?\((.*)\)', item, re.S)
+        if not match:
+            raise ApiError(400, 'PGRST100', f'"failed to parse select parameter ({item})"')
+        alias, target, hint, columns = match.groups()
+        inner = hint == 'inner'
+        hint = None if inner else hint
+        column = table.columns.get(target)
+        if column is not None and column.references:
+            # Pela coluna: para-um na tabela referenciada
+            name, _, remote = column.references.partition('.')
+            return alias or target, _Embed(self._table(name), column.name, remote, False, [], inner)
+        related = self._table(target)
+        outgoing = [c for c in table.columns.values()
+                    if c.references and c.references.partition('.')[0] == related.name and hint in (None, c.name)]
+        incoming = [c for c in related.columns.values()
+                    if c.references and c.references.partition('.')[0] == table.name and hint in (None, c.name)]
+        if not outgoing and not incoming:
+            raise ApiError(400, 'PGRST200', f"Could not find a relationship between '{table.name}' and "
+                                            f"'{related.name}' in the schema cache")
+        if len(outgoing) + len(incoming) > 1:
+            raise ApiError(300, 'PGRST201', f"Could not embed because more than one relationship was found for "
+                                            f"'{table.name}' and '{related.name}'",
+                           hint='use !<coluna> para escolher a chave estrangeira')
+        if outgoing:
+            return alias or target, _Embed(related, outgoing[0].name, outgoing[0].references.partition('.')[2],
+                                           False, [], inner)
+        # Para-muitos: linhas da outra tabela que apontam para esta
+        return alias or target, _Embed(related, incoming[0].references.partition('.')[2], incoming[0].name,
+                                       True, [], inner)
+
+    def _select(self, table: FakeTable, select: str) -> Optional[list]:
+        """[(nome na resposta, coluna ou _Embed)] ou None para select=count"""
+        if select.replace(' ', '') in ('count', 'count()'):
+            return None
+        fields = []
+        for item in _split_top(select):
+            if item == '*':
+                fields.extend((name, name) for name in table.columns)
+            elif '(' in item:
+                alias, embed = self._embed(table, item)
+                embed.fields = self._select(embed.table, item[item.index('(') + 1:-1] or '*') or []
+                fields.append((alias, embed))
+            else:
+                alias, _, name = item.split('::', 1)[0].rpartition(':')
+                fields.append((alias or name, table.column(name).name))
+        return fields
+
+    def _embedded(self, embed: _Embed, value):
+        if value is None:
+            return [] if embed.many else None
+        rows = [self._row(embed.table, row, embed.fields) for row in
+                self._db.execute(f'SELECT * FROM "{embed.table.name}" WHERE "{embed.remote}" = ?', (value,))]
+        return rows if embed.many else (rows[0] if rows else None)
+
+    def _row(self, table: FakeTable, row, fields: Optional[list] = None) -> dict:
+        fields = fields or [(name, name) for name in table.columns]
+        return {alias: self._embedded(source, row[source.local]) if isinstance(source, _Embed)
+                else _decode(table.columns.get(source), row[source]) for alias, source in fields}
+
+    def _inner(self, table: FakeTable, fields: Optional[list]) -> List[str]:
+        """`!inner`: só as linhas que têm o recurso embutido"""
+        return [f'EXISTS (SELECT 1 FROM "{embed.table.name}" WHERE "{embed.table.name}"."{embed.remote}" = '
+                f'"{table.name}"."{embed.local}")'
+                for _, embed in (fields or []) if isinstance(embed, _Embed) and embed.inner]
+
+    def select(self, table_name: str, params: List[Tuple[str, str]], headers: Dict[str, str]):
+        """(status, linhas, cabeçalhos extras) de um GET"""
+        table = self._table(table_name)
+        query = dict(params)
+        fields = self._select(table, query.get('select', '*'))
+        where, args = self._where(table, params)
+        inner = self._inner(table, fields)
+        if inner:
+            where = f"{where} AND {' AND '.join(inner)}" if where else f" WHERE {' AND '.join(inner)}"
+        prefer = headers.get('prefer', '')
+        offset, limit = 0, None
+        requested = re.fullmatch(r'\s*(\d+)-(\d*)\s*', headers.get('range', ''))
+        if requested:
+            offset = int(requested.group(1))
+            limit = int(requested.group(2)) - offset + 1 if requested.group(2) else None
+        if 'limit' in query:
+            limit = int(query['limit'])
+        if 'offset' in query:
+            offset = int(query['offset'])
+
+        with self._lock:
+            total = None
+            if fields is None or 'count=' in prefer:
+                total = self._db.execute(f'SELECT COUNT(*) FROM "{table.name}"{where}', args).fetchone()[0]
+            if fields is None:
+                return 200, [{'count': total}], {'Content-Range': f"0-0/{total}"}
+            sql = f'SELECT * FROM "{table.name}"{where}{self._order(table, query.get("order"))}'
+            sql += f" LIMIT {limit if limit is not None else -1} OFFSET {offset}"
+            rows = [self._row(table, row, fields) for row in self._db.execute(sql, args)]
+
+        end = offset + len(rows) - 1
+        content_range = f"{offset}-{end}/{total if total is not None else '*'}" if rows else \
+            f"*/{total if total is not None else '*'}"
+        partial = requested and total is not None and len(rows) < total
+        return (206 if partial else 200), rows, {'Content-Range': content_range}
+
+    def _validate(self, table: FakeTable, values: Dict[str, object]):
+        for column in table.columns.values():
+            if values.get(column.name) is None and not column.nullable:
+                raise ApiError(400, '23502', f'null value in column "{column.name}" of relation "{table.name}" '
+                                             f'violates not-null constraint')
+
+    def insert(self, table_name: str, body, params: List[Tuple[str, str]], prefer: str) -> List[dict]:
+        table = self._table(table_name)
+        rows = body if isinstance(body, list) else [body]
+        if any(not isinstance(row, dict) for row in rows):
+            raise ApiError(400, 'PGRST102', 'All object keys must match')
+        query = dict(params)
+        keys = list(query['columns'].split(',')) if 'columns' in query else list(dict.fromkeys(k for r in rows for k in r))
+        for key in keys:
+            if key not in table.columns:
+                raise ApiError(400, 'PGRST204', f"Could not find the '{key}' column of '{table.name}' in the schema cache")
+        missing_default = 'missing=default' in prefer or len(rows) == 1
+
+        conflict = ''
+        if 'resolution=' in prefer:
+            target = tuple(query['on_conflict'].split(',')) if 'on_conflict' in query else table.primary_key
+            updates = [key for key in keys if key not in target]
+            if 'resolution=ignore-duplicates' in prefer or not updates:
+                conflict = f" ON CONFLICT ({', '.join(target)}) DO NOTHING"
+            else:
+                conflict = (f" ON CONFLICT ({', '.join(target)}) DO UPDATE SET "
+                            + ', '.join(f'"{key}" = excluded."{key}"' for key in updates))
+
+        columns = list(table.columns)
+        names = ', '.join(f'"{name}"' for name in columns)
+        sql = f'INSERT INTO "{table.name}" ({names}) VALUES ({", ".join("?" * len(columns))}){conflict} RETURNING *'
+        inserted = []
+        with self._lock:
+            self._db.execute('BEGIN')
+            try:
+                for row in rows:
+                    values = {}
+                    for name, column in table.columns.items():
+                        if name in row:
+                            values[name] = _encode(column, row[name])
+                        elif name not in keys or missing_default:
+                            values[name] = _encode(column, _default(column))
+                        else:
+                            values[name] = None
+                    self._validate(table, values)
+                    result = self._db.execute(sql, [values[c] for c in columns]).fetchone()
+                    if result is not None:
+                        inserted.append(self._row(table, result))
+                self._db.execute('COMMIT')
+            except sqlite3.IntegrityError as e:
+                self._db.execute('ROLLBACK')
+                raise ApiError(409, '23505', f'duplicate key value violates unique constraint ({e})')
+            except sqlite3.OperationalError as e:
+                self._db.execute('ROLLBACK')
+                raise ApiError(400, '42P10', str(e))
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+        return inserted
+
+    def update(self, table_name: str, body, params: List[Tuple[str, str]]) -> List[dict]:
+        table = self._table(table_name)
+        if not isinstance(body, dict):
+            raise ApiError(400, 'PGRST102', 'Corpo do PATCH deve ser um objeto JSON')
+        values = {}
+        for key, value in body.items():
+            if key not in table.columns:
+                raise ApiError(400, 'PGRST204', f"Could not find the '{key}' column of '{table.name}' in the schema cache")
+            column = table.columns[key]
+            values[key] = _encode(column, value)
+            if values[key] is None and not column.nullable:
+                raise ApiError(400, '23502', f'null value in column "{key}" of relation "{table.name}" '
+                                             f'violates not-null constraint')
+        if table.touch_updated_at and 'updated_at' in table.columns:
+            values['updated_at'] = _now()
+        if not values:
+            return []
+        where, args = self._where(table, params)
+        assignments = ', '.join(f'"{key}" = ?' for key in values)
+        with self._lock:
+            try:
+                cursor = self._db.execute(f'UPDATE "{table.name}" SET {assignments}{where} RETURNING *',
+                                          list(values.values()) + args)
+                return [self._row(table, row) for row in cursor.fetchall()]
+            except sqlite3.IntegrityError as e:
+                raise ApiError(409, '23505', f'duplicate key value violates unique constraint ({e})')
+
+    def delete(self, table_name: str, params: List[Tuple[str, str]]) -> List[dict]:
+        table = self._table(table_name)
+        where, args = self._where(table, params)
+        with self._lock:
+            cursor = self._db.execute(f'DELETE FROM "{table.name}"{where} RETURNING *', args)
+            return [self._row(table, row) for row in cursor.fetchall()]
+
+    def rpc(self, function: str, payload) -> Tuple[int, object]:
+        sql = payload.get('sql') if isinstance(payload, dict) else None
+        if function == 'exec_sql' and isinstance(sql, str):
+            self.execute_sql(sql)
+            return 204, None
+        if function == 'query_sql' and isinstance(sql, str):
+            return 200, self.query(sql)
+        raise ApiError(404, 'PGRST202', f"Could not find the function public.{function} in the schema cache")
+
+    def openapi(self) -> dict:
+        types = {'int': 'integer', 'number': 'number', 'bool': 'boolean', 'text': 'string', 'timestamp': 'string'}
+        definitions = {}
+        for table in self.tables.values():
+            properties = {}
+            for column in table.columns.values():
+                spec = {'format': re.sub(r'\(.*\)', '', column.type).lower()}
+                if column.type.endswith('[]'):
+                    spec['type'] = 'array'
+                elif column.kind in types:
+                    spec['type'] = types[column.kind]
+                properties[column.name] = spec
+            required = [c.name for c in table.columns.values() if not c.nullable and c.default is None]
+            definitions[table.name] = {'type': 'object', 'properties': properties, 'required': required}
+        return {'swagger': '2.0', 'info': {'title': 'PostgREST falso (SQLite)'}, 'definitions': definitions}
+
+
+def _affected(rows: List[dict], prefer: str) -> Dict[str, str]:
+    """Content-Range de um POST/PATCH/DELETE: total de linhas afetadas quando pedido"""
+    if 'count=' not in prefer:
+        return {}
+    return {'Content-Range': f"0-{len(rows) - 1}/{len(rows)}" if rows else '*/0'}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo no mesmo envio: sem isso o Nagle + ACK atrasado somam ~40 ms por resposta
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body=None, headers: Optional[Dict[str, str]] = None, server_ms: float = 0.0):
+        data = b'' if body is None or status == 204 else json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        if data:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Server-Timing', f"transaction;dur={server_ms:.3f}")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if data and self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def _handle(self):
+        fake = self.server.fake
+        parts = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+
+        injected = fake._inject()
+        if injected is not None:
+            self._reply(injected, {'code': 'PGRST000', 'details': None, 'hint': 'erro injetado pelo PostgREST falso',
+                                   'message': 'Service Unavailable'}, {'Retry-After': '1'})
+            return
+
+        path = unquote(parts.path)
+        if not path.startswith('/rest/v1'):
+            self._reply(404, {'code': 'PGRST000', 'details': None, 'hint': None, 'message': f"Rota não suportada: {path}"})
+            return
+        resource = path[len('/rest/v1'):].strip('/')
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        prefer = headers.get('prefer', '')
+        started = time.perf_counter()
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            self._reply(400, {'code': 'PGRST102', 'details': None, 'hint': None, 'message': 'Empty or invalid json'})
+            return
+
+        def elapsed():
+            return (time.perf_counter() - started) * 1000
+
+        try:
+            if not resource:
+                self._reply(200, fake.openapi(), server_ms=elapsed())
+            elif resource.startswith('rpc/'):
+                status, result = fake.rpc(resource[4:], body)
+                self._reply(status, result, server_ms=elapsed())
+            elif self.command in ('GET', 'HEAD'):
+                status, rows, extra = fake.select(resource, params, headers)
+                self._reply(status, rows, extra, elapsed())
+            elif self.command == 'POST':
+                rows = fake.insert(resource, body if body is not None else [], params, prefer)
+                self._reply(201, rows if 'return=representation' in prefer else None, _affected(rows, prefer),
+                            elapsed())
+            elif self.command == 'PATCH':
+                rows = fake.update(resource, body, params)
+                representation = 'return=representation' in prefer
+                self._reply(200 if representation else 204, rows if representation else None,
+                            _affected(rows, prefer), elapsed())
+            elif self.command == 'DELETE':
+                rows = fake.delete(resource, params)
+                representation = 'return=representation' in prefer
+                self._reply(200 if representation else 204, rows if representation else None,
+                            _affected(rows, prefer), elapsed())
+            else:
+                self._reply(405, {'code': 'PGRST117', 'details': None, 'hint': None,
+                                  'message': f"Unsupported HTTP method: {self.command}"})
+        except ApiError as e:
+            self._reply(e.status, e.body, server_ms=elapsed())
+        except (ValueError, KeyError, sqlite3.Error) as e:
+            self._reply(400, {'code': 'PGRST100', 'details': None, 'hint': None, 'message': str(e)},
+                        server_ms=elapsed())
+
+    do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = _handle
@@ -0,0 +1,142 @@
+"""
+📈 Histograma de latência HDR (High Dynamic Range)
+Mesma organização de baldes do HdrHistogram: faixas por potência de 2, cada
+uma dividida em sub-baldes lineares, com erro relativo limitado por
+`significant_figures` (3 => 0,1%) em toda a faixa, de microssegundos a minutos,
+com memória fixa. Os percentis altos (p99, p99.9) ficam exatos o bastante para
+comparar execuções, o que médias e amostras não garantem.
+
+Os contadores são esparsos ({índice: contagem}), então histogramas de várias
+threads ou processos podem ser somados (`merge`) e serializados em JSON
+(`to_dict`/`from_dict`) sem perder precisão.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, Optional
+
+DEFAULT_LOWEST = 1                 # 1 µs
+DEFAULT_HIGHEST = 3_600_000_000    # 1 h em µs
+DEFAULT_SIGNIFICANT_FIGURES = 3
+DEFAULT_PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Valores inteiros (microssegundos por convenção) em baldes log-lineares"""
+
+    def __init__(self, lowest: int = DEFAULT_LOWEST, highest: int = DEFAULT_HIGHEST,
+                 significant_figures: int = DEFAULT_SIGNIFICANT_FIGURES):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures deve estar entre 1 e 5")
+        self.lowest = max(1, int(lowest))
+        self.highest = max(2 * self.lowest, int(highest))
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        self._unit_magnitude = int(math.floor(math.log2(self.lowest)))
+        self._sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self._sub_bucket_half_count_magnitude = self._sub_bucket_count_magnitude - 1
+        self._sub_bucket_count = 1 << self._sub_bucket_count_magnitude
+        self._sub_bucket_half_count = self._sub_bucket_count // 2
+        self._sub_bucket_mask = (self._sub_bucket_count - 1) << self._unit_magnitude
+
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._sum = 0
+        self._lock = threading.Lock()
+
+    # Índices no estilo HdrHistogram
+    def _index(self, value: int) -> int:
+        bucket = (value | self._sub_bucket_mask).bit_length() - self._unit_magnitude - \
+            (self._sub_bucket_half_count_magnitude + 1)
+        sub_bucket = value >> (bucket + self._unit_magnitude)
+        return ((bucket + 1) << self._sub_bucket_half_count_magnitude) + (sub_bucket - self._sub_bucket_half_count)
+
+    def _highest_equivalent(self, index: int) -> int:
+        bucket = (index >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket < 0:
+            sub_bucket -= self._sub_bucket_half_count
+            bucket = 0
+        shift = bucket + self._unit_magnitude
+        return (sub_bucket << shift) + (1 << shift) - 1
+
+    def record(self, value, count: int = 1):
+        value = min(max(int(value), 0), self.highest)
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.total += count
+            self._sum += value * count
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def record_seconds(self, seconds: float):
+        """Atalho: duração em segundos (perf_counter) gravada em microssegundos"""
+        self.record(round(seconds * 1_000_000))
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        if (other.lowest, other.significant_figures) != (self.lowest, self.significant_figures):
+            raise ValueError("Histogramas com configurações diferentes não podem ser somados")
+        with self._lock:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.total += other.total
+            self._sum += other._sum
+            if other.min is not None:
+                self.min = other.min if self.min is None else min(self.min, other.min)
+                self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total if self.total else 0.0
+
+    def percentile(self, percentile: float) -> int:
+        """Maior valor equivalente ao balde que contém o percentil pedido"""
+        if not self.total:
+            return 0
+        target = max(1, int(math.ceil(percentile / 100.0 * self.total)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[float, int]:
+        return {p: self.percentile(p) for p in percentiles}
+
+    def summary_ms(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Optional[float]]:
+        """Resumo em milissegundos: count, min, mean, pXX, max"""
+        summary = {'count': self.total,
+                   'min': self.min / 1000 if self.min is not None else None,
+                   'mean': round(self.mean / 1000, 3)}
+        for p, value in self.percentiles(percentiles).items():
+            summary[f"p{p:g}"] = value / 1000
+        summary['max'] = self.max / 1000 if self.max is not None else None
+        return summary
+
+    def to_dict(self) -> dict:
+        return {
+            'lowest': self.lowest,
+            'highest': self.highest,
+            'significant_figures': self.significant_figures,
+            'total': self.total,
+            'sum': self._sum,
+            'min': self.min,
+            'max': self.max,
+            'counts': {str(index): count for index, count in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LatencyHistogram':
+        histogram = cls(data['lowest'], data['highest'], data['significant_figures'])
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        histogram.total = data['total']
+        histogram._sum = data['sum']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
@@ -0,0 +1,412 @@
+"""
+📥 Importação em streaming (CSV/NDJSON) com upsert em lotes
+Lê o arquivo registro a registro (memória limitada ao tamanho do lote vezes os
+envios em andamento), converte e valida cada linha contra o modelo da tabela
+(NOT NULL, CHECK de `choices`, tamanho de VARCHAR, UUID, datas, JSON) antes de
+enviar, e grava lotes via POST com `Prefer: resolution=merge-duplicates`.
+
+O progresso é salvo num checkpoint após cada lote confirmado; se a importação
+for interrompida, a próxima execução com o mesmo arquivo pula os registros já
+gravados. Os lotes em andamento na interrupção podem ter sido gravados sem
+entrar no checkpoint e são reenviados: como são upserts, isso só é inofensivo
+se as linhas trazem a chave do conflito (`on_conflict` ou a chave primária).
+Linhas sem ela recebem um id novo do banco (gen_random_uuid()) e seriam
+duplicadas, então a retomada é recusada nesse caso.
+Linhas inválidas não são enviadas: vão para um arquivo de rejeitados (NDJSON)
+com o número da linha e os erros.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .client import get_admin_client, RETURN_MINIMAL
+from .schema import Column, Table
+from .sql import error_message
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHECKPOINT_DIR = os.path.join('.cache', 'import')
+MERGE_DUPLICATES = 'resolution=merge-duplicates'
+MISSING_DEFAULT = 'missing=default'
+
+_TRUE = ('true', 't', '1', 'yes', 'y', 'sim', 's')
+_FALSE = ('false', 'f', '0', 'no', 'n', 'nao', 'não')
+_VARCHAR_RE = re.compile(r'^VARCHAR\((\d+)\)$', re.IGNORECASE)
+_DECIMAL_RE = re.compile(r'^DECIMAL\((\d+),\s*(\d+)\)$', re.IGNORECASE)
+
+
+def detect_format(path: str) -> str:
+    return 'ndjson' if path.lower().endswith(('.ndjson', '.jsonl', '.json')) else 'csv'
+
+
+def iter_records(path: str, file_format: Optional[str] = None) -> Iterator[Tuple[int, dict]]:
+    """(linha, registro) do arquivo, um por vez"""
+    file_format = file_format or detect_format(path)
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        if file_format == 'csv':
+            reader = csv.DictReader(f)
+            for record in reader:
+                # Linha onde o registro termina (campos entre aspas podem ter quebras)
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield line_number, json.loads(line)
+                    except ValueError as e:
+                        yield line_number, {'__error__': f"JSON inválido: {e}"}
+
+
+class _Invalid(ValueError):
+    pass
+
+
+def _coerce(column: Column, value):
+    """Converter o valor lido (texto no CSV) para o tipo JSON esperado pelo PostgREST"""
+    if value is None or (isinstance(value, str) and value.strip() == ''):
+        return None
+    sql_type = column.type.upper()
+
+    if sql_type in ('BOOLEAN', 'BOOL'):
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise _Invalid(f"booleano inválido: {value!r}")
+
+    if sql_type in ('INTEGER', 'INT', 'BIGINT'):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise _Invalid(f"inteiro inválido: {value!r}")
+        if number != int(number):
+            raise _Invalid(f"inteiro inválido: {value!r}")
+        return int(number)
+
+    match = _DECIMAL_RE.match(sql_type)
+    if match:
+        try:
+            number = round(float(str(value).replace(',', '.') if isinstance(value, str) else value),
+                           int(match.group(2)))
+        except (TypeError, ValueError):
+            raise _Invalid(f"número inválido: {value!r}")
+        if abs(number) >= 10 ** (int(match.group(1)) - int(match.group(2))):
+            raise _Invalid(f"{value!r} excede {column.type}")
+        return number
+
+    if sql_type == 'UUID':
+        try:
+            return str(uuid.UUID(str(value).strip()))
+        except ValueError:
+            raise _Invalid(f"UUID inválido: {value!r}")
+
+    if sql_type == 'DATE':
+        try:
+            return date.fromisoformat(str(value).strip()[:10]).isoformat()
+        except ValueError:
+            raise _Invalid(f"data inválida: {value!r}")
+
+    if sql_type.startswith('TIMESTAMP'):
+        text = str(value).strip()
+        try:
+            datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            raise _Invalid(f"data/hora inválida: {value!r}")
+        return text
+
+    if sql_type == 'JSONB':
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except ValueError:
+                raise _Invalid(f"JSON inválido: {value!r}")
+        return value
+
+    if sql_type.endswith('[]'):
+        if isinstance(value, list):
+            return [str(item) for item in value]
+        text = str(value).strip()
+        # Aceita o literal do Postgres {a,b} ou uma lista separada por ;
+        if text.startswith('{') and text.endswith('}'):
+            text = text[1:-1].replace(',', ';')
+        return [item.strip().strip('"') for item in text.split(';') if item.strip()]
+
+    text = value if isinstance(value, str) else str(value)
+    match = _VARCHAR_RE.match(sql_type)
+    if match and len(text) > int(match.group(1)):
+        raise _Invalid(f"{len(text)} caracteres excede {column.type}")
+    return text
+
+
+def validate_record(table: Table, record: dict, defaults: Optional[dict] = None) -> Tuple[dict, List[str]]:
+    """(linha convertida, erros) conforme as restrições do modelo da tabela"""
+    if '__error__' in record:
+        return {}, [record['__error__']]
+
+    row: Dict[str, object] = {}
+    errors: List[str] = []
+    for name, value in record.items():
+        if name is None:
+            errors.append("colunas a mais que o cabeçalho")
+            continue
+        column = table.column(name.strip())
+        if column is None:
+            errors.append(f"coluna desconhecida: {name}")
+            continue
+        try:
+            row[column.name] = _coerce(column, value)
+        except _Invalid as e:
+            errors.append(f"{column.name}: {e}")
+
+    for name, value in (defaults or {}).items():
+        if row.get(name) is None:
+            row[name] = value
+
+    for column in table.columns:
+        value = row.get(column.name)
+        if value is None:
+            # Ausente ou vazio: fica fora do lote e o default da coluna vale (missing=default)
+            if not column.nullable and column.default is None and not column.primary_key:
+                errors.append(f"{column.name}: obrigatório")
+            row.pop(column.name, None)
+        elif column.choices and value not in column.choices:
+            errors.append(f"{column.name}: {value!r} fora de {', '.join(column.choices)}")
+
+    return row, errors
+
+
+@dataclass
+class Rejected:
+    line: int
+    errors: List[str]
+    record: dict
+
+
+@dataclass
+class ImportCheckpoint:
+    """Posição confirmada da importação de um arquivo"""
+    path: str
+    table: str
+    size: int
+    mtime: float
+    records: int = 0
+    rows: int = 0
+    rejected: int = 0
+
+    @classmethod
+    def for_file(cls, path: str, table: str) -> 'ImportCheckpoint':
+        stat = os.stat(path)
+        return cls(os.path.abspath(path), table, stat.st_size, stat.st_mtime)
+
+    def matches(self, other: 'ImportCheckpoint') -> bool:
+        return (self.path, self.table, self.size, self.mtime) == (other.path, other.table, other.size, other.mtime)
+
+
+def checkpoint_path(path: str, table: str, directory: str = DEFAULT_CHECKPOINT_DIR) -> str:
+    name = re.sub(r'[^\w.-]+', '_', os.path.abspath(path).strip('/'))
+    return os.path.join(directory, f"{table}--{name}.json")
+
+
+def load_checkpoint(path: str, table: str, directory: str = DEFAULT_CHECKPOINT_DIR) -> ImportCheckpoint:
+    """Checkpoint salvo para o arquivo, ou um novo se o arquivo mudou desde então"""
+    current = ImportCheckpoint.for_file(path, table)
+    try:
+        with open(checkpoint_path(path, table, directory), 'r') as f:
+            saved = ImportCheckpoint(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return current
+    return saved if saved.matches(current) else current
+
+
+def save_checkpoint(checkpoint: ImportCheckpoint, directory: str = DEFAULT_CHECKPOINT_DIR):
+    os.makedirs(directory, exist_ok=True)
+    target = checkpoint_path(checkpoint.path, checkpoint.table, directory)
+    temporary = target + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(checkpoint.__dict__, f)
+    os.replace(temporary, target)
+
+
+def clear_checkpoint(path: str, table: str, directory: str = DEFAULT_CHECKPOINT_DIR):
+    try:
+        os.remove(checkpoint_path(path, table, directory))
+    except OSError:
+        pass
+
+
+@dataclass
+class _Chunk:
+    rows: List[dict]
+    records: int
+    rejected: List[Rejected]
+    first_line: int
+    last_line: int
+
+
+@dataclass
+class ImportReport:
+    table: str
+    path: str
+    resumed_from: int = 0
+    records: int = 0
+    rows: int = 0
+    rejected: int = 0
+    requests: int = 0
+    elapsed_ms: float = 0.0
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    error_lines: Tuple[int, int] = (0, 0)
+    completed: bool = False
+    resumable: bool = True
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / (self.elapsed_ms / 1000) if self.elapsed_ms else 0.0
+
+
+def _chunks(table: Table, records: Iterator[Tuple[int, dict]], chunk_size: int,
+            defaults: Optional[dict]) -> Iterator[_Chunk]:
+    chunk = _Chunk([], 0, [], 0, 0)
+    for line, record in records:
+        row, errors = validate_record(table, record, defaults)
+        chunk.records += 1
+        chunk.first_line = chunk.first_line or line
+        chunk.last_line = line
+        if errors:
+            chunk.rejected.append(Rejected(line, errors, record))
+        else:
+            chunk.rows.append(row)
+        if chunk.records >= chunk_size:
+            yield chunk
+            chunk = _Chunk([], 0, [], 0, 0)
+    if chunk.records:
+        yield chunk
+
+
+def conflict_columns(table: Table, on_conflict: Optional[str] = None) -> List[str]:
+    """Colunas que identificam a linha no upsert: `on_conflict` ou a chave primária"""
+    if on_conflict:
+        return [name.strip() for name in on_conflict.split(',') if name.strip()]
+    return [column.name for column in table.columns if column.primary_key]
+
+
+def _without_key(rows: List[dict], columns: List[str]) -> int:
+    return sum(1 for row in rows if any(row.get(name) is None for name in columns))
+
+
+def _upsert(client, table: str, rows: List[dict], on_conflict: Optional[str]):
+    if not rows:
+        return None
+    # Registros do NDJSON podem ter chaves diferentes: `columns` fixa o conjunto do lote
+    columns = sorted({name for row in rows for name in row})
+    params = {'columns': ','.join(columns)}
+    if on_conflict:
+        params['on_conflict'] = on_conflict
+    return client.post(table, json=rows, params=params,
+                       prefer=f"{MERGE_DUPLICATES},{MISSING_DEFAULT},{RETURN_MINIMAL}")
+
+
+def import_file(path: str, table: Table, client=None, file_format: Optional[str] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 2, on_conflict: Optional[str] = None,
+                defaults: Optional[dict] = None, rejects_path: Optional[str] = None,
+                resume: bool = True, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR,
+                on_progress=None) -> ImportReport:
+    """Importar o arquivo em lotes de upsert, retomando do último checkpoint
+
+    Até `workers` lotes ficam em andamento; o checkpoint só avança sobre lotes
+    confirmados em sequência, então uma falha nunca pula registros. Com
+    `resume=False` o checkpoint não é lido, gravado nem apagado (validação).
+    """
+    client = client or get_admin_client()
+    checkpoint = load_checkpoint(path, table.name, checkpoint_dir) if resume else \
+        ImportCheckpoint.for_file(path, table.name)
+    report = ImportReport(table.name, path, resumed_from=checkpoint.records,
+                          rows=checkpoint.rows, rejected=checkpoint.rejected, records=checkpoint.records)
+    started = time.perf_counter()
+
+    records = iter_records(path, file_format)
+    for _ in range(checkpoint.records):
+        if next(records, None) is None:
+            break
+
+    rejects = open(rejects_path, 'a' if checkpoint.records else 'w') if rejects_path else None
+    pending = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            def confirm():
+                chunk, future = pending.popleft()
+                try:
+                    response = future.result()
+                except Exception as e:
+                    report.error, report.error_lines = str(e), (chunk.first_line, chunk.last_line)
+                    return False
+                if response is not None:
+                    report.requests += 1
+                    if response.status_code not in (200, 201, 204):
+                        report.status_code = response.status_code
+                        report.error = error_message(response)
+                        report.error_lines = (chunk.first_line, chunk.last_line)
+                        return False
+
+                if rejects:
+                    for rejected in chunk.rejected:
+                        rejects.write(json.dumps({'line': rejected.line, 'errors': rejected.errors,
+                                                  'record': rejected.record}, ensure_ascii=False) + '\n')
+                    rejects.flush()
+                checkpoint.records += chunk.records
+                checkpoint.rows += len(chunk.rows)
+                checkpoint.rejected += len(chunk.rejected)
+                if resume:
+                    save_checkpoint(checkpoint, checkpoint_dir)
+                report.records, report.rows, report.rejected = checkpoint.records, checkpoint.rows, checkpoint.rejected
+                if on_progress:
+                    on_progress(report)
+                return True
+
+            key = conflict_columns(table, on_conflict)
+            # Na retomada, os primeiros `workers` lotes podem já ter sido gravados antes da interrupção
+            unconfirmed = max(1, workers) if checkpoint.records else 0
+            for chunk in _chunks(table, records, chunk_size, defaults):
+                missing = _without_key(chunk.rows, key) if unconfirmed else 0
+                unconfirmed = max(0, unconfirmed - 1)
+                if missing:
+                    report.error = (f"{missing} linha(s) sem {', '.join(key)}: retomar duplicaria os lotes "
+                                    f"gravados após o checkpoint (a partir da linha {chunk.first_line}); "
+                                    f"use on_conflict com uma chave natural UNIQUE presente no arquivo")
+                    report.error_lines = (chunk.first_line, chunk.last_line)
+                    report.resumable = False
+                    break
+                pending.append((chunk, executor.submit(_upsert, client, table.name, chunk.rows, on_conflict)))
+                if len(pending) >= max(1, workers) and not confirm():
+                    break
+            while pending and report.success:
+                if not confirm():
+                    break
+            # Após uma falha, esperar os lotes já enviados sem avançar o checkpoint
+            for _, future in pending:
+                future.exception()
+    finally:
+        if rejects:
+            rejects.close()
+
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    if report.success:
+        report.completed = True
+        if resume:
+            clear_checkpoint(path, table.name, checkpoint_dir)
+    return report
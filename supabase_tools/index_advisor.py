@@ -0,0 +1,260 @@
+"""
+🧭 Consultor de índices (RLS + padrões de consulta da aplicação)
+Lê as políticas RLS (docs/rls-policies.sql) e os filtros usados pelos serviços do
+frontend (nciso-frontend/src/lib/services/*.ts) e propõe índices para o modelo:
+
+- compostos `(tenant_id, coluna)`: toda consulta via PostgREST já carrega o
+  predicado de tenant da política, então a coluna filtrada pela aplicação entra
+  como segunda chave;
+- parciais `(tenant_id) WHERE is_active` para listagens de registros ativos;
+- BRIN em `created_at` para varreduras por período em tabelas só de inserção.
+
+Índices de uma coluna que passam a ser cobertos (prefixo de um composto ou
+substituídos pelo parcial) são marcados como redundantes. Índices de chaves
+estrangeiras são mantidos: o Postgres precisa deles nas exclusões em cascata.
+"""
+
+import glob
+import math
+import re
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .schema import Index, Schema, Table
+from .sql import read_statements
+
+DEFAULT_POLICY_FILE = 'docs/rls-policies.sql'
+DEFAULT_SERVICES_GLOB = 'nciso-frontend/src/lib/services/*.ts'
+TENANT_COLUMN = 'tenant_id'
+
+PAGE_SIZE = 8192
+BTREE_FILL = 0.9
+BRIN_PAGES_PER_RANGE = 128
+
+_POLICY_RE = re.compile(r'^CREATE\s+POLICY\s+"?([^"\s]+)"?\s+ON\s+(?:public\.)?"?(\w+)"?(.*)$',
+                        re.IGNORECASE | re.DOTALL)
+# coluna = (auth.jwt() ->> 'claim')::tipo   /   coluna = auth.uid()
+_CLAIM_PREDICATE_RE = re.compile(r'\b(\w+)\s*=\s*\(?\s*(?:\(\s*select\s+)?auth\.\w+\(\)', re.IGNORECASE)
+_FROM_RE = re.compile(r"\.from\(\s*(?:'(\w+)'|\"(\w+)\"|this\.TABLE_NAME)\s*\)")
+_TABLE_NAME_RE = re.compile(r"TABLE_NAME\s*=\s*['\"](\w+)['\"]")
+_FILTER_RE = re.compile(r"\.(eq|neq|gt|gte|lt|lte|in|is|order)\(\s*['\"](\w+)['\"]")
+_METHOD_RE = re.compile(r'^\s*(?:public\s+|private\s+|static\s+)*async\s+\w+\s*\(', re.MULTILINE)
+
+# Largura média (bytes) de cada tipo dentro de uma entrada de índice
+_TYPE_WIDTHS = (
+    (r'^UUID$', 16),
+    (r'^BOOL(EAN)?$', 1),
+    (r'^(INT|INTEGER|DATE)$', 4),
+    (r'^(BIGINT|TIMESTAMP.*|TIMESTAMPTZ)$', 8),
+    (r'^DECIMAL.*$', 8),
+)
+_DEFAULT_VARCHAR_WIDTH = 16
+
+
+@dataclass(frozen=True)
+class QueryPattern:
+    """Filtros de uma consulta da aplicação (`.from(...)` + `.eq/.gte/.order...`)"""
+    table: str
+    equality: Tuple[str, ...] = ()
+    ranges: Tuple[str, ...] = ()
+    order: Tuple[str, ...] = ()
+    source: str = ''
+
+
+@dataclass(frozen=True)
+class IndexProposal:
+    table: str
+    index: Index
+    reason: str
+
+
+@dataclass(frozen=True)
+class RedundantIndex:
+    table: str
+    index: Index
+    replaced_by: str
+    reason: str
+
+
+@dataclass
+class IndexAdvice:
+    proposals: List[IndexProposal] = field(default_factory=list)
+    redundant: List[RedundantIndex] = field(default_factory=list)
+
+    def for_table(self, name: str):
+        return ([p for p in self.proposals if p.table == name],
+                [r for r in self.redundant if r.table == name])
+
+
+def policy_columns(path: str = DEFAULT_POLICY_FILE) -> Dict[str, Set[str]]:
+    """{tabela: colunas comparadas a claims do JWT} nas políticas RLS"""
+    columns: Dict[str, Set[str]] = {}
+    for statement in read_statements(path):
+        # Comentários antes do CREATE POLICY ficam no início do comando
+        body = '\n'.join(line for line in statement.sql.splitlines() if not line.strip().startswith('--'))
+        match = _POLICY_RE.match(body.strip())
+        if not match:
+            continue
+        table, predicate = match.group(2).lower(), match.group(3)
+        # Subconsultas (IN (SELECT ... FROM outra_tabela ...)) filtram a outra tabela
+        if re.search(r'\bIN\s*\(\s*SELECT\b', predicate, re.IGNORECASE):
+            continue
+        found = {column.lower() for column in _CLAIM_PREDICATE_RE.findall(predicate)}
+        if found:
+            columns.setdefault(table, set()).update(found)
+    return columns
+
+
+def query_patterns(paths: Iterable[str]) -> List[QueryPattern]:
+    """Padrões de filtro das chamadas supabase-js nos serviços do frontend"""
+    patterns = []
+    for path in paths:
+        with open(path, 'r') as f:
+            source = f.read()
+        table_constant = _TABLE_NAME_RE.search(source)
+        # Cada método async é analisado isoladamente
+        bodies = _METHOD_RE.split(source)[1:]
+        for body in bodies:
+            for table, text in _split_queries(body):
+                if table is None:
+                    if not table_constant:
+                        continue
+                    table = table_constant.group(1)
+                filters = _FILTER_RE.findall(text)
+                equality = tuple(dict.fromkeys(c for op, c in filters if op in ('eq', 'in', 'is') and c != 'id'))
+                ranges = tuple(dict.fromkeys(c for op, c in filters if op in ('gt', 'gte', 'lt', 'lte')))
+                order = tuple(dict.fromkeys(c for op, c in filters if op == 'order'))
+                if equality or ranges or order:
+                    patterns.append(QueryPattern(table, equality, ranges, order, path))
+    return patterns
+
+
+def _split_queries(body: str):
+    """[(tabela ou None para this.TABLE_NAME, texto até o próximo .from)]"""
+    matches = list(_FROM_RE.finditer(body))
+    chunks = []
+    for number, match in enumerate(matches):
+        end = matches[number + 1].start() if number + 1 < len(matches) else len(body)
+        chunks.append((match.group(1) or match.group(2), body[match.end():end]))
+    return chunks
+
+
+def _column_width(table: Table, name: str) -> int:
+    column = table.column(name)
+    sql_type = column.type.upper() if column else 'TEXT'
+    for pattern, width in _TYPE_WIDTHS:
+        if re.match(pattern, sql_type):
+            return width
+    match = re.match(r'^VARCHAR\((\d+)\)$', sql_type)
+    if match:
+        return 1 + min(int(match.group(1)), _DEFAULT_VARCHAR_WIDTH)
+    return 1 + _DEFAULT_VARCHAR_WIDTH
+
+
+def estimate_index_bytes(table: Table, index: Index, rows: int, active_fraction: float = 0.8,
+                         row_width: int = 256) -> int:
+    """Tamanho aproximado do índice para `rows` linhas na tabela"""
+    if index.method and index.method.lower() == 'brin':
+        heap_pages = math.ceil(rows * row_width / PAGE_SIZE)
+        ranges = math.ceil(heap_pages / BRIN_PAGES_PER_RANGE)
+        # Metapágina + revmap + páginas de resumo (~32 bytes por faixa)
+        return (2 + math.ceil(ranges * 32 / PAGE_SIZE)) * PAGE_SIZE
+
+    if index.where:
+        rows = int(rows * active_fraction)
+    key = sum(_column_width(table, name) for name in index.columns)
+    # Cabeçalho da tupla de índice (8) + chave alinhada em 8 + ponteiro de linha (4)
+    entry = 8 + 8 * math.ceil(key / 8) + 4
+    leaf_pages = math.ceil(rows * entry / ((PAGE_SIZE - 24) * BTREE_FILL))
+    # ~1% de páginas internas + metapágina
+    return (leaf_pages + math.ceil(leaf_pages / 100) + 1) * PAGE_SIZE
+
+
+def advise_indexes(schema: Schema, policies: Dict[str, Set[str]],
+                   patterns: Iterable[QueryPattern]) -> IndexAdvice:
+    """Propor índices compostos/parciais/BRIN e marcar os de uma coluna redundantes"""
+    patterns = list(patterns)
+    advice = IndexAdvice()
+
+    for table in schema.tables:
+        tenant_columns = policies.get(table.name) or set()
+        if TENANT_COLUMN in tenant_columns or (not tenant_columns and table.column(TENANT_COLUMN)):
+            leading = TENANT_COLUMN
+        else:
+            continue
+
+        table_patterns = [p for p in patterns if p.table == table.name]
+        fk_columns = {name for name, _ in table.foreign_keys}
+        existing = {index.index_name(table.name) for index in table.indexes}
+        proposed: List[IndexProposal] = []
+
+        equality_columns: List[str] = []
+        for pattern in table_patterns:
+            for name in pattern.equality:
+                if name not in equality_columns and name != leading and table.column(name):
+                    equality_columns.append(name)
+
+        for name in equality_columns:
+            column = table.column(name)
+            if name in fk_columns:
+                continue
+            if column.type.upper() in ('BOOLEAN', 'BOOL'):
+                if name == 'is_active':
+                    index = Index((leading,), name=f"idx_{table.name}_{leading}_active", where='is_active')
+                    proposed.append(IndexProposal(table.name, index,
+                                                  f"listagens filtram {name} = true dentro do tenant"))
+                continue
+            index = Index((leading, name))
+            proposed.append(IndexProposal(table.name, index,
+                                          f"RLS filtra {leading} e a aplicação filtra {name}"))
+
+        uses_created_at = any('created_at' in p.order or 'created_at' in p.ranges for p in table_patterns)
+        if uses_created_at and table.column('created_at'):
+            index = Index(('created_at',), name=f"idx_{table.name}_created_at_brin", method='brin')
+            proposed.append(IndexProposal(table.name, index,
+                                          "created_at cresce com a inserção: BRIN cobre varreduras por período"))
+
+        proposed = [p for p in proposed if p.index.index_name(table.name) not in existing]
+        advice.proposals.extend(proposed)
+
+        for index in table.indexes:
+            if len(index.columns) != 1 or index.unique or index.where or index.method:
+                continue
+            column = index.columns[0]
+            if column in fk_columns:
+                continue
+            for proposal in proposed:
+                new = proposal.index
+                new_name = new.index_name(table.name)
+                if new.method:
+                    continue
+                if column == leading and new.columns[0] == leading and len(new.columns) > 1:
+                    reason = f"{column} é prefixo de {new_name}"
+                elif column != leading and new.columns == (leading, column):
+                    reason = f"toda consulta carrega {leading} pela RLS: {new_name} cobre {column}"
+                elif column == 'is_active' and new.where == 'is_active':
+                    reason = f"substituído pelo índice parcial {new_name}"
+                else:
+                    continue
+                advice.redundant.append(RedundantIndex(table.name, index, new_name, reason))
+                break
+
+    return advice
+
+
+def apply_index_advice(schema: Schema, advice: IndexAdvice) -> Schema:
+    """Novo modelo com os índices propostos e sem os redundantes"""
+    tables = []
+    for table in schema.tables:
+        proposals, redundant = advice.for_table(table.name)
+        dropped = {r.index.index_name(table.name) for r in redundant}
+        indexes = tuple(i for i in table.indexes if i.index_name(table.name) not in dropped)
+        indexes += tuple(p.index for p in proposals)
+        tables.append(replace(table, indexes=indexes))
+    return replace(schema, tables=tuple(tables))
+
+
+def load_advice(schema: Schema, policy_file: str = DEFAULT_POLICY_FILE,
+                services_glob: str = DEFAULT_SERVICES_GLOB) -> IndexAdvice:
+    """Atalho: políticas + serviços do frontend nos caminhos padrão do repositório"""
+    return advise_indexes(schema, policy_columns(policy_file), query_patterns(sorted(glob.glob(services_glob))))
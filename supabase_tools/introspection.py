@@ -0,0 +1,130 @@
+"""
+🧭 Introspecção do schema via OpenAPI do PostgREST
+O PostgREST publica todas as tabelas e colunas expostas em `GET /rest/v1/`.
+Este módulo busca esse documento uma única vez, guarda-o em disco (validado
+por ETag quando o servidor envia, e identificado pelo hash do schema) e
+responde localmente "quais tabelas/colunas existem".
+"""
+
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from .client import get_client
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'supabase')
+DEFAULT_MAX_AGE = 300  # segundos em que o cache é usado sem revalidar
+
+OPENAPI_ACCEPT = 'application/openapi+json'
+
+
+def schema_hash(document):
+    """Hash estável das definições (tabelas/colunas) do documento OpenAPI"""
+    definitions = document.get('definitions', {})
+    canonical = json.dumps(definitions, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class SchemaIntrospector:
+    """Tabelas e colunas expostas pelo PostgREST, com cache local"""
+
+    def __init__(self, client=None, cache_dir=DEFAULT_CACHE_DIR, max_age=DEFAULT_MAX_AGE):
+        self.client = client or get_client()
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self._cache = None
+
+    @property
+    def cache_path(self):
+        host = urlparse(self.client.url).netloc or 'local'
+        safe_host = host.replace(':', '_')
+        return os.path.join(self.cache_dir, f"openapi-{safe_host}.json")
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def load(self, refresh=False):
+        """Documento OpenAPI (do cache quando válido, senão do servidor)"""
+        if self._cache is not None and not refresh:
+            return self._cache['document']
+
+        cached = self._read_cache()
+        if cached and not refresh and time.time() - cached.get('fetched_at', 0) < self.max_age:
+            self._cache = cached
+            return cached['document']
+
+        headers = {'Accept': OPENAPI_ACCEPT}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+
+        response = self.client.get('', headers=headers)
+
+        if response.status_code == 304 and cached:
+            cached['fetched_at'] = time.time()
+            self._write_cache(cached)
+            self._cache = cached
+            return cached['document']
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Falha ao buscar o schema OpenAPI ({response.status_code}): {response.text}"
+            )
+
+        document = response.json()
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'schema_hash': schema_hash(document),
+            'fetched_at': time.time(),
+            'document': document
+        }
+        self._write_cache(entry)
+        self._cache = entry
+        return document
+
+    @property
+    def schema_hash(self):
+        self.load()
+        return self._cache['schema_hash']
+
+    def tables(self):
+        """Nomes de todas as tabelas/views expostas"""
+        return set(self.load().get('definitions', {}).keys())
+
+    def has_table(self, table):
+        return table in self.tables()
+
+    def columns(self, table):
+        """Colunas de uma tabela: {nome: {'type', 'format', 'required'}}"""
+        definition = self.load().get('definitions', {}).get(table)
+        if definition is None:
+            return {}
+        required = set(definition.get('required', []))
+        return {
+            name: {
+                'type': spec.get('type'),
+                'format': spec.get('format'),
+                'required': name in required
+            }
+            for name, spec in definition.get('properties', {}).items()
+        }
+
+    def missing_tables(self, tables):
+        existing = self.tables()
+        return [table for table in tables if table not in existing]
+
+    def missing_columns(self, table, columns):
+        existing = self.columns(table)
+        return [column for column in columns if column not in existing]
@@ -0,0 +1,484 @@
+"""
+🔥 Gerador de carga em malha aberta (open-loop) para o PostgREST
+As operações chegam numa taxa fixa (ou Poisson) independente de quanto o
+servidor demora a responder, como usuários reais. A latência de cada operação
+é medida a partir do instante em que ela *deveria* ter começado: se o servidor
+(ou o pool de conexões) enfileira, a espera aparece nos percentis, em vez de
+simplesmente reduzir a taxa de envio como num laço sequencial (malha fechada).
+
+Cada operação de uma mistura (`MIXES`) é uma sequência de requisições — o CRUD
+de test_supabase_connection() (insert → read → delete) ou as listagens dos
+serviços do frontend — e tem dois histogramas HDR: latência total desde a
+chegada agendada e tempo de serviço das requisições. Cada etapa HTTP também
+tem o seu.
+
+Um único processo Python não satura o PostgREST (GIL, codificação JSON), então
+`run_load_processes` divide a taxa entre vários processos, um por núcleo, cada
+um com seus próprios histogramas; o coordenador só soma os relatórios no fim.
+O uso de CPU do processo mais ocupado vai no relatório: perto de 100% de um
+núcleo, a taxa medida é do cliente, não do servidor.
+"""
+
+import math
+import multiprocessing
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .client import SupabaseClient, RETURN_REPRESENTATION
+from .histogram import LatencyHistogram
+
+DEFAULT_TENANT = 'seed-tenant-0000'
+DEFAULT_PAGE_SIZE = 10
+CLIENT_CPU_THRESHOLD = 0.85  # fração de um núcleo a partir da qual o gerador é o gargalo
+
+
+class OperationFailed(Exception):
+    def __init__(self, step, status_code, message=''):
+        super().__init__(f"{step}: {status_code} {message}".strip())
+        self.step = step
+        self.status_code = status_code
+
+
+class OperationContext:
+    """Acesso ao cliente para as operações, cronometrando cada etapa HTTP"""
+
+    def __init__(self, client, tenant_id: str, run_tenant: str, report: 'LoadReport', measured: bool = True):
+        self.client = client
+        self.tenant_id = tenant_id
+        self.run_tenant = run_tenant
+        self.report = report
+        self.measured = measured
+
+    def call(self, step: str, method: str, path: str, expect=(200, 206), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.client.request(method, path, **kwargs)
+        except Exception as e:
+            raise OperationFailed(step, None, str(e))
+        if self.measured:
+            self.report.step(step).record_seconds(time.perf_counter() - started)
+        if response.status_code not in expect:
+            raise OperationFailed(step, response.status_code)
+        return response
+
+
+def _page_headers(size=DEFAULT_PAGE_SIZE):
+    return {'Range-Unit': 'items', 'Range': f"0-{size - 1}"}
+
+
+def op_crud(ctx: OperationContext):
+    """Sequência de test_supabase_connection(): cria, lê e exclui uma organização"""
+    now = datetime.now(timezone.utc).isoformat()
+    org = {'name': 'Organização de Carga n.CISO', 'type': 'company', 'description': 'Criada pelo gerador de carga',
+           'tenant_id': ctx.run_tenant, 'is_active': True, 'created_at': now, 'updated_at': now}
+    response = ctx.call('crud.insert', 'POST', 'organizations', expect=(201,), json=org,
+                        prefer=RETURN_REPRESENTATION)
+    org_id = response.json()[0]['id']
+    ctx.call('crud.read', 'GET', 'organizations', params={'id': f"eq.{org_id}", 'select': '*'})
+    ctx.call('crud.delete', 'DELETE', 'organizations', expect=(200, 204), params={'id': f"eq.{org_id}"})
+
+
+def op_list_organizations(ctx: OperationContext):
+    ctx.call('list_organizations', 'GET', 'organizations',
+             params={'select': '*', 'tenant_id': f"eq.{ctx.tenant_id}", 'is_active': 'eq.true',
+                     'order': 'name.asc'}, headers=_page_headers(50))
+
+
+def op_list_assets(ctx: OperationContext):
+    """Primeira página da listagem de ativos, com total (count=exact) como no frontend"""
+    ctx.call('list_assets', 'GET', 'assets',
+             params={'select': '*', 'tenant_id': f"eq.{ctx.tenant_id}", 'order': 'created_at.desc'},
+             headers=_page_headers(), prefer='count=exact')
+
+
+def op_list_credentials(ctx: OperationContext):
+    """CredentialsRegistryService.list(): credenciais com o ativo embutido"""
+    ctx.call('list_credentials', 'GET', 'credentials_registry',
+             params={'select': '*,assets:asset_id(name,type,classification)',
+                     'tenant_id': f"eq.{ctx.tenant_id}", 'order': 'created_at.desc'},
+             headers=_page_headers(), prefer='count=exact')
+
+
+def op_expiring_credentials(ctx: OperationContext):
+    """Credenciais ativas que vencem nos próximos 30 dias"""
+    limit = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+    ctx.call('expiring_credentials', 'GET', 'credentials_registry',
+             params={'select': 'id,asset_id,holder_id,valid_until', 'tenant_id': f"eq.{ctx.tenant_id}",
+                     'status': 'eq.active', 'valid_until': f"lt.{limit}", 'order': 'valid_until.asc'},
+             headers=_page_headers(50))
+
+
+def op_list_privileged(ctx: OperationContext):
+    ctx.call('list_privileged', 'GET', 'privileged_access',
+             params={'select': '*', 'tenant_id': f"eq.{ctx.tenant_id}", 'status': 'eq.active',
+                     'order': 'created_at.desc'},
+             headers=_page_headers(), prefer='count=exact')
+
+
+OPERATIONS: Dict[str, Callable[[OperationContext], None]] = {
+    'crud': op_crud,
+    'list_organizations': op_list_organizations,
+    'list_assets': op_list_assets,
+    'list_credentials': op_list_credentials,
+    'expiring_credentials': op_expiring_credentials,
+    'list_privileged': op_list_privileged,
+}
+
+MIXES: Dict[str, Dict[str, float]] = {
+    'crud': {'crud': 1},
+    'read-heavy': {'list_assets': 35, 'list_credentials': 25, 'list_organizations': 15,
+                   'list_privileged': 15, 'expiring_credentials': 10},
+    'mixed': {'list_assets': 30, 'list_credentials': 20, 'list_organizations': 10,
+              'list_privileged': 10, 'expiring_credentials': 10, 'crud': 20},
+}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Nome de uma mistura pronta ou pesos `op=peso,op=peso`"""
+    if text in MIXES:
+        return dict(MIXES[text])
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Operação desconhecida: {name} (disponíveis: {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+@dataclass
+class OperationStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> int:
+        return self.latency.total
+
+    @property
+    def failed(self) -> int:
+        return sum(self.errors.values())
+
+
+@dataclass
+class LoadReport:
+    rate: float
+    duration: float
+    mix: Dict[str, float]
+    scheduled: int = 0
+    dropped: int = 0
+    unfinished: int = 0
+    elapsed: float = 0.0
+    max_schedule_lag_ms: float = 0.0
+    workers: int = 1
+    client_cpu: float = 0.0
+    operations: Dict[str, OperationStats] = field(default_factory=dict)
+    steps: Dict[str, LatencyHistogram] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def operation(self, name: str) -> OperationStats:
+        with self._lock:
+            return self.operations.setdefault(name, OperationStats())
+
+    def step(self, name: str) -> LatencyHistogram:
+        with self._lock:
+            return self.steps.setdefault(name, LatencyHistogram())
+
+    def record_error(self, name: str, error: str):
+        stats = self.operation(name)
+        with self._lock:
+            stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    @property
+    def completed(self) -> int:
+        return sum(stats.ok for stats in self.operations.values())
+
+    @property
+    def failed(self) -> int:
+        return sum(stats.failed for stats in self.operations.values())
+
+    @property
+    def throughput(self) -> float:
+        """Operações concluídas com sucesso por segundo"""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def client_bound(self, threshold: float = CLIENT_CPU_THRESHOLD) -> bool:
+        """Algum processo gerador ficou perto de um núcleo inteiro de CPU"""
+        return self.client_cpu >= threshold
+
+    def total_latency(self) -> LatencyHistogram:
+        total = LatencyHistogram()
+        for stats in self.operations.values():
+            total.merge(stats.latency)
+        return total
+
+    def saturated(self, slo_p99_ms: Optional[float] = None, tolerance: float = 0.95) -> bool:
+        """Não acompanhou a taxa oferecida (ou estourou o p99 alvo)"""
+        # Compara com as chegadas efetivamente sorteadas, não com a taxa nominal
+        offered = self.scheduled / self.duration if self.duration else 0.0
+        attempted = (self.completed + self.failed) / self.elapsed if self.elapsed else 0.0
+        if self.dropped or self.unfinished or attempted < offered * tolerance:
+            return True
+        return slo_p99_ms is not None and self.total_latency().percentile(99) / 1000 > slo_p99_ms
+
+    def to_dict(self) -> dict:
+        return {
+            'rate': self.rate,
+            'duration': self.duration,
+            'mix': self.mix,
+            'scheduled': self.scheduled,
+            'dropped': self.dropped,
+            'unfinished': self.unfinished,
+            'elapsed': round(self.elapsed, 3),
+            'max_schedule_lag_ms': round(self.max_schedule_lag_ms, 2),
+            'throughput': round(self.throughput, 2),
+            'workers': self.workers,
+            'client_cpu': round(self.client_cpu, 3),
+            'operations': {
+                name: {'latency': stats.latency.to_dict(), 'service': stats.service.to_dict(),
+                       'errors': stats.errors}
+                for name, stats in sorted(self.operations.items())
+            },
+            'steps': {name: histogram.to_dict() for name, histogram in sorted(self.steps.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LoadReport':
+        report = cls(data['rate'], data['duration'], data['mix'], scheduled=data['scheduled'],
+                     dropped=data['dropped'], unfinished=data['unfinished'], elapsed=data['elapsed'],
+                     max_schedule_lag_ms=data['max_schedule_lag_ms'], workers=data.get('workers', 1),
+                     client_cpu=data.get('client_cpu', 0.0))
+        for name, stats in data['operations'].items():
+            report.operations[name] = OperationStats(LatencyHistogram.from_dict(stats['latency']),
+                                                     LatencyHistogram.from_dict(stats['service']),
+                                                     dict(stats['errors']))
+        for name, histogram in data['steps'].items():
+            report.steps[name] = LatencyHistogram.from_dict(histogram)
+        return report
+
+    def merge(self, other: 'LoadReport') -> 'LoadReport':
+        """Somar o relatório de outro processo que rodou a mesma mistura no mesmo intervalo"""
+        self.rate += other.rate
+        self.scheduled += other.scheduled
+        self.dropped += other.dropped
+        self.unfinished += other.unfinished
+        self.workers += other.workers
+        self.elapsed = max(self.elapsed, other.elapsed)
+        self.max_schedule_lag_ms = max(self.max_schedule_lag_ms, other.max_schedule_lag_ms)
+        self.client_cpu = max(self.client_cpu, other.client_cpu)
+        for name, stats in other.operations.items():
+            mine = self.operation(name)
+            mine.latency.merge(stats.latency)
+            mine.service.merge(stats.service)
+            for error, count in stats.errors.items():
+                mine.errors[error] = mine.errors.get(error, 0) + count
+        for name, histogram in other.steps.items():
+            self.step(name).merge(histogram)
+        return self
+
+
+def load_client(concurrency: int) -> SupabaseClient:
+    """Cliente dedicado: pool do tamanho da concorrência, sem limitador nem novas tentativas
+
+    Um 429/503 precisa aparecer como erro na medição, não ser escondido por backoff.
+    """
+    return SupabaseClient(key=os.getenv('SUPABASE_SERVICE_ROLE_KEY') or None, pool_size=concurrency,
+                          adaptive=False, max_retries=0)
+
+
+def _arrivals(rate: float, duration: float, poisson: bool, rng: random.Random) -> Iterable[float]:
+    """Instantes de chegada (segundos desde o início)"""
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate) if poisson else 1.0 / rate
+        if offset >= duration:
+            return
+        yield offset
+
+
+def run_load(client, mix: Dict[str, float], rate: float, duration: float, concurrency: int = 64,
+             tenant_id: str = DEFAULT_TENANT, run_tenant: str = '', warmup: float = 0.0,
+             poisson: bool = True, seed: Optional[int] = None, max_backlog: Optional[int] = None,
+             drain_timeout: float = 30.0, start_at: Optional[float] = None) -> LoadReport:
+    """Disparar operações em `rate` por segundo durante `duration` segundos
+
+    Operações iniciadas durante o `warmup` rodam mas não entram nos histogramas.
+    Se mais de `max_backlog` operações estiverem pendentes, as novas chegadas são
+    descartadas e contadas: o alvo já está saturado e a fila só cresceria.
+    `start_at` (time.time()) alinha o início de vários processos.
+    """
+    rng = random.Random(seed)
+    names, weights = zip(*mix.items())
+    report = LoadReport(rate, duration, dict(mix))
+    max_backlog = max_backlog or concurrency * 50
+    pending = [0]
+    pending_lock = threading.Lock()
+
+    def execute(name, scheduled_at, measured):
+        ctx = OperationContext(client, tenant_id, run_tenant, report, measured)
+        started = time.perf_counter()
+        try:
+            OPERATIONS[name](ctx)
+        except OperationFailed as e:
+            if measured:
+                report.record_error(name, f"{e.step}:{e.status_code or 'erro'}")
+        else:
+            finished = time.perf_counter()
+            if measured:
+                stats = report.operation(name)
+                stats.latency.record_seconds(finished - scheduled_at)
+                stats.service.record_seconds(finished - started)
+        finally:
+            with pending_lock:
+                pending[0] -= 1
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    if start_at is not None:
+        time.sleep(max(0.0, start_at - time.time()))
+    start = time.perf_counter()
+    cpu_started = time.process_time()
+    try:
+        for offset in _arrivals(rate, warmup + duration, poisson, rng):
+            scheduled_at = start + offset
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                report.max_schedule_lag_ms = max(report.max_schedule_lag_ms, -delay * 1000)
+
+            measured = offset >= warmup
+            if measured:
+                report.scheduled += 1
+            with pending_lock:
+                if pending[0] >= max_backlog:
+                    if measured:
+                        report.dropped += 1
+                    continue
+                pending[0] += 1
+            executor.submit(execute, rng.choices(names, weights)[0], scheduled_at, measured)
+    finally:
+        deadline = time.perf_counter() + drain_timeout
+        while time.perf_counter() < deadline:
+            with pending_lock:
+                if pending[0] <= 0:
+                    break
+            time.sleep(0.01)
+        with pending_lock:
+            report.unfinished = max(0, pending[0])
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    wall = time.perf_counter() - start
+    report.client_cpu = (time.process_time() - cpu_started) / wall if wall > 0 else 0.0
+    report.elapsed = max(wall - warmup, 1e-9)
+    return report
+
+
+def available_cpus() -> List[int]:
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _load_process(index: int, cpu: Optional[int], client_factory: Callable, concurrency: int,
+                  results, args: tuple, kwargs: dict):
+    """Corpo de cada processo gerador: fixa o núcleo, cria o próprio cliente e devolve o relatório"""
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError:
+            pass
+    try:
+        report = run_load(client_factory(concurrency), *args, concurrency=concurrency, **kwargs)
+        results.put((index, report.to_dict(), None))
+    except Exception as e:
+        results.put((index, None, str(e)))
+
+
+def run_load_processes(mix: Dict[str, float], rate: float, duration: float, processes: Optional[int] = None,
+                       concurrency: int = 64, client_factory: Callable = None, pin: bool = True,
+                       seed: Optional[int] = None, warmup: float = 0.0, drain_timeout: float = 30.0,
+                       **kwargs) -> LoadReport:
+    """`run_load` dividido entre processos (padrão: um por núcleo disponível)
+
+    Taxa e concorrência são totais, repartidas igualmente. Cada processo cria seu
+    cliente com `client_factory(concorrência)` (padrão: `load_client`), que
+    precisa ser uma função de módulo para funcionar com o método spawn.
+    """
+    cpus = available_cpus()
+    processes = max(1, processes or len(cpus))
+    client_factory = client_factory or load_client
+    per_process = max(1, math.ceil(concurrency / processes))
+    # Todos começam juntos, depois de importar e abrir conexões
+    start_at = time.time() + 1.0 + 0.05 * processes
+
+    results = multiprocessing.Queue()
+    workers = []
+    for index in range(processes):
+        process_kwargs = dict(kwargs, warmup=warmup, drain_timeout=drain_timeout, start_at=start_at,
+                              seed=None if seed is None else seed + index)
+        cpu = cpus[index % len(cpus)] if pin else None
+        worker = multiprocessing.Process(
+            target=_load_process, daemon=True,
+            args=(index, cpu, client_factory, per_process, results,
+                  (mix, rate / processes, duration), process_kwargs))
+        worker.start()
+        workers.append(worker)
+
+    merged = None
+    errors = []
+    deadline = start_at + warmup + duration + drain_timeout + 30.0
+    try:
+        for _ in workers:
+            try:
+                index, data, error = results.get(timeout=max(1.0, deadline - time.time()))
+            except queue.Empty:
+                errors.append("processo gerador não respondeu a tempo")
+                break
+            if error:
+                errors.append(f"processo {index}: {error}")
+                continue
+            report = LoadReport.from_dict(data)
+            merged = report if merged is None else merged.merge(report)
+    finally:
+        for worker in workers:
+            worker.join(timeout=1.0)
+            if worker.is_alive():
+                worker.terminate()
+
+    if errors:
+        raise RuntimeError('; '.join(errors))
+    merged.rate = rate
+    return merged
+
+
+def run_steps(client, mix: Dict[str, float], rates: Iterable[float], duration: float,
+              on_step: Optional[Callable[[LoadReport], None]] = None, stop_when_saturated: bool = True,
+              slo_p99_ms: Optional[float] = None, processes: int = 1, **kwargs) -> List[LoadReport]:
+    """Uma execução por taxa (degraus crescentes), até saturar
+
+    Com `processes` > 1 cada degrau roda em `run_load_processes` e `client` é
+    ignorado (cada processo cria o seu).
+    """
+    reports = []
+    for rate in rates:
+        if processes > 1:
+            report = run_load_processes(mix, rate, duration, processes=processes, **kwargs)
+        else:
+            report = run_load(client, mix, rate, duration, **kwargs)
+        reports.append(report)
+        if on_step:
+            on_step(report)
+        if stop_when_saturated and report.saturated(slo_p99_ms):
+            break
+    return reports
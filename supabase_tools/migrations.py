@@ -0,0 +1,204 @@
+"""
+📒 Ledger de migrações com checksum
+Cada passo de provisionamento é registrado na tabela `schema_migrations`
+com o checksum do seu SQL. Execuções seguintes pulam os passos já aplicados,
+detectam passos editados (checksum diferente) e aplicam só os pendentes, na
+ordem. O passo e o seu registro no ledger vão na mesma chamada a exec_sql,
+então são aplicados (ou falham) juntos.
+
+O ledger decide o que é pulado, então fica fechado como o query_sql/explain_sql:
+RLS ligado sem políticas e sem grants para anon/authenticated. Só a service
+role (que ignora o RLS) lê e grava os registros.
+"""
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .client import get_client
+from .schema import Schema
+from .sql import error_message
+
+LEDGER_TABLE = 'schema_migrations'
+
+APPLIED = 'applied'
+PENDING = 'pending'
+CHANGED = 'changed'
+# Tabela inexistente: PostgREST 12+ (cache do schema) e versões anteriores (Postgres)
+MISSING_RELATION_CODES = ('PGRST205', '42P01')
+
+
+@dataclass(frozen=True)
+class Migration:
+    id: str
+    sql: str
+    description: str = ''
+
+    @property
+    def checksum(self) -> str:
+        normalized = '\n'.join(line.rstrip() for line in self.sql.strip().splitlines())
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class MigrationStatus:
+    migration: Migration
+    state: str
+    applied_checksum: Optional[str] = None
+
+
+@dataclass
+class MigrationResult:
+    migration: Migration
+    success: bool
+    elapsed_ms: float
+    error: Optional[str] = None
+
+
+def migrations_from_schema(schema: Schema) -> List[Migration]:
+    """Passos idempotentes (tabela, índices, triggers) na ordem do modelo"""
+    steps = []
+    for table in schema.tables:
+        steps.append(Migration(f"{table.name}.table", table.render_create(),
+                               f"tabela {table.name}"))
+        if table.partitioning:
+            steps.append(Migration(f"{table.name}.partitions", '\n\n'.join(table.render_partitions()),
+                                   f"partições de {table.name}"))
+        for index in table.indexes:
+            name = index.index_name(table.name)
+            steps.append(Migration(f"{table.name}.index.{name}", index.render(table.name),
+                                   f"índice {name}"))
+        for trigger in table.triggers:
+            sql = (f"{trigger.render_function()}\n\n"
+                   f"DROP TRIGGER IF EXISTS {trigger.name} ON {table.name};\n\n"
+                   f"{trigger.render(table.name)}")
+            steps.append(Migration(f"{table.name}.trigger.{trigger.name}", sql,
+                                   f"trigger {trigger.name}"))
+    return steps
+
+
+def migrations_from_directory(directory: str) -> List[Migration]:
+    """Arquivos `NNNN_descricao.sql` de um diretório, em ordem de nome"""
+    steps = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.sql'):
+            continue
+        with open(os.path.join(directory, filename), 'r') as f:
+            sql = f.read()
+        migration_id = filename[:-len('.sql')]
+        steps.append(Migration(migration_id, sql, migration_id.replace('_', ' ')))
+    return steps
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _missing_relation(response) -> bool:
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    code = body.get('code') if isinstance(body, dict) else None
+    if code is not None:
+        return code in MISSING_RELATION_CODES
+    # PostgREST antigo responde 404 sem corpo para tabela desconhecida
+    return response.status_code == 404
+
+
+class MigrationRunner:
+    """Aplica apenas os passos pendentes, registrando cada um no ledger"""
+
+    def __init__(self, client=None, ledger_table=LEDGER_TABLE):
+        self.client = client or get_client()
+        self.ledger_table = ledger_table
+
+    def ledger_ddl(self) -> str:
+        return (f"CREATE TABLE IF NOT EXISTS {self.ledger_table} (\n"
+                f"  id VARCHAR(255) PRIMARY KEY,\n"
+                f"  checksum VARCHAR(64) NOT NULL,\n"
+                f"  description TEXT,\n"
+                f"  execution_ms INTEGER,\n"
+                f"  applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()\n"
+                f");\n"
+                f"ALTER TABLE {self.ledger_table} ENABLE ROW LEVEL SECURITY;\n"
+                f"REVOKE ALL ON TABLE {self.ledger_table} FROM PUBLIC;\n"
+                f"REVOKE ALL ON TABLE {self.ledger_table} FROM anon, authenticated;\n"
+                f"GRANT ALL ON TABLE {self.ledger_table} TO service_role;")
+
+    def ensure_ledger(self):
+        # O NOTIFY faz o PostgREST enxergar a tabela nova sem reiniciar
+        response = self.client.exec_sql(f"{self.ledger_ddl()}\nNOTIFY pgrst, 'reload schema';")
+        if response.status_code not in (200, 204):
+            raise RuntimeError(f"Falha ao criar o ledger ({response.status_code}): {error_message(response)}")
+
+    def applied(self) -> dict:
+        """{id: checksum} dos passos já registrados (cria o ledger se faltar)"""
+        response = self.client.get(f"{self.ledger_table}?select=id,checksum")
+        if response.status_code == 200:
+            return {row['id']: row['checksum'] for row in response.json()}
+        if _missing_relation(response):
+            self.ensure_ledger()
+            return {}
+        hint = " (o ledger exige a SUPABASE_SERVICE_ROLE_KEY)" if response.status_code in (401, 403) else ''
+        raise RuntimeError(f"Falha ao ler o ledger ({response.status_code}){hint}: {error_message(response)}")
+
+    def status(self, migrations: List[Migration]) -> List[MigrationStatus]:
+        applied = self.applied()
+        statuses = []
+        for migration in migrations:
+            checksum = applied.get(migration.id)
+            if checksum is None:
+                state = PENDING
+            elif checksum == migration.checksum:
+                state = APPLIED
+            else:
+                state = CHANGED
+            statuses.append(MigrationStatus(migration, state, checksum))
+        return statuses
+
+    def _record_sql(self, migration: Migration) -> str:
+        # Tempo medido no servidor, desde o início da chamada a exec_sql
+        elapsed = "(EXTRACT(EPOCH FROM clock_timestamp() - statement_timestamp()) * 1000)::INTEGER"
+        return (f"INSERT INTO {self.ledger_table} (id, checksum, description, execution_ms) "
+                f"VALUES ({_sql_literal(migration.id)}, {_sql_literal(migration.checksum)}, "
+                f"{_sql_literal(migration.description)}, {elapsed}) "
+                f"ON CONFLICT (id) DO UPDATE SET checksum = EXCLUDED.checksum, "
+                f"description = EXCLUDED.description, execution_ms = EXCLUDED.execution_ms, "
+                f"applied_at = NOW();")
+
+    def apply(self, migration: Migration) -> MigrationResult:
+        started = time.perf_counter()
+        sql = f"{migration.sql.rstrip().rstrip(';')};\n\n{self._record_sql(migration)}"
+        try:
+            response = self.client.exec_sql(sql)
+        except Exception as e:
+            return MigrationResult(migration, False, (time.perf_counter() - started) * 1000, str(e))
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code in (200, 204):
+            return MigrationResult(migration, True, elapsed)
+        return MigrationResult(migration, False, elapsed, f"{response.status_code}: {response.text}")
+
+    def run(self, migrations: List[Migration], reapply_changed=False,
+            on_result: Optional[Callable[[MigrationResult], None]] = None):
+        """Aplicar os passos pendentes em ordem; para no primeiro erro
+
+        Passos editados só são reaplicados com `reapply_changed=True`.
+        Devolve (statuses, results).
+        """
+        statuses = self.status(migrations)
+        results = []
+        for status in statuses:
+            if status.state == APPLIED:
+                continue
+            if status.state == CHANGED and not reapply_changed:
+                continue
+            result = self.apply(status.migration)
+            results.append(result)
+            if on_result:
+                on_result(result)
+            if not result.success:
+                break
+        return statuses, results
@@ -0,0 +1,223 @@
+"""
+📑 Paginação por chave (keyset) das listagens do tenant
+As listagens do frontend pedem `limit/offset`: para entregar a página N o
+Postgres lê e descarta as (N-1) x tamanho linhas anteriores, então a latência
+cresce linearmente com a profundidade. A alternativa é a ordem estável
+`(tenant_id, created_at, id)`, servida pelo índice `idx_<tabela>_tenant_id_created_at_id`
+que o gerador de SQL emite para todas as tabelas: a próxima página começa logo
+depois da última linha vista (o cursor), e cada página custa O(tamanho da
+página) em qualquer profundidade.
+
+O cursor é opaco para o cliente (base64 de `[created_at, id]`). O filtro
+"depois do cursor" leva também `created_at=lte.<cursor>`, que o planner usa
+como limite da varredura do índice; o `or=(...)` só desempata as linhas com o
+mesmo created_at. Linhas com created_at nulo ficam fora da paginação por chave.
+
+`benchmark_pagination` mede, nos dados semeados, a latência de uma página em
+profundidades crescentes com as duas estratégias.
+"""
+
+import base64
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .export import keyset_params
+from .histogram import LatencyHistogram
+from .schema import Schema
+from .sql import error_message
+from .tables import KEYSET_ORDER, NCISO_SCHEMA
+from .testdata import COUNT_EXACT, _content_range_total
+
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_PAGES = (1, 10, 50, 100, 250, 500)
+DEFAULT_RUNS = 20
+DEFAULT_WARMUP = 2
+# Dentro do tenant a ordem é (created_at, id), da mais recente para a mais antiga
+CURSOR_KEYS = tuple(key for key in KEYSET_ORDER if key != 'tenant_id')
+
+
+def encode_cursor(row: dict) -> str:
+    """Cursor opaco a partir da última linha da página"""
+    payload = json.dumps([row[key] for key in CURSOR_KEYS], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError(f"Cursor inválido: {cursor}")
+    if not isinstance(values, list) or len(values) != len(CURSOR_KEYS):
+        raise ValueError(f"Cursor inválido: {cursor}")
+    return tuple(values)
+
+
+def keyset_page_params(tenant_id: str, page_size: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                       select: str = '*') -> Dict[str, str]:
+    """Parâmetros PostgREST da página seguinte ao cursor (None = primeira página)"""
+    values = decode_cursor(cursor) if cursor else None
+    params = {'select': select, 'tenant_id': f"eq.{tenant_id}", 'limit': str(page_size),
+              **keyset_params(CURSOR_KEYS, values, descending=True)}
+    if values is not None:
+        # Limite da varredura no índice; o or=(...) desempata dentro do mesmo created_at
+        params[CURSOR_KEYS[0]] = f"lte.{values[0]}"
+    return params
+
+
+def offset_page_params(tenant_id: str, page: int, page_size: int = DEFAULT_PAGE_SIZE,
+                       select: str = '*') -> Dict[str, str]:
+    """Mesma ordem com limit/offset, como o frontend pagina hoje (página a partir de 1)"""
+    return {'select': select, 'tenant_id': f"eq.{tenant_id}", 'limit': str(page_size),
+            'offset': str((page - 1) * page_size),
+            'order': ','.join(f"{key}.desc" for key in CURSOR_KEYS)}
+
+
+@dataclass
+class Page:
+    rows: List[dict]
+    next_cursor: Optional[str]
+    elapsed_ms: float
+
+
+def fetch_keyset_page(client, table: str, tenant_id: str, cursor: Optional[str] = None,
+                      page_size: int = DEFAULT_PAGE_SIZE, select: str = '*') -> Page:
+    """Uma página por chave; `next_cursor` é None na última"""
+    if select != '*':
+        columns = [column.strip() for column in select.split(',')]
+        select = ','.join(columns + [key for key in CURSOR_KEYS if key not in columns])
+    started = time.perf_counter()
+    response = client.get(table, params=keyset_page_params(tenant_id, page_size, cursor, select))
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"{table}: página após {cursor} falhou ({response.status_code}): {error_message(response)}")
+    rows = response.json() or []
+    next_cursor = encode_cursor(rows[-1]) if len(rows) == page_size else None
+    return Page(rows, next_cursor, elapsed)
+
+
+@dataclass
+class DepthTiming:
+    page: int
+    offset: LatencyHistogram = field(default_factory=LatencyHistogram)
+    keyset: LatencyHistogram = field(default_factory=LatencyHistogram)
+    rows: int = 0
+    consistent: bool = True
+
+    def speedup(self, percentile: float = 50.0) -> Optional[float]:
+        """Latência com offset / com chave no percentil pedido"""
+        if not self.offset.total or not self.keyset.total:
+            return None
+        return self.offset.percentile(percentile) / max(self.keyset.percentile(percentile), 1)
+
+
+@dataclass
+class TablePagination:
+    table: str
+    page_size: int
+    total: Optional[int] = None
+    depths: List[DepthTiming] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def growth(self, strategy: str, percentile: float = 50.0) -> Optional[float]:
+        """Latência da página mais funda / da primeira para 'offset' ou 'keyset'"""
+        measured = [d for d in self.depths if getattr(d, strategy).total]
+        if len(measured) < 2:
+            return None
+        first, deepest = getattr(measured[0], strategy), getattr(measured[-1], strategy)
+        return deepest.percentile(percentile) / max(first.percentile(percentile), 1)
+
+    def to_dict(self) -> dict:
+        return {
+            'table': self.table,
+            'page_size': self.page_size,
+            'total': self.total,
+            'offset_growth': self.growth('offset'),
+            'keyset_growth': self.growth('keyset'),
+            'error': self.error,
+            'depths': [{
+                'page': d.page,
+                'offset': d.offset.summary_ms(),
+                'keyset': d.keyset.summary_ms(),
+                'speedup_p50': d.speedup(),
+                'rows': d.rows,
+                'consistent': d.consistent,
+            } for d in self.depths],
+        }
+
+
+def _total(client, table: str, tenant_id: str) -> Optional[int]:
+    response = client.get(table, params={'select': 'id', 'tenant_id': f"eq.{tenant_id}", 'limit': '1'},
+                          prefer=COUNT_EXACT)
+    if response.status_code not in (200, 206):
+        raise RuntimeError(f"{table}: contagem falhou ({response.status_code}): {error_message(response)}")
+    return _content_range_total(response)
+
+
+def _cursor_before(client, table: str, tenant_id: str, page: int, page_size: int) -> Optional[str]:
+    """Cursor da última linha da página anterior (fora da medição)"""
+    if page <= 1:
+        return None
+    params = offset_page_params(tenant_id, page, page_size, ','.join(CURSOR_KEYS))
+    params.update({'offset': str((page - 1) * page_size - 1), 'limit': '1'})
+    response = client.get(table, params=params)
+    if response.status_code != 200:
+        raise RuntimeError(f"{table}: cursor da página {page} falhou ({response.status_code}): {error_message(response)}")
+    rows = response.json()
+    return encode_cursor(rows[0]) if rows else None
+
+
+def _measure(client, table: str, tenant_id: str, timing: DepthTiming, page_size: int, runs: int, warmup: int):
+    cursor = _cursor_before(client, table, tenant_id, timing.page, page_size)
+    sides = (
+        ('offset', offset_page_params(tenant_id, timing.page, page_size), timing.offset),
+        ('keyset', keyset_page_params(tenant_id, page_size, cursor), timing.keyset),
+    )
+    for run in range(warmup + runs):
+        ids = {}
+        # Alterna quem vai primeiro para não favorecer um lado com cache quente
+        for name, params, histogram in (sides if run % 2 == 0 else sides[::-1]):
+            started = time.perf_counter()
+            response = client.get(table, params=params)
+            elapsed = time.perf_counter() - started
+            if response.status_code != 200:
+                raise RuntimeError(f"{table}: página {timing.page} ({name}) falhou "
+                                   f"({response.status_code}): {error_message(response)}")
+            if run >= warmup:
+                histogram.record_seconds(elapsed)
+            if run == 0:
+                ids[name] = [row.get('id') for row in response.json() or []]
+        if run == 0:
+            timing.rows = len(ids['offset'])
+            timing.consistent = ids['offset'] == ids['keyset']
+
+
+def _pages(pages: Sequence[int], total: Optional[int], page_size: int) -> List[int]:
+    """Profundidades que existem para o tenant, mais a última página (o pior caso do offset)"""
+    if total is None:
+        return sorted(set(pages))
+    last = max(1, -(-total // page_size))
+    return sorted({page for page in pages if page <= last} | {last})
+
+
+def benchmark_pagination(client, tenant_id: str, tables: Optional[Iterable[str]] = None,
+                         schema: Schema = NCISO_SCHEMA, pages: Sequence[int] = DEFAULT_PAGES,
+                         page_size: int = DEFAULT_PAGE_SIZE, runs: int = DEFAULT_RUNS,
+                         warmup: int = DEFAULT_WARMUP, on_table=None) -> List[TablePagination]:
+    """Latência de uma página por profundidade, offset x chave, para cada tabela do tenant"""
+    results = []
+    for name in (tables or schema.table_names):
+        result = TablePagination(name, page_size)
+        results.append(result)
+        try:
+            result.total = _total(client, name, tenant_id)
+            for page in _pages(pages, result.total, page_size):
+                timing = DepthTiming(page)
+                result.depths.append(timing)
+                _measure(client, name, tenant_id, timing, page_size, runs, warmup)
+        except Exception as e:
+            result.error = str(e)
+        if on_table:
+            on_table(result)
+    return results
@@ -0,0 +1,355 @@
+"""
+🔬 Captura de planos (EXPLAIN ANALYZE) das consultas quentes
+Catálogo das formas de consulta mais usadas pelos serviços do frontend
+(nciso-frontend/src/lib/services/*.ts) escritas em SQL sobre o schema do
+n.CISO: listagens paginadas por tenant, filtros por FK/estado, contagens e o
+embed de ativos nas credenciais. Cada consulta roda com
+`EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` nos dados semeados e o plano é
+analisado em busca de:
+
+- Seq Scan em tabela grande (linhas lidas acima de um mínimo);
+- ordenação/hash que transbordou para disco (Sort externo, Hash Batches > 1);
+- estimativa errada do planejador (linhas estimadas x reais acima de 10x).
+
+O exec_sql não devolve resultados, então os planos vêm da função
+`explain_sql` (scripts/create-explain-sql-function.sql), instalada pelo próprio
+exec_sql. Os planos ficam em benchmarks/plans/<rótulo>/ (um JSON por consulta),
+com o rótulo derivado do hash do schema, e podem ser comparados entre versões.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from .schema import Schema
+from .sql import error_message, execute_statements, read_statements
+from .tables import NCISO_SCHEMA
+
+PLANS_DIR = os.path.join('benchmarks', 'plans')
+EXPLAIN_FUNCTION_SCRIPT = os.path.join('scripts', 'create-explain-sql-function.sql')
+MIN_SEQ_SCAN_ROWS = 1000
+MISESTIMATE_FACTOR = 10.0
+MIN_MISESTIMATE_ROWS = 100
+_SAMPLE_RE = re.compile(r'\{sample\.(\w+)\}')
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    name: str
+    table: str
+    sql: str
+    source: str = ''
+
+    @property
+    def samples(self) -> List[str]:
+        """Colunas cujo valor é sorteado dos dados do tenant (`{sample.coluna}`)"""
+        return list(dict.fromkeys(_SAMPLE_RE.findall(self.sql)))
+
+    def render(self, tenant_id: str, samples: Optional[Dict[str, str]] = None) -> str:
+        sql = self.sql.replace('{tenant}', _literal(tenant_id))
+        for column, value in (samples or {}).items():
+            sql = sql.replace(f"{{sample.{column}}}", _literal(value))
+        return sql
+
+
+def _literal(value) -> str:
+    if value is None:
+        return 'NULL'
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+_PAGE = 'LIMIT 10 OFFSET 0'
+
+HOT_QUERIES = (
+    HotQuery('organizations.list', 'organizations',
+             "SELECT * FROM organizations WHERE tenant_id = {tenant} AND is_active ORDER BY name",
+             'isms.ts organizationService.list'),
+    HotQuery('organizations.children', 'organizations',
+             "SELECT * FROM organizations WHERE tenant_id = {tenant} AND parent_id = {sample.parent_id} "
+             "AND is_active ORDER BY name",
+             'isms.ts organizationService.list(parent_id)'),
+    HotQuery('assets.list', 'assets',
+             f"SELECT * FROM assets WHERE tenant_id = {{tenant}} AND is_active ORDER BY created_at DESC {_PAGE}",
+             'isms.ts assetService.list'),
+    HotQuery('assets.count', 'assets',
+             "SELECT count(*) FROM assets WHERE tenant_id = {tenant} AND is_active",
+             'isms.ts assetService.list (count=exact)'),
+    HotQuery('assets.by_organization', 'assets',
+             "SELECT * FROM assets WHERE tenant_id = {tenant} AND organization_id = {sample.organization_id} "
+             f"AND type = 'digital' AND is_active ORDER BY created_at DESC {_PAGE}",
+             'isms.ts assetService.list(organization_id, type)'),
+    HotQuery('teams.by_organization', 'teams',
+             "SELECT * FROM teams WHERE tenant_id = {tenant} AND organization_id = {sample.organization_id} "
+             "AND is_active ORDER BY name"),
+    HotQuery('credentials.list', 'credentials_registry',
+             "SELECT c.*, a.name AS asset_name, a.type AS asset_type, a.classification AS asset_classification "
+             "FROM credentials_registry c LEFT JOIN assets a ON a.id = c.asset_id "
+             f"WHERE c.tenant_id = {{tenant}} ORDER BY c.created_at DESC {_PAGE}",
+             'credentials-registry.ts CredentialsRegistryService.list (embed assets)'),
+    HotQuery('credentials.count', 'credentials_registry',
+             "SELECT count(*) FROM credentials_registry WHERE tenant_id = {tenant}",
+             'credentials-registry.ts CredentialsRegistryService.list (count=exact)'),
+    HotQuery('credentials.by_asset', 'credentials_registry',
+             "SELECT * FROM credentials_registry WHERE tenant_id = {tenant} AND asset_id = {sample.asset_id} "
+             f"AND access_type = 'admin' ORDER BY created_at DESC {_PAGE}",
+             'credentials-registry.ts CredentialsRegistryService.listByAsset'),
+    HotQuery('credentials.expiring', 'credentials_registry',
+             "SELECT id, asset_id, holder_id, valid_until FROM credentials_registry WHERE tenant_id = {tenant} "
+             "AND status = 'active' AND valid_until >= now() AND valid_until <= now() + interval '30 days' "
+             "ORDER BY valid_until",
+             'credentials-registry.ts CredentialsRegistryService.listExpiringSoon'),
+    HotQuery('privileged.list', 'privileged_access',
+             "SELECT * FROM privileged_access WHERE tenant_id = {tenant} AND status = 'active' "
+             f"ORDER BY created_at DESC {_PAGE}",
+             'privileged-access.ts PrivilegedAccessService.list'),
+    HotQuery('privileged.by_user', 'privileged_access',
+             "SELECT * FROM privileged_access WHERE tenant_id = {tenant} AND user_id = {sample.user_id} "
+             f"ORDER BY created_at DESC {_PAGE}",
+             'privileged-access.ts PrivilegedAccessService.listByUser'),
+    HotQuery('privileged.audit_due', 'privileged_access',
+             "SELECT * FROM privileged_access WHERE tenant_id = {tenant} AND status = 'active' "
+             "AND (last_audit_date IS NULL OR last_audit_date < now() - interval '90 days') "
+             "ORDER BY last_audit_date",
+             'privileged-access.ts PrivilegedAccessService.listNeedsAudit'),
+    HotQuery('evaluations.list', 'evaluations',
+             "SELECT * FROM evaluations WHERE tenant_id = {tenant} AND status = 'in_progress' "
+             f"AND start_date >= current_date - 365 ORDER BY created_at DESC {_PAGE}",
+             'evaluations.ts EvaluationsService.list(status, start_date)'),
+    HotQuery('documents.list', 'technical_documents',
+             "SELECT * FROM technical_documents WHERE tenant_id = {tenant} AND document_type = 'policy' "
+             f"ORDER BY created_at DESC {_PAGE}",
+             'technical-docs.ts TechnicalDocumentsService.list(document_type)'),
+    HotQuery('documents.by_scope', 'technical_documents',
+             "SELECT * FROM technical_documents WHERE tenant_id = {tenant} AND scope_id = {sample.scope_id} "
+             f"ORDER BY created_at DESC {_PAGE}",
+             'technical-docs.ts TechnicalDocumentsService.list(scope_id)'),
+)
+
+
+def validate_catalog(queries: Iterable[HotQuery] = HOT_QUERIES, schema: Schema = NCISO_SCHEMA) -> List[str]:
+    """Consultas que citam tabelas/colunas de amostra inexistentes no modelo"""
+    problems = []
+    for query in queries:
+        table = schema.table(query.table)
+        if table is None:
+            problems.append(f"{query.name}: tabela {query.table} fora do schema")
+            continue
+        for column in query.samples:
+            if table.column(column) is None:
+                problems.append(f"{query.name}: coluna {query.table}.{column} fora do schema")
+    return problems
+
+
+@dataclass(frozen=True)
+class PlanFinding:
+    kind: str
+    node: str
+    message: str
+
+
+def _node_label(node: dict) -> str:
+    label = node.get('Node Type', '?')
+    if node.get('Index Name'):
+        label += f" using {node['Index Name']}"
+    if node.get('Relation Name'):
+        label += f" on {node['Relation Name']}"
+    return label
+
+
+def iter_nodes(plan: dict):
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.get('Plans', ())))
+
+
+def analyze_plan(plan: dict, min_seq_scan_rows: int = MIN_SEQ_SCAN_ROWS,
+                 misestimate_factor: float = MISESTIMATE_FACTOR) -> List[PlanFinding]:
+    """Seq scans grandes, transbordos para disco e estimativas erradas num plano JSON"""
+    findings = []
+    for node in iter_nodes(plan):
+        label = _node_label(node)
+        loops = node.get('Actual Loops', 1) or 1
+        actual = node.get('Actual Rows', 0) * loops
+        if node.get('Node Type') == 'Seq Scan':
+            if 'Actual Rows' in node:
+                scanned, how = actual + node.get('Rows Removed by Filter', 0) * loops, 'lidas'
+            else:
+                # EXPLAIN sem ANALYZE: só a estimativa do planner
+                scanned, how = node.get('Plan Rows', 0), 'estimadas'
+            if scanned >= min_seq_scan_rows:
+                findings.append(PlanFinding('seq_scan', label, f"{scanned:,} linhas {how} sequencialmente"
+                                            + (f", filtro: {node['Filter']}" if node.get('Filter') else '')))
+        if node.get('Sort Space Type') == 'Disk' or 'external' in str(node.get('Sort Method', '')):
+            findings.append(PlanFinding('sort_spill', label,
+                                        f"ordenação em disco ({node.get('Sort Method')}, "
+                                        f"{node.get('Sort Space Used', '?')}kB): aumente work_mem ou indexe a ordem"))
+        if node.get('Hash Batches', 1) > 1:
+            findings.append(PlanFinding('hash_spill', label, f"hash em {node['Hash Batches']} lotes (disco)"))
+        if 'Actual Rows' in node:
+            planned = node.get('Plan Rows', 0) * loops
+            ratio = max(planned, 1) / max(actual, 1)
+            if max(planned, actual) >= MIN_MISESTIMATE_ROWS and (ratio >= misestimate_factor
+                                                                  or ratio <= 1 / misestimate_factor):
+                findings.append(PlanFinding('misestimate', label,
+                                            f"estimadas {planned:,.0f} linhas, reais {actual:,.0f}: "
+                                            f"rode ANALYZE ou crie estatísticas estendidas"))
+    return findings
+
+
+@dataclass
+class CapturedPlan:
+    query: HotQuery
+    sql: str
+    plan: Optional[dict] = None
+    error: Optional[str] = None
+    findings: List[PlanFinding] = field(default_factory=list)
+
+    @property
+    def execution_ms(self) -> Optional[float]:
+        return self.plan.get('Execution Time') if self.plan else None
+
+    @property
+    def planning_ms(self) -> Optional[float]:
+        return self.plan.get('Planning Time') if self.plan else None
+
+    @property
+    def shared_read(self) -> int:
+        """Blocos lidos do disco (fora do shared_buffers) no nó raiz"""
+        return self.plan['Plan'].get('Shared Read Blocks', 0) if self.plan else 0
+
+    def scans(self) -> Dict[str, str]:
+        """{relação: tipo de varredura (com índice)} — a forma do plano comparada entre versões"""
+        if not self.plan:
+            return {}
+        return {node['Relation Name']: _node_label(node) for node in iter_nodes(self.plan['Plan'])
+                if node.get('Relation Name')}
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.query.name,
+            'table': self.query.table,
+            'source': self.query.source,
+            'sql': self.sql,
+            'error': self.error,
+            'execution_ms': self.execution_ms,
+            'planning_ms': self.planning_ms,
+            'findings': [{'kind': f.kind, 'node': f.node, 'message': f.message} for f in self.findings],
+            'plan': self.plan,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CapturedPlan':
+        query = HotQuery(data['name'], data['table'], data['sql'], data.get('source', ''))
+        return cls(query, data['sql'], data.get('plan'), data.get('error'),
+                   [PlanFinding(f['kind'], f['node'], f['message']) for f in data.get('findings', ())])
+
+
+def install_explain_function(client, path: str = EXPLAIN_FUNCTION_SCRIPT):
+    """Criar rpc/explain_sql pelo exec_sql"""
+    return execute_statements(read_statements(path), client)
+
+
+def sample_values(client, query: HotQuery, tenant_id: str) -> Dict[str, str]:
+    samples = {}
+    for column in query.samples:
+        rows = client.query_sql(f"SELECT {column} AS value FROM {query.table} "
+                                f"WHERE tenant_id = {_literal(tenant_id)} AND {column} IS NOT NULL LIMIT 1")
+        samples[column] = rows[0]['value'] if rows else None
+    return samples
+
+
+def explain(client, sql: str, analyze: bool = True) -> dict:
+    response = client.rpc('explain_sql', {'sql': sql, 'analyze': analyze})
+    if response.status_code != 200:
+        raise RuntimeError(f"explain_sql falhou ({response.status_code}): {error_message(response)}")
+    plan = response.json()
+    return plan[0] if isinstance(plan, list) else plan
+
+
+def capture_plans(client, tenant_id: str, queries: Iterable[HotQuery] = HOT_QUERIES, analyze: bool = True,
+                  min_seq_scan_rows: int = MIN_SEQ_SCAN_ROWS, on_plan=None) -> List[CapturedPlan]:
+    """EXPLAIN de cada consulta do catálogo no tenant indicado, com a análise do plano"""
+    captured = []
+    for query in queries:
+        result = CapturedPlan(query, '')
+        try:
+            result.sql = query.render(tenant_id, sample_values(client, query, tenant_id))
+            result.plan = explain(client, result.sql, analyze)
+            result.findings = analyze_plan(result.plan['Plan'], min_seq_scan_rows)
+        except Exception as e:
+            result.error = str(e)
+        captured.append(result)
+        if on_plan:
+            on_plan(result)
+    return captured
+
+
+def default_label(schema: Schema = NCISO_SCHEMA) -> str:
+    return f"schema-{schema.content_hash()[:12]}"
+
+
+def save_plans(plans: Iterable[CapturedPlan], label: str, metadata: Optional[dict] = None,
+               directory: str = PLANS_DIR) -> str:
+    target = os.path.join(directory, label)
+    os.makedirs(target, exist_ok=True)
+    names = []
+    for plan in plans:
+        names.append(plan.query.name)
+        with open(os.path.join(target, f"{plan.query.name}.json"), 'w') as f:
+            json.dump(plan.to_dict(), f, indent=2, sort_keys=True)
+    with open(os.path.join(target, 'manifest.json'), 'w') as f:
+        json.dump({**(metadata or {}), 'label': label, 'queries': names}, f, indent=2, sort_keys=True)
+    return target
+
+
+def load_plans(path: str) -> Dict[str, CapturedPlan]:
+    """Planos salvos num diretório (ou rótulo dentro de benchmarks/plans)"""
+    if not os.path.isdir(path):
+        path = os.path.join(PLANS_DIR, path)
+    with open(os.path.join(path, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    plans = {}
+    for name in manifest['queries']:
+        with open(os.path.join(path, f"{name}.json"), 'r') as f:
+            plans[name] = CapturedPlan.from_dict(json.load(f))
+    return plans
+
+
+@dataclass
+class PlanChange:
+    name: str
+    before_ms: Optional[float]
+    after_ms: Optional[float]
+    scan_changes: List[str] = field(default_factory=list)
+    new_findings: List[str] = field(default_factory=list)
+    resolved_findings: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.scan_changes or self.new_findings or self.resolved_findings)
+
+
+def diff_plans(before: Dict[str, CapturedPlan], after: Dict[str, CapturedPlan]) -> List[PlanChange]:
+    """Mudanças de forma (varreduras por relação) e de achados entre duas capturas"""
+    changes = []
+    for name in sorted(set(before) | set(after)):
+        old, new = before.get(name), after.get(name)
+        change = PlanChange(name, old.execution_ms if old else None, new.execution_ms if new else None)
+        if old is None or new is None:
+            change.scan_changes.append('consulta nova' if old is None else 'consulta removida')
+            changes.append(change)
+            continue
+        old_scans, new_scans = old.scans(), new.scans()
+        for relation in sorted(set(old_scans) | set(new_scans)):
+            if old_scans.get(relation) != new_scans.get(relation):
+                change.scan_changes.append(f"{old_scans.get(relation, '—')} → {new_scans.get(relation, '—')}")
+        old_kinds = {(f.kind, f.node) for f in old.findings}
+        new_kinds = {(f.kind, f.node) for f in new.findings}
+        change.new_findings = [f"{kind}: {node}" for kind, node in sorted(new_kinds - old_kinds)]
+        change.resolved_findings = [f"{kind}: {node}" for kind, node in sorted(old_kinds - new_kinds)]
+        changes.append(change)
+    return changes
@@ -0,0 +1,87 @@
+"""
+🔎 Verificador concorrente de tabelas
+Consulta `GET /rest/v1/<tabela>?select=count&limit=1` para uma lista inteira
+de tabelas em paralelo (asyncio + pool HTTP compartilhado), com limite de
+concorrência, e devolve um mapa estruturado de disponibilidade.
+
+Por padrão a concorrência acompanha o tamanho do pool do cliente
+(SUPABASE_HTTP_POOL_SIZE); com pool >= número de tabelas a varredura
+completa custa aproximadamente um round-trip.
+"""
+
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .client import get_client
+
+_CREATE_TABLE_RE = re.compile(
+    r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:"?public"?\.)?"?([A-Za-z_][A-Za-z0-9_]*)"?',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class TableStatus:
+    """Resultado da verificação de uma tabela"""
+    table: str
+    available: bool
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+def tables_from_sql(path):
+    """Nomes das tabelas declaradas em um arquivo SQL, na ordem em que aparecem"""
+    with open(path, 'r') as f:
+        sql = f.read()
+    seen = []
+    for name in _CREATE_TABLE_RE.findall(sql):
+        if name not in seen:
+            seen.append(name)
+    return seen
+
+
+def _probe_one(client, table):
+    started = time.perf_counter()
+    try:
+        response = client.get(f"{table}?select=count&limit=1")
+    except Exception as e:
+        return TableStatus(table, False, None, str(e), (time.perf_counter() - started) * 1000)
+
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.status_code == 200:
+        return TableStatus(table, True, 200, None, elapsed)
+    return TableStatus(table, False, response.status_code, response.text, elapsed)
+
+
+async def probe_tables_async(tables: Iterable[str], client=None,
+                             concurrency: Optional[int] = None) -> Dict[str, TableStatus]:
+    """Verificar todas as tabelas com no máximo `concurrency` requisições simultâneas"""
+    client = client or get_client()
+    concurrency = concurrency or client.pool_size
+    tables: List[str] = list(dict.fromkeys(tables))
+    if not tables:
+        return {}
+
+    workers = max(1, min(concurrency, len(tables)))
+    semaphore = asyncio.Semaphore(workers)
+    loop = asyncio.get_running_loop()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        async def probe(table):
+            async with semaphore:
+                return await loop.run_in_executor(executor, _probe_one, client, table)
+
+        results = await asyncio.gather(*(probe(table) for table in tables))
+
+    return {status.table: status for status in results}
+
+
+def probe_tables(tables: Iterable[str], client=None,
+                 concurrency: Optional[int] = None) -> Dict[str, TableStatus]:
+    """Versão síncrona de probe_tables_async para os scripts"""
+    return asyncio.run(probe_tables_async(tables, client=client, concurrency=concurrency))
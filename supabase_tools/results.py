@@ -0,0 +1,308 @@
+"""
+🗃️ Resultados de benchmark versionáveis
+Cada execução de benchmark grava um arquivo JSON com o ambiente (host, Python,
+commit, URL do projeto), o tamanho do conjunto de dados e as métricas em forma
+plana (`<operação>.p99_ms`, `<operação>.throughput`, ...). Os resultados ficam
+em benchmarks/results/ (fora do git); a referência de cada benchmark fica em
+benchmarks/baselines/<nome>.json e é versionada junto com o schema e as
+políticas.
+
+`compare_results` confronta uma execução com a referência métrica a métrica:
+latências e taxas de erro pioram ao subir, vazão piora ao cair. Uma métrica
+regride quando a variação passa do limite (10% por padrão, ajustável por
+padrão de nome) e também passa de um piso absoluto, para que 0,3ms → 0,4ms numa
+consulta trivial não bloqueie uma mudança. Métrica da referência ausente na
+execução também é regressão (ex.: nenhum degrau de carga sustentado).
+
+No benchmark de carga, latências, vazão e erros são medidos no maior degrau
+sustentado (`rate`, a taxa oferecida). Se esse degrau mudou, elas não são
+comparáveis e ficam de fora; quem decide é `sustained_rate`.
+"""
+
+import fnmatch
+import glob
+import json
+import os
+import platform
+import socket
+import subprocess
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from .testdata import _content_range_total
+
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+BASELINES_DIR = os.path.join('benchmarks', 'baselines')
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+MIN_DELTA_MS = 1.0
+MIN_DELTA_RATE = 0.005
+MIN_DELTA_SLOWDOWN = 0.05
+HIGHER_IS_BETTER = ('throughput', 'rows_per_second', 'sustained_rate')
+# Ponto de operação do benchmark de carga: informativo, não é comparado; só a
+# taxa sustentada se compara entre pontos de operação diferentes
+OPERATING_POINT = 'rate'
+SUSTAINED_RATE = 'sustained_rate'
+RESULT_PERCENTILES = ('p50', 'p95', 'p99', 'p99.9')
+
+
+@dataclass
+class BenchmarkResult:
+    benchmark: str
+    metrics: Dict[str, float] = field(default_factory=dict)
+    environment: Dict[str, object] = field(default_factory=dict)
+    dataset: Dict[str, object] = field(default_factory=dict)
+    parameters: Dict[str, object] = field(default_factory=dict)
+    created_at: str = ''
+    version: int = FORMAT_VERSION
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BenchmarkResult':
+        return cls(data['benchmark'], dict(data.get('metrics', {})), dict(data.get('environment', {})),
+                   dict(data.get('dataset', {})), dict(data.get('parameters', {})),
+                   data.get('created_at', ''), data.get('version', FORMAT_VERSION))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment() -> Dict[str, object]:
+    """Onde a execução rodou: cliente e projeto alvo (sem credenciais)"""
+    return {
+        'host': socket.gethostname(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'commit': _git_commit(),
+        'target': urlparse(os.getenv('SUPABASE_URL', '')).netloc or None,
+    }
+
+
+def dataset_size(client, tables: Iterable[str], tenants: Optional[Iterable[str]] = None) -> Dict[str, object]:
+    """Linhas por tabela (estimativa do planejador: barata mesmo com milhões de linhas)"""
+    rows = {}
+    for table in tables:
+        response = client.get(table, params={'select': 'id', 'limit': '1'}, prefer='count=estimated')
+        rows[table] = _content_range_total(response) if response.status_code in (200, 206) else None
+    dataset = {'rows': rows}
+    if tenants is not None:
+        dataset['tenants'] = list(tenants)
+    return dataset
+
+
+def new_result(benchmark: str, metrics: Dict[str, float], dataset: Optional[dict] = None,
+               parameters: Optional[dict] = None) -> BenchmarkResult:
+    return BenchmarkResult(benchmark, {name: round(value, 4) for name, value in metrics.items() if value is not None},
+                           environment(), dataset or {}, parameters or {},
+                           datetime.now(timezone.utc).isoformat(timespec='seconds'))
+
+
+def load_metrics(reports) -> Dict[str, float]:
+    """Métricas planas de relatórios do gerador de carga (um por degrau de taxa)"""
+    metrics: Dict[str, float] = {}
+    sustained = [r for r in reports if not r.saturated()]
+    if sustained:
+        metrics[SUSTAINED_RATE] = max(r.throughput for r in sustained)
+    # Latências do maior degrau sustentado: o mesmo ponto de operação entre execuções
+    report = max(sustained, key=lambda r: r.rate) if sustained else (reports[-1] if reports else None)
+    if report is None:
+        return metrics
+    metrics[OPERATING_POINT] = report.rate
+    metrics['throughput'] = report.throughput
+    for name, stats in report.operations.items():
+        summary = stats.latency.summary_ms()
+        for key in RESULT_PERCENTILES:
+            metrics[f"{name}.{key}_ms"] = summary[key]
+        attempts = stats.ok + stats.failed
+        metrics[f"{name}.error_rate"] = stats.failed / attempts if attempts else 0.0
+    return metrics
+
+
+def rls_metrics(overheads) -> Dict[str, float]:
+    """Métricas planas do benchmark de RLS: lentidão por tabela e latência com RLS por consulta"""
+    metrics: Dict[str, float] = {}
+    for overhead in overheads:
+        for percentile in (50, 95):
+            slowdown = overhead.slowdown(percentile)
+            if slowdown is not None:
+                metrics[f"{overhead.table}.slowdown_p{percentile}"] = slowdown
+        for query in overhead.queries:
+            if query.tenant.total:
+                summary = query.tenant.summary_ms()
+                metrics[f"{overhead.table}.{query.query}.p50_ms"] = summary['p50']
+                metrics[f"{overhead.table}.{query.query}.p95_ms"] = summary['p95']
+    return metrics
+
+
+def pagination_metrics(tables) -> Dict[str, float]:
+    """Métricas planas do benchmark de paginação: latência por profundidade e crescimento por estratégia"""
+    metrics: Dict[str, float] = {}
+    for table in tables:
+        for strategy in ('offset', 'keyset'):
+            growth = table.growth(strategy)
+            if growth is not None:
+                metrics[f"{table.table}.{strategy}.growth"] = growth
+        for depth in table.depths:
+            for strategy in ('offset', 'keyset'):
+                histogram = getattr(depth, strategy)
+                if histogram.total:
+                    summary = histogram.summary_ms()
+                    metrics[f"{table.table}.{strategy}.page_{depth.page}.p50_ms"] = summary['p50']
+                    metrics[f"{table.table}.{strategy}.page_{depth.page}.p95_ms"] = summary['p95']
+    return metrics
+
+
+def save_result(result: BenchmarkResult, directory: str = RESULTS_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    stamp = (result.created_at or datetime.now(timezone.utc).isoformat()).replace(':', '').replace('+0000', 'Z')
+    path = os.path.join(directory, f"{result.benchmark}-{stamp}.json")
+    with open(path, 'w') as f:
+        json.dump(result.to_dict(), f, indent=2, sort_keys=True)
+    return path
+
+
+def load_result(path: str) -> BenchmarkResult:
+    with open(path, 'r') as f:
+        return BenchmarkResult.from_dict(json.load(f))
+
+
+def baseline_path(benchmark: str, directory: str = BASELINES_DIR) -> str:
+    return os.path.join(directory, f"{benchmark}.json")
+
+
+def latest_result(benchmark: str, directory: str = RESULTS_DIR) -> Optional[str]:
+    paths = sorted(glob.glob(os.path.join(directory, f"{benchmark}-*.json")))
+    return paths[-1] if paths else None
+
+
+def promote_baseline(path: str, directory: str = BASELINES_DIR) -> str:
+    """Tornar um resultado a referência do seu benchmark"""
+    result = load_result(path)
+    target = baseline_path(result.benchmark, directory)
+    os.makedirs(directory, exist_ok=True)
+    with open(target, 'w') as f:
+        json.dump(result.to_dict(), f, indent=2, sort_keys=True)
+    return target
+
+
+@dataclass
+class MetricDelta:
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+    threshold: float
+    regressed: bool = False
+    improved: bool = False
+    comparable: bool = True
+
+    @property
+    def change(self) -> Optional[float]:
+        """Variação relativa (+0.25 = 25% maior)"""
+        if self.baseline is None or self.current is None:
+            return None
+        if self.baseline == 0:
+            return 0.0 if self.current == 0 else float('inf')
+        return (self.current - self.baseline) / abs(self.baseline)
+
+
+@dataclass
+class ResultComparison:
+    baseline: BenchmarkResult
+    current: BenchmarkResult
+    deltas: List[MetricDelta] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> List[MetricDelta]:
+        return [delta for delta in self.deltas if delta.regressed]
+
+    @property
+    def improvements(self) -> List[MetricDelta]:
+        return [delta for delta in self.deltas if delta.improved]
+
+    @property
+    def missing(self) -> List[str]:
+        return [delta.name for delta in self.deltas if delta.current is None and delta.comparable]
+
+    @property
+    def passed(self) -> bool:
+        return not self.regressions
+
+    def warnings(self) -> List[str]:
+        """Diferenças de ambiente/dados que tornam a comparação menos confiável"""
+        warnings = []
+        for key in ('target', 'cpus'):
+            before, after = self.baseline.environment.get(key), self.current.environment.get(key)
+            if before != after:
+                warnings.append(f"{key} diferente: {before} → {after}")
+        before_rows = self.baseline.dataset.get('rows') or {}
+        after_rows = self.current.dataset.get('rows') or {}
+        for table in sorted(set(before_rows) & set(after_rows)):
+            before, after = before_rows[table], after_rows[table]
+            if before and after and abs(after - before) / before > 0.2:
+                warnings.append(f"{table}: {before:,} → {after:,} linhas")
+        before, after = self.baseline.metrics.get(OPERATING_POINT), self.current.metrics.get(OPERATING_POINT)
+        if before != after:
+            warnings.append(f"taxa oferecida diferente ({before} → {after}): latências e vazão não comparadas")
+        if self.baseline.parameters != self.current.parameters:
+            warnings.append("parâmetros da execução diferentes")
+        return warnings
+
+
+def higher_is_better(name: str) -> bool:
+    return name.rsplit('.', 1)[-1] in HIGHER_IS_BETTER
+
+
+def metric_threshold(name: str, default: float, overrides: Optional[Dict[str, float]] = None) -> float:
+    """Limite da métrica: o primeiro padrão (fnmatch) de `overrides` que casar"""
+    for pattern, value in (overrides or {}).items():
+        if fnmatch.fnmatch(name, pattern):
+            return value
+    return default
+
+
+def _min_delta(name: str) -> float:
+    if name.endswith('_ms'):
+        return MIN_DELTA_MS
+    if name.endswith('error_rate'):
+        return MIN_DELTA_RATE
+    if '.slowdown_' in name or name.endswith('.growth'):
+        return MIN_DELTA_SLOWDOWN
+    return 0.0
+
+
+def compare_results(baseline: BenchmarkResult, current: BenchmarkResult, threshold: float = DEFAULT_THRESHOLD,
+                    overrides: Optional[Dict[str, float]] = None) -> ResultComparison:
+    if baseline.benchmark != current.benchmark:
+        raise ValueError(f"Benchmarks diferentes: {baseline.benchmark} x {current.benchmark}")
+    comparison = ResultComparison(baseline, current)
+    same_point = baseline.metrics.get(OPERATING_POINT) == current.metrics.get(OPERATING_POINT)
+    for name in sorted(set(baseline.metrics) | set(current.metrics)):
+        before, after = baseline.metrics.get(name), current.metrics.get(name)
+        delta = MetricDelta(name, before, after, metric_threshold(name, threshold, overrides))
+        comparison.deltas.append(delta)
+        if name == OPERATING_POINT or (not same_point and name != SUSTAINED_RATE):
+            # Medidas em taxas oferecidas diferentes não se comparam
+            delta.comparable = False
+            continue
+        if after is None:
+            delta.regressed = before is not None
+            continue
+        if before is None:
+            continue
+        worse = (before - after) if higher_is_better(name) else (after - before)
+        relative = worse / abs(before) if before else (float('inf') if worse > 0 else 0.0)
+        if worse > _min_delta(name) and relative > delta.threshold:
+            delta.regressed = True
+        elif -worse > _min_delta(name) and -relative > delta.threshold:
+            delta.improved = True
+    return comparison
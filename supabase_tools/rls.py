@@ -0,0 +1,459 @@
+"""
+🔐 Linter e reescritor de políticas RLS
+Encontra chamadas por linha em políticas (`auth.jwt()`, `auth.uid()`,
+`current_setting(...)`) e reescreve a expressão no formato
+`(select auth.jwt() ...)`, que o Postgres avalia uma única vez por consulta
+(InitPlan) em vez de uma vez por linha.
+
+O benchmark opcional cria tabelas sintéticas num Postgres local (psycopg2),
+aplica as políticas originais e as reescritas e compara o tempo de
+EXPLAIN ANALYZE por tabela.
+"""
+
+import hashlib
+import json
+import re
+import statistics
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .sql import read_statements
+
+_POLICY_HEAD_RE = re.compile(
+    r'CREATE\s+POLICY\s+("(?:[^"]|"")+"|\w+)\s+ON\s+((?:\w+\.)?"?\w+"?)'
+    r'(?:\s+AS\s+(PERMISSIVE|RESTRICTIVE))?(?:\s+FOR\s+(ALL|SELECT|INSERT|UPDATE|DELETE))?'
+    r'(?:\s+TO\s+([\w\s,"]+?))?(?=\s+USING\b|\s+WITH\s+CHECK\b|\s*$)',
+    re.IGNORECASE
+)
+_CLAUSE_RE = re.compile(r'\b(USING|WITH\s+CHECK)\s*\(', re.IGNORECASE)
+_CALL_RE = re.compile(r'\b(auth\.\w+|current_setting)\s*\(', re.IGNORECASE)
+_ACCESSOR_RE = re.compile(r"\s*(?:->>|->)\s*(?:'(?:[^']|'')*'|\d+)")
+_CAST_RE = re.compile(r"\s*::\s*\w+(?:\[\])?")
+_SELECT_BEFORE_RE = re.compile(r'\(\s*select\s+[\s(]*$', re.IGNORECASE)
+_FUNCTION_RE = re.compile(r'^CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(?:public\.)?"?(\w+)"?', re.IGNORECASE)
+_COMPARED_COLUMN_RE = re.compile(r'\b(\w+)\s*=\s*\(\s*select\s+', re.IGNORECASE)
+_TRAILING_CAST_RE = re.compile(r'::\s*(\w+)\s*\)$')
+
+
+@dataclass
+class Policy:
+    name: str
+    table: str
+    command: str
+    using: Optional[str]
+    with_check: Optional[str]
+    sql: str
+    line: int
+    source: str = ''
+    permissive: bool = True
+    roles: Optional[str] = None
+
+    @property
+    def location(self) -> str:
+        return f"{self.source}:{self.line}" if self.source else f"linha {self.line}"
+
+    @property
+    def has_subquery(self) -> bool:
+        """Subconsulta em outras tabelas (os `(select auth...)` não têm FROM)"""
+        text = ' '.join(filter(None, (self.using, self.with_check)))
+        return bool(re.search(r'\bFROM\b', text, re.IGNORECASE))
+
+
+@dataclass
+class LintFinding:
+    policy: Policy
+    clause: str
+    expression: str
+    line: int
+    rewritable: bool
+    message: str
+
+
+@dataclass
+class RewriteResult:
+    policy: Policy
+    using: Optional[str]
+    with_check: Optional[str]
+    findings: List[LintFinding] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.using != self.policy.using or self.with_check != self.policy.with_check
+
+    def render_alter(self) -> str:
+        """ALTER POLICY que aplica a versão reescrita num banco existente"""
+        parts = [f"ALTER POLICY {_quote(self.policy.name)} ON {self.policy.table}"]
+        if self.using is not None:
+            parts.append(f"USING ({self.using})")
+        if self.with_check is not None:
+            parts.append(f"WITH CHECK ({self.with_check})")
+        return ' '.join(parts) + ';'
+
+    def render_create(self, table: Optional[str] = None) -> str:
+        return _render_policy(self.policy, self.using, self.with_check, table)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _render_policy(policy: Policy, using: Optional[str], with_check: Optional[str],
+                   table: Optional[str] = None) -> str:
+    parts = [f"CREATE POLICY {_quote(policy.name)} ON {table or policy.table}"]
+    if not policy.permissive:
+        parts.append("AS RESTRICTIVE")
+    parts.append(f"FOR {policy.command}")
+    if policy.roles:
+        parts.append(f"TO {policy.roles}")
+    if using is not None:
+        parts.append(f"USING ({using})")
+    if with_check is not None:
+        parts.append(f"WITH CHECK ({with_check})")
+    return ' '.join(parts) + ';'
+
+
+def _matching_paren(text: str, open_index: int) -> int:
+    """Índice do `)` que fecha o `(` em `open_index` (ignorando strings)"""
+    depth = 0
+    i = open_index
+    while i < len(text):
+        char = text[i]
+        if char == "'":
+            i = text.find("'", i + 1)
+            while i != -1 and text[i + 1:i + 2] == "'":
+                i = text.find("'", i + 2)
+            if i == -1:
+                break
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError("Parênteses desbalanceados na política")
+
+
+def _strip_comments(sql: str) -> str:
+    return '\n'.join(line for line in sql.splitlines() if not line.strip().startswith('--')).strip()
+
+
+def parse_policies(path: str) -> List[Policy]:
+    """Políticas CREATE POLICY de um arquivo SQL"""
+    policies = []
+    for statement in read_statements(path):
+        sql = _strip_comments(statement.sql)
+        match = _POLICY_HEAD_RE.match(sql)
+        if not match:
+            continue
+        clauses: Dict[str, str] = {}
+        for clause in _CLAUSE_RE.finditer(sql, match.end()):
+            start = clause.end() - 1
+            end = _matching_paren(sql, start)
+            key = 'using' if clause.group(1).upper() == 'USING' else 'with_check'
+            clauses[key] = sql[start + 1:end].strip()
+        name = match.group(1)
+        if name.startswith('"'):
+            name = name[1:-1].replace('""', '"')
+        policies.append(Policy(
+            name=name,
+            table=match.group(2),
+            command=(match.group(4) or 'ALL').upper(),
+            using=clauses.get('using'),
+            with_check=clauses.get('with_check'),
+            sql=sql,
+            line=statement.line,
+            source=statement.source,
+            permissive=(match.group(3) or 'PERMISSIVE').upper() == 'PERMISSIVE',
+            roles=match.group(5).strip() if match.group(5) else None,
+        ))
+    return policies
+
+
+def helper_functions(path: str) -> Tuple[str, ...]:
+    """Funções criadas no mesmo arquivo (chamadas por linha se usadas em políticas)"""
+    names = []
+    for statement in read_statements(path):
+        match = _FUNCTION_RE.match(_strip_comments(statement.sql))
+        if match:
+            names.append(match.group(1).lower())
+    return tuple(names)
+
+
+def _expression_span(text: str, start: int, call_open: int) -> Tuple[int, int]:
+    """Expandir a chamada para incluir `->>`/`->`, casts e parênteses que a envolvem"""
+    end = _matching_paren(text, call_open) + 1
+    while True:
+        match = _ACCESSOR_RE.match(text, end) or _CAST_RE.match(text, end)
+        if match:
+            end = match.end()
+            continue
+        before = text[:start].rstrip()
+        after = text[end:].lstrip()
+        # `( expr )` que não é chamada de função nem o parêntese de USING/CHECK
+        if (before.endswith('(') and after.startswith(')')
+                and not re.search(r'[\w"]\s*\($', before)):
+            start = len(before) - 1
+            end = len(text) - len(after) + 1
+            continue
+        return start, end
+
+
+def rewrite_expression(expression: str, helpers: Iterable[str] = ()) -> Tuple[str, List[Tuple[str, bool, str]]]:
+    """Expressão reescrita + [(trecho, reescrito?, mensagem)] encontrados"""
+    findings = []
+    result = expression
+    offset = 0
+    while True:
+        match = _CALL_RE.search(result, offset)
+        if not match:
+            break
+        start, end = _expression_span(result, match.start(), match.end() - 1)
+        fragment = result[start:end]
+        if _SELECT_BEFORE_RE.search(result[:start]):
+            offset = end
+            continue
+        findings.append((fragment, True, f"{match.group(1)}() avaliado por linha"))
+        replacement = f"(select {fragment})"
+        result = result[:start] + replacement + result[end:]
+        offset = start + len(replacement)
+
+    for name in helpers:
+        for call in re.finditer(rf'\b{re.escape(name)}\s*\(', result, re.IGNORECASE):
+            fragment = result[call.start():_matching_paren(result, call.end() - 1) + 1]
+            findings.append((fragment, False,
+                             f"função {name}() chamada por linha: declare-a STABLE e use (select {name}(...)) "
+                             f"quando os argumentos não dependerem da linha"))
+    return result, findings
+
+
+def _finding_line(policy: Policy, fragment: str) -> int:
+    index = policy.sql.find(fragment)
+    return policy.line + (policy.sql[:index].count('\n') if index >= 0 else 0)
+
+
+def rewrite_policy(policy: Policy, helpers: Iterable[str] = ()) -> RewriteResult:
+    helpers = tuple(helpers)
+    result = RewriteResult(policy, policy.using, policy.with_check)
+    for clause, attribute in (('USING', 'using'), ('WITH CHECK', 'with_check')):
+        expression = getattr(policy, attribute)
+        if expression is None:
+            continue
+        rewritten, found = rewrite_expression(expression, helpers)
+        setattr(result, attribute, rewritten)
+        for fragment, rewritable, message in found:
+            result.findings.append(LintFinding(policy, clause, fragment, _finding_line(policy, fragment),
+                                               rewritable, message))
+    return result
+
+
+def lint_file(path: str) -> List[RewriteResult]:
+    helpers = helper_functions(path)
+    return [rewrite_policy(policy, helpers) for policy in parse_policies(path)]
+
+
+def compare_files(before: str, after: str) -> List[RewriteResult]:
+    """Políticas de `before` com as expressões da política de mesmo nome em `after`
+
+    Para medir um arquivo que já foi reescrito contra a versão anterior dele;
+    políticas ausentes em `after` ficam inalteradas.
+    """
+    def key(policy: Policy) -> Tuple[str, str]:
+        return policy.table.split('.')[-1].strip('"'), policy.name
+
+    rewritten = {key(policy): policy for policy in parse_policies(after)}
+    results = []
+    for policy in parse_policies(before):
+        match = rewritten.get(key(policy), policy)
+        results.append(RewriteResult(policy, match.using, match.with_check))
+    return results
+
+
+def rewrite_file(path: str) -> str:
+    """Conteúdo do arquivo com as políticas reescritas e o resto intacto"""
+    with open(path, 'r') as f:
+        text = f.read()
+    for result in lint_file(path):
+        if not result.changed:
+            continue
+        # A busca começa no CREATE POLICY desta política (nomes são únicos por tabela)
+        head = text.find(result.policy.sql.splitlines()[0])
+        for original, rewritten in ((result.policy.using, result.using),
+                                    (result.policy.with_check, result.with_check)):
+            if original is None or original == rewritten:
+                continue
+            index = text.find(original, max(head, 0))
+            if index >= 0:
+                text = text[:index] + rewritten + text[index + len(original):]
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Benchmark num Postgres local
+# ---------------------------------------------------------------------------
+
+BENCH_SCHEMA = 'rls_bench'
+BENCH_ROLE = 'rls_bench_reader'
+
+# Stubs das funções do Supabase para um Postgres local; só as que faltarem são
+# criadas (e depois removidas), nunca substituídas
+_AUTH_STUBS = {
+    'jwt': """CREATE FUNCTION auth.jwt() RETURNS jsonb LANGUAGE sql STABLE AS $$
+  SELECT coalesce(nullif(current_setting('request.jwt.claims', true), ''), '{}')::jsonb
+$$""",
+    'uid': """CREATE FUNCTION auth.uid() RETURNS uuid LANGUAGE sql STABLE AS $$
+  SELECT nullif(auth.jwt() ->> 'sub', '')::uuid
+$$""",
+    'role': """CREATE FUNCTION auth.role() RETURNS text LANGUAGE sql STABLE AS $$
+  SELECT auth.jwt() ->> 'role'
+$$""",
+}
+
+
+@dataclass
+class TableBenchmark:
+    table: str
+    policies: List[str]
+    before_ms: Optional[float] = None
+    after_ms: Optional[float] = None
+    skipped: Optional[str] = None
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if not self.before_ms or not self.after_ms:
+            return None
+        return self.before_ms / self.after_ms
+
+
+def _md5_uuid(value: str) -> str:
+    """Mesmo valor que `md5(value)::uuid` no Postgres"""
+    return str(uuid.UUID(hashlib.md5(value.encode('utf-8')).hexdigest()))
+
+
+def _bench_columns(results: List[RewriteResult]) -> Dict[str, str]:
+    """Colunas referenciadas pelas políticas, com o tipo do cast quando houver"""
+    columns = {'id': 'uuid', 'tenant_id': 'uuid'}
+    for result in results:
+        for expression in filter(None, (result.using, result.with_check)):
+            for match in _COMPARED_COLUMN_RE.finditer(expression):
+                open_index = expression.index('(', match.start())
+                fragment = expression[open_index:_matching_paren(expression, open_index) + 1]
+                cast = _TRAILING_CAST_RE.search(fragment)
+                columns.setdefault(match.group(1).lower(), cast.group(1).lower() if cast else 'text')
+    return columns
+
+
+def benchmark_policies(results: Iterable[RewriteResult], dsn: str, rows: int = 100_000,
+                       tenants: int = 50, runs: int = 5) -> List[TableBenchmark]:
+    """Comparar políticas originais e reescritas por tabela num Postgres local"""
+    try:
+        import psycopg2
+    except ImportError:
+        raise RuntimeError("psycopg2 não instalado: pip install psycopg2-binary")
+
+    by_table: Dict[str, List[RewriteResult]] = {}
+    for result in results:
+        by_table.setdefault(result.policy.table.split('.')[-1].strip('"'), []).append(result)
+
+    claims = json.dumps({
+        'tenant_id': _md5_uuid('tenant-1'),
+        'user_id': _md5_uuid('user-1'),
+        'sub': _md5_uuid('user-1'),
+        'role': 'admin',
+    })
+
+    connection = psycopg2.connect(dsn)
+    connection.autocommit = True
+    cursor = connection.cursor()
+    benchmarks = []
+    created_schema = False
+    created_functions = []
+
+    def measure(table):
+        timings = []
+        cursor.execute(f"SET ROLE {BENCH_ROLE}")
+        cursor.execute("SELECT set_config('request.jwt.claims', %s, false)", (claims,))
+        try:
+            for _ in range(runs):
+                cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) SELECT count(*) FROM {BENCH_SCHEMA}.{table}")
+                plan = cursor.fetchone()[0]
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                timings.append(plan[0]['Execution Time'])
+        finally:
+            cursor.execute("RESET ROLE")
+        return statistics.median(timings)
+
+    try:
+        cursor.execute("SELECT to_regnamespace('auth') IS NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("CREATE SCHEMA auth")
+            created_schema = True
+        for name, sql in _AUTH_STUBS.items():
+            cursor.execute("SELECT to_regprocedure(%s) IS NULL", (f"auth.{name}()",))
+            if cursor.fetchone()[0]:
+                cursor.execute(sql)
+                created_functions.append(name)
+        cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+        cursor.execute(f"SELECT 1 FROM pg_roles WHERE rolname = '{BENCH_ROLE}'")
+        if not cursor.fetchone():
+            cursor.execute(f"CREATE ROLE {BENCH_ROLE} NOLOGIN")
+        cursor.execute(f"GRANT USAGE ON SCHEMA {BENCH_SCHEMA}, auth TO {BENCH_ROLE}")
+
+        for table, table_results in by_table.items():
+            names = [result.policy.name for result in table_results]
+            benchmark = TableBenchmark(table, names)
+            benchmarks.append(benchmark)
+            if not any(result.changed for result in table_results):
+                benchmark.skipped = "nenhuma política reescrita"
+                continue
+            if any(result.policy.has_subquery for result in table_results):
+                benchmark.skipped = "política com subconsulta em outras tabelas"
+                continue
+
+            columns = _bench_columns(table_results)
+            definitions = ', '.join(
+                f"{name} {sql_type}" + (' PRIMARY KEY' if name == 'id' else '')
+                for name, sql_type in columns.items()
+            )
+            values = ', '.join(
+                f"md5('tenant-' || (g % {tenants}))::uuid" if name == 'tenant_id'
+                else "md5('row-' || g)::uuid" if name == 'id'
+                else f"md5('{name}-' || (g % {tenants * 10}))::uuid" if sql_type == 'uuid'
+                else f"'{name}-' || (g % 10)"
+                for name, sql_type in columns.items()
+            )
+            cursor.execute(f"CREATE TABLE {BENCH_SCHEMA}.{table} ({definitions}, payload TEXT)")
+            cursor.execute(f"INSERT INTO {BENCH_SCHEMA}.{table} ({', '.join(columns)}, payload) "
+                           f"SELECT {values}, repeat('x', 100) FROM generate_series(1, {int(rows)}) g")
+            cursor.execute(f"CREATE INDEX ON {BENCH_SCHEMA}.{table} (tenant_id)")
+            cursor.execute(f"ANALYZE {BENCH_SCHEMA}.{table}")
+            cursor.execute(f"ALTER TABLE {BENCH_SCHEMA}.{table} ENABLE ROW LEVEL SECURITY")
+            cursor.execute(f"GRANT SELECT ON {BENCH_SCHEMA}.{table} TO {BENCH_ROLE}")
+
+            for result in table_results:
+                cursor.execute(_render_policy(result.policy, result.policy.using, result.policy.with_check,
+                                              f"{BENCH_SCHEMA}.{table}"))
+            try:
+                benchmark.before_ms = measure(table)
+                for result in table_results:
+                    cursor.execute(f"DROP POLICY {_quote(result.policy.name)} ON {BENCH_SCHEMA}.{table}")
+                    cursor.execute(result.render_create(f"{BENCH_SCHEMA}.{table}"))
+                benchmark.after_ms = measure(table)
+            except psycopg2.Error as e:
+                benchmark.skipped = str(e).strip().splitlines()[0]
+    finally:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        cursor.execute(f"SELECT 1 FROM pg_roles WHERE rolname = '{BENCH_ROLE}'")
+        if cursor.fetchone():
+            cursor.execute(f"DROP OWNED BY {BENCH_ROLE}")
+            cursor.execute(f"DROP ROLE {BENCH_ROLE}")
+        # Só o que foi criado aqui: um schema auth existente fica intacto
+        for name in reversed(created_functions):
+            cursor.execute(f"DROP FUNCTION IF EXISTS auth.{name}()")
+        if created_schema:
+            cursor.execute("DROP SCHEMA IF EXISTS auth")
+        connection.close()
+
+    return benchmarks
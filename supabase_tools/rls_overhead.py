@@ -0,0 +1,373 @@
+"""
+⚖️ Custo das políticas RLS por tabela (service role x JWT de tenant)
+Roda o mesmo conjunto de consultas por tabela sobre os dados semeados duas
+vezes: com a service role (que ignora RLS) e com JWTs de tenant (sujeitos às
+políticas). As duas versões levam o mesmo filtro `tenant_id=eq.<tenant>` que o
+frontend envia, então a diferença de latência é o custo da política em si.
+
+As medições são intercaladas (service, tenant, tenant, service, ...) e em
+sequência, uma requisição por vez: aqui interessa a latência de cada consulta,
+não a vazão, e concorrência só somaria ruído. Quando o PostgREST tem
+`db-plan-enabled`, o plano EXPLAIN ANALYZE de cada lado também é coletado e
+comparado (varreduras diferentes, filtro da política avaliado por linha em vez
+de InitPlan).
+
+Para cada tabela o relatório cruza o resultado com as políticas de
+docs/rls-policies.sql e os achados do linter de RLS, sugerindo reescrita ou
+índice de apoio.
+
+Antes de medir, os tenants são conferidos contra as políticas: se as do arquivo
+fazem `(auth.jwt() ->> 'tenant_id')::uuid` e o tenant não é um UUID (os semeados
+são `seed-tenant-0000`...), toda consulta do lado do tenant falharia com "invalid
+input syntax for type uuid". Como o arquivo pode não ser o que está aplicado no
+banco, isso só gera um aviso; quem decide é uma leitura por tenant, que aborta a
+medição se o banco devolver o erro de tipo do claim.
+"""
+
+import re
+import statistics
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .histogram import LatencyHistogram
+from .index_advisor import DEFAULT_POLICY_FILE, policy_columns
+from .rls import lint_file
+from .schema import Schema, Table
+from .sql import error_message
+from .tables import NCISO_SCHEMA
+from .testdata import COUNT_EXACT, _content_range_total
+
+DEFAULT_RUNS = 30
+DEFAULT_WARMUP = 3
+DEFAULT_PAGE_SIZE = 20
+SLOWDOWN_THRESHOLD = 1.2  # acima disso a tabela entra nas sugestões
+PLAN_ACCEPT = 'application/vnd.pgrst.plan+json; options=analyze'
+_AUTH_CALLS = ('jwt()', 'uid()', 'current_setting(')
+_UUID_CLAIM_RE = re.compile(r"->>\s*'(\w+)'\s*\)?\s*::\s*uuid\b", re.IGNORECASE)
+# Claim incompatível com a política: texto que não é UUID, ou uuid x varchar sem operador
+CLAIM_ERROR_CODES = ('22P02', '42883')
+
+
+@dataclass(frozen=True)
+class BenchQuery:
+    name: str
+    params: Dict[str, str]
+    headers: Optional[Dict[str, str]] = None
+    prefer: Optional[str] = None
+
+
+def table_queries(table: Table, tenant_id: str, sample_id: Optional[str] = None) -> List[BenchQuery]:
+    """Consultas típicas do frontend sobre uma tabela, todas filtradas pelo tenant"""
+    tenant = {'tenant_id': f"eq.{tenant_id}"}
+    page = {'Range-Unit': 'items', 'Range': f"0-{DEFAULT_PAGE_SIZE - 1}"}
+    order = 'created_at.desc' if table.column('created_at') else 'id.asc'
+    queries = [
+        BenchQuery('page', {'select': '*', **tenant, 'order': order}, page),
+        BenchQuery('count', {'select': 'id', **tenant, 'limit': '1'}, prefer=COUNT_EXACT),
+    ]
+    if sample_id:
+        queries.append(BenchQuery('lookup', {'select': '*', **tenant, 'id': f"eq.{sample_id}"}))
+    column = next((c for c in table.columns if c.choices), None)
+    if column:
+        queries.append(BenchQuery(f"filter_{column.name}",
+                                  {'select': '*', **tenant, column.name: f"eq.{column.choices[0]}", 'order': order},
+                                  page, prefer=COUNT_EXACT))
+    elif table.column('is_active'):
+        queries.append(BenchQuery('filter_is_active',
+                                  {'select': '*', **tenant, 'is_active': 'eq.true', 'order': order},
+                                  page, prefer=COUNT_EXACT))
+    return queries
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    execution_ms: float
+    planning_ms: float
+    nodes: Tuple[str, ...]
+    per_row_auth: bool
+    init_plan: bool
+
+    @property
+    def seq_scans(self) -> Tuple[str, ...]:
+        return tuple(node for node in self.nodes if node.startswith('Seq Scan'))
+
+
+def summarize_plan(plan) -> Optional[PlanSummary]:
+    """Resumo de um EXPLAIN (FORMAT JSON): nós de varredura e como a política foi avaliada"""
+    if isinstance(plan, list):
+        plan = plan[0] if plan else None
+    if not isinstance(plan, dict) or 'Plan' not in plan:
+        return None
+    nodes: List[str] = []
+    flags = {'per_row': False, 'init': False}
+
+    def walk(node, in_init_plan=False):
+        in_init_plan = in_init_plan or node.get('Parent Relationship') == 'InitPlan'
+        flags['init'] = flags['init'] or in_init_plan
+        label = node.get('Node Type', '?')
+        if node.get('Index Name'):
+            label += f" using {node['Index Name']}"
+        if node.get('Relation Name'):
+            label += f" on {node['Relation Name']}"
+            nodes.append(label)
+        conditions = ' '.join(str(node.get(key, '')) for key in ('Filter', 'Index Cond', 'Recheck Cond'))
+        if not in_init_plan and any(call in conditions for call in _AUTH_CALLS):
+            flags['per_row'] = True
+        for child in node.get('Plans', ()):
+            walk(child, in_init_plan)
+
+    walk(plan['Plan'])
+    return PlanSummary(plan.get('Execution Time', 0.0), plan.get('Planning Time', 0.0),
+                       tuple(nodes), flags['per_row'], flags['init'])
+
+
+def plan_differences(service: Optional[PlanSummary], tenant: Optional[PlanSummary]) -> List[str]:
+    if service is None or tenant is None:
+        return []
+    differences = []
+    for node in tenant.nodes:
+        if node not in service.nodes:
+            differences.append(f"só com RLS: {node}")
+    for node in service.nodes:
+        if node not in tenant.nodes:
+            differences.append(f"só sem RLS: {node}")
+    if tenant.per_row_auth:
+        differences.append("auth.jwt()/auth.uid() avaliado por linha (sem InitPlan)")
+    return differences
+
+
+@dataclass
+class QueryComparison:
+    table: str
+    query: str
+    service: LatencyHistogram = field(default_factory=LatencyHistogram)
+    tenant: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_rows: Optional[int] = None
+    tenant_rows: Optional[int] = None
+    service_plan: Optional[PlanSummary] = None
+    tenant_plan: Optional[PlanSummary] = None
+    errors: List[str] = field(default_factory=list)
+
+    def slowdown(self, percentile: float = 50.0) -> Optional[float]:
+        """Latência com RLS / sem RLS no percentil pedido"""
+        if not self.service.total or not self.tenant.total:
+            return None
+        return self.tenant.percentile(percentile) / max(self.service.percentile(percentile), 1)
+
+    @property
+    def rows_match(self) -> bool:
+        return self.service_rows == self.tenant_rows
+
+    @property
+    def plan_differences(self) -> List[str]:
+        return plan_differences(self.service_plan, self.tenant_plan)
+
+
+@dataclass
+class TableOverhead:
+    table: str
+    policies: List[str] = field(default_factory=list)
+    findings: List[str] = field(default_factory=list)
+    queries: List[QueryComparison] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def slowdown(self, percentile: float = 50.0) -> Optional[float]:
+        """Mediana da razão RLS/service das consultas da tabela"""
+        ratios = [ratio for ratio in (q.slowdown(percentile) for q in self.queries) if ratio is not None]
+        return statistics.median(ratios) if ratios else None
+
+    def to_dict(self) -> dict:
+        return {
+            'table': self.table,
+            'policies': self.policies,
+            'slowdown_p50': self.slowdown(50),
+            'slowdown_p95': self.slowdown(95),
+            'error': self.error,
+            'suggestions': self.suggestions,
+            'queries': [{
+                'query': q.query,
+                'service': q.service.summary_ms(),
+                'tenant': q.tenant.summary_ms(),
+                'service_rows': q.service_rows,
+                'tenant_rows': q.tenant_rows,
+                'service_plan_ms': q.service_plan.execution_ms if q.service_plan else None,
+                'tenant_plan_ms': q.tenant_plan.execution_ms if q.tenant_plan else None,
+                'plan_differences': q.plan_differences,
+                'errors': q.errors,
+            } for q in self.queries],
+        }
+
+
+def _timed(client, table: str, query: BenchQuery):
+    started = time.perf_counter()
+    response = client.get(table, params=query.params, headers=query.headers, prefer=query.prefer)
+    return response, time.perf_counter() - started
+
+
+def _rows(response) -> Optional[int]:
+    total = _content_range_total(response)
+    if total is not None:
+        return total
+    try:
+        return len(response.json())
+    except ValueError:
+        return None
+
+
+def fetch_plan(client, table: str, query: BenchQuery) -> Optional[PlanSummary]:
+    """Plano via PostgREST (Accept: ...plan+json); None se db-plan-enabled estiver desligado"""
+    headers = {**(query.headers or {}), 'Accept': PLAN_ACCEPT}
+    response = client.get(table, params=query.params, headers=headers, prefer=query.prefer)
+    if response.status_code != 200:
+        return None
+    try:
+        return summarize_plan(response.json())
+    except ValueError:
+        return None
+
+
+def _sample_id(client, table: str, tenant_id: str) -> Optional[str]:
+    response = client.get(table, params={'select': 'id', 'tenant_id': f"eq.{tenant_id}", 'limit': '1'})
+    if response.status_code != 200:
+        raise RuntimeError(f"{table}: leitura falhou ({response.status_code}): {error_message(response)}")
+    rows = response.json()
+    return rows[0]['id'] if rows else None
+
+
+def _compare(comparison: QueryComparison, service_client, tenant_client, query: BenchQuery,
+             runs: int, warmup: int):
+    sides = (('service', service_client, comparison.service), ('tenant', tenant_client, comparison.tenant))
+    for run in range(warmup + runs):
+        # Alterna quem vai primeiro para não favorecer um lado com cache quente
+        for name, client, histogram in (sides if run % 2 == 0 else sides[::-1]):
+            response, elapsed = _timed(client, comparison.table, query)
+            if response.status_code not in (200, 206):
+                comparison.errors.append(f"{name}: {response.status_code} {error_message(response)}")
+                return
+            if run >= warmup:
+                histogram.record_seconds(elapsed)
+            if run == 0 and getattr(comparison, f"{name}_rows") is None:
+                setattr(comparison, f"{name}_rows", _rows(response))
+
+
+def _suggestions(overhead: TableOverhead, columns: Dict[str, set], subquery_tables: set) -> List[str]:
+    suggestions = []
+    if not overhead.policies:
+        suggestions.append("sem política em docs/rls-policies.sql: confira as políticas aplicadas no banco")
+    if any(not q.rows_match for q in overhead.queries if q.service.total and q.tenant.total):
+        suggestions.append("resultados diferentes com RLS: a política filtra além do tenant_id "
+                           "(ou o claim tenant_id não confere com o dado)")
+    if overhead.findings or any(q.tenant_plan and q.tenant_plan.per_row_auth for q in overhead.queries):
+        suggestions.append("reescrever no formato (select auth.jwt() ...) — lint-rls-policies.py --write")
+    slowdown = overhead.slowdown()
+    if slowdown is not None and slowdown >= SLOWDOWN_THRESHOLD:
+        if any(q.tenant_plan and q.tenant_plan.seq_scans and not (q.service_plan and q.service_plan.seq_scans)
+               for q in overhead.queries):
+            wanted = ', '.join(sorted(columns.get(overhead.table, {'tenant_id'})))
+            suggestions.append(f"Seq Scan só com RLS: índice de apoio em ({wanted})")
+        if overhead.table in subquery_tables:
+            suggestions.append("política com subconsulta: indexe a FK/tenant_id da tabela consultada "
+                               "ou use uma função STABLE em (select ...)")
+    return suggestions
+
+
+def uuid_claims(policies) -> set:
+    """Claims do JWT convertidos para uuid nas políticas (`(auth.jwt() ->> 'x')::uuid`)"""
+    claims = set()
+    for policy in policies:
+        for clause in (policy.using, policy.with_check):
+            claims.update(_UUID_CLAIM_RE.findall(clause or ''))
+    return claims
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def check_tenant_claims(tenant_ids: Iterable[str], policies) -> Optional[str]:
+    """Motivo pelo qual os JWTs destes tenants não passariam pelas políticas, ou None"""
+    if 'tenant_id' not in uuid_claims(policies):
+        return None
+    invalid = [tenant_id for tenant_id in tenant_ids if not _is_uuid(tenant_id)]
+    if not invalid:
+        return None
+    return (f"as políticas convertem o claim tenant_id para uuid, mas {', '.join(invalid)} "
+            f"{'não é UUID' if len(invalid) == 1 else 'não são UUIDs'}: "
+            f"se elas estiverem aplicadas, toda consulta com RLS falhará com 'invalid input syntax for type uuid'. "
+            f"Use tenants UUID ou alinhe as políticas ao tenant_id VARCHAR do schema (sem ::uuid)")
+
+
+def _probe_claims(tenant_clients: Dict[str, object], table: str) -> Optional[str]:
+    """Uma leitura por tenant: erro de tipo do claim vindo das políticas aplicadas no banco"""
+    for tenant_id, client in tenant_clients.items():
+        response = client.get(table, params={'select': 'id', 'tenant_id': f"eq.{tenant_id}", 'limit': '1'})
+        if response.status_code in (200, 206):
+            continue
+        try:
+            code = response.json().get('code')
+        except (ValueError, AttributeError):
+            code = None
+        if code in CLAIM_ERROR_CODES:
+            return (f"{table} com o JWT de {tenant_id} falhou ({response.status_code}): {error_message(response)}"
+                    f" — o claim tenant_id não é compatível com as políticas aplicadas")
+    return None
+
+
+def benchmark_rls_overhead(service_client, tenant_clients: Dict[str, object],
+                           tables: Optional[Iterable[str]] = None, schema: Schema = NCISO_SCHEMA,
+                           runs: int = DEFAULT_RUNS, warmup: int = DEFAULT_WARMUP, plans: bool = True,
+                           policy_file: str = DEFAULT_POLICY_FILE,
+                           on_table=None, on_warning=None) -> List[TableOverhead]:
+    """Comparar, por tabela, as mesmas consultas com e sem RLS para cada tenant em `tenant_clients`
+
+    Claims incompatíveis com as políticas do arquivo vão para `on_warning`; levanta
+    ValueError antes de medir só se o banco recusar o claim de algum tenant.
+    """
+    results = lint_file(policy_file)
+    names = list(tables or schema.table_names)
+    warning = check_tenant_claims(tenant_clients, [r.policy for r in results])
+    if warning and on_warning:
+        on_warning(f"{policy_file}: {warning}")
+    problem = _probe_claims(tenant_clients, names[0]) if names else None
+    if problem:
+        raise ValueError(problem)
+    by_table: Dict[str, list] = {}
+    for result in results:
+        by_table.setdefault(result.policy.table.split('.')[-1].strip('"').lower(), []).append(result)
+    columns = policy_columns(policy_file)
+    subquery_tables = {name for name, found in by_table.items() if any(r.policy.has_subquery for r in found)}
+
+    overheads = []
+    for name in names:
+        table = schema.table(name)
+        found = by_table.get(name, [])
+        overhead = TableOverhead(name, [r.policy.name for r in found],
+                                 [f"{f.policy.name}: {f.message}" for r in found for f in r.findings])
+        overheads.append(overhead)
+        try:
+            comparisons: Dict[str, QueryComparison] = {}
+            for tenant_id, tenant_client in tenant_clients.items():
+                sample = _sample_id(service_client, name, tenant_id)
+                for query in table_queries(table, tenant_id, sample):
+                    comparison = comparisons.get(query.name)
+                    if comparison is None:
+                        comparison = comparisons[query.name] = QueryComparison(name, query.name)
+                    # Histogramas somados entre tenants; linhas e planos do primeiro
+                    _compare(comparison, service_client, tenant_client, query, runs, warmup)
+                    if plans and comparison.service_plan is None and not comparison.errors:
+                        comparison.service_plan = fetch_plan(service_client, name, query)
+                        comparison.tenant_plan = fetch_plan(tenant_client, name, query)
+            overhead.queries = list(comparisons.values())
+        except Exception as e:
+            overhead.error = str(e)
+        overhead.suggestions = _suggestions(overhead, columns, subquery_tables)
+        if on_table:
+            on_table(overhead)
+    return overheads
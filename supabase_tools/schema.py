@@ -0,0 +1,361 @@
+"""
+🧱 Modelo declarativo de schema
+Tabelas, colunas, CHECKs, chaves estrangeiras, índices e triggers descritos
+em Python, com renderização para o DDL usado no Supabase. O mesmo modelo é
+usado pelo gerador de SQL, pelos scripts de criação e pelas ferramentas que
+precisam conhecer o schema (validadores, seeders, verificações).
+
+A renderização completa é guardada em cache por hash do conteúdo (modelo +
+código do renderizador), então um schema que não mudou não é renderizado
+de novo.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'supabase')
+
+
+@dataclass(frozen=True)
+class ForeignKey:
+    table: str
+    column: str = 'id'
+    on_delete: Optional[str] = None
+
+    def render(self) -> str:
+        sql = f"REFERENCES {self.table}({self.column})"
+        if self.on_delete:
+            sql += f" ON DELETE {self.on_delete}"
+        return sql
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    type: str
+    nullable: bool = True
+    default: Optional[str] = None
+    primary_key: bool = False
+    choices: Tuple[str, ...] = ()
+    references: Optional[ForeignKey] = None
+
+    @property
+    def check(self) -> Optional[str]:
+        """Expressão do CHECK gerada a partir de `choices`"""
+        if not self.choices:
+            return None
+        values = ', '.join(f"'{value}'" for value in self.choices)
+        return f"{self.name} IN ({values})"
+
+    def render(self) -> str:
+        parts = [self.name, self.type]
+        if self.primary_key:
+            parts.append('PRIMARY KEY')
+        if not self.nullable and not self.primary_key:
+            parts.append('NOT NULL')
+        if self.default is not None:
+            parts.append(f"DEFAULT {self.default}")
+        if self.check:
+            parts.append(f"CHECK ({self.check})")
+        if self.references:
+            parts.append(self.references.render())
+        return ' '.join(parts)
+
+
+@dataclass(frozen=True)
+class Index:
+    columns: Tuple[str, ...]
+    name: Optional[str] = None
+    unique: bool = False
+    method: Optional[str] = None
+    where: Optional[str] = None
+
+    def index_name(self, table: str) -> str:
+        return self.name or f"idx_{table}_{'_'.join(self.columns)}"
+
+    def render(self, table: str) -> str:
+        unique = 'UNIQUE ' if self.unique else ''
+        using = f" USING {self.method}" if self.method else ''
+        where = f" WHERE {self.where}" if self.where else ''
+        return (f"CREATE {unique}INDEX IF NOT EXISTS {self.index_name(table)} "
+                f"ON {table}{using}({', '.join(self.columns)}){where};")
+
+
+@dataclass(frozen=True)
+class Trigger:
+    """Trigger com função plpgsql própria"""
+    name: str
+    body: Tuple[str, ...]
+    timing: str = 'BEFORE UPDATE'
+    for_each: str = 'ROW'
+    comment: Optional[str] = None
+
+    def render_function(self) -> str:
+        body = '\n'.join(f"  {line}" for line in self.body)
+        return (f"CREATE OR REPLACE FUNCTION {self.name}()\n"
+                f"RETURNS TRIGGER AS $$\n"
+                f"BEGIN\n"
+                f"{body}\n"
+                f"END;\n"
+                f"$$ LANGUAGE plpgsql;")
+
+    def render(self, table: str) -> str:
+        return (f"CREATE TRIGGER {self.name}\n"
+                f"  {self.timing} ON {table}\n"
+                f"  FOR EACH {self.for_each}\n"
+                f"  EXECUTE FUNCTION {self.name}();")
+
+
+def updated_at_trigger(table: str) -> Trigger:
+    """Trigger padrão que mantém `updated_at` atualizado"""
+    return Trigger(
+        name=f"update_{table}_updated_at",
+        body=('NEW.updated_at = NOW();', 'RETURN NEW;'),
+        comment='Trigger para atualizar updated_at'
+    )
+
+
+# Formato do sufixo das partições por intervalo (to_char/to_date)
+_RANGE_SUFFIX_FORMATS = {'day': 'YYYYMMDD', 'month': 'YYYYMM', 'year': 'YYYY'}
+
+
+@dataclass(frozen=True)
+class Partitioning:
+    """Particionamento declarativo: HASH (ex.: tenant_id) ou RANGE (ex.: created_at)
+
+    O Postgres exige a coluna de partição na chave primária, então a PK da
+    tabela vira `(id, coluna)`. Por isso só tabelas folha podem ser
+    particionadas: um `REFERENCES tabela(id)` apontando para ela deixaria de
+    ter uma chave única em que se apoiar. Índices criados na tabela mãe são
+    replicados como índices locais em cada partição.
+
+    - hash: `partitions` partições fixas `<tabela>_p<n>`;
+    - range: partição DEFAULT + função `create_<tabela>_partitions(n)` que cria
+      as próximas `premake` partições por `interval`, agendada via pg_cron
+      quando a extensão existe, e `drop_<tabela>_partitions(intervalo)` para
+      retenção (DROP da partição em vez de DELETE em massa).
+    """
+    strategy: str
+    column: str
+    partitions: int = 8
+    interval: str = 'month'
+    premake: int = 3
+    schedule: str = '0 3 * * *'
+
+    def __post_init__(self):
+        if self.strategy not in ('hash', 'range'):
+            raise ValueError(f"Estratégia de partição inválida: {self.strategy}")
+        if self.strategy == 'range' and self.interval not in _RANGE_SUFFIX_FORMATS:
+            raise ValueError(f"Intervalo de partição inválido: {self.interval}")
+
+    def render_clause(self) -> str:
+        return f"PARTITION BY {self.strategy.upper()} ({self.column})"
+
+    def render_partitions(self, table: str) -> Tuple[str, ...]:
+        if self.strategy == 'hash':
+            return tuple(
+                f"CREATE TABLE IF NOT EXISTS {table}_p{n} PARTITION OF {table} "
+                f"FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {n});"
+                for n in range(self.partitions)
+            )
+        return (
+            f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT;",
+            self._render_create_function(table),
+            f"SELECT create_{table}_partitions({self.premake});",
+            self._render_drop_function(table),
+            self._render_schedule(table),
+        )
+
+    def _render_create_function(self, table: str) -> str:
+        suffix = _RANGE_SUFFIX_FORMATS[self.interval]
+        return (f"CREATE OR REPLACE FUNCTION create_{table}_partitions(periods_ahead INTEGER DEFAULT {self.premake})\n"
+                f"RETURNS VOID AS $$\n"
+                f"DECLARE\n"
+                f"  period_start DATE := date_trunc('{self.interval}', NOW())::DATE;\n"
+                f"  period_end DATE;\n"
+                f"BEGIN\n"
+                f"  FOR i IN 0..periods_ahead LOOP\n"
+                f"    period_end := (period_start + INTERVAL '1 {self.interval}')::DATE;\n"
+                f"    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',\n"
+                f"                   '{table}_' || to_char(period_start, '{suffix}'), period_start, period_end);\n"
+                f"    period_start := period_end;\n"
+                f"  END LOOP;\n"
+                f"END;\n"
+                f"$$ LANGUAGE plpgsql;")
+
+    def _render_drop_function(self, table: str) -> str:
+        suffix = _RANGE_SUFFIX_FORMATS[self.interval]
+        return (f"CREATE OR REPLACE FUNCTION drop_{table}_partitions(older_than INTERVAL)\n"
+                f"RETURNS INTEGER AS $$\n"
+                f"DECLARE\n"
+                f"  child RECORD;\n"
+                f"  dropped INTEGER := 0;\n"
+                f"BEGIN\n"
+                f"  FOR child IN\n"
+                f"    SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid\n"
+                f"    WHERE i.inhparent = '{table}'::regclass AND c.relname ~ '^{table}_[0-9]+$'\n"
+                f"  LOOP\n"
+                f"    IF to_date(substring(child.relname from '[0-9]+$'), '{suffix}')\n"
+                f"       < date_trunc('{self.interval}', NOW() - older_than) THEN\n"
+                f"      EXECUTE format('DROP TABLE %I', child.relname);\n"
+                f"      dropped := dropped + 1;\n"
+                f"    END IF;\n"
+                f"  END LOOP;\n"
+                f"  RETURN dropped;\n"
+                f"END;\n"
+                f"$$ LANGUAGE plpgsql;")
+
+    def _render_schedule(self, table: str) -> str:
+        return (f"DO $$\n"
+                f"BEGIN\n"
+                f"  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN\n"
+                f"    PERFORM cron.schedule('create_{table}_partitions', '{self.schedule}',\n"
+                f"                          'SELECT create_{table}_partitions({self.premake})');\n"
+                f"  END IF;\n"
+                f"END;\n"
+                f"$$;")
+
+
+@dataclass(frozen=True)
+class Table:
+    name: str
+    columns: Tuple[Column, ...]
+    indexes: Tuple[Index, ...] = ()
+    triggers: Tuple[Trigger, ...] = ()
+    title: Optional[str] = None
+    partitioning: Optional[Partitioning] = None
+
+    def column(self, name: str) -> Optional[Column]:
+        for column in self.columns:
+            if column.name == name:
+                return column
+        return None
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(column.name for column in self.columns)
+
+    @property
+    def foreign_keys(self) -> Tuple[Tuple[str, ForeignKey], ...]:
+        return tuple((c.name, c.references) for c in self.columns if c.references)
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        """Outras tabelas referenciadas por chaves estrangeiras"""
+        deps = []
+        for _, fk in self.foreign_keys:
+            if fk.table != self.name and fk.table not in deps:
+                deps.append(fk.table)
+        return tuple(deps)
+
+    @property
+    def primary_key(self) -> Tuple[str, ...]:
+        key = tuple(column.name for column in self.columns if column.primary_key)
+        if self.partitioning and self.partitioning.column not in key:
+            key += (self.partitioning.column,)
+        return key
+
+    def render_create(self, if_not_exists: bool = True) -> str:
+        guard = 'IF NOT EXISTS ' if if_not_exists else ''
+        if not self.partitioning:
+            columns = ',\n'.join(f"  {column.render()}" for column in self.columns)
+            return f"CREATE TABLE {guard}{self.name} (\n{columns}\n);"
+        # PK composta com a coluna de partição, declarada como restrição da tabela
+        lines = [f"  {replace(column, primary_key=False, nullable=False).render()}" if column.primary_key
+                 else f"  {column.render()}" for column in self.columns]
+        lines.append(f"  PRIMARY KEY ({', '.join(self.primary_key)})")
+        columns = ',\n'.join(lines)
+        return f"CREATE TABLE {guard}{self.name} (\n{columns}\n) {self.partitioning.render_clause()};"
+
+    def render_partitions(self) -> Tuple[str, ...]:
+        return self.partitioning.render_partitions(self.name) if self.partitioning else ()
+
+    def render_indexes(self) -> Tuple[str, ...]:
+        return tuple(index.render(self.name) for index in self.indexes)
+
+    def render(self) -> str:
+        """DDL completo da tabela: CREATE TABLE, índices e triggers"""
+        sections = [self.render_create()]
+        if self.partitioning:
+            separator = '\n' if self.partitioning.strategy == 'hash' else '\n\n'
+            sections.append(f"-- Partições de {self.name}\n" + separator.join(self.render_partitions()))
+        if self.indexes:
+            sections.append(f"-- Índices para {self.name}\n" + '\n'.join(self.render_indexes()))
+        for trigger in self.triggers:
+            header = f"-- {trigger.comment}\n" if trigger.comment else ''
+            sections.append(header + trigger.render_function())
+            sections.append(trigger.render(self.name))
+        return '\n\n'.join(sections)
+
+
+@dataclass(frozen=True)
+class Schema:
+    tables: Tuple[Table, ...] = field(default_factory=tuple)
+
+    def table(self, name: str) -> Optional[Table]:
+        for table in self.tables:
+            if table.name == name:
+                return table
+        return None
+
+    @property
+    def table_names(self) -> Tuple[str, ...]:
+        return tuple(table.name for table in self.tables)
+
+    def with_partitioning(self, partitioning: Dict[str, Partitioning]) -> 'Schema':
+        """Cópia do schema com as tabelas indicadas particionadas"""
+        unknown = set(partitioning) - set(self.table_names)
+        if unknown:
+            raise ValueError(f"Tabelas desconhecidas: {', '.join(sorted(unknown))}")
+        referenced = {}
+        for table in self.tables:
+            for _, fk in table.foreign_keys:
+                if fk.table in partitioning:
+                    referenced.setdefault(fk.table, []).append(table.name)
+        if referenced:
+            raise ValueError("Tabelas referenciadas por chaves estrangeiras não podem ser particionadas: "
+                             + '; '.join(f"{name} (por {', '.join(sorted(set(sources)))})"
+                                         for name, sources in sorted(referenced.items())))
+        return replace(self, tables=tuple(
+            replace(table, partitioning=partitioning[table.name]) if table.name in partitioning else table
+            for table in self.tables
+        ))
+
+    def content_hash(self, *extra: str) -> str:
+        """Hash do modelo + código deste módulo + partes extras da renderização"""
+        digest = hashlib.sha256()
+        digest.update(repr(self).encode('utf-8'))
+        with open(__file__, 'rb') as f:
+            digest.update(f.read())
+        for part in extra:
+            digest.update(b'\0')
+            digest.update(part.encode('utf-8'))
+        return digest.hexdigest()
+
+
+def render_cached(schema: Schema, render: Callable[[Schema], str], *key_parts: str,
+                  cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Renderizar o schema usando o cache em disco quando o hash não mudou"""
+    cache_path = os.path.join(cache_dir, f"schema-{schema.content_hash(*key_parts)[:16]}.sql")
+    try:
+        with open(cache_path, 'r') as f:
+            return f.read()
+    except OSError:
+        pass
+
+    sql = render(schema)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            f.write(sql)
+    except OSError:
+        # Cache é apenas otimização; diretório somente leitura não é erro
+        pass
+    return sql
+
+
+def render_tables(tables: Iterable[Table]) -> str:
+    """CREATE TABLE de várias tabelas, sem índices nem triggers"""
+    return '\n\n'.join(table.render_create() for table in tables)
@@ -0,0 +1,142 @@
+"""
+🧮 Diferença entre o schema desejado e o catálogo ao vivo
+Compara o modelo (supabase_tools.tables) com o catálogo do Postgres e gera
+apenas o DDL necessário: tabelas e colunas ausentes, NOT NULL, tipos,
+CHECKs alterados, chaves estrangeiras, índices e triggers faltantes.
+
+Nada é removido automaticamente: colunas e índices que existem só no banco
+são listados como avisos.
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+from .catalog import check_values, fetch_catalog, normalize_type
+from .schema import Schema
+
+
+@dataclass(frozen=True)
+class SchemaChange:
+    kind: str
+    table: str
+    description: str
+    statement: str
+
+
+@dataclass
+class SchemaDiff:
+    changes: List[SchemaChange]
+    warnings: List[str]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changes
+
+    @property
+    def statements(self) -> List[str]:
+        return [change.statement for change in self.changes]
+
+    def render(self) -> str:
+        """Script SQL com todas as mudanças, na ordem de aplicação"""
+        return '\n\n'.join(self.statements)
+
+
+def _check_constraint_name(table, column):
+    return f"{table}_{column}_check"
+
+
+def _diff_table(table, live, changes, warnings):
+    """Mudanças para uma tabela que já existe no banco"""
+    for column in table.columns:
+        live_column = live.columns.get(column.name)
+        if live_column is None:
+            changes.append(SchemaChange(
+                'add_column', table.name, f"coluna {table.name}.{column.name} ausente",
+                f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {column.render()};"
+            ))
+            continue
+
+        wanted_type = normalize_type(column.type)
+        if normalize_type(live_column.type) != wanted_type:
+            changes.append(SchemaChange(
+                'alter_type', table.name,
+                f"{table.name}.{column.name}: {live_column.type} -> {wanted_type}",
+                f"ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE {column.type};"
+            ))
+
+        wanted_not_null = column.name in table.primary_key or not column.nullable
+        if live_column.not_null != wanted_not_null:
+            action = 'SET' if wanted_not_null else 'DROP'
+            changes.append(SchemaChange(
+                'alter_nullability', table.name,
+                f"{table.name}.{column.name}: {action} NOT NULL",
+                f"ALTER TABLE {table.name} ALTER COLUMN {column.name} {action} NOT NULL;"
+            ))
+
+        live_check = live.check_for_column(column.name)
+        if column.choices:
+            if live_check is None or set(check_values(live_check[1])) != set(column.choices):
+                drop = (f"ALTER TABLE {table.name} DROP CONSTRAINT IF EXISTS {live_check[0]};\n"
+                        if live_check else '')
+                changes.append(SchemaChange(
+                    'replace_check', table.name,
+                    f"CHECK de {table.name}.{column.name} diferente do modelo",
+                    f"{drop}ALTER TABLE {table.name} ADD CONSTRAINT "
+                    f"{_check_constraint_name(table.name, column.name)} CHECK ({column.check});"
+                ))
+        elif live_check is not None:
+            warnings.append(f"{table.name}.{column.name}: CHECK {live_check[0]} existe só no banco")
+
+        if column.references and live.foreign_key_for_column(column.name) is None:
+            changes.append(SchemaChange(
+                'add_foreign_key', table.name,
+                f"chave estrangeira {table.name}.{column.name} ausente",
+                f"ALTER TABLE {table.name} ADD CONSTRAINT {table.name}_{column.name}_fkey "
+                f"FOREIGN KEY ({column.name}) {column.references.render()};"
+            ))
+
+    wanted_columns = set(table.column_names)
+    for name in live.columns:
+        if name not in wanted_columns:
+            warnings.append(f"{table.name}.{name}: coluna existe só no banco")
+
+    for index in table.indexes:
+        if index.index_name(table.name) not in live.indexes:
+            changes.append(SchemaChange(
+                'create_index', table.name, f"índice {index.index_name(table.name)} ausente",
+                index.render(table.name)
+            ))
+
+    # Índices das constraints (PRIMARY KEY, UNIQUE) vêm junto com a tabela
+    wanted_indexes = {index.index_name(table.name) for index in table.indexes}
+    for name in live.indexes:
+        if name not in wanted_indexes and not name.endswith(('_pkey', '_key')):
+            warnings.append(f"{table.name}: índice {name} existe só no banco")
+
+    for trigger in table.triggers:
+        if trigger.name not in live.triggers:
+            changes.append(SchemaChange(
+                'create_trigger', table.name, f"trigger {trigger.name} ausente",
+                f"{trigger.render_function()}\n\n{trigger.render(table.name)}"
+            ))
+
+
+def diff_schema(schema: Schema, catalog) -> SchemaDiff:
+    """Comparar o modelo com um LiveCatalog já carregado"""
+    changes: List[SchemaChange] = []
+    warnings: List[str] = []
+
+    for table in schema.tables:
+        live = catalog.table(table.name)
+        if live is None:
+            changes.append(SchemaChange('create_table', table.name, f"tabela {table.name} ausente",
+                                        table.render()))
+        else:
+            _diff_table(table, live, changes, warnings)
+
+    return SchemaDiff(changes, warnings)
+
+
+def plan_schema_changes(schema: Schema, client=None) -> SchemaDiff:
+    """Ler o catálogo (uma chamada) e devolver o DDL mínimo para o modelo"""
+    return diff_schema(schema, fetch_catalog(client))
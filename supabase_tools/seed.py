@@ -0,0 +1,456 @@
+"""
+🌱 Gerador determinístico de dados sintéticos multi-tenant
+Produz volumes realistas para todas as tabelas do modelo: árvores de
+organizações com profundidade configurável, milhares de ativos por organização,
+equipes, avaliações, documentos técnicos e credenciais/acessos privilegiados
+com janelas de validade coerentes com o status.
+
+Cada tenant usa o próprio `random.Random` semeado com `(seed, índice)`: a mesma
+semente e a mesma data de referência geram exatamente os mesmos dados, em
+qualquer ordem ou paralelismo. Os UUIDs também saem do gerador, então as chaves
+estrangeiras são conhecidas antes da inserção e nenhuma resposta precisa ser
+lida de volta.
+
+A escrita usa POSTs em massa do PostgREST (um array JSON por requisição) com
+`return=minimal` e `resolution=ignore-duplicates`: reexecutar a mesma semente
+apenas completa o que faltou. Os tenants são gravados em paralelo; dentro de
+um tenant as tabelas seguem a ordem das chaves estrangeiras.
+"""
+
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .client import get_admin_client, RETURN_MINIMAL
+from .concurrency import run_bulk
+from .sql import error_message
+
+# Pais antes dos filhos (organizations.parent_id é resolvido dentro da própria tabela)
+SEED_ORDER = (
+    'organizations',
+    'teams',
+    'assets',
+    'evaluations',
+    'technical_documents',
+    'credentials_registry',
+    'privileged_access',
+)
+
+DEFAULT_BATCH_SIZE = 5000
+IGNORE_DUPLICATES = 'resolution=ignore-duplicates'
+
+_ORG_TYPES = ('company', 'division', 'department')
+_ORG_LABELS = {'company': 'Empresa', 'division': 'Divisão', 'department': 'Departamento', 'unit': 'Unidade'}
+_NAME_PREFIXES = ('Alfa', 'Atlas', 'Aurora', 'Boreal', 'Cobalto', 'Delta', 'Estrela', 'Fênix', 'Granito',
+                  'Horizonte', 'Íris', 'Jade', 'Lumen', 'Meridiano', 'Netuno', 'Órion', 'Prisma', 'Quartzo',
+                  'Rubi', 'Safira', 'Titã', 'Vértice', 'Zênite')
+_NAME_SUFFIXES = ('Tecnologia', 'Seguros', 'Energia', 'Logística', 'Saúde', 'Varejo', 'Financeira',
+                  'Telecom', 'Indústria', 'Serviços')
+_AREAS = ('Tecnologia', 'Financeiro', 'Operações', 'Jurídico', 'Recursos Humanos', 'Comercial',
+          'Segurança', 'Compliance', 'Infraestrutura', 'Produtos', 'Atendimento', 'Auditoria')
+_ASSET_KINDS = {
+    'infrastructure': ('Servidor', 'Firewall', 'Switch', 'Roteador', 'Storage', 'Balanceador'),
+    'software': ('ERP', 'CRM', 'Portal', 'API', 'Aplicativo', 'Serviço'),
+    'data': ('Base de Clientes', 'Data Lake', 'Backup', 'Planilha', 'Repositório', 'Banco de Dados'),
+    'digital': ('Domínio', 'Certificado', 'Conta de Nuvem', 'Chave de API', 'Site'),
+    'physical': ('Notebook', 'Estação', 'Datacenter', 'Cofre', 'Impressora', 'Celular'),
+    'person': ('Analista', 'Gerente', 'Administrador', 'Terceirizado', 'Diretor'),
+}
+# Pesos aproximados de um inventário real: infraestrutura e software dominam
+_ASSET_WEIGHTS = {'infrastructure': 30, 'software': 25, 'data': 15, 'digital': 15, 'physical': 10, 'person': 5}
+_LEVELS = ('low', 'medium', 'high', 'critical')
+_LOCATIONS = ('São Paulo - DC1', 'São Paulo - DC2', 'Rio de Janeiro', 'Belo Horizonte', 'Curitiba',
+              'Porto Alegre', 'Recife', 'AWS sa-east-1', 'AWS us-east-1', 'Azure Brazil South', 'Remoto')
+_DOC_TYPES = ('policy', 'procedure', 'standard', 'guideline', 'template', 'manual', 'checklist')
+_DOC_STATUSES = (('draft', 15), ('review', 10), ('approved', 20), ('active', 45), ('inactive', 10))
+_DOC_FILES = (('pdf', 'application/pdf'), ('docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+              ('md', 'text/markdown'), ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'))
+_TAGS = ('iso27001', 'lgpd', 'nist', 'cis', 'backup', 'acesso', 'rede', 'nuvem', 'incidente', 'continuidade')
+_EVAL_STATUSES = (('draft', 15), ('in_progress', 25), ('completed', 40), ('reviewed', 20))
+_CREDENTIAL_LEVELS = (('read', 50), ('write', 30), ('admin', 15), ('full', 5))
+_PRIVILEGED_LEVELS = (('read', 10), ('write', 20), ('admin', 50), ('full', 20))
+_SCOPE_TYPES = ('system', 'database', 'application', 'network', 'infrastructure')
+# Credenciais duram meses; acessos privilegiados costumam ser curtos (JIT)
+_CREDENTIAL_DAYS = ((30, 20), (90, 35), (180, 25), (365, 20))
+_PRIVILEGED_DAYS = ((1, 30), (7, 35), (30, 25), (90, 10))
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    tenants: int = 100
+    depth: int = 4
+    fanout: int = 3
+    assets_per_org: int = 250
+    teams_per_org: int = 2
+    users_per_tenant: int = 300
+    credentials_per_asset: float = 1.5
+    privileged_per_tenant: int = 500
+    evaluations_per_tenant: int = 120
+    documents_per_tenant: int = 400
+    history_days: int = 730
+    seed: int = 42
+    reference_date: Optional[date] = None
+    tenant_prefix: str = 'seed-tenant'
+
+    @property
+    def orgs_per_tenant(self) -> int:
+        return sum(self.fanout ** level for level in range(max(1, self.depth)))
+
+    @property
+    def now(self) -> datetime:
+        day = self.reference_date or datetime.now(timezone.utc).date()
+        return datetime.combine(day, dt_time(), tzinfo=timezone.utc)
+
+    def tenant_id(self, index: int) -> str:
+        return f"{self.tenant_prefix}-{index:04d}"
+
+    def rows_per_tenant(self) -> Dict[str, int]:
+        orgs = self.orgs_per_tenant
+        assets = orgs * self.assets_per_org
+        return {
+            'organizations': orgs,
+            'teams': orgs * self.teams_per_org,
+            'assets': assets,
+            'evaluations': self.evaluations_per_tenant,
+            'technical_documents': self.documents_per_tenant,
+            'credentials_registry': round(assets * self.credentials_per_asset),
+            'privileged_access': self.privileged_per_tenant,
+        }
+
+    def expected_rows(self) -> Dict[str, int]:
+        return {table: count * self.tenants for table, count in self.rows_per_tenant().items()}
+
+
+class _TenantGenerator:
+    """Linhas de um tenant, sempre iguais para a mesma (semente, índice, data)"""
+
+    def __init__(self, config: SeedConfig, index: int):
+        self.config = config
+        self.tenant_id = config.tenant_id(index)
+        self.rng = random.Random(f"{config.seed}:{index}")
+        self.now = config.now
+        self.users = [self.uuid() for _ in range(max(1, config.users_per_tenant))]
+        self.company = f"{self.rng.choice(_NAME_PREFIXES)} {self.rng.choice(_NAME_SUFFIXES)}"
+        self.organizations: List[dict] = []
+        self.teams: List[dict] = []
+        self.assets: List[dict] = []
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def weighted(self, options):
+        values, weights = zip(*options)
+        return self.rng.choices(values, weights)[0]
+
+    def moment(self, earliest: datetime, latest: Optional[datetime] = None) -> datetime:
+        latest = latest or self.now
+        span = max(0.0, (latest - earliest).total_seconds())
+        return earliest + timedelta(seconds=int(self.rng.random() * span))
+
+    def history_start(self) -> datetime:
+        return self.now - timedelta(days=self.config.history_days)
+
+    def base(self, created_at: datetime) -> dict:
+        stamp = created_at.isoformat()
+        return {'id': self.uuid(), 'tenant_id': self.tenant_id, 'created_at': stamp, 'updated_at': stamp}
+
+    # Organizações: árvore em largura, pais sempre antes dos filhos
+    def generate_organizations(self) -> List[dict]:
+        created_at = self.history_start()
+        level_rows = [None]
+        for level in range(max(1, self.config.depth)):
+            next_level = []
+            for parent in level_rows:
+                for number in range(1 if parent is None else self.config.fanout):
+                    created_at = min(created_at + timedelta(minutes=self.rng.randint(1, 240)), self.now)
+                    row = self.base(created_at)
+                    if parent is None:
+                        name = self.company
+                    else:
+                        name = f"{parent['name']} / {self.rng.choice(_AREAS)} {number + 1}"
+                    org_type = _ORG_TYPES[level] if level < len(_ORG_TYPES) else 'unit'
+                    row.update({
+                        'name': name[:255],
+                        'type': org_type,
+                        'parent_id': parent['id'] if parent else None,
+                        'description': f"{_ORG_LABELS[org_type]} de {self.company}",
+                        'is_active': self.rng.random() < 0.95,
+                    })
+                    next_level.append(row)
+            self.organizations.extend(next_level)
+            level_rows = next_level
+        return self.organizations
+
+    def generate_teams(self) -> List[dict]:
+        for org in self.organizations:
+            for number in range(self.config.teams_per_org):
+                row = self.base(self.moment(datetime.fromisoformat(org['created_at'])))
+                row.update({
+                    'name': f"Equipe {self.rng.choice(_AREAS)} {number + 1}",
+                    'description': f"Equipe de {org['name']}",
+                    'organization_id': org['id'],
+                    'is_active': self.rng.random() < 0.9,
+                })
+                self.teams.append(row)
+        return _by_created_at(self.teams)
+
+    def generate_assets(self) -> List[dict]:
+        kinds = list(_ASSET_WEIGHTS.items())
+        for org in self.organizations:
+            org_created = datetime.fromisoformat(org['created_at'])
+            for number in range(self.config.assets_per_org):
+                kind = self.weighted(kinds)
+                confidentiality = self.weighted(zip(_LEVELS, (30, 35, 25, 10)))
+                row = self.base(self.moment(org_created))
+                row.update({
+                    'name': f"{self.rng.choice(_ASSET_KINDS[kind])} {number + 1:05d}",
+                    'type': kind,
+                    'description': f"Ativo {kind} de {org['name']}",
+                    'owner_id': self.rng.choice(self.users),
+                    'classification': {
+                        'confidentiality': confidentiality,
+                        'integrity': self.weighted(zip(_LEVELS, (20, 40, 30, 10))),
+                        'availability': self.weighted(zip(_LEVELS, (25, 35, 25, 15))),
+                    },
+                    # Valores com cauda longa, como num inventário real
+                    'value': round(min(self.rng.lognormvariate(9, 1.5), 9_999_999_999), 2),
+                    'location': self.rng.choice(_LOCATIONS),
+                    'organization_id': org['id'],
+                    'is_active': self.rng.random() < 0.92,
+                })
+                self.assets.append(row)
+        return _by_created_at(self.assets)
+
+    def generate_evaluations(self) -> List[dict]:
+        rows = []
+        for number in range(self.config.evaluations_per_tenant):
+            status = self.weighted(_EVAL_STATUSES)
+            start = self.moment(self.history_start()).date()
+            finished = status in ('completed', 'reviewed')
+            row = self.base(datetime.combine(start, dt_time(), tzinfo=timezone.utc))
+            row.update({
+                'name': f"Avaliação {self.rng.choice(_TAGS).upper()} {number + 1:04d}",
+                'description': None,
+                'scope_id': self.rng.choice(self.organizations)['id'],
+                'domain_id': None,
+                'control_id': None,
+                'status': status,
+                'percentage_score': round(self.rng.uniform(35, 100), 2) if finished else None,
+                'evidence_count': self.rng.randint(0, 60) if status != 'draft' else 0,
+                'start_date': start.isoformat(),
+                'end_date': (start + timedelta(days=self.rng.randint(7, 90))).isoformat() if finished else None,
+                'notes': None,
+                'created_by': self.rng.choice(self.users),
+            })
+            rows.append(row)
+        return _by_created_at(rows)
+
+    def generate_technical_documents(self) -> List[dict]:
+        rows = []
+        for number in range(self.config.documents_per_tenant):
+            document_type = self.rng.choice(_DOC_TYPES)
+            extension, file_type = self.rng.choice(_DOC_FILES)
+            asset = self.rng.choice(self.assets) if self.assets and self.rng.random() < 0.7 else None
+            row = self.base(self.moment(self.history_start()))
+            row.update({
+                'name': f"{document_type.capitalize()} {number + 1:04d}",
+                'description': None,
+                'document_type': document_type,
+                'version': f"{self.rng.randint(1, 5)}.{self.rng.randint(0, 9)}",
+                'content': None,
+                'file_path': f"{self.tenant_id}/documents/{document_type}-{number + 1:04d}.{extension}",
+                'file_size': int(self.rng.lognormvariate(12, 1.2)),
+                'file_type': file_type,
+                'tags': self.rng.sample(_TAGS, self.rng.randint(1, 4)),
+                'scope_id': self.rng.choice(self.organizations)['id'],
+                'asset_id': asset['id'] if asset else None,
+                'control_id': None,
+                'status': self.weighted(_DOC_STATUSES),
+                'created_by': self.rng.choice(self.users),
+            })
+            rows.append(row)
+        return _by_created_at(rows)
+
+    def access_window(self, durations) -> dict:
+        """Janela de validade e campos de aprovação/revogação coerentes com o status"""
+        # Algumas concessões começam no futuro (aprovadas com antecedência)
+        valid_from = self.moment(self.history_start(), self.now + timedelta(days=30))
+        valid_until = valid_from + timedelta(days=self.weighted(durations), seconds=self.rng.randint(0, 86399))
+        created_at = valid_from - timedelta(seconds=self.rng.randint(0, 7 * 86400))
+
+        if valid_from > self.now:
+            status = self.weighted((('pending', 60), ('approved', 40)))
+        elif valid_until < self.now:
+            status = self.weighted((('expired', 85), ('revoked', 15)))
+        else:
+            status = self.weighted((('active', 85), ('pending', 5), ('revoked', 5), ('inactive', 5)))
+
+        approved = status != 'pending'
+        approved_at = self.moment(created_at, min(valid_from, self.now)) if approved else None
+        revoked_at = None
+        if status == 'revoked':
+            revoked_at = self.moment(valid_from, min(valid_until, self.now))
+
+        row = self.base(created_at)
+        row.update({
+            'justification': None,
+            'valid_from': valid_from.isoformat(),
+            'valid_until': valid_until.isoformat(),
+            'status': status,
+            'approved_by': self.rng.choice(self.users) if approved else None,
+            'approved_at': approved_at.isoformat() if approved_at else None,
+            'revoked_by': self.rng.choice(self.users) if revoked_at else None,
+            'revoked_at': revoked_at.isoformat() if revoked_at else None,
+            'created_by': self.rng.choice(self.users),
+        })
+        return row
+
+    def generate_credentials_registry(self) -> List[dict]:
+        rows = []
+        count = round(len(self.assets) * self.config.credentials_per_asset)
+        for _ in range(count):
+            asset = self.rng.choice(self.assets)
+            by_team = self.teams and self.rng.random() < 0.2
+            row = self.access_window(_CREDENTIAL_DAYS)
+            row.update({
+                'asset_id': asset['id'],
+                'holder_type': 'team' if by_team else 'user',
+                'holder_id': self.rng.choice(self.teams)['id'] if by_team else self.rng.choice(self.users),
+                'access_type': self.weighted(_CREDENTIAL_LEVELS),
+                'justification': f"Acesso a {asset['name']}",
+            })
+            rows.append(row)
+        return _by_created_at(rows)
+
+    def generate_privileged_access(self) -> List[dict]:
+        rows = []
+        for _ in range(self.config.privileged_per_tenant):
+            scope_type = self.rng.choice(_SCOPE_TYPES)
+            row = self.access_window(_PRIVILEGED_DAYS)
+            audited = row['status'] in ('active', 'expired', 'revoked') and self.rng.random() < 0.6
+            audit_date = self.moment(datetime.fromisoformat(row['valid_from'])) if audited else None
+            row.update({
+                'user_id': self.rng.choice(self.users),
+                'scope_type': scope_type,
+                'scope_id': self.rng.choice(self.assets)['id'] if self.assets else f"{scope_type}-{self.rng.randint(1, 99)}",
+                'access_level': self.weighted(_PRIVILEGED_LEVELS),
+                'justification': f"Manutenção de {scope_type}",
+                'last_audit_date': audit_date.isoformat() if audit_date else None,
+                'audit_notes': 'Revisão periódica sem apontamentos' if audited else None,
+            })
+            rows.append(row)
+        return _by_created_at(rows)
+
+
+def _by_created_at(rows: List[dict]) -> List[dict]:
+    # Inserir em ordem de criação mantém created_at correlacionado com a posição física (BRIN)
+    rows.sort(key=lambda row: row['created_at'])
+    return rows
+
+
+def tenant_rows(config: SeedConfig, index: int) -> Iterator[Tuple[str, List[dict]]]:
+    """(tabela, linhas) de um tenant, na ordem das chaves estrangeiras"""
+    generator = _TenantGenerator(config, index)
+    for table in SEED_ORDER:
+        yield table, getattr(generator, f"generate_{table}")()
+
+
+def chunked(rows: List[dict], size: int) -> Iterator[List[dict]]:
+    size = max(1, size)
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+@dataclass
+class TenantResult:
+    tenant_id: str
+    rows: Dict[str, int] = field(default_factory=dict)
+    requests: int = 0
+    elapsed_ms: float = 0.0
+    table: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class SeedReport:
+    results: List[TenantResult] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(result.success for result in self.results)
+
+    @property
+    def failures(self) -> List[TenantResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def rows(self) -> Dict[str, int]:
+        totals = {table: 0 for table in SEED_ORDER}
+        for result in self.results:
+            for table, count in result.rows.items():
+                totals[table] += count
+        return totals
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total_rows / (self.elapsed_ms / 1000) if self.elapsed_ms else 0.0
+
+
+def seed_tenant(config: SeedConfig, index: int, client=None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> TenantResult:
+    """Gerar e gravar um tenant; para na primeira falha (as tabelas seguintes dependem dela)"""
+    client = client or get_admin_client()
+    result = TenantResult(config.tenant_id(index))
+    started = time.perf_counter()
+    prefer = f"{RETURN_MINIMAL},{IGNORE_DUPLICATES}"
+
+    for table, rows in tenant_rows(config, index):
+        for batch in chunked(rows, batch_size):
+            try:
+                response = client.post(table, json=batch, prefer=prefer)
+            except Exception as e:
+                result.table, result.error = table, str(e)
+                break
+            result.requests += 1
+            if response.status_code not in (200, 201, 204):
+                result.table, result.status_code = table, response.status_code
+                result.error = error_message(response)
+                break
+            result.rows[table] = result.rows.get(table, 0) + len(batch)
+        if result.error:
+            break
+
+    result.elapsed_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+def seed_tenants(config: SeedConfig, client=None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_workers: Optional[int] = None,
+                 on_result: Optional[Callable[[TenantResult], None]] = None) -> SeedReport:
+    """Gravar todos os tenants em paralelo (um tenant por tarefa)"""
+    client = client or get_admin_client()
+    report = SeedReport()
+    started = time.perf_counter()
+
+    def run(index):
+        result = seed_tenant(config, index, client, batch_size)
+        if on_result:
+            on_result(result)
+        return result
+
+    report.results = run_bulk(run, range(config.tenants), client=client, max_workers=max_workers)
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
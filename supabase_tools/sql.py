@@ -0,0 +1,289 @@
+"""
+✂️ Divisão e execução de scripts SQL comando a comando
+Separa um script em comandos individuais respeitando strings ('...', E'...'),
+identificadores ("..."), comentários (-- e /* */, inclusive aninhados) e corpos
+$$ ... $$ / $tag$ ... $tag$ de funções plpgsql. A leitura é em streaming, linha
+a linha, e cada comando guarda a linha onde começa no arquivo.
+
+Os comandos podem ser enviados ao exec_sql um a um ou em lotes; o relatório
+traz a latência de cada envio e, quando um lote falha, o comando exato que
+causou o erro (o lote é reexecutado comando a comando, já que cada chamada a
+exec_sql é uma transação e o lote com erro não deixou nada aplicado).
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional
+
+from .client import get_client
+
+_DOLLAR_TAG_RE = re.compile(r'\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$')
+
+_NORMAL, _LINE_COMMENT, _BLOCK_COMMENT, _QUOTE, _ESCAPE_QUOTE, _IDENTIFIER, _DOLLAR = range(7)
+
+
+@dataclass(frozen=True)
+class Statement:
+    sql: str
+    line: int
+    index: int
+    source: str = ''
+
+    @property
+    def location(self) -> str:
+        return f"{self.source}:{self.line}" if self.source else f"linha {self.line}"
+
+    @property
+    def summary(self) -> str:
+        code = [line for line in self.sql.splitlines() if line.strip() and not line.strip().startswith('--')]
+        return ' '.join(' '.join(code).split())[:80]
+
+
+def _lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Reagrupar pedaços arbitrários de texto em linhas completas"""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line + '\n'
+    if pending:
+        yield pending
+
+
+def iter_statements(chunks: Iterable[str], source: str = '') -> Iterator[Statement]:
+    """Gerar os comandos conforme o texto chega (um arquivo aberto serve como `chunks`)"""
+    state = _NORMAL
+    depth = 0
+    tag = ''
+    buffer: List[str] = []
+    start_line: Optional[int] = None
+    index = 0
+
+    for line_number, line in enumerate(_lines(chunks), 1):
+        i = 0
+        segment_start = 0
+        length = len(line)
+
+        while i < length:
+            char = line[i]
+
+            if state == _LINE_COMMENT:
+                # Vai até o fim da linha
+                i = length
+                state = _NORMAL
+                break
+
+            if state == _BLOCK_COMMENT:
+                pair = line[i:i + 2]
+                if pair == '/*':
+                    depth += 1
+                    i += 2
+                elif pair == '*/':
+                    depth -= 1
+                    i += 2
+                    if depth == 0:
+                        state = _NORMAL
+                else:
+                    i += 1
+                continue
+
+            if state in (_QUOTE, _ESCAPE_QUOTE, _IDENTIFIER):
+                quote = '"' if state == _IDENTIFIER else "'"
+                if state == _ESCAPE_QUOTE and char == '\\':
+                    i += 2
+                elif char == quote:
+                    if line[i + 1:i + 2] == quote:
+                        i += 2
+                    else:
+                        i += 1
+                        state = _NORMAL
+                else:
+                    i += 1
+                continue
+
+            if state == _DOLLAR:
+                end = line.find(tag, i)
+                if end == -1:
+                    i = length
+                else:
+                    i = end + len(tag)
+                    state = _NORMAL
+                continue
+
+            # Estado normal
+            pair = line[i:i + 2]
+            if pair == '--':
+                state = _LINE_COMMENT
+                i += 2
+                continue
+            if pair == '/*':
+                state = _BLOCK_COMMENT
+                depth = 1
+                i += 2
+                continue
+
+            if not char.isspace() and char != ';' and start_line is None:
+                start_line = line_number
+
+            if char == "'":
+                escaped = i > 0 and line[i - 1] in 'eE' and (i < 2 or not (line[i - 2].isalnum() or line[i - 2] == '_'))
+                state = _ESCAPE_QUOTE if escaped else _QUOTE
+                i += 1
+            elif char == '"':
+                state = _IDENTIFIER
+                i += 1
+            elif char == '$':
+                match = _DOLLAR_TAG_RE.match(line, i)
+                if match and not (i > 0 and (line[i - 1].isalnum() or line[i - 1] == '_')):
+                    tag = match.group(0)
+                    state = _DOLLAR
+                    i = match.end()
+                else:
+                    i += 1
+            elif char == ';':
+                buffer.append(line[segment_start:i])
+                sql = ''.join(buffer).strip()
+                if start_line is not None:
+                    index += 1
+                    yield Statement(sql, start_line, index, source)
+                buffer = []
+                start_line = None
+                i += 1
+                segment_start = i
+            else:
+                i += 1
+
+        if state == _LINE_COMMENT:
+            state = _NORMAL
+        buffer.append(line[segment_start:])
+
+    sql = ''.join(buffer).strip()
+    if start_line is not None:
+        yield Statement(sql, start_line, index + 1, source)
+
+
+def read_statements(path: str) -> Iterator[Statement]:
+    """Comandos de um arquivo SQL, lidos em streaming"""
+    with open(path, 'r') as f:
+        yield from iter_statements(f, source=path)
+
+
+def split_statements(text: str) -> List[str]:
+    """Comandos do script, sem o `;` final e sem trechos só de comentários"""
+    return [statement.sql for statement in iter_statements([text])]
+
+
+def batches(statements: Iterable[Statement], size: int) -> Iterator[List[Statement]]:
+    batch: List[Statement] = []
+    for statement in statements:
+        batch.append(statement)
+        if len(batch) >= max(1, size):
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@dataclass
+class StatementResult:
+    statements: List[Statement]
+    success: bool
+    elapsed_ms: float
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def statement(self) -> Statement:
+        return self.statements[0]
+
+
+@dataclass
+class ScriptReport:
+    results: List[StatementResult] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(result.success for result in self.results)
+
+    @property
+    def failures(self) -> List[StatementResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def statement_count(self) -> int:
+        return sum(len(result.statements) for result in self.results if result.success)
+
+    def slowest(self, count=10) -> List[StatementResult]:
+        return sorted(self.results, key=lambda result: result.elapsed_ms, reverse=True)[:count]
+
+    def to_dict(self) -> dict:
+        return {
+            'elapsed_ms': round(self.elapsed_ms, 2),
+            'results': [
+                {
+                    'location': result.statement.location,
+                    'statements': len(result.statements),
+                    'summary': result.statement.summary,
+                    'success': result.success,
+                    'elapsed_ms': round(result.elapsed_ms, 2),
+                    'status_code': result.status_code,
+                    'error': result.error,
+                }
+                for result in self.results
+            ],
+        }
+
+
+def error_message(response) -> str:
+    """Mensagem do Postgres repassada pelo PostgREST, quando houver"""
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text
+    if isinstance(body, dict) and body.get('message'):
+        detail = ' | '.join(str(body[key]) for key in ('details', 'hint') if body.get(key))
+        return f"{body['message']} ({detail})" if detail else body['message']
+    return json.dumps(body)
+
+
+def _send(client, statements: List[Statement]) -> StatementResult:
+    sql = ';\n'.join(statement.sql for statement in statements) + ';'
+    started = time.perf_counter()
+    try:
+        response = client.exec_sql(sql)
+    except Exception as e:
+        return StatementResult(statements, False, (time.perf_counter() - started) * 1000, error=str(e))
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.status_code in (200, 204):
+        return StatementResult(statements, True, elapsed, response.status_code)
+    return StatementResult(statements, False, elapsed, response.status_code, error_message(response))
+
+
+def execute_statements(statements: Iterable[Statement], client=None, batch_size=1,
+                       stop_on_error=True) -> ScriptReport:
+    """Enviar os comandos ao exec_sql em lotes de `batch_size`, medindo cada envio"""
+    client = client or get_client()
+    report = ScriptReport()
+    started = time.perf_counter()
+
+    for batch in batches(statements, batch_size):
+        result = _send(client, batch)
+        if result.success or len(batch) == 1:
+            report.results.append(result)
+        else:
+            # Localizar o comando com erro reenviando o lote um a um; sem
+            # stop_on_error o restante do lote também é enviado e relatado
+            for statement in batch:
+                single = _send(client, [statement])
+                report.results.append(single)
+                if not single.success and stop_on_error:
+                    break
+        if not report.results[-1].success and stop_on_error:
+            break
+
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
@@ -0,0 +1,214 @@
+"""
+📋 Schema do n.CISO (fonte única)
+Definição das tabelas do n.ISMS usada para gerar o supabase-schema-ready.sql
+e por todos os scripts que precisam conhecer tabelas, colunas e restrições.
+"""
+
+from .schema import Column, ForeignKey, Index, Schema, Table, updated_at_trigger
+
+TIMESTAMPTZ = 'TIMESTAMP WITH TIME ZONE'
+
+ACCESS_LEVELS = ('read', 'write', 'admin', 'full')
+ACCESS_STATUSES = ('pending', 'approved', 'active', 'inactive', 'expired', 'revoked')
+KEYSET_ORDER = ('tenant_id', 'created_at', 'id')
+
+
+def _id():
+    return Column('id', 'UUID', primary_key=True, default='gen_random_uuid()')
+
+
+def _tenant_id():
+    return Column('tenant_id', 'VARCHAR(255)', nullable=False)
+
+
+def _timestamps():
+    return (
+        Column('created_at', TIMESTAMPTZ, default='NOW()'),
+        Column('updated_at', TIMESTAMPTZ, default='NOW()'),
+    )
+
+
+def _indexes(*columns):
+    return tuple(Index((column,)) for column in columns)
+
+
+def _keyset_index():
+    # Ordem estável da paginação por chave; também cobre os filtros só por tenant_id
+    return Index(KEYSET_ORDER)
+
+
+ORGANIZATIONS = Table(
+    name='organizations',
+    title='TABELA DE ORGANIZAÇÕES',
+    columns=(
+        _id(),
+        Column('name', 'VARCHAR(255)', nullable=False),
+        Column('type', 'VARCHAR(50)', nullable=False,
+               choices=('company', 'department', 'unit', 'division')),
+        Column('parent_id', 'UUID', references=ForeignKey('organizations')),
+        Column('description', 'TEXT'),
+        _tenant_id(),
+        Column('is_active', 'BOOLEAN', default='true'),
+        *_timestamps(),
+    ),
+    indexes=(_keyset_index(), *_indexes('parent_id', 'type', 'is_active')),
+    triggers=(updated_at_trigger('organizations'),),
+)
+
+ASSETS = Table(
+    name='assets',
+    title='TABELA DE ATIVOS',
+    columns=(
+        _id(),
+        Column('name', 'VARCHAR(255)', nullable=False),
+        Column('type', 'VARCHAR(50)', nullable=False,
+               choices=('physical', 'digital', 'person', 'software', 'infrastructure', 'data')),
+        Column('description', 'TEXT'),
+        Column('owner_id', 'UUID'),
+        Column('classification', 'JSONB', nullable=False,
+               default='\'{"confidentiality": "low", "integrity": "low", "availability": "low"}\''),
+        Column('value', 'DECIMAL(15,2)'),
+        Column('location', 'VARCHAR(255)'),
+        Column('organization_id', 'UUID', references=ForeignKey('organizations')),
+        _tenant_id(),
+        Column('is_active', 'BOOLEAN', default='true'),
+        *_timestamps(),
+    ),
+    indexes=(_keyset_index(), *_indexes('organization_id', 'type', 'is_active')),
+    triggers=(updated_at_trigger('assets'),),
+)
+
+EVALUATIONS = Table(
+    name='evaluations',
+    title='TABELA DE AVALIAÇÕES',
+    columns=(
+        _id(),
+        Column('name', 'VARCHAR(255)', nullable=False),
+        Column('description', 'TEXT'),
+        Column('scope_id', 'UUID'),
+        Column('domain_id', 'UUID'),
+        Column('control_id', 'UUID'),
+        Column('status', 'VARCHAR(50)', nullable=False, default="'draft'",
+               choices=('draft', 'in_progress', 'completed', 'reviewed')),
+        Column('percentage_score', 'DECIMAL(5,2)'),
+        Column('evidence_count', 'INTEGER', default='0'),
+        Column('start_date', 'DATE', nullable=False),
+        Column('end_date', 'DATE'),
+        Column('notes', 'TEXT'),
+        _tenant_id(),
+        Column('created_by', 'VARCHAR(255)'),
+        *_timestamps(),
+    ),
+    indexes=(_keyset_index(), *_indexes('status', 'start_date')),
+    triggers=(updated_at_trigger('evaluations'),),
+)
+
+TECHNICAL_DOCUMENTS = Table(
+    name='technical_documents',
+    title='TABELA DE DOCUMENTOS TÉCNICOS',
+    columns=(
+        _id(),
+        Column('name', 'VARCHAR(255)', nullable=False),
+        Column('description', 'TEXT'),
+        Column('document_type', 'VARCHAR(50)', nullable=False,
+               choices=('policy', 'procedure', 'standard', 'guideline', 'template', 'manual', 'checklist')),
+        Column('version', 'VARCHAR(20)', default="'1.0'"),
+        Column('content', 'TEXT'),
+        Column('file_path', 'VARCHAR(500)'),
+        Column('file_size', 'BIGINT'),
+        Column('file_type', 'VARCHAR(100)'),
+        Column('tags', 'TEXT[]'),
+        Column('scope_id', 'UUID'),
+        Column('asset_id', 'UUID', references=ForeignKey('assets')),
+        Column('control_id', 'UUID'),
+        Column('status', 'VARCHAR(50)', nullable=False, default="'draft'",
+               choices=('draft', 'review', 'approved', 'active', 'inactive')),
+        _tenant_id(),
+        Column('created_by', 'VARCHAR(255)'),
+        *_timestamps(),
+    ),
+    indexes=(_keyset_index(), *_indexes('document_type', 'status', 'scope_id')),
+    triggers=(updated_at_trigger('technical_documents'),),
+)
+
+TEAMS = Table(
+    name='teams',
+    title='TABELA DE EQUIPES',
+    columns=(
+        _id(),
+        Column('name', 'VARCHAR(255)', nullable=False),
+        Column('description', 'TEXT'),
+        Column('organization_id', 'UUID', references=ForeignKey('organizations')),
+        _tenant_id(),
+        Column('is_active', 'BOOLEAN', default='true'),
+        *_timestamps(),
+    ),
+    indexes=(_keyset_index(), *_indexes('organization_id', 'is_active')),
+    triggers=(updated_at_trigger('teams'),),
+)
+
+CREDENTIALS_REGISTRY = Table(
+    name='credentials_registry',
+    title='TABELA DE REGISTRO DE CREDENCIAIS',
+    columns=(
+        _id(),
+        Column('asset_id', 'UUID', nullable=False, references=ForeignKey('assets')),
+        Column('holder_type', 'VARCHAR(20)', nullable=False, choices=('user', 'team')),
+        Column('holder_id', 'VARCHAR(255)', nullable=False),
+        Column('access_type', 'VARCHAR(20)', nullable=False, choices=ACCESS_LEVELS),
+        Column('justification', 'TEXT'),
+        Column('valid_from', TIMESTAMPTZ, nullable=False),
+        Column('valid_until', TIMESTAMPTZ, nullable=False),
+        Column('status', 'VARCHAR(20)', nullable=False, default="'pending'", choices=ACCESS_STATUSES),
+        Column('approved_by', 'VARCHAR(255)'),
+        Column('approved_at', TIMESTAMPTZ),
+        Column('revoked_by', 'VARCHAR(255)'),
+        Column('revoked_at', TIMESTAMPTZ),
+        _tenant_id(),
+        Column('created_by', 'VARCHAR(255)'),
+        *_timestamps(),
+    ),
+    indexes=(_keyset_index(), *_indexes('asset_id', 'holder_type', 'status', 'valid_until')),
+    triggers=(updated_at_trigger('credentials_registry'),),
+)
+
+PRIVILEGED_ACCESS = Table(
+    name='privileged_access',
+    title='TABELA DE ACESSO PRIVILEGIADO',
+    columns=(
+        _id(),
+        Column('user_id', 'VARCHAR(255)', nullable=False),
+        Column('scope_type', 'VARCHAR(50)', nullable=False,
+               choices=('system', 'database', 'application', 'network', 'infrastructure')),
+        Column('scope_id', 'VARCHAR(255)', nullable=False),
+        Column('access_level', 'VARCHAR(20)', nullable=False, choices=ACCESS_LEVELS),
+        Column('justification', 'TEXT'),
+        Column('valid_from', TIMESTAMPTZ, nullable=False),
+        Column('valid_until', TIMESTAMPTZ, nullable=False),
+        Column('status', 'VARCHAR(20)', nullable=False, default="'pending'", choices=ACCESS_STATUSES),
+        Column('approved_by', 'VARCHAR(255)'),
+        Column('approved_at', TIMESTAMPTZ),
+        Column('revoked_by', 'VARCHAR(255)'),
+        Column('revoked_at', TIMESTAMPTZ),
+        Column('last_audit_date', TIMESTAMPTZ),
+        Column('audit_notes', 'TEXT'),
+        _tenant_id(),
+        Column('created_by', 'VARCHAR(255)'),
+        *_timestamps(),
+    ),
+    indexes=(_keyset_index(), *_indexes('user_id', 'scope_type', 'status', 'valid_until')),
+    triggers=(updated_at_trigger('privileged_access'),),
+)
+
+# Tabelas que crescem sem limite por tenant: candidatas a particionamento
+HIGH_VOLUME_TABLES = ('evaluations', 'credentials_registry', 'privileged_access')
+
+NCISO_SCHEMA = Schema(tables=(
+    ORGANIZATIONS,
+    ASSETS,
+    EVALUATIONS,
+    TECHNICAL_DOCUMENTS,
+    TEAMS,
+    CREDENTIALS_REGISTRY,
+    PRIVILEGED_ACCESS,
+))
@@ -0,0 +1,154 @@
+"""
+🧹 Dados de teste com escopo de execução
+Cada execução de smoke test/benchmark grava num tenant próprio,
+`testrun-<AAAAMMDDTHHMMSSZ>-<sufixo>`, e a limpeza é um único DELETE filtrado
+por tenant_id por tabela (filhos antes dos pais), em vez de um DELETE por linha.
+Linhas gravadas fora do tenant da execução podem ser registradas com `track()`
+e são removidas em lotes de `id=in.(...)`.
+
+Como o carimbo de data/hora no tenant_id é ordenável, o coletor de execuções
+órfãs (scripts que caíram antes de limpar) remove tudo com tenant_id entre
+`testrun-` e `testrun-<limite>` com um DELETE por tabela.
+"""
+
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .client import get_admin_client, RETURN_MINIMAL, RETURN_REPRESENTATION
+from .clone import table_levels
+from .concurrency import run_bulk
+from .sql import error_message
+from .tables import NCISO_SCHEMA
+
+RUN_PREFIX = 'testrun-'
+STAMP_FORMAT = '%Y%m%dT%H%M%SZ'
+DEFAULT_MAX_AGE = timedelta(hours=6)
+IN_BATCH_SIZE = 200
+COUNT_EXACT = 'count=exact'
+
+
+def new_run_id(label: str = '', now: Optional[datetime] = None) -> str:
+    """tenant_id de uma execução: ordenável pela data/hora de início"""
+    now = now or datetime.now(timezone.utc)
+    suffix = secrets.token_hex(3)
+    label = ''.join(char for char in label.lower() if char.isalnum())[:16]
+    return f"{RUN_PREFIX}{now.strftime(STAMP_FORMAT)}-{label + '-' if label else ''}{suffix}"
+
+
+def run_started_at(run_id: str) -> Optional[datetime]:
+    if not run_id.startswith(RUN_PREFIX):
+        return None
+    try:
+        return datetime.strptime(run_id[len(RUN_PREFIX):][:16], STAMP_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _content_range_total(response) -> Optional[int]:
+    """Total do Content-Range (`*/N`) devolvido com Prefer: count=exact"""
+    content_range = response.headers.get('Content-Range', '') if hasattr(response, 'headers') else ''
+    total = content_range.rsplit('/', 1)[-1]
+    return int(total) if total.isdigit() else None
+
+
+def _delete(client, table: str, params: Dict[str, str]) -> int:
+    response = client.delete(table, params=params, prefer=f"{RETURN_MINIMAL},{COUNT_EXACT}")
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f"{table}: exclusão falhou ({response.status_code}): {error_message(response)}")
+    return _content_range_total(response) or 0
+
+
+def delete_ids(client, table: str, ids: Iterable[str], batch_size: int = IN_BATCH_SIZE) -> int:
+    """Excluir por `id=in.(...)` em lotes (limitados pelo tamanho da URL)"""
+    ids = list(dict.fromkeys(ids))
+    deleted = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        deleted += _delete(client, table, {'id': f"in.({','.join(chunk)})"})
+    return deleted
+
+
+def _delete_tables(client, tables: Iterable[str], params: Dict[str, str]) -> Dict[str, int]:
+    """Mesmo filtro em cada tabela, filhos antes dos pais; um nível de FK por vez"""
+    wanted = set(tables)
+    deleted: Dict[str, int] = {}
+    for level in reversed(table_levels(NCISO_SCHEMA)):
+        names = [table.name for table in level if table.name in wanted]
+        counts = run_bulk(lambda name: _delete(client, name, params), names, client=client)
+        deleted.update(zip(names, counts))
+    return deleted
+
+
+class TestRun:
+    """Tenant descartável de uma execução; limpo ao sair do `with`, mesmo com erro"""
+
+    def __init__(self, client=None, label: str = '', tables: Optional[Iterable[str]] = None):
+        self.client = client or get_admin_client()
+        self.run_id = new_run_id(label)
+        # Tabelas a limpar pelo tenant: as indicadas, ou as que receberam insert()
+        self.tables = set(tables or ())
+        self.tracked: Dict[str, List[str]] = {}
+        self.deleted: Dict[str, int] = {}
+
+    @property
+    def tenant_id(self) -> str:
+        return self.run_id
+
+    def tag(self, row: dict) -> dict:
+        return {**row, 'tenant_id': self.run_id}
+
+    def insert(self, table: str, rows, prefer: str = RETURN_REPRESENTATION):
+        """POST com as linhas marcadas com o tenant da execução"""
+        rows = [self.tag(row) for row in (rows if isinstance(rows, list) else [rows])]
+        self.tables.add(table)
+        return self.client.post(table, json=rows, prefer=prefer)
+
+    def track(self, table: str, ids: Iterable[str]):
+        """Registrar linhas gravadas fora do tenant da execução"""
+        self.tracked.setdefault(table, []).extend(i for i in ids if i)
+
+    def cleanup(self) -> Dict[str, int]:
+        deleted = _delete_tables(self.client, self.tables, {'tenant_id': f"eq.{self.run_id}"})
+        for level in reversed(table_levels(NCISO_SCHEMA)):
+            for table in level:
+                if self.tracked.get(table.name):
+                    deleted[table.name] = deleted.get(table.name, 0) + \
+                        delete_ids(self.client, table.name, self.tracked.pop(table.name))
+        self.deleted = deleted
+        return deleted
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
+
+
+def sweep_filter(max_age: timedelta = DEFAULT_MAX_AGE, now: Optional[datetime] = None) -> Dict[str, str]:
+    """Filtro das execuções iniciadas antes de `now - max_age`"""
+    cutoff = (now or datetime.now(timezone.utc)) - max_age
+    return {'and': f"(tenant_id.gte.{RUN_PREFIX},tenant_id.lt.{RUN_PREFIX}{cutoff.strftime(STAMP_FORMAT)})"}
+
+
+def count_orphans(client=None, max_age: timedelta = DEFAULT_MAX_AGE,
+                  tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Linhas de execuções órfãs por tabela (sem excluir)"""
+    client = client or get_admin_client()
+    params = {'select': 'id', 'limit': '1', **sweep_filter(max_age)}
+
+    def count(table):
+        response = client.get(table, params=params, prefer=COUNT_EXACT)
+        if response.status_code not in (200, 206):
+            raise RuntimeError(f"{table}: contagem falhou ({response.status_code}): {error_message(response)}")
+        return _content_range_total(response) or 0
+
+    names = list(tables or NCISO_SCHEMA.table_names)
+    return dict(zip(names, run_bulk(count, names, client=client)))
+
+
+def sweep_orphans(client=None, max_age: timedelta = DEFAULT_MAX_AGE,
+                  tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Excluir os dados de execuções mais antigas que `max_age`: um DELETE por tabela"""
+    client = client or get_admin_client()
+    return _delete_tables(client, tables or NCISO_SCHEMA.table_names, sweep_filter(max_age))
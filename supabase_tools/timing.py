@@ -0,0 +1,320 @@
+"""
+⏱️ Tempo de cada requisição por fase (DNS, TCP, TLS, TTFB, transferência)
+Quando uma chamada ao Supabase demora, a latência total não diz se o tempo foi
+gasto na rede, no handshake TLS, no proxy (Traefik) ou no Postgres. Com o
+registro ligado, o SupabaseClient passa a usar conexões urllib3 instrumentadas:
+
+- DNS: resolução do host, feita pela própria conexão antes do connect;
+- TCP: connect do socket no endereço resolvido;
+- TLS: handshake (só HTTPS);
+- TTFB: do envio da requisição aos cabeçalhos da resposta;
+- transferência: leitura do corpo da resposta.
+
+DNS, TCP e TLS só existem em conexões novas; as reaproveitadas pelo keep-alive
+entram apenas em TTFB e transferência. Se o PostgREST devolver `Server-Timing`
+(`server-timing-enabled = true`), as fases do servidor (jwt, parse, plan,
+transaction, response) também são registradas e `rede+proxy` = TTFB menos o
+tempo declarado pelo servidor, o que separa o custo do Traefik/rede do tempo
+do banco.
+
+No HTTP/2 (httpx) as fases vêm do trace do httpcore, que não separa o DNS do
+connect TCP.
+
+Os tempos são somados por endpoint (método + caminho, sem a query) em
+histogramas HDR. Com SUPABASE_HTTP_TIMING=1 todos os clientes do processo
+compartilham um registro e a tabela é impressa ao fim da execução;
+SUPABASE_HTTP_TIMING=<arquivo>.json grava também o JSON.
+"""
+
+import atexit
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from .histogram import LatencyHistogram
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'transfer', 'total')
+CONNECTION_PHASES = ('dns', 'connect', 'tls')
+PROXY_PHASE = 'proxy'  # TTFB - Server-Timing: rede + proxy até o PostgREST
+
+_local = threading.local()
+
+
+@dataclass
+class RequestTiming:
+    endpoint: str
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: Optional[float] = None  # só HTTPS
+    ttfb: float = 0.0
+    transfer: float = 0.0
+    total: float = 0.0
+    new_connection: bool = False
+    status: Optional[int] = None
+    error: Optional[str] = None
+    server: Dict[str, float] = field(default_factory=dict)  # ms, do Server-Timing
+    headers_at: Optional[float] = None
+    _started: Dict[str, float] = field(default_factory=dict, repr=False)
+
+    def trace(self, event: str, info: dict):
+        """Callback `trace` do httpcore (extensions do httpx) para o HTTP/2"""
+        phase, _, state = event.rpartition('.')
+        now = time.perf_counter()
+        if state == 'started':
+            self._started[phase] = now
+            return
+        if state != 'complete' or phase not in self._started:
+            return
+        elapsed = now - self._started.pop(phase)
+        if phase == 'connection.connect_tcp':
+            self.connect, self.new_connection = elapsed, True
+        elif phase == 'connection.start_tls':
+            self.tls = elapsed
+        elif phase.endswith('.receive_response_headers'):
+            self.ttfb, self.headers_at = elapsed, now
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Registro da requisição em andamento nesta thread (None fora de `track`)"""
+    return getattr(_local, 'timing', None)
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """`jwt;dur=0.3, plan;dur=1.2` -> {'jwt': 0.3, 'plan': 1.2} (ms)"""
+    phases = {}
+    for entry in (header or '').split(','):
+        name, *params = [part.strip() for part in entry.split(';')]
+        for param in params:
+            key, _, value = param.partition('=')
+            if name and key.lower() == 'dur':
+                try:
+                    phases[name] = phases.get(name, 0.0) + float(value.strip('"'))
+                except ValueError:
+                    pass
+    return phases
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """`GET organizations`, `POST rpc/exec_sql`: caminho relativo a /rest/v1, sem a query"""
+    path = urlparse(url).path if '://' in url else url.split('?', 1)[0]
+    for prefix in ('/rest/v1/', '/rest/v1'):
+        if path.startswith(prefix):
+            path = path[len(prefix):]
+            break
+    return f"{method.upper()} {path.strip('/') or '/'}"
+
+
+class _TimedConnection:
+    """Resolve o DNS e conecta em passos separados para medir cada um"""
+
+    def _new_conn(self):
+        timing = current_timing()
+        if timing is None:
+            return super()._new_conn()
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            # Deixa o erro de resolução sair pelo caminho normal do urllib3
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        timing.dns = resolved - started
+        error = None
+        try:
+            # Mesma ordem de tentativa de create_connection, um endereço por vez
+            for address in dict.fromkeys(info[4][0] for info in addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+                    continue
+                timing.connect = time.perf_counter() - resolved
+                timing.new_connection = True
+                return sock
+        finally:
+            self._dns_host = host
+        raise error
+
+    def getresponse(self, *args, **kwargs):
+        timing = current_timing()
+        started = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        if timing is not None:
+            timing.headers_at = time.perf_counter()
+            timing.ttfb = timing.headers_at - started
+        return response
+
+
+class TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    def connect(self):
+        timing = current_timing()
+        started = time.perf_counter()
+        super().connect()
+        if timing is not None:
+            # connect() = _new_conn() (DNS + TCP) + handshake
+            timing.tls = max(0.0, time.perf_counter() - started - timing.dns - timing.connect)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter cujos pools criam conexões instrumentadas"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool,
+                                                   'https': TimedHTTPSConnectionPool}
+
+
+@dataclass
+class EndpointTiming:
+    endpoint: str
+    requests: int = 0
+    new_connections: int = 0
+    errors: int = 0
+    phases: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    server: Dict[str, LatencyHistogram] = field(default_factory=dict)
+
+    def histogram(self, phase: str) -> LatencyHistogram:
+        return self.phases.setdefault(phase, LatencyHistogram())
+
+    def percentile_ms(self, phase: str, percentile: float = 50.0) -> Optional[float]:
+        histogram = self.phases.get(phase) or self.server.get(phase)
+        if histogram is None or not histogram.total:
+            return None
+        return histogram.percentile(percentile) / 1000
+
+    def add(self, timing: RequestTiming):
+        self.requests += 1
+        if timing.error:
+            self.errors += 1
+            return
+        if timing.new_connection:
+            self.new_connections += 1
+            for phase in CONNECTION_PHASES:
+                if getattr(timing, phase) is not None:
+                    self.histogram(phase).record_seconds(getattr(timing, phase))
+        for phase in ('ttfb', 'transfer', 'total'):
+            self.histogram(phase).record_seconds(getattr(timing, phase))
+        if timing.server:
+            for name, duration in timing.server.items():
+                self.server.setdefault(name, LatencyHistogram()).record(round(duration * 1000))
+            server_seconds = sum(timing.server.values()) / 1000
+            self.histogram(PROXY_PHASE).record_seconds(max(0.0, timing.ttfb - server_seconds))
+
+    def to_dict(self) -> dict:
+        return {
+            'endpoint': self.endpoint,
+            'requests': self.requests,
+            'new_connections': self.new_connections,
+            'errors': self.errors,
+            'phases': {name: histogram.summary_ms() for name, histogram in self.phases.items()},
+            'server': {name: histogram.summary_ms() for name, histogram in self.server.items()},
+        }
+
+
+class TimingRecorder:
+    """Fases de cada requisição somadas por endpoint (seguro entre threads)"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointTiming] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, method: str, url: str):
+        timing = RequestTiming(endpoint_name(method, url))
+        previous = current_timing()
+        _local.timing = timing
+        started = time.perf_counter()
+        try:
+            yield timing
+        except Exception as e:
+            timing.error = type(e).__name__
+            raise
+        finally:
+            _local.timing = previous
+            finished = time.perf_counter()
+            timing.total = finished - started
+            if timing.headers_at is not None:
+                timing.transfer = finished - timing.headers_at
+            self.add(timing)
+
+    def add(self, timing: RequestTiming):
+        with self._lock:
+            endpoint = self.endpoints.get(timing.endpoint)
+            if endpoint is None:
+                endpoint = self.endpoints[timing.endpoint] = EndpointTiming(timing.endpoint)
+            endpoint.add(timing)
+
+    @property
+    def requests(self) -> int:
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+    def to_dict(self) -> dict:
+        return {'endpoints': [self.endpoints[name].to_dict() for name in sorted(self.endpoints)]}
+
+    def format_table(self, percentile: float = 50.0) -> List[str]:
+        """Linhas da tabela de fases (ms no percentil pedido) por endpoint"""
+        def cell(value):
+            return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+        header = (f"{'Endpoint':<36}{'req':>6}{'novas':>7}{'DNS':>9}{'TCP':>9}{'TLS':>9}"
+                  f"{'TTFB':>9}{'transf.':>9}{'total':>9}{'servidor':>9}{'rede+px':>9}")
+        lines = [f"⏱️  Fases por endpoint (p{percentile:g}, ms; DNS/TCP/TLS só em conexões novas)", header]
+        for name in sorted(self.endpoints, key=lambda n: -self.endpoints[n].requests):
+            endpoint = self.endpoints[name]
+            server = [h.percentile(percentile) for h in endpoint.server.values() if h.total]
+            lines.append(
+                f"{name[:35]:<36}{endpoint.requests:>6}{endpoint.new_connections:>7}"
+                + ''.join(cell(endpoint.percentile_ms(phase, percentile)) for phase in PHASES)
+                + cell(sum(server) / 1000 if server else None)
+                + cell(endpoint.percentile_ms(PROXY_PHASE, percentile))
+                + (f"  ❌ {endpoint.errors} erro(s)" if endpoint.errors else ''))
+        return lines
+
+
+_shared_recorder = None
+
+
+def shared_recorder(json_path: Optional[str] = None) -> TimingRecorder:
+    """Registro único do processo, impresso (e gravado em `json_path`) ao sair"""
+    global _shared_recorder
+    if _shared_recorder is None:
+        _shared_recorder = TimingRecorder()
+        atexit.register(_report_at_exit, _shared_recorder, json_path)
+    return _shared_recorder
+
+
+def _report_at_exit(recorder: TimingRecorder, json_path: Optional[str]):
+    if not recorder.requests:
+        return
+    print()
+    for line in recorder.format_table():
+        print(line)
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(recorder.to_dict(), f, indent=2)
+        print(f"✅ Fases das requisições salvas em: {json_path}")
@@ -0,0 +1,57 @@
+"""
+🎫 JWTs de tenant para testes de RLS
+Assina tokens HS256 com o segredo JWT do projeto (SUPABASE_JWT_SECRET), com os
+claims que as políticas de docs/rls-policies.sql leem: `role`, `sub` e
+`tenant_id`. O PostgREST troca para o papel do claim `role` e expõe os claims
+em `auth.jwt()`, então uma requisição com esse token passa pelas políticas
+exatamente como uma sessão do frontend daquele tenant.
+
+Só a biblioteca padrão (hmac/base64): o formato é simples o bastante e evita
+uma dependência apenas para os scripts de benchmark.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+import uuid
+from typing import Optional
+
+from .client import SupabaseClient
+
+AUTHENTICATED_ROLE = 'authenticated'
+DEFAULT_TTL = 3600
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def sign_jwt(claims: dict, secret: str) -> str:
+    header = _b64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    payload = _b64url(json.dumps(claims, separators=(',', ':')).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def tenant_user_id(tenant_id: str) -> str:
+    """`sub` estável por tenant (auth.uid() nas políticas)"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"nciso:user:{tenant_id}"))
+
+
+def tenant_token(tenant_id: str, secret: Optional[str] = None, role: str = AUTHENTICATED_ROLE,
+                 ttl: int = DEFAULT_TTL, **claims) -> str:
+    secret = secret or os.getenv('SUPABASE_JWT_SECRET')
+    if not secret:
+        raise RuntimeError("SUPABASE_JWT_SECRET não configurado")
+    now = int(time.time())
+    payload = {'aud': AUTHENTICATED_ROLE, 'role': role, 'sub': tenant_user_id(tenant_id),
+               'tenant_id': tenant_id, 'iat': now, 'exp': now + ttl, **claims}
+    return sign_jwt(payload, secret)
+
+
+def tenant_client(tenant_id: str, secret: Optional[str] = None, **kwargs) -> SupabaseClient:
+    """Cliente com a chave anon e o JWT do tenant: sujeito às políticas RLS"""
+    return SupabaseClient(access_token=tenant_token(tenant_id, secret), **kwargs)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+"""
+🧹 Limpeza de Execuções de Teste Órfãs
+Remove os dados de smoke tests/benchmarks que caíram antes de limpar o próprio
+tenant (testrun-*), com um único DELETE por tabela
+"""
+
+import os
+import re
+import argparse
+from datetime import timedelta
+
+from supabase_tools import get_admin_client, count_orphans, sweep_orphans, NCISO_SCHEMA
+from supabase_tools.testdata import DEFAULT_MAX_AGE
+
+_AGE_RE = re.compile(r'^(\d+)([mhd])$')
+_AGE_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+
+def parse_age(text):
+    match = _AGE_RE.match(text.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError("use o formato 30m, 6h ou 2d")
+    return timedelta(**{_AGE_UNITS[match.group(2)]: int(match.group(1))})
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Excluir dados de execuções de teste abandonadas')
+    parser.add_argument('--older-than', type=parse_age, default=DEFAULT_MAX_AGE, help='Idade mínima da execução: 30m, 6h, 2d (padrão: 6h)')
+    parser.add_argument('--tables', nargs='+', choices=NCISO_SCHEMA.table_names, help='Limitar a estas tabelas')
+    parser.add_argument('--dry-run', action='store_true', help='Apenas contar as linhas órfãs')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def main():
+    args = parse_args()
+    load_env()
+
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_ANON_KEY'):
+        print("❌ Variáveis de ambiente não configuradas!")
+        return False
+
+    client = get_admin_client()
+    action = 'Contando' if args.dry_run else 'Removendo'
+    print(f"🧹 {action} dados de execuções iniciadas há mais de {args.older_than}...\n")
+
+    try:
+        if args.dry_run:
+            counts = count_orphans(client, args.older_than, args.tables)
+        else:
+            counts = sweep_orphans(client, args.older_than, args.tables)
+    except RuntimeError as e:
+        print(f"❌ {str(e)}")
+        return False
+
+    for table, count in counts.items():
+        print(f"{'📋' if args.dry_run else '🗑️ '} {table}: {count:,}")
+
+    print(f"\n📊 Resumo:")
+    print(f"Linhas {'órfãs' if args.dry_run else 'removidas'}: {sum(counts.values()):,}")
+    return True
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""
+🧮 Sincronizador de Schema
+Compara o schema do n.CISO (modelo Python) com o banco e aplica apenas o DDL necessário
+"""
+
+import os
+import argparse
+
+from supabase_tools import get_admin_client, plan_schema_changes, NCISO_SCHEMA
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Aplicar apenas as diferenças entre o modelo e o banco')
+    parser.add_argument('--apply', action='store_true', help='Executar o DDL via rpc/exec_sql (padrão: apenas mostrar)')
+    parser.add_argument('--output', help='Salvar o DDL gerado neste arquivo')
+    return parser.parse_args()
+
+def load_env():
+    """Carregar variáveis de ambiente do arquivo .env"""
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    try:
+                        key, value = line.strip().split('=', 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        continue
+
+def main():
+    args = parse_args()
+    load_env()
+
+    print("🧮 Comparando schema desejado com o banco...\n")
+
+    client = get_admin_client()
+
+    try:
+        diff = plan_schema_changes(NCISO_SCHEMA, client)
+    except Exception as e:
+        print(f"❌ Erro ao ler o catálogo: {str(e)}")
+        print("💡 Crie a função de leitura no SQL Editor do Supabase:")
+        print("   scripts/create-query-sql-function.sql")
+        return False
+
+    for warning in diff.warnings:
+        print(f"⚠️  {warning}")
+
+    if diff.is_empty:
+        print("✅ Schema já está atualizado - nenhum DDL a executar!")
+        return True
+
+    print(f"📋 {len(diff.changes)} mudança(s) necessária(s):")
+    for change in diff.changes:
+        print(f"   • [{change.kind}] {change.description}")
+
+    sql = diff.render()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(sql + '\n')
+        print(f"\n✅ DDL salvo em: {args.output}")
+
+    if not args.apply:
+        print("\n💡 Execute novamente com --apply para aplicar as mudanças")
+        if not args.output:
+            print("\n📄 DDL:")
+            print("=" * 80)
+            print(sql)
+            print("=" * 80)
+        return True
+
+    response = client.exec_sql(sql)
+    if response.status_code in (200, 204):
+        print("\n✅ Mudanças aplicadas com sucesso!")
+        return True
+
+    print(f"\n❌ Erro ao aplicar mudanças: {response.status_code}")
+    print(response.text)
+    return False
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -6,10 +6,11 @@ Script para testar se conseguimos conectar e gravar dados no Supabase
 """
 
 import os
-import requests
 import json
 from datetime import datetime
 
+from supabase_tools import get_client, probe_tables, TestRun
+
 def test_supabase_connection():
     print("🧪 Testando conexão com Supabase...\n")
     
@@ -26,20 +27,15 @@ def test_supabase_connection():
         print("Execute: ./configure-supabase.sh")
         return False
     
-    # Headers para requisições
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
-    }
+    # Cliente compartilhado (keep-alive + timeouts)
+    client = get_client()
+    # Dados de teste num tenant próprio da execução, removidos no finally
+    run = TestRun(client, label='conexao')
     
     try:
         # Teste 1: Verificar se conseguimos conectar
         print("\n📋 Teste 1: Verificar conexão")
-        health_url = f"{supabase_url}/rest/v1/organizations?select=count&limit=1"
-        
-        response = requests.get(health_url, headers=headers)
+        response = client.get("organizations?select=count&limit=1")
         
         if response.status_code == 200:
             print("✅ Conexão estabelecida com sucesso!")
@@ -53,14 +49,13 @@ def test_supabase_connection():
             "name": "Organização de Teste n.CISO",
             "type": "company",
             "description": "Organização criada para teste de conexão",
-            "tenant_id": "test-tenant",
+            "tenant_id": run.tenant_id,
             "is_active": True,
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat()
         }
         
-        insert_url = f"{supabase_url}/rest/v1/organizations"
-        response = requests.post(insert_url, headers=headers, json=test_org)
+        insert_response = response = run.insert("organizations", test_org)
         
         if response.status_code == 201:
             print("✅ Dados inseridos com sucesso!")
@@ -70,8 +65,7 @@ def test_supabase_connection():
             
             # Teste 3: Ler os dados inseridos
             print("\n📋 Teste 3: Ler dados inseridos")
-            read_url = f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}"
-            response = requests.get(read_url, headers=headers)
+            response = client.get(f"organizations?id=eq.{org_id}")
             
             if response.status_code == 200:
                 data = response.json()
@@ -86,14 +80,11 @@ def test_supabase_connection():
             
             # Teste 4: Limpar dados de teste
             print("\n📋 Teste 4: Limpar dados de teste")
-            delete_url = f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}"
-            response = requests.delete(delete_url, headers=headers)
-            
-            if response.status_code == 204:
-                print("✅ Dados de teste removidos com sucesso!")
-            else:
-                print(f"❌ Erro ao deletar dados: {response.status_code}")
-                print(response.text)
+            try:
+                deleted = run.cleanup()
+                print(f"✅ Dados de teste removidos com sucesso! ({deleted.get('organizations', 0)} linha(s))")
+            except RuntimeError as e:
+                print(f"❌ Erro ao deletar dados: {e}")
         else:
             print("❌ Erro ao inserir dados:")
             print(f"Status: {response.status_code}")
@@ -117,17 +108,13 @@ def test_supabase_connection():
             'controls'
         ]
         
-        for table in tables:
-            try:
-                table_url = f"{supabase_url}/rest/v1/{table}?select=count&limit=1"
-                response = requests.get(table_url, headers=headers)
-                
-                if response.status_code == 200:
-                    print(f"✅ Tabela '{table}': Disponível")
-                else:
-                    print(f"❌ Tabela '{table}': {response.status_code} - {response.text}")
-            except Exception as e:
-                print(f"❌ Tabela '{table}': {str(e)}")
+        for table, status in probe_tables(tables, client=client).items():
+            if status.available:
+                print(f"✅ Tabela '{table}': Disponível")
+            elif status.status_code is None:
+                print(f"❌ Tabela '{table}': {status.error}")
+            else:
+                print(f"❌ Tabela '{table}': {status.status_code} - {status.error}")
         
         print("\n🎉 Teste de conexão concluído!")
         print("\n📊 Resumo:")
@@ -135,7 +122,7 @@ def test_supabase_connection():
         print("✅ Conexão: Estabelecida")
         print("✅ Autenticação: Configurada")
         
-        if response.status_code != 201:
+        if insert_response.status_code != 201:
             print("⚠️  Inserção de dados: Falhou (tabelas podem não existir)")
             print("\n💡 Para resolver:")
             print("1. Execute os scripts SQL no painel do Supabase")
@@ -151,6 +138,13 @@ def test_supabase_connection():
     except Exception as error:
         print(f"❌ Erro durante o teste: {error}")
         return False
+    
+    finally:
+        if run.tables and not run.deleted:
+            try:
+                run.cleanup()
+            except RuntimeError as e:
+                print(f"⚠️  Limpeza pendente ({run.tenant_id}): {e}")
 
 if __name__ == "__main__":
     # Carregar variáveis de ambiente do arquivo .env
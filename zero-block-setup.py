@@ -6,10 +6,11 @@ Guia passo a passo para configurar o Supabase e testar
 """
 
 import os
-import requests
 import json
 from datetime import datetime
 
+from supabase_tools import get_client, probe_tables, NCISO_SCHEMA, TestRun
+
 def show_instructions():
     """Mostrar instruções detalhadas"""
     print("🎯 ZERANDO O BLOCO - SETUP COMPLETO n.CISO")
@@ -75,43 +76,24 @@ def test_after_setup():
         print("❌ Variáveis de ambiente não configuradas!")
         return False
     
-    headers = {
-        'apikey': supabase_key,
-        'Authorization': f'Bearer {supabase_key}',
-        'Content-Type': 'application/json',
-        'Prefer': 'return=representation'
-    }
+    client = get_client()
     
     # Lista de tabelas para testar
-    tables_to_test = [
-        'organizations',
-        'assets',
-        'evaluations',
-        'technical_documents',
-        'teams',
-        'credentials_registry',
-        'privileged_access'
-    ]
+    tables_to_test = list(NCISO_SCHEMA.table_names)
     
     available_tables = []
     
     print("📋 Verificando tabelas disponíveis...")
     
-    for table in tables_to_test:
-        try:
-            response = requests.get(
-                f"{supabase_url}/rest/v1/{table}?select=count&limit=1",
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                print(f"✅ Tabela '{table}': Disponível")
-                available_tables.append(table)
-            else:
-                print(f"❌ Tabela '{table}': Não disponível ({response.status_code})")
-                
-        except Exception as e:
-            print(f"❌ Erro ao verificar '{table}': {str(e)}")
+    # Verificação concorrente (uma rodada de requisições em paralelo)
+    for table, status in probe_tables(tables_to_test, client=client).items():
+        if status.available:
+            print(f"✅ Tabela '{table}': Disponível")
+            available_tables.append(table)
+        elif status.error and status.status_code is None:
+            print(f"❌ Erro ao verificar '{table}': {status.error}")
+        else:
+            print(f"❌ Tabela '{table}': Não disponível ({status.status_code})")
     
     print(f"\n📊 Resumo:")
     print(f"Tabelas disponíveis: {len(available_tables)}/{len(tables_to_test)}")
@@ -122,20 +104,17 @@ def test_after_setup():
         # Testar inserção em organizations
         print("\n🧪 Testando inserção de dados...")
         
+        # Tenant próprio da execução: nada fica para trás no demo-tenant
+        run = TestRun(client, label='zeroblock')
         test_org = {
             'name': 'n.CISO Corporation',
             'type': 'company',
             'description': 'Empresa principal do sistema n.CISO',
-            'tenant_id': 'demo-tenant',
             'is_active': True
         }
         
         try:
-            response = requests.post(
-                f"{supabase_url}/rest/v1/organizations",
-                headers=headers,
-                json=test_org
-            )
+            response = run.insert("organizations", test_org)
             
             if response.status_code == 201:
                 print("✅ Inserção em organizations funcionando!")
@@ -143,28 +122,22 @@ def test_after_setup():
                 org_id = org_data[0]['id'] if org_data else None
                 
                 # Testar leitura
-                read_response = requests.get(
-                    f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}",
-                    headers=headers
-                )
+                read_response = client.get(f"organizations?id=eq.{org_id}")
                 
                 if read_response.status_code == 200:
                     print("✅ Leitura de organizations funcionando!")
                     
-                    # Limpar dados de teste
-                    delete_response = requests.delete(
-                        f"{supabase_url}/rest/v1/organizations?id=eq.{org_id}",
-                        headers=headers
-                    )
+                    # Limpar dados de teste (um DELETE por tabela, filtrado pelo tenant da execução)
+                    deleted = run.cleanup()
                     
-                    if delete_response.status_code == 204:
+                    if deleted.get('organizations'):
                         print("✅ Exclusão de organizations funcionando!")
                         print("\n🎉 BLOCO ZERADO COM SUCESSO!")
                         print("✅ Todas as operações CRUD funcionando!")
                         print("✅ n.ISMS está pronto para uso!")
                         return True
                     else:
-                        print(f"⚠️  Erro na exclusão: {delete_response.status_code}")
+                        print("⚠️  Erro na exclusão: nenhuma linha removida")
                 else:
                     print(f"❌ Erro na leitura: {read_response.status_code}")
             else:
@@ -173,6 +146,12 @@ def test_after_setup():
                 
         except Exception as e:
             print(f"❌ Erro no teste: {str(e)}")
+        finally:
+            if not run.deleted:
+                try:
+                    run.cleanup()
+                except RuntimeError as e:
+                    print(f"⚠️  Limpeza pendente ({run.tenant_id}): {str(e)}")
     else:
         print("\n❌ Nem todas as tabelas estão disponíveis.")
         print("💡 Execute o SQL no Supabase primeiro!")